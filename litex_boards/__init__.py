@@ -1,7 +1,8 @@
 import os
 import sys
-import glob
 import importlib
+import importlib.abc
+import importlib.util
 
 # Boards Vendors.
 
@@ -40,39 +41,73 @@ vendors = [
     "xilinx",
 ]
 
-# Get all platforms/targets.
+# Short Names --------------------------------------------------------------------------------------
+
+# Verify if a Vendor prefix is present in platform/target name, if so create a short alias to allow
+# the platform/target to be imported with the full name or short name ex:
+# from litex_boards.platforms import digilent_arty or
+# from litex_boards.platforms import arty
+# Aliases are only resolved from the file names: the board module itself is only imported when the
+# alias is requested, so importing a board no longer imports all the others (and their cores).
+
 litex_boards_dir = os.path.dirname(os.path.realpath(__file__))
-platforms        = glob.glob(f"{litex_boards_dir}/platforms/*.py")
-targets          = glob.glob(f"{litex_boards_dir}/targets/*.py")
 
-# For each platform:
-for platform in platforms:
-    platform = os.path.basename(platform)
-    platform = platform.replace(".py", "")
-    # Verify if a Vendor prefix is present in platform name, if so create the short import to
-    # allow the platform to be imported with the full name or short name ex:
-    # from litex_boards.platforms import digilent_arty or
-    # from litex_boards.platforms import arty
-    if platform.split("_")[0] in vendors:
-        short_platform = platform[len(platform.split("_")[0])+1:]
-        p = importlib.import_module(f"litex_boards.platforms.{platform}")
-        vars()[short_platform] = p
-        sys.modules[f"litex_boards.platforms.{short_platform}"] = p
+def _collect_short_names(package):
+    short_names = {}
+    for f in sorted(os.listdir(os.path.join(litex_boards_dir, package))):
+        name, ext = os.path.splitext(f)
+        if ext != ".py":
+            continue
+        vendor = name.split("_")[0]
+        if vendor in vendors:
+            short_names[name[len(vendor)+1:]] = name
+    return short_names
+
+short_names = {
+    "platforms" : _collect_short_names("platforms"),
+    "targets"   : _collect_short_names("targets"),
+}
+
+def resolve_short_name(package, name):
+    """Return the full module name of a platform/target short name (or None)."""
+    full_name = short_names[package].get(name, None)
+    if full_name is None:
+        return None
+    return f"{__name__}.{package}.{full_name}"
+
+class _ShortNameLoader(importlib.abc.Loader):
+    def __init__(self, full_name):
+        self.full_name = full_name
+
+    def create_module(self, spec):
+        # Return the module imported with its full name so that both names share the same module.
+        module = importlib.import_module(self.full_name)
+        self.full_spec = module.__spec__
+        return module
+
+    def exec_module(self, module):
+        # The import machinery sets the short name spec on the module: restore the full name one.
+        module.__spec__ = self.full_spec
+
+    # Used by runpy to allow running a target with its short name (ex: python3 -m ...targets.arty).
+    def get_code(self, fullname):
+        return importlib.util.find_spec(self.full_name).loader.get_code(self.full_name)
+
+    def is_package(self, fullname):
+        return False
+
+class _ShortNameFinder(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path=None, target=None):
+        prefix, _, name = fullname.rpartition(".")
+        for package in short_names.keys():
+            if prefix == f"{__name__}.{package}":
+                full_name = resolve_short_name(package, name)
+                if full_name is not None:
+                    origin = importlib.util.find_spec(full_name).origin
+                    return importlib.util.spec_from_loader(fullname, _ShortNameLoader(full_name),
+                        origin = origin)
+        return None
 
-# For each target:
-for target in targets:
-    target = os.path.basename(target)
-    target = target.replace(".py", "")
-    # Verify if a Vendor prefix is present in target name, if so create the short import to
-    # allow the target to be imported with the full name or short name ex:
-    # from litex_boards.targets import digilent_arty or
-    # from litex_boards.targets import arty
-    if target.split("_")[0] in vendors:
-        try:
-            short_target = target[len(target.split("_")[0])+1:]
-            t = importlib.import_module(f"litex_boards.targets.{target}")
-            vars()[short_target] = t
-            sys.modules[f"litex_boards.targets.{short_target}"] = t
-        except ModuleNotFoundError:
-            # Not all dependencies for this target is satisfied. Skip.
-            pass
+# Inserted first to give short names precedence over existing files.
+if not any(isinstance(finder, _ShortNameFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _ShortNameFinder())
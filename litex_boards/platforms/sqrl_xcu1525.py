@@ -78,6 +78,30 @@ _io = [
         Subsignal("tx_p", Pins("AF7 AG9 AH7 AJ9 AK7 AL9 AM7 AN9 AP7 AR9 AT7 AU9 AV7 BB5 BD5 BF5")),
     ),
 
+    # QSFP28 (Same pinout than the Alveo U200/U250).
+    ("qsfp28", 0,
+        Subsignal("clk_n", Pins("K10")),
+        Subsignal("clk_p", Pins("K11")),
+        Subsignal("fs0", Pins("AT20"), IOStandard("LVCMOS12")),
+        Subsignal("fs1", Pins("AU22"), IOStandard("LVCMOS12")),
+        Subsignal("refclk_reset", Pins("AT22"), IOStandard("LVCMOS12")),
+        Subsignal("rxn", Pins("N3 M1 L3 K1")),
+        Subsignal("rxp", Pins("N4 M2 L4 K2")),
+        Subsignal("txn", Pins("N8 M6 L8 K6")),
+        Subsignal("txp", Pins("N9 M7 L9 K7")),
+    ),
+    ("qsfp28", 1,
+        Subsignal("clk_n", Pins("P10")),
+        Subsignal("clk_p", Pins("P11")),
+        Subsignal("fs0", Pins("AR22"), IOStandard("LVCMOS12")),
+        Subsignal("fs1", Pins("AU20"), IOStandard("LVCMOS12")),
+        Subsignal("refclk_reset", Pins("AR21"), IOStandard("LVCMOS12")),
+        Subsignal("rxn", Pins("U3 T1 R3 P1")),
+        Subsignal("rxp", Pins("U4 T2 R4 P2")),
+        Subsignal("txn", Pins("U8 T6 R8 P6")),
+        Subsignal("txp", Pins("U9 T7 R9 P7")),
+    ),
+
     # DDR4 SDRAM
     ("ddram", 0,
         Subsignal("a", Pins(
@@ -0,0 +1,273 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+AXI helpers shared by the targets.
+
+Striped burst DMAs: write a stream to memory (AXIStripedDMAWriter) or read memory to a stream
+(AXIStripedDMAReader) with full AXI bursts, over one or several AXI ports (HBM pseudo-channels,
+Zynq PS7 HP ports, etc...) to sum their bandwidth:
+
+    self.submodules.dma_writer = AXIStripedDMAWriter(ports)
+    self.comb += source.connect(self.dma_writer.sink)
+
+Both are controlled through CSRs: base/length (bytes, burst aligned, as wide as the ports' addresses)
+of the buffer, enable (0 resets the DMA), loop (over the buffer), done and error (buffer not in the
+striped address space: the transfer is not started).
+"""
+
+from functools import reduce
+from operator import add
+
+from migen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# AXI Striped DMA ----------------------------------------------------------------------------------
+
+class _AXIStriping:
+    """Flat address space striped over AXI ports at burst granularity.
+
+    Burst n of the flat space goes to port n % nports. With port_size, each port targets its own
+    region (port i: [(port_offset + i)*port_size, (port_offset + i + 1)*port_size], ex HBM
+    pseudo-channels to avoid the HBM switch) at burst n // nports of the region; without, the ports
+    share the address space (ex Zynq PS7 HP ports) and only spread the bandwidth.
+
+    The flat address space is nports*port_size bytes (or the ports' address space without port_size);
+    buffers outside of it are rejected instead of spilling into the next port's region.
+    """
+    def __init__(self, ports, port_offset=0, burst_length=16, port_size=None):
+        assert len(ports) in [1, 2, 4, 8, 16, 32]
+        assert burst_length <= 16 # AXI3 ports (AxLEN: 4-bit).
+        self.ports         = ports
+        self.port_offset   = port_offset
+        self.burst_length  = burst_length
+        self.port_size     = port_size
+        self.data_width    = len(ports[0].w.data)
+        self.address_width = len(ports[0].aw.addr)
+        self.size          = len(ports)*port_size if port_size is not None else 2**self.address_width
+        self.burst_bytes   = burst_length*self.data_width//8
+        self.burst_shift   = log2_int(self.burst_bytes)
+        self.port_bits     = log2_int(len(ports), need_pow2=True)
+        if port_size is not None:
+            assert port_size % self.burst_bytes == 0
+            assert (port_offset + len(ports))*port_size <= 2**self.address_width
+
+    def port(self, address):
+        if self.port_bits == 0:
+            return 0
+        return address[self.burst_shift:self.burst_shift + self.port_bits]
+
+    def port_address(self, port, address):
+        if self.port_size is None:
+            return address
+        local = Cat(address[:self.burst_shift], address[self.burst_shift + self.port_bits:])
+        return (self.port_offset + port)*self.port_size + local
+
+    def add_csr(self, module):
+        """Add the CSRs to module and return its enable (0 when the buffer is out of bounds)."""
+        aw = self.address_width
+        module._base   = CSRStorage(aw, name="base",   description="Base byte address (burst aligned).")
+        module._length = CSRStorage(aw, name="length", description="Length in bytes (burst multiple).")
+        module._enable = CSRStorage(name="enable", description="Enable (0: reset, 1: run).")
+        module._done   = CSRStatus(name="done",    description="Transfer done.")
+        module._loop   = CSRStorage(name="loop",   description="Loop over the buffer.")
+        module._error  = CSRStatus(name="error",   description="Buffer out of the striped address space.")
+
+        # Bound check.
+        end    = Signal(aw + 1)
+        enable = Signal()
+        module.comb += [
+            end.eq(module._base.storage + module._length.storage),
+            module._error.status.eq(end > self.size),
+            enable.eq(module._enable.storage & ~module._error.status),
+        ]
+        return enable
+
+class AXIStripedDMAWriter(Module, AutoCSR):
+    """Write a stream to memory with AXI bursts striped over several AXI ports."""
+    def __init__(self, ports, **kwargs):
+        self.striping = s = _AXIStriping(ports, **kwargs)
+        self.sink     = sink = stream.Endpoint([("data", s.data_width)])
+        enable        = s.add_csr(self)
+
+        # # #
+
+        nbursts  = Signal(s.address_width)
+        self.comb += nbursts.eq(self._length.storage[s.burst_shift:])
+
+        # Address (AW) channels: issue one burst per port in round-robin.
+        aw_offset = Signal(s.address_width)
+        aw_count  = Signal(s.address_width)
+        aw_addr   = Signal(s.address_width)
+        aw_port   = Signal(max(s.port_bits, 1))
+        self.comb += [
+            aw_addr.eq(self._base.storage + aw_offset),
+            aw_port.eq(s.port(aw_addr)),
+        ]
+        aw_ready = Signal()
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.aw.valid.eq(enable & (aw_count != nbursts) & (aw_port == i)),
+                port.aw.addr.eq(s.port_address(i, aw_addr)),
+                port.aw.burst.eq(0b01), # INCR.
+                port.aw.len.eq(s.burst_length - 1),
+                port.aw.size.eq(log2_int(s.data_width//8)),
+                port.aw.id.eq(0),
+                If(aw_port == i, aw_ready.eq(port.aw.ready)),
+            ]
+        self.sync += [
+            If(~enable,
+                aw_offset.eq(0),
+                aw_count.eq(0),
+            ).Elif((aw_count != nbursts) & aw_ready,
+                aw_offset.eq(aw_offset + s.burst_bytes),
+                aw_count.eq(aw_count + 1),
+                If(self._loop.storage & (aw_count == (nbursts - 1)),
+                    aw_offset.eq(0),
+                    aw_count.eq(0),
+                )
+            )
+        ]
+
+        # Data (W) channels: route sink to the ports in the same order, burst_length beats each.
+        w_offset = Signal(s.address_width)
+        w_count  = Signal(s.address_width)
+        w_beat   = Signal(max=s.burst_length)
+        w_addr   = Signal(s.address_width)
+        w_port   = Signal(max(s.port_bits, 1))
+        w_ready  = Signal()
+        self.comb += [
+            w_addr.eq(self._base.storage + w_offset),
+            w_port.eq(s.port(w_addr)),
+        ]
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.w.valid.eq(enable & (w_count != nbursts) & sink.valid & (w_port == i)),
+                port.w.data.eq(sink.data),
+                port.w.strb.eq(2**(s.data_width//8) - 1),
+                port.w.last.eq(w_beat == (s.burst_length - 1)),
+                If(w_port == i, w_ready.eq(port.w.ready)),
+            ]
+        self.comb += sink.ready.eq(enable & (w_count != nbursts) & w_ready)
+        self.sync += [
+            If(~enable,
+                w_offset.eq(0),
+                w_count.eq(0),
+                w_beat.eq(0),
+            ).Elif(sink.valid & sink.ready,
+                w_beat.eq(w_beat + 1),
+                If(w_beat == (s.burst_length - 1),
+                    w_beat.eq(0),
+                    w_offset.eq(w_offset + s.burst_bytes),
+                    w_count.eq(w_count + 1),
+                    If(self._loop.storage & (w_count == (nbursts - 1)),
+                        w_offset.eq(0),
+                        w_count.eq(0),
+                    )
+                )
+            )
+        ]
+
+        # Response (B) channels: count write responses of all the ports.
+        b_count = Signal(s.address_width)
+        b_valid = Signal(len(ports))
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.b.ready.eq(1),
+                b_valid[i].eq(port.b.valid),
+            ]
+        self.sync += [
+            If(~enable,
+                b_count.eq(0)
+            ).Else(
+                b_count.eq(b_count + reduce(add, [b_valid[i] for i in range(len(ports))]))
+            )
+        ]
+        self.comb += self._done.status.eq(enable & ~self._loop.storage &
+            (b_count == nbursts))
+
+class AXIStripedDMAReader(Module, AutoCSR):
+    """Read memory with AXI bursts striped over several AXI ports to a stream."""
+    def __init__(self, ports, **kwargs):
+        self.striping = s = _AXIStriping(ports, **kwargs)
+        self.source   = source = stream.Endpoint([("data", s.data_width)])
+        enable        = s.add_csr(self)
+
+        # # #
+
+        nbursts  = Signal(s.address_width)
+        self.comb += nbursts.eq(self._length.storage[s.burst_shift:])
+
+        # Address (AR) channels: issue one burst per port in round-robin.
+        ar_offset = Signal(s.address_width)
+        ar_count  = Signal(s.address_width)
+        ar_addr   = Signal(s.address_width)
+        ar_port   = Signal(max(s.port_bits, 1))
+        ar_ready  = Signal()
+        self.comb += [
+            ar_addr.eq(self._base.storage + ar_offset),
+            ar_port.eq(s.port(ar_addr)),
+        ]
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.ar.valid.eq(enable & (ar_count != nbursts) & (ar_port == i)),
+                port.ar.addr.eq(s.port_address(i, ar_addr)),
+                port.ar.burst.eq(0b01), # INCR.
+                port.ar.len.eq(s.burst_length - 1),
+                port.ar.size.eq(log2_int(s.data_width//8)),
+                port.ar.id.eq(0),
+                If(ar_port == i, ar_ready.eq(port.ar.ready)),
+            ]
+        self.sync += [
+            If(~enable,
+                ar_offset.eq(0),
+                ar_count.eq(0),
+            ).Elif((ar_count != nbursts) & ar_ready,
+                ar_offset.eq(ar_offset + s.burst_bytes),
+                ar_count.eq(ar_count + 1),
+                If(self._loop.storage & (ar_count == (nbursts - 1)),
+                    ar_offset.eq(0),
+                    ar_count.eq(0),
+                )
+            )
+        ]
+
+        # Data (R) channels: collect the bursts in the order they have been issued.
+        r_offset = Signal(s.address_width)
+        r_count  = Signal(s.address_width)
+        r_addr   = Signal(s.address_width)
+        r_port   = Signal(max(s.port_bits, 1))
+        r_last   = Signal()
+        self.comb += [
+            r_addr.eq(self._base.storage + r_offset),
+            r_port.eq(s.port(r_addr)),
+        ]
+        for i, port in enumerate(ports):
+            self.comb += [
+                port.r.ready.eq(enable & (r_count != nbursts) & (r_port == i) &
+                    source.ready),
+                If(r_port == i,
+                    source.valid.eq(enable & (r_count != nbursts) & port.r.valid),
+                    source.data.eq(port.r.data),
+                    r_last.eq(port.r.last),
+                )
+            ]
+        self.sync += [
+            If(~enable,
+                r_offset.eq(0),
+                r_count.eq(0),
+            ).Elif(source.valid & source.ready & r_last,
+                r_offset.eq(r_offset + s.burst_bytes),
+                r_count.eq(r_count + 1),
+                If(self._loop.storage & (r_count == (nbursts - 1)),
+                    r_offset.eq(0),
+                    r_count.eq(0),
+                )
+            )
+        ]
+        self.comb += self._done.status.eq(enable & ~self._loop.storage &
+            (r_count == nbursts))
@@ -0,0 +1,624 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Video capture helpers shared by the targets.
+
+Capture pipeline, one per video input, in sys:
+
+    Video source -> VideoPixelPacker -> VideoCaptureRing (DRAM) -> PCIe DMA Writer (to the host).
+
+- Video source: HDMIRXGTHPHY (HDMI/DVI input received by GTH transceivers: TMDS word alignment,
+  decoding and channel deskew) or VideoPatternSource (color bars at the video timings, to validate
+  the DRAM/PCIe path without a source).
+- VideoPixelPacker: active pixels packed as rgb888 (32-bit, VideoFrameBuffer's format) in DRAM
+  words, the first pixel of each frame flagged.
+- VideoCaptureRing: frames written to a ring of frame buffers in DRAM and read back, frame by
+  frame, once written. The reader skips the frames overwritten before it could read them.
+
+Options (--hdmi-capture-inputs, --hdmi-capture-source, --hdmi-capture-timings,
+--hdmi-capture-frames) with the DRAM bandwidth (writes + reads) checked against the board's SDRAM:
+
+    parser = argparse.ArgumentParser()
+    capture_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **capture_argdict(args))
+
+    # In BaseSoC:
+    capture = capture_params(kwargs, ninputs=4,
+        sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41J256M16, "1:4", databits=64))
+    sources = [VideoPatternSource(capture["timings"], sys_clk_freq) for n in capture["inputs"]]
+    add_video_capture(self, sources, timings=capture["timings"], nframes=capture["frames"],
+        dmas = [getattr(self, "pcie_dma{}".format(i)) for i in range(len(sources))])
+"""
+
+from types import SimpleNamespace
+
+from migen import *
+from migen.genlib.cdc import MultiReg
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+from litex.soc.cores.code_tmds import control_tokens
+from litex.soc.cores.video import video_data_layout, video_timings
+from litex.soc.cores.video import VideoTimingGenerator
+
+from litex_boards.soc.video import _get_timings
+
+# Arguments ----------------------------------------------------------------------------------------
+
+capture_sources = ["hdmi", "pattern"]
+
+# Default capture timings/number of frames of the DRAM rings.
+capture_timings_default = "1920x1080@60Hz"
+capture_frames_default  = 4
+
+# Bytes per captured pixel (rgb888, 32-bit).
+capture_bytes_per_pixel = 4
+
+# Efficiency of the SDRAM on the capture traffic (interleaved write/read streams of the inputs).
+capture_sdram_efficiency = 0.6
+
+def capture_args(parser):
+    parser.add_argument("--hdmi-capture-inputs", default=None,
+        help="HDMI inputs to capture (ex: 0,1, default: all).")
+    parser.add_argument("--hdmi-capture-source", default=None, choices=capture_sources,
+        help="Capture source: hdmi (HDMI inputs) or pattern (color bars, DRAM/PCIe test) (default: "
+             "target's default).")
+    parser.add_argument("--hdmi-capture-timings", default=None,
+        help="Capture timings, sizing the frame buffers (default: {}).".format(
+            capture_timings_default))
+    parser.add_argument("--hdmi-capture-frames", default=None, type=int,
+        help="Frame buffers in each DRAM ring (default: {}).".format(capture_frames_default))
+
+def capture_argdict(args):
+    r = {
+        "hdmi_capture_inputs"  : args.hdmi_capture_inputs,
+        "hdmi_capture_source"  : args.hdmi_capture_source,
+        "hdmi_capture_timings" : args.hdmi_capture_timings,
+        "hdmi_capture_frames"  : args.hdmi_capture_frames,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+# Capture Parameters -------------------------------------------------------------------------------
+
+def capture_bandwidth(timings):
+    """Return the DRAM bandwidth (bytes/s) of a captured input: active pixels written + read."""
+    name, t = _get_timings(timings)
+    h_total = t["h_active"] + t["h_blanking"]
+    v_total = t["v_active"] + t["v_blanking"]
+    fps     = t["pix_clk"]/(h_total*v_total)
+    return 2*t["h_active"]*t["v_active"]*capture_bytes_per_pixel*fps
+
+def capture_params(kwargs, ninputs, sdram_bandwidth=None, source="hdmi"):
+    """Return the capture parameters (inputs, source, timings, frames) of the board.
+
+    source is the board's default source ("pattern" when its HDMI inputs are not wired yet). The DRAM
+    bandwidth of the captured inputs is checked against the (derated) bandwidth of the
+    board's SDRAM (sdram_bandwidth, bytes/s).
+    """
+    inputs  = kwargs.get("hdmi_capture_inputs", None)
+    source  = kwargs.get("hdmi_capture_source", source)
+    timings = kwargs.get("hdmi_capture_timings", capture_timings_default)
+    frames  = kwargs.get("hdmi_capture_frames", capture_frames_default)
+    if inputs is None:
+        inputs = list(range(ninputs))
+    elif isinstance(inputs, str):
+        inputs = [int(n) for n in inputs.split(",")]
+    if (len(inputs) == 0) or (len(set(inputs)) != len(inputs)) or \
+        any(not (0 <= n < ninputs) for n in inputs):
+        raise ValueError("Capture: invalid inputs {}, available: 0 to {}.".format(
+            inputs, ninputs - 1))
+    if source not in capture_sources:
+        raise ValueError("Capture: unsupported source {}, supported: {}.".format(
+            source, ", ".join(capture_sources)))
+    if frames < 2:
+        raise ValueError("Capture: {} frames, at least 2 are required.".format(frames))
+    name, t = _get_timings(timings)
+
+    # SDRAM bandwidth budget.
+    if sdram_bandwidth is not None:
+        required = len(inputs)*capture_bandwidth((name, t))
+        budget   = sdram_bandwidth*capture_sdram_efficiency
+        if required > budget:
+            raise ValueError("Capture: {}x {} needs {:.1f}MB/s, over the SDRAM budget of "
+                "{:.1f}MB/s ({:.0%} of {:.1f}MB/s), capture fewer inputs or use a wider "
+                "SDRAM.".format(len(inputs), name, required/1e6, budget/1e6,
+                capture_sdram_efficiency, sdram_bandwidth/1e6))
+
+    return {
+        "inputs"  : inputs,
+        "source"  : source,
+        "timings" : name if name in video_timings else (name, t),
+        "frames"  : frames,
+    }
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _is_control_token(char):
+    return Reduce("OR", [char == token for token in control_tokens])
+
+# TMDS Decoder -------------------------------------------------------------------------------------
+
+class TMDSDecoder(Module):
+    """Decode a (word aligned) TMDS character to data (de=1) or control (de=0) (combinatorial)."""
+    def __init__(self):
+        self.input = Signal(10)
+        self.d     = Signal(8)
+        self.c     = Signal(2)
+        self.de    = Signal()
+
+        # # #
+
+        # Control tokens.
+        self.comb += self.de.eq(1)
+        self.comb += Case(self.input, {token: [self.de.eq(0), self.c.eq(n)]
+            for n, token in enumerate(control_tokens)})
+
+        # Data: optional inversion (bit 9), then XOR (bit 8 set) or XNOR decoding.
+        data = Signal(8)
+        self.comb += data.eq(Mux(self.input[9], ~self.input[:8], self.input[:8]))
+        self.comb += self.d[0].eq(data[0])
+        for i in range(1, 8):
+            self.comb += self.d[i].eq(Mux(self.input[8],
+                data[i] ^ data[i-1],
+                ~(data[i] ^ data[i-1])))
+
+# TMDS Aligner -------------------------------------------------------------------------------------
+
+class TMDSAligner(Module):
+    """Align the TMDS characters of a raw (unaligned) bitstream of nwords characters per cycle.
+
+    The bitstream is shifted by 0-9 bits until control periods (runs of at least min_run control
+    tokens) are seen: each period (in cycles) without any moves to the next shift.
+    """
+    def __init__(self, nwords=2, period=2**16, min_run=8):
+        self.input   = Signal(10*nwords) # First received bit in LSB.
+        self.output  = Signal(10*nwords) # Aligned characters, first in LSBs.
+        self.aligned = Signal()
+        self.shift   = Signal(max=10)
+
+        # # #
+
+        # Shift.
+        data = Signal(10*nwords)
+        self.sync += data.eq(self.input)
+        window = Cat(data, self.input)
+        self.sync += Case(self.shift, {
+            i: self.output.eq(window[i:i + 10*nwords]) for i in range(10)})
+
+        # Control token runs.
+        run  = Signal(max=min_run + 1)
+        runs = [run]
+        for i in range(nwords):
+            char  = self.output[10*i:10*(i+1)]
+            token = Signal()
+            self.comb += token.eq(_is_control_token(char))
+            new_run = Signal(max=min_run + 1)
+            self.comb += If(token,
+                new_run.eq(Mux(runs[-1] == min_run, min_run, runs[-1] + 1))
+            )
+            runs.append(new_run)
+        seen = Signal()
+        self.sync += [
+            run.eq(runs[-1]),
+            If(runs[-1] == min_run, seen.eq(1)),
+        ]
+
+        # Check each period, shift when no control period.
+        timer = Signal(max=period)
+        self.sync += [
+            timer.eq(timer + 1),
+            If(timer == (period - 1),
+                timer.eq(0),
+                seen.eq(0),
+                self.aligned.eq(seen | (runs[-1] == min_run)),
+                If(~seen & (runs[-1] != min_run),
+                    self.shift.eq(Mux(self.shift == 9, 0, self.shift + 1))
+                )
+            )
+        ]
+
+# TMDS Channel Sync --------------------------------------------------------------------------------
+
+tmds_char_layout = [("d", 8), ("c", 2), ("de", 1)]
+
+class TMDSChannelSync(Module):
+    """Deskew the decoded TMDS channels (b, g, r) on the start of the data enable periods.
+
+    Each channel is buffered in a FIFO of depth characters (max skew): unsynced, the channels
+    are dropped up to the start of a data enable period, where they wait for each other. Synced,
+    they are read together (and sync is lost when their data enables differ).
+    """
+    def __init__(self, nchannels=3, depth=16):
+        self.sinks  = sinks  = [stream.Endpoint(tmds_char_layout) for n in range(nchannels)]
+        self.source = source = stream.Endpoint(video_data_layout)
+        self.synced = synced = Signal()
+
+        # # #
+
+        fifos = [stream.SyncFIFO(tmds_char_layout, depth, buffered=True) for n in range(nchannels)]
+        self.submodules += fifos
+        for sink, fifo in zip(sinks, fifos):
+            self.comb += sink.connect(fifo.sink)
+        heads = [fifo.source for fifo in fifos]
+
+        all_valid = Signal()
+        all_de    = Signal()
+        any_de    = Signal()
+        self.comb += [
+            all_valid.eq(Reduce("AND", [head.valid for head in heads])),
+            all_de.eq(Reduce("AND", [head.de for head in heads])),
+            any_de.eq(Reduce("OR",  [head.de for head in heads])),
+        ]
+
+        # Synced: read all the channels together.
+        self.comb += [
+            source.valid.eq(synced & all_valid),
+            source.b.eq(heads[0].d),
+            source.g.eq(heads[1].d),
+            source.r.eq(heads[2].d),
+            source.hsync.eq(heads[0].c[0]),
+            source.vsync.eq(heads[0].c[1]),
+            source.de.eq(all_de),
+        ]
+        self.sync += [
+            If(synced & all_valid & any_de & ~all_de,
+                synced.eq(0)
+            ).Elif(~synced & all_valid & all_de,
+                synced.eq(1)
+            )
+        ]
+
+        # Unsynced: drop each channel up to the start of a data enable period.
+        for head in heads:
+            de_last = Signal()
+            self.sync += If(head.valid & head.ready, de_last.eq(head.de))
+            self.comb += If(synced,
+                head.ready.eq(all_valid & source.ready)
+            ).Else(
+                head.ready.eq(~(head.de & ~de_last) & ~(all_valid & all_de))
+            )
+
+# HDMI RX GTH PHY ----------------------------------------------------------------------------------
+
+class HDMIRXGTHPHY(Module, AutoCSR):
+    """HDMI/DVI receiver on UltraScale GTH transceivers (TMDS data channels, 2 characters/cycle).
+
+    Each TMDS data channel is received by a GTH (CPLL from refclk, CDR at linerate: 10x pixel
+    clock of the timings, rejected when the CPLL can't generate it from refclk), word aligned and crossed to sys where it is decoded; the channels are then deskewed to
+    a video_data_layout stream (source) at the pixel rate. sys_clk has to be faster than the pixel
+    clock. Requires LiteICLink.
+    """
+    def __init__(self, pads, refclk, refclk_freq, sys_clk_freq, timings=capture_timings_default,
+        clock_domain_prefix="hdmi_in", rx_polarity=0):
+        from liteiclink.serdes.gth_ultrascale import GTHChannelPLL, GTH3
+
+        # TMDS: 10 bits per pixel clock.
+        name, t  = _get_timings(timings)
+        linerate = 10*t["pix_clk"]
+        try:
+            GTHChannelPLL.compute_config(refclk_freq, linerate)
+        except ValueError:
+            raise ValueError("Capture: {} ({:.3f}Gbps TMDS linerate) not supported by the GTH CPLL "
+                "with a {:.2f}MHz refclk.".format(name, linerate/1e9, refclk_freq/1e6))
+
+        self.source  = stream.Endpoint(video_data_layout)
+        self._status = CSRStatus(name="status", fields=[
+            CSRField("aligned", size=3, description="TMDS channels word aligned."),
+            CSRField("synced",  size=1, description="TMDS channels deskewed."),
+        ])
+
+        # # #
+
+        self.submodules.channel_sync = channel_sync = TMDSChannelSync(nchannels=3)
+        aligned = Signal(3)
+        for n in range(3):
+            cd = "{}_rx{}".format(clock_domain_prefix, n)
+
+            # GTH.
+            pll = GTHChannelPLL(refclk, refclk_freq, linerate)
+            self.submodules += pll
+            gth = GTH3(pll,
+                tx_pads       = SimpleNamespace(p=Signal(), n=Signal()), # Unused.
+                rx_pads       = SimpleNamespace(
+                    p = getattr(pads, "data{}_p".format(n)),
+                    n = getattr(pads, "data{}_n".format(n))),
+                sys_clk_freq  = sys_clk_freq,
+                data_width    = 20,
+                clock_aligner = False,
+                rx_polarity   = rx_polarity)
+            gth = ClockDomainsRenamer({
+                "tx": "{}_tx{}".format(clock_domain_prefix, n),
+                "rx": cd})(gth)
+            setattr(self.submodules, "gth{}".format(n), gth)
+
+            # Word alignment (in the recovered clock domain).
+            aligner = ClockDomainsRenamer(cd)(TMDSAligner(nwords=2))
+            setattr(self.submodules, "aligner{}".format(n), aligner)
+            self.comb += aligner.input.eq(Cat(*[decoder.input for decoder in gth.decoders]))
+            self.specials += MultiReg(aligner.aligned, aligned[n])
+
+            # Clock Domain Crossing to sys and conversion to 1 character/cycle.
+            cdc = stream.AsyncFIFO([("data", 20)], depth=8, buffered=True)
+            cdc = ClockDomainsRenamer({"write": cd, "read": "sys"})(cdc)
+            converter = stream.Converter(20, 10)
+            decoder   = TMDSDecoder()
+            self.submodules += cdc, converter, decoder
+            self.comb += [
+                cdc.sink.valid.eq(1),
+                cdc.sink.data.eq(aligner.output),
+                cdc.source.connect(converter.sink),
+                decoder.input.eq(converter.source.data),
+                converter.source.connect(channel_sync.sinks[n], omit={"data"}),
+                channel_sync.sinks[n].d.eq(decoder.d),
+                channel_sync.sinks[n].c.eq(decoder.c),
+                channel_sync.sinks[n].de.eq(decoder.de),
+            ]
+        self.comb += [
+            channel_sync.source.connect(self.source),
+            self._status.fields.aligned.eq(aligned),
+            self._status.fields.synced.eq(channel_sync.synced),
+        ]
+
+# Video Pattern Source -----------------------------------------------------------------------------
+
+class VideoPatternSource(Module, AutoCSR):
+    """Color bars at the video timings, paced to the pixel clock (video_data_layout stream)."""
+    def __init__(self, timings, sys_clk_freq):
+        self.source = source = stream.Endpoint(video_data_layout)
+
+        # # #
+
+        name, t = _get_timings(timings)
+        assert t["pix_clk"] <= sys_clk_freq
+        self.submodules.vtg = vtg = VideoTimingGenerator(default_video_timings=t)
+
+        # Pacing: one pixel per pixel clock period (on average).
+        ce  = Signal()
+        acc = Signal(16)
+        inc = int(2**16*t["pix_clk"]/sys_clk_freq)
+        self.sync += Cat(acc, ce).eq(acc + inc)
+        self.comb += [
+            vtg.source.connect(source, keep={"hsync", "vsync", "de"}),
+            source.valid.eq(vtg.source.valid & ce),
+            vtg.source.ready.eq(source.ready & ce),
+        ]
+
+        # Color Bars (8 bars, from hcount: ColorBarsPattern restarts its bars on stalls). hcount is
+        # one ahead of the active pixel.
+        color_bars = [
+            # R     G     B
+            [0xff, 0xff, 0xff], # White
+            [0xff, 0xff, 0x00], # Yellow
+            [0x00, 0xff, 0xff], # Cyan
+            [0x00, 0xff, 0x00], # Green
+            [0xff, 0x00, 0xff], # Purple
+            [0xff, 0x00, 0x00], # Red
+            [0x00, 0x00, 0xff], # Blue
+            [0x00, 0x00, 0x00], # Black
+        ]
+        bar = Signal(3)
+        for i in range(1, 8):
+            self.comb += If(vtg.source.hcount > (i*t["h_active"])//8, bar.eq(i))
+        self.comb += Case(bar, {i: [
+            source.r.eq(color_bars[i][0]),
+            source.g.eq(color_bars[i][1]),
+            source.b.eq(color_bars[i][2])] for i in range(8)})
+
+# Video Pixel Packer -------------------------------------------------------------------------------
+
+class VideoPixelPacker(Module):
+    """Pack the active pixels as rgb888 (32-bit) in data_width words, first set on each frame start.
+
+    Frames start on the first active pixel following a vsync rising edge; frames are expected to
+    be a multiple of data_width/32 pixels.
+    """
+    def __init__(self, data_width=32):
+        self.sink   = sink   = stream.Endpoint(video_data_layout)
+        self.source = source = stream.Endpoint([("data", data_width)])
+
+        # # #
+
+        self.submodules.converter = converter = stream.Converter(32, data_width)
+
+        # Start of Frame.
+        vsync_last = Signal()
+        sof        = Signal()
+        self.sync += [
+            If(sink.valid & sink.ready,
+                vsync_last.eq(sink.vsync),
+                If(sink.vsync & ~vsync_last,
+                    sof.eq(1)
+                ).Elif(sink.de,
+                    sof.eq(0)
+                )
+            )
+        ]
+
+        # Active pixels (Blanking is dropped).
+        self.comb += [
+            converter.sink.valid.eq(sink.valid & sink.de),
+            converter.sink.first.eq(sof),
+            converter.sink.data.eq(Cat(sink.b, sink.g, sink.r, Signal(8))),
+            sink.ready.eq(~sink.de | converter.sink.ready),
+            converter.source.connect(source),
+        ]
+
+# Video Capture Ring -------------------------------------------------------------------------------
+
+class VideoCaptureRing(Module, AutoCSR):
+    """Write the captured frames to a ring of frame buffers in DRAM and read them back in order.
+
+    Frame n is written at base + (n % nframes)*frame_size (bytes, in the SDRAM) from the start of a
+    frame (sink.first); frames are read back (source) once written. When the writer laps the reader,
+    the overwritten frames are skipped (and counted in overflows). enable=0 resets the ring.
+    """
+    def __init__(self, write_port, read_port, base=0, frame_size=0, nframes=4, fifo_depth=64):
+        from litedram.frontend.dma import LiteDRAMDMAWriter, LiteDRAMDMAReader
+
+        assert write_port.data_width == read_port.data_width
+        data_width  = write_port.data_width
+        self.sink   = sink   = stream.Endpoint([("data", data_width)])
+        self.source = source = stream.Endpoint([("data", data_width)])
+
+        self._enable     = CSRStorage(name="enable", description="Enable (0: reset, 1: run).")
+        self._base       = CSRStorage(32, name="base", reset=base,
+            description="Base byte address (in the SDRAM).")
+        self._frame_size = CSRStorage(32, name="frame_size", reset=frame_size,
+            description="Frame size in bytes.")
+        self._nframes    = CSRStorage(8,  name="nframes", reset=nframes,
+            description="Frames in the ring.")
+        self._writes     = CSRStatus(32,  name="writes",    description="Frames written.")
+        self._reads      = CSRStatus(32,  name="reads",     description="Frames read.")
+        self._overflows  = CSRStatus(32,  name="overflows", description="Frames skipped (lapped).")
+
+        # # #
+
+        shift  = log2_int(data_width//8)
+        enable = self._enable.storage
+        words  = Signal(32)
+        base   = Signal(32)
+        self.comb += [
+            words.eq(self._frame_size.storage[shift:]),
+            base.eq(self._base.storage[shift:]),
+        ]
+
+        # Writer.
+        self.submodules.writer = writer = LiteDRAMDMAWriter(write_port, fifo_depth=fifo_depth)
+        w_offset = Signal(32)
+        w_frame  = Signal(32) # Base word address of the written frame.
+        w_index  = Signal(8)
+        w_count  = self._writes.status
+        w_active = Signal()
+        self.comb += [
+            writer.sink.address.eq(w_frame + w_offset),
+            writer.sink.data.eq(sink.data),
+            If(w_active & ~(sink.first & (w_offset != 0)),
+                writer.sink.valid.eq(sink.valid),
+                sink.ready.eq(writer.sink.ready),
+            ).Else(
+                # Wait for the start of a frame (a new frame restarts the frame being written).
+                sink.ready.eq(~sink.first | ~enable),
+            )
+        ]
+        self.sync += [
+            If(~enable,
+                w_active.eq(0),
+                w_offset.eq(0),
+                w_frame.eq(base),
+                w_index.eq(0),
+                w_count.eq(0),
+            ).Elif(~w_active,
+                If(sink.valid & sink.first, w_active.eq(1))
+            ).Elif(sink.valid & sink.first & (w_offset != 0),
+                w_offset.eq(0)
+            ).Elif(writer.sink.valid & writer.sink.ready,
+                w_offset.eq(w_offset + 1),
+                If(w_offset == (words - 1),
+                    w_active.eq(0),
+                    w_offset.eq(0),
+                    w_count.eq(w_count + 1),
+                    w_frame.eq(w_frame + words),
+                    w_index.eq(w_index + 1),
+                    If(w_index == (self._nframes.storage - 1),
+                        w_frame.eq(base),
+                        w_index.eq(0),
+                    )
+                )
+            )
+        ]
+
+        # Reader.
+        self.submodules.reader = reader = LiteDRAMDMAReader(read_port, fifo_depth=fifo_depth)
+        r_offset  = Signal(32)
+        r_frame   = Signal(32) # Base word address of the read frame.
+        r_index   = Signal(8)
+        r_count   = self._reads.status
+        r_active  = Signal()
+        r_lag     = Signal(32)
+        overflows = self._overflows.status
+        self.comb += [
+            r_lag.eq(w_count - r_count),
+            reader.sink.valid.eq(r_active),
+            reader.sink.address.eq(r_frame + r_offset),
+            reader.source.connect(source),
+        ]
+        r_next = [
+            r_count.eq(r_count + 1),
+            r_frame.eq(r_frame + words),
+            r_index.eq(r_index + 1),
+            If(r_index == (self._nframes.storage - 1),
+                r_frame.eq(base),
+                r_index.eq(0),
+            )
+        ]
+        self.sync += [
+            If(~enable,
+                r_active.eq(0),
+                r_offset.eq(0),
+                r_frame.eq(base),
+                r_index.eq(0),
+                r_count.eq(0),
+                overflows.eq(0),
+            ).Elif(~r_active,
+                If(r_lag >= self._nframes.storage,
+                    # Lapped by the writer: skip the overwritten frame.
+                    overflows.eq(overflows + 1),
+                    *r_next
+                ).Elif(r_lag != 0,
+                    r_active.eq(1)
+                )
+            ).Elif(reader.sink.ready,
+                r_offset.eq(r_offset + 1),
+                If(r_offset == (words - 1),
+                    r_active.eq(0),
+                    r_offset.eq(0),
+                    *r_next
+                )
+            )
+        ]
+
+# Add Video Capture --------------------------------------------------------------------------------
+
+def add_video_capture(soc, sources, name="video_capture", timings=capture_timings_default,
+    nframes=capture_frames_default, dmas=[], base=None):
+    """Capture the video sources to DRAM rings, read back to the PCIe DMA Writers (one per source).
+
+    The rings are placed at the top of the SDRAM by default (base: SDRAM offset of the first ring).
+    """
+    _, t = _get_timings(timings)
+    frame_size = t["h_active"]*t["v_active"]*capture_bytes_per_pixel
+    ring_size  = nframes*frame_size
+    if base is None:
+        base = soc.bus.regions["main_ram"].size - len(sources)*ring_size
+    for n, video_source in enumerate(sources):
+        write_port = soc.sdram.crossbar.get_port("write")
+        read_port  = soc.sdram.crossbar.get_port("read")
+        packer = VideoPixelPacker(data_width=write_port.data_width)
+        ring   = VideoCaptureRing(write_port, read_port,
+            base       = base + n*ring_size,
+            frame_size = frame_size,
+            nframes    = nframes)
+        setattr(soc.submodules, "{}{}_source".format(name, n), video_source)
+        setattr(soc.submodules, "{}{}_packer".format(name, n), packer)
+        setattr(soc.submodules, "{}{}".format(name, n), ring)
+        soc.comb += [
+            video_source.source.connect(packer.sink),
+            packer.source.connect(ring.sink),
+        ]
+        if n < len(dmas):
+            converter = stream.Converter(write_port.data_width, dmas[n].data_width)
+            soc.submodules += converter
+            soc.comb += [
+                ring.source.connect(converter.sink),
+                converter.source.connect(dmas[n].sink),
+            ]
+        else:
+            soc.comb += ring.source.ready.eq(1)
+    soc.add_constant("VIDEO_CAPTURE_CHANNELS", len(sources))
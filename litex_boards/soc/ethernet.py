@@ -0,0 +1,434 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Ethernet helpers shared by the targets.
+
+Etherbone options (--eth-dw, --etherbone-buffer-depth, --with-udp-streamer), with the board's
+defaults and checked against the Ethernet PHY:
+
+    parser = argparse.ArgumentParser()
+    etherbone_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **etherbone_argdict(args))
+
+    # In BaseSoC:
+    add_etherbone(self, phy=self.ethphy, ip_address=eth_ip, **etherbone_params(kwargs, self.ethphy))
+
+- eth_dw: data width of the UDP/IP core. With 8 (1G PHYs' width), the core runs in the PHY's RX
+  clock domain; with 32/64, it runs in the sys clock domain (a 32-bit core sustains 1G at sys_clk
+  >= 31.25MHz).
+- etherbone_buffer_depth: depth (in words) of the Etherbone buffers, the max number of reads/writes
+  of an Etherbone record: the host can read/write up to this number of words per packet (burst)
+  instead of a single word.
+- udp_streamer: UDP frontend streaming the SoC's bus to the host at link rate (memory dumps), see
+  UDPMemoryStreamer and litex_boards/tools/udp_dump.py.
+
+Ethernet PHY options (--eth-rate, --eth-port) for boards with SFP/QSFP cages: 1G (board's 1000BASE-X
+PHY) or 10G/25G (USXXVEthernetPHY, used with a 64-bit UDP/IP core).
+"""
+
+import os
+
+from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
+from migen.genlib.cdc import MultiReg
+
+from litex.soc.interconnect import wishbone
+from litex.soc.interconnect.csr import *
+from litex.soc.cores.dma import WishboneDMAReader
+
+# Constants ----------------------------------------------------------------------------------------
+
+# Supported UDP/IP core data widths.
+eth_dws = [8, 32, 64]
+
+# Max Etherbone buffer depth (Etherbone records' read/write counts are 8-bit).
+etherbone_buffer_depth_max = 255
+
+# Default UDP Streamer port.
+udp_streamer_port_default = 2000
+
+# Line rates (Gbps) of the USXXVEthernetPHY per transceiver type.
+xxv_line_rates = {"GTH": [10], "GTY": [10, 25]}
+
+# Arguments ----------------------------------------------------------------------------------------
+
+def etherbone_args(parser):
+    parser.add_argument("--eth-dw", default=None, type=int,
+        help="Ethernet UDP/IP core data width: 8, 32 or 64 (default: PHY's data width).")
+    parser.add_argument("--etherbone-buffer-depth", default=None, type=int,
+        help="Etherbone buffer depth in words, max burst length of the accesses (default: board's default).")
+    parser.add_argument("--with-udp-streamer", action="store_true",
+        help="Enable UDP Streamer (bulk reads of the SoC's bus at link rate, with Etherbone).")
+    parser.add_argument("--udp-streamer-port", default=None, type=int,
+        help="UDP Streamer port (default: {}).".format(udp_streamer_port_default))
+
+def etherbone_argdict(args):
+    r = {
+        "eth_dw"                 : args.eth_dw,
+        "etherbone_buffer_depth" : args.etherbone_buffer_depth,
+        "with_udp_streamer"      : True if args.with_udp_streamer else None,
+        "udp_streamer_port"      : args.udp_streamer_port,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+def eth_phy_args(parser, rates=[1], ports=[0]):
+    parser.add_argument("--eth-rate", default=rates[0], type=int, choices=rates,
+        help="Ethernet line rate in Gbps (default: {}).".format(rates[0]))
+    parser.add_argument("--eth-port", default=ports[0], type=int, choices=ports,
+        help="Ethernet SFP/QSFP cage (default: {}).".format(ports[0]))
+
+def eth_phy_argdict(args):
+    return {
+        "eth_rate" : args.eth_rate,
+        "eth_port" : args.eth_port,
+    }
+
+# Etherbone Parameters -----------------------------------------------------------------------------
+
+def etherbone_params(kwargs, phy, buffer_depth=None, data_widths=eth_dws):
+    """Return the Etherbone parameters of add_etherbone for the board.
+
+    buffer_depth is the board's default (None: LiteEth's default), overridden by the Etherbone
+    options passed to the SoC (kwargs). data_widths are the core data widths supported by the board.
+    The parameters are checked against the PHY.
+    """
+    phy_dw = getattr(phy, "dw", 8)
+
+    data_width   = kwargs.get("eth_dw", max(phy_dw, min(data_widths)))
+    buffer_depth = kwargs.get("etherbone_buffer_depth", buffer_depth)
+    if data_width not in data_widths:
+        raise ValueError("Ethernet: data width ({}) not supported by the board, supported: {}.".format(
+            data_width, ", ".join(str(dw) for dw in data_widths)))
+    if data_width < phy_dw:
+        raise ValueError("Ethernet: data width ({}) smaller than the {}-bit PHY.".format(
+            data_width, phy_dw))
+    if buffer_depth is not None and not (1 <= buffer_depth <= etherbone_buffer_depth_max):
+        raise ValueError("Etherbone: buffer depth ({}) must be between 1 and {}.".format(
+            buffer_depth, etherbone_buffer_depth_max))
+
+    params = {"data_width": data_width}
+    if buffer_depth is not None:
+        params["buffer_depth"] = buffer_depth
+    if kwargs.get("with_udp_streamer", False):
+        params["with_udp_streamer"] = True
+        params["udp_streamer_port"] = kwargs.get("udp_streamer_port", udp_streamer_port_default)
+    return params
+
+# UDP Memory Streamer ------------------------------------------------------------------------------
+
+def _swap_bytes(s):
+    return Cat(*[s[8*i:8*(i + 1)] for i in reversed(range(len(s)//8))])
+
+class UDPMemoryStreamer(Module):
+    """Stream the SoC's bus to the host over UDP (bulk reads at link rate).
+
+    Request (host --> SoC, big-endian): address (32-bit, bytes), length (32-bit, bytes), both 32-bit
+    aligned. Response (SoC --> host, to the IP/port of the request): packets of up to packet_size
+    bytes prefixed with their address (32-bit, big-endian), data in the bus' byte order. Requests
+    received while streaming are dropped.
+
+    cd is the clock domain of the UDP port (the module has to be renamed to it when not sys).
+    """
+    def __init__(self, udp, udp_port, packet_size=1024, cd="sys"):
+        self.bus = bus = wishbone.Interface()
+        port = udp.crossbar.get_port(udp_port, dw=32, cd=cd)
+
+        # # #
+
+        packet_words = packet_size//4
+
+        # Request.
+        address    = Signal(32)
+        remaining  = Signal(32)
+        ip_address = Signal(32)
+        dst_port   = Signal(16)
+        rx_count   = Signal(2)
+        start      = Signal()
+
+        # Bus reads (issued ahead of the packets).
+        self.submodules.dma = dma = WishboneDMAReader(bus, endianness="big") # No byte swap.
+        rd_address   = Signal(30)
+        rd_remaining = Signal(32)
+        self.comb += [
+            dma.sink.valid.eq(rd_remaining != 0),
+            dma.sink.address.eq(rd_address),
+        ]
+        self.sync += [
+            If(start,
+                rd_address.eq(address[2:]),
+                rd_remaining.eq(_swap_bytes(port.source.data)[2:]),
+            ).Elif(dma.sink.valid & dma.sink.ready,
+                rd_address.eq(rd_address + 1),
+                rd_remaining.eq(rd_remaining - 1),
+            )
+        ]
+
+        # Packets.
+        count   = Signal(max=packet_words + 1)
+        nwords  = Signal(max=packet_words + 1)
+        self.comb += If(remaining > packet_words,
+            nwords.eq(packet_words)
+        ).Else(
+            nwords.eq(remaining)
+        )
+        self.comb += [
+            port.sink.src_port.eq(udp_port),
+            port.sink.dst_port.eq(dst_port),
+            port.sink.ip_address.eq(ip_address),
+            port.sink.length.eq(4 + 4*nwords),
+        ]
+        if hasattr(port.sink, "last_be"):
+            self.comb += port.sink.last_be.eq(0b1000)
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        self.comb += port.source.ready.eq(1)
+        fsm.act("IDLE",
+            If(port.source.valid,
+                If(rx_count != 3,
+                    NextValue(rx_count, rx_count + 1)
+                ),
+                If(rx_count == 0,
+                    NextValue(address, _swap_bytes(port.source.data))
+                ),
+                If(rx_count == 1,
+                    NextValue(remaining, _swap_bytes(port.source.data)[2:])
+                ),
+                If(port.source.last,
+                    NextValue(rx_count, 0),
+                    NextValue(ip_address, port.source.ip_address),
+                    NextValue(dst_port,   port.source.src_port),
+                    If((rx_count == 1) & (_swap_bytes(port.source.data)[2:] != 0),
+                        start.eq(1),
+                        NextState("HEADER")
+                    )
+                )
+            )
+        )
+        fsm.act("HEADER",
+            port.sink.valid.eq(1),
+            port.sink.data.eq(_swap_bytes(address)),
+            If(port.sink.ready,
+                NextValue(count, 0),
+                NextState("DATA")
+            )
+        )
+        fsm.act("DATA",
+            port.sink.valid.eq(dma.source.valid),
+            port.sink.last.eq(count == (nwords - 1)),
+            port.sink.data.eq(dma.source.data),
+            dma.source.ready.eq(port.sink.ready),
+            If(port.sink.valid & port.sink.ready,
+                NextValue(count, count + 1),
+                If(port.sink.last,
+                    NextValue(address,   address   + 4*nwords),
+                    NextValue(remaining, remaining - nwords),
+                    If(remaining == nwords,
+                        NextState("IDLE")
+                    ).Else(
+                        NextState("HEADER")
+                    )
+                )
+            )
+        )
+
+# 10G/25G Ethernet PHY -----------------------------------------------------------------------------
+
+class USXXVEthernetPHY(Module, AutoCSR):
+    """Xilinx UltraScale(+) 10G/25G Ethernet Subsystem PHY (10GBASE-R/25GBASE-R on a GT lane).
+
+    The xxv_ethernet IP is generated in PCS/PMA mode (64-bit XGMII, no external file required) and
+    LiteEth's XGMII PHY does the framing on its 64-bit data path: use it with a 64-bit UDP/IP core
+    (add_etherbone(..., data_width=64)). The XGMII runs at 156.25MHz (10G) or 390.625MHz (25G).
+
+    pads: GT lane (txp/txn/rxp/rxn, lane selects the lane of multi-lane pads), refclk_pads: GT
+    reference clock (clk_p/clk_n or p/n) of refclk_freq. The GT is placed by its pins.
+    """
+    dw = 64
+    def __init__(self, platform, pads, refclk_pads, sys_clk_freq, lane=0, line_rate=10,
+        refclk_freq  = 156.25e6,
+        gt_type      = "GTY",
+        ip_name      = "xxv_ethernet_0",
+        ip_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "vivado_ip")):
+        from liteeth.phy.xgmii import LiteEthPHYXGMII
+
+        if line_rate not in xxv_line_rates[gt_type]:
+            raise ValueError("Ethernet: {}G not supported by {} transceivers, supported: {}.".format(
+                line_rate, gt_type, ", ".join(f"{r}G" for r in xxv_line_rates[gt_type])))
+        self.platform     = platform
+        self.ip_name      = ip_name
+        self.ip_cache_dir = ip_cache_dir
+        self.ip_config    = {
+            "CORE"                : "Ethernet PCS/PMA 64-bit",
+            "BASE_R_KR"           : "BASE-R",
+            "DATA_PATH_INTERFACE" : "MII",
+            "NUM_OF_CORES"        : 1,
+            "LINE_RATE"           : line_rate,
+            "GT_TYPE"             : gt_type,
+            "GT_REF_CLK_FREQ"     : "{:.8g}".format(refclk_freq/1e6),
+            "GT_DRP_CLK"          : "{:.2f}".format(sys_clk_freq/1e6),
+            "INCLUDE_RX_FIFO"     : 1,
+        }
+        self.tx_clk_freq = self.rx_clk_freq = {10: 156.25e6, 25: 390.625e6}[line_rate]
+
+        self.block_lock = CSRStatus(description="PCS block lock (link up).")
+
+        # # #
+
+        # XGMII PHY (RX data re-timed to the TX clock by the IP's RX FIFO).
+        mii_clk = Signal()
+        xgmii_clock_pads = Record([("rx", 1), ("tx", 1)])
+        xgmii_pads       = Record([("tx_ctl", 8), ("tx_data", 64), ("rx_ctl", 8), ("rx_data", 64)])
+        self.comb += [
+            xgmii_clock_pads.rx.eq(mii_clk),
+            xgmii_clock_pads.tx.eq(mii_clk),
+        ]
+        self.submodules.xgmii = xgmii = LiteEthPHYXGMII(xgmii_clock_pads, xgmii_pads, dw=64)
+        self.crg    = xgmii.crg
+        self.sink   = xgmii.sink
+        self.source = xgmii.source
+        self.integrated_ifg_inserter = xgmii.integrated_ifg_inserter
+        self.cd_eth_tx, self.cd_eth_rx = xgmii.cd_eth_tx, xgmii.cd_eth_rx
+
+        # Resets.
+        tx_reset = Signal()
+        rx_reset = Signal()
+        self.specials += [
+            AsyncResetSynchronizer(xgmii.crg.cd_eth_tx, tx_reset),
+            AsyncResetSynchronizer(xgmii.crg.cd_eth_rx, rx_reset),
+        ]
+
+        # Status.
+        block_lock = Signal()
+        self.specials += MultiReg(block_lock, self.block_lock.status)
+
+        # IP.
+        def get_lane(name):
+            s = getattr(pads, name)
+            return s[lane] if len(s) > 1 else s
+        refclk_p = refclk_pads.clk_p if hasattr(refclk_pads, "clk_p") else refclk_pads.p
+        refclk_n = refclk_pads.clk_n if hasattr(refclk_pads, "clk_n") else refclk_pads.n
+        self.ip_params = dict(
+            # Clks/Rsts.
+            i_gt_refclk_p                  = refclk_p,
+            i_gt_refclk_n                  = refclk_n,
+            i_dclk                         = ClockSignal("sys"),
+            i_sys_reset                    = ResetSignal("sys"),
+            o_tx_mii_clk_0                 = mii_clk,
+            i_rx_core_clk_0                = mii_clk,
+            i_tx_reset_0                   = 0,
+            i_rx_reset_0                   = 0,
+            o_user_tx_reset_0              = tx_reset,
+            o_user_rx_reset_0              = rx_reset,
+            i_gtwiz_reset_tx_datapath_0    = 0,
+            i_gtwiz_reset_rx_datapath_0    = 0,
+            i_qpllreset_in_0               = 0,
+            i_txoutclksel_in_0             = 0b101,
+            i_rxoutclksel_in_0             = 0b101,
+            i_gt_loopback_in_0             = 0b000,
+
+            # GT.
+            i_gt_rxp_in_0                  = get_lane("rxp"),
+            i_gt_rxn_in_0                  = get_lane("rxn"),
+            o_gt_txp_out_0                 = get_lane("txp"),
+            o_gt_txn_out_0                 = get_lane("txn"),
+
+            # XGMII.
+            i_tx_mii_d_0                   = xgmii_pads.tx_data,
+            i_tx_mii_c_0                   = xgmii_pads.tx_ctl,
+            o_rx_mii_d_0                   = xgmii_pads.rx_data,
+            o_rx_mii_c_0                   = xgmii_pads.rx_ctl,
+
+            # PCS Control/Status.
+            i_ctl_tx_data_pattern_select_0 = 0,
+            i_ctl_tx_test_pattern_0        = 0,
+            i_ctl_rx_data_pattern_select_0 = 0,
+            i_ctl_rx_test_pattern_0        = 0,
+            o_stat_rx_block_lock_0         = block_lock,
+        )
+
+    def add_sources(self, platform):
+        ip_tcl = []
+        if self.ip_cache_dir is not None:
+            # Share IP synthesis results between builds (the IP is only synthesized once per config).
+            os.makedirs(self.ip_cache_dir, exist_ok=True)
+            ip_tcl.append(f"config_ip_cache -use_cache_location {self.ip_cache_dir}")
+        ip_tcl.append(f"create_ip -vendor xilinx.com -name xxv_ethernet -module_name {self.ip_name}")
+        ip_tcl.append(f"set obj [get_ips {self.ip_name}]")
+        ip_tcl.append("set_property -dict [list \\")
+        for config, value in self.ip_config.items():
+            ip_tcl.append("CONFIG.{} {} \\".format(config, "{{" + str(value) + "}}"))
+        ip_tcl.append("] $obj")
+        ip_tcl.append("synth_ip $obj")
+        platform.toolchain.pre_synthesis_commands += ip_tcl
+
+    def do_finalize(self):
+        self.add_sources(self.platform)
+        self.specials += Instance(self.ip_name, **self.ip_params)
+
+# Etherbone ----------------------------------------------------------------------------------------
+
+def add_etherbone(soc, phy, name="etherbone", phy_cd="eth", data_width=8,
+    mac_address             = 0x10e2d5000000,
+    ip_address              = "192.168.1.50",
+    udp_port                = 1234,
+    buffer_depth            = None,
+    with_udp_streamer       = False,
+    udp_streamer_port       = udp_streamer_port_default,
+    with_timing_constraints = True):
+    """Add Etherbone (and optional UDP Streamer) to the SoC with a data_width UDP/IP core."""
+    from liteeth.core import LiteEthUDPIPCore
+    from liteeth.frontend.etherbone import LiteEthEtherbone
+
+    assert data_width in eth_dws
+
+    # Core.
+    ethcore = LiteEthUDPIPCore(
+        phy         = phy,
+        mac_address = mac_address,
+        ip_address  = ip_address,
+        clk_freq    = soc.clk_freq,
+        dw          = data_width)
+    if data_width == 8:
+        # Run the 8-bit core in PHY's RX clock domain.
+        ethcore = ClockDomainsRenamer({
+            "eth_tx": phy_cd + "_tx",
+            "eth_rx": phy_cd + "_rx",
+            "sys":    phy_cd + "_rx"})(ethcore)
+        # Create Etherbone clock domain (core's sys is renamed) and run it from sys clock domain.
+        etherbone_cd = name
+        setattr(soc.clock_domains, f"cd_{name}", ClockDomain(name))
+        soc.comb += getattr(soc, f"cd_{name}").clk.eq(ClockSignal("sys"))
+        soc.comb += getattr(soc, f"cd_{name}").rst.eq(ResetSignal("sys"))
+    else:
+        # Run the wide core in sys clock domain.
+        ethcore = ClockDomainsRenamer({
+            "eth_tx": phy_cd + "_tx",
+            "eth_rx": phy_cd + "_rx"})(ethcore)
+        etherbone_cd = "sys"
+    setattr(soc.submodules, "ethcore_" + name, ethcore)
+
+    # Etherbone.
+    etherbone_kwargs = {} if buffer_depth is None else {"buffer_depth": buffer_depth}
+    etherbone = LiteEthEtherbone(ethcore.udp, udp_port, mode="master", cd=etherbone_cd, **etherbone_kwargs)
+    setattr(soc.submodules, name, etherbone)
+    soc.bus.add_master(name=name, master=etherbone.wishbone.bus)
+
+    # UDP Streamer.
+    if with_udp_streamer:
+        streamer = UDPMemoryStreamer(ethcore.udp, udp_streamer_port, cd=etherbone_cd)
+        streamer = ClockDomainsRenamer(etherbone_cd)(streamer)
+        setattr(soc.submodules, name + "_udp_streamer", streamer)
+        soc.bus.add_master(name=name + "_udp_streamer", master=streamer.bus)
+
+    # Timing constraints.
+    if with_timing_constraints:
+        eth_rx_clk = getattr(phy, "crg", phy).cd_eth_rx.clk
+        eth_tx_clk = getattr(phy, "crg", phy).cd_eth_tx.clk
+        soc.platform.add_period_constraint(eth_rx_clk, 1e9/phy.rx_clk_freq)
+        soc.platform.add_period_constraint(eth_tx_clk, 1e9/phy.tx_clk_freq)
+        soc.platform.add_false_path_constraints(soc.crg.cd_sys.clk, eth_rx_clk, eth_tx_clk)
@@ -0,0 +1,132 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+PCIe helpers shared by the targets.
+
+Provides the common PCIe arguments of the targets and their validation against the PCIe PHY:
+
+    parser = argparse.ArgumentParser()
+    pcie_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **pcie_argdict(args))
+
+    # In BaseSoC:
+    self.submodules.pcie_phy = S7PCIEPHY(platform,
+        bar0_size = 0x20000,
+        **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+    self.add_pcie(phy=self.pcie_phy, **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
+
+The lanes select the pcie_x<lanes> resource of the platform and, with the speed, the data width of
+the PHY (sized to sustain the link bandwidth).
+
+Each DMA channel gets its own writer/reader MSIs and its own /dev/litepcieN device in the LitePCIe
+driver (the number of channels is exported to the driver with the DMA_CHANNELS constant).
+"""
+
+# Constants ----------------------------------------------------------------------------------------
+
+# Max number of DMA channels supported by the LitePCIe driver (CSR_PCIE_DMA0_BASE..7).
+pcie_dmas_max = 8
+
+# Default DMA buffering depth (in bytes).
+pcie_dma_buffering_depth_default = 1024
+
+# Supported speeds/lanes of the PHYs and corresponding data widths (first speed is the default).
+pcie_phy_data_widths = {
+    "S7PCIEPHY" : {
+        "gen2" : {1: 64, 2: 64, 4: 128, 8: 128},
+    },
+    "USPCIEPHY" : {
+        "gen3" : {1: 64, 2: 64, 4: 128, 8: 256},
+    },
+    "USPPCIEPHY" : {
+        "gen3" : {1: 64, 2: 64, 4: 128, 8: 256, 16: 512},
+    },
+    "USPHBMPCIEPHY" : {
+        "gen3" : {1: 64, 2: 64, 4: 128, 8: 256, 16: 512},
+        "gen4" : {1: 64, 2: 128, 4: 256, 8: 512},
+    },
+}
+
+# Arguments ----------------------------------------------------------------------------------------
+
+def pcie_args(parser):
+    parser.add_argument("--pcie-lanes", default=None, type=int,
+        help="Number of PCIe lanes (default: target's default).")
+    parser.add_argument("--pcie-speed", default=None,
+        help="PCIe speed: gen2, gen3 or gen4 (default: PHY's max speed).")
+    parser.add_argument("--pcie-dmas", default=None, type=int,
+        help="Number of PCIe DMA channels (default: target's default, 1 on most, max: {}).".format(pcie_dmas_max))
+    parser.add_argument("--pcie-dma-buffering-depth", default=pcie_dma_buffering_depth_default, type=int,
+        help="PCIe DMA buffering depth in bytes, 0 to disable buffering (default: {}).".format(
+            pcie_dma_buffering_depth_default))
+
+def pcie_argdict(args):
+    r = {
+        "pcie_lanes"               : args.pcie_lanes,
+        "pcie_speed"               : args.pcie_speed,
+        "pcie_dmas"                : args.pcie_dmas,
+        "pcie_dma_buffering_depth" : args.pcie_dma_buffering_depth,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+# PHY Parameters -----------------------------------------------------------------------------------
+
+def pcie_phy_lanes(platform):
+    """Return the lanes of the pcie_x<lanes> resources of the platform."""
+    lanes = []
+    for resource in platform.constraint_manager.available:
+        name = resource[0]
+        if name.startswith("pcie_x") and name[len("pcie_x"):].isdigit():
+            lanes.append(int(name[len("pcie_x"):]))
+    return sorted(set(lanes))
+
+def pcie_phy_params(platform, phy_cls, lanes=4, speed=None):
+    """Check the lanes/speed against the platform and PHY and return the PHY parameters."""
+    speeds = pcie_phy_data_widths[phy_cls.__name__]
+    if speed is None:
+        speed = list(speeds.keys())[0]
+    if speed not in speeds:
+        raise ValueError("PCIe: {} not supported by {}, supported: {}.".format(
+            speed, phy_cls.__name__, ", ".join(speeds.keys())))
+    if lanes not in speeds[speed]:
+        raise ValueError("PCIe: {} x{} not supported by {}, supported: {}.".format(
+            speed, lanes, phy_cls.__name__, ", ".join("x{}".format(n) for n in speeds[speed])))
+    if lanes not in pcie_phy_lanes(platform):
+        raise ValueError("PCIe: x{} not available on the platform, available: {}.".format(
+            lanes, ", ".join("x{}".format(n) for n in pcie_phy_lanes(platform))))
+    params = {
+        "pads"       : platform.request("pcie_x{}".format(lanes)),
+        "data_width" : speeds[speed][lanes],
+    }
+    # 7-Series PHY is Gen2 only and has no speed parameter.
+    if phy_cls.__name__ != "S7PCIEPHY":
+        params["speed"] = speed
+    return params
+
+# DMA Parameters -----------------------------------------------------------------------------------
+
+def pcie_dma_params(phy, ndmas=1, buffering_depth=pcie_dma_buffering_depth_default):
+    """Check the DMA configuration against the PHY and return the DMA parameters of add_pcie."""
+    bytes_per_word = phy.data_width//8
+    if not (1 <= ndmas <= pcie_dmas_max):
+        raise ValueError("PCIe: {} DMA channels requested, supported: 1 to {}.".format(
+            ndmas, pcie_dmas_max))
+    if buffering_depth != 0:
+        # Buffering FIFOs are sized in PHY words (buffering_depth//bytes_per_word) and their level
+        # is reported in PHY words: depth has to be a power of 2 and hold at least 2 words.
+        if buffering_depth & (buffering_depth - 1):
+            raise ValueError("PCIe: DMA buffering depth ({}) must be a power of 2.".format(
+                buffering_depth))
+        if buffering_depth < 2*bytes_per_word:
+            raise ValueError("PCIe: DMA buffering depth ({}) too small for a {}-bit PHY, min: {}.".format(
+                buffering_depth, phy.data_width, 2*bytes_per_word))
+    return {
+        "ndmas"               : ndmas,
+        "with_dma_buffering"  : buffering_depth != 0,
+        "dma_buffering_depth" : buffering_depth or pcie_dma_buffering_depth_default,
+    }
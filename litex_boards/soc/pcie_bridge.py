@@ -0,0 +1,486 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+PCIe DMA bridges shared by the targets.
+
+Connects LitePCIe DMA channels directly to the SATA sector streamers and to LiteDRAM DMAs, so the
+host moves data to/from the drives or the SDRAM without going through the CPU of the SoC:
+
+    # In BaseSoC (after add_pcie):
+    add_sata_ports(self, ..., dma="pcie")             # SATA sector streamer(s) <-> PCIe DMA(s).
+    add_pcie_sdram_dmas(self, [self.sdram.crossbar])  # LiteDRAM DMAs <-> next PCIe DMA(s).
+
+    # After the build:
+    generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+    generate_pcie_bridge_software(soc, os.path.join(builder.output_dir, "driver"))
+
+The PCIe DMA channels are allocated to the bridges in order (pcie_dma_alloc): the channel of each
+bridge is exported in the <BRIDGE>_PCIE_DMA constant (/dev/litepcie<n> of the driver).
+
+The host-side API (driver/user/bridge, liblitepcie_bridge.a) moves scatter/gather lists between
+host buffers and the bridges (sectors of a SATA drive/volume, SDRAM addresses):
+
+    const struct litepcie_bridge *bridge = litepcie_bridge_get("sata_streamer0");
+    struct litepcie_sg sg[] = {
+        {.address = 0x000000, .buf = header, .length =   4096},
+        {.address = 0x100000, .buf = data,   .length = 1<<20},
+    };
+    litepcie_bridge_read(bridge, sg, 2);
+
+The data goes through the DMA buffers of the LitePCIe driver (mmap): for each piece of a segment
+(up to half the DMA buffers), the host only programs the bridge (sector/count or base/length) over
+BAR0, enables the DMA channel and waits for the bridge. Reads are extended by at least one DMA
+buffer (to flush the previous ones), so sectors/SDRAM beyond the segments are read (not returned:
+only the segments are copied to the host buffers, litepcie_bridge_util only writes the requested
+length to its file).
+"""
+
+import os
+
+# Constants ----------------------------------------------------------------------------------------
+
+# Bridge kinds: SATASectorStreamer (sata), LiteDRAM DMA Writer/Reader (sdram).
+pcie_bridge_kinds = ["sata", "sdram"]
+
+# PCIe DMA Channels Allocation ---------------------------------------------------------------------
+
+def _pcie_bridges(soc):
+    if not hasattr(soc, "pcie_bridges"):
+        soc.pcie_bridges = []
+    return soc.pcie_bridges
+
+def pcie_dma_alloc(soc, name, kind, unit):
+    """Allocate the next free PCIe DMA channel of the SoC to the bridge name (its CSRs' prefix).
+
+    kind is one of pcie_bridge_kinds, unit the granularity (in bytes) of the bridge's addresses and
+    lengths (sector/stripe or SDRAM word). Returns the LitePCIeDMA of the channel.
+    """
+    assert kind in pcie_bridge_kinds
+    bridges = _pcie_bridges(soc)
+    n       = len(bridges)
+    dma     = getattr(soc, "pcie_dma{}".format(n), None)
+    if dma is None:
+        raise ValueError("PCIe: no DMA channel left for {} ({} used by {}), use --pcie-dmas={}.".format(
+            name, n, ", ".join(b["name"] for b in bridges) or "none", n + 1))
+    bridges.append({"name": name, "kind": kind, "dma": n, "unit": unit})
+    soc.add_constant("{}_PCIE_DMA".format(name.upper()), n)
+    return dma
+
+# PCIe <-> SDRAM DMAs ------------------------------------------------------------------------------
+
+def add_pcie_sdram_dmas(soc, crossbars, name="sdram_dma"):
+    """Connect the next PCIe DMA channels to LiteDRAM DMAs, one per crossbar (SDRAM channel).
+
+    The DMAs (<name><n>_writer/reader, see add_sdram_dma) are added while PCIe DMA channels are
+    left (at least one is required).
+    """
+    from litex_boards.soc.sdram import add_sdram_dma
+
+    for n, crossbar in enumerate(crossbars):
+        if n > 0 and not hasattr(soc, "pcie_dma{}".format(len(_pcie_bridges(soc)))):
+            break
+        dma_name = "{}{}".format(name, n)
+        pcie_dma = pcie_dma_alloc(soc, dma_name,
+            kind = "sdram",
+            unit = crossbar.controller.data_width//8)
+        sink, source = add_sdram_dma(soc, dma_name, crossbar, pcie_dma.data_width)
+        soc.comb += [
+            pcie_dma.source.connect(sink),
+            source.connect(pcie_dma.sink),
+        ]
+
+# Software -----------------------------------------------------------------------------------------
+
+_pcie_bridge_regs = {
+    "sata"  : ["sector", "count", "write", "start", "done", "error"],
+    "sdram" : ["writer_base", "writer_length", "writer_enable", "writer_done",
+               "reader_base", "reader_length", "reader_enable", "reader_done"],
+}
+
+def get_pcie_bridge_header(soc):
+    r = "/* Generated by LiteX-Boards: PCIe DMA bridges (see litex_boards/soc/pcie_bridge.py). */\n"
+    r += "\n#ifndef __GENERATED_LITEPCIE_BRIDGE_H\n#define __GENERATED_LITEPCIE_BRIDGE_H\n"
+    r += "\n#include <stdint.h>\n#include <stddef.h>\n"
+    r += "\n#ifdef __cplusplus\nextern \"C\" {\n#endif\n"
+    r += "\n/* Bridge kinds. */\n"
+    for n, kind in enumerate(pcie_bridge_kinds):
+        r += "#define LITEPCIE_BRIDGE_{} {}\n".format(kind.upper(), n)
+    r += "\n/* Bridge registers. */\n"
+    for kind in pcie_bridge_kinds:
+        for n, reg in enumerate(_pcie_bridge_regs[kind]):
+            r += "#define LITEPCIE_BRIDGE_{}_{} {}\n".format(kind.upper(), reg.upper(), n)
+    r += "\nstruct litepcie_bridge {\n"
+    r += "    const char *name;  /* Bridge name (CSRs prefix). */\n"
+    r += "    int kind;          /* LITEPCIE_BRIDGE_SATA/SDRAM. */\n"
+    r += "    int dma;           /* PCIe DMA channel (/dev/litepcie<dma>). */\n"
+    r += "    uint32_t unit;     /* Granularity of the addresses/lengths (bytes). */\n"
+    r += "    uint32_t regs[8];  /* Bridge's CSRs. */\n"
+    r += "    uint32_t writer_loop_status; /* PCIe DMA Writer's Loop Status CSR. */\n"
+    r += "};\n"
+    r += "\n/* Scatter/Gather segment: length bytes at address (bytes) of the bridge from/to buf. */\n"
+    r += "struct litepcie_sg {\n"
+    r += "    uint64_t address;\n"
+    r += "    void *buf;\n"
+    r += "    size_t length;\n"
+    r += "};\n"
+    r += "\n#define LITEPCIE_BRIDGES {}\n".format(len(_pcie_bridges(soc)))
+    r += "extern const struct litepcie_bridge litepcie_bridges[LITEPCIE_BRIDGES];\n"
+    r += "\n/* Return the bridge name (NULL if not found). */\n"
+    r += "const struct litepcie_bridge *litepcie_bridge_get(const char *name);\n"
+    r += "\n/* Transfer the segments from (read) or to (write) the bridge, return 0 or -errno. */\n"
+    r += "int litepcie_bridge_read(const struct litepcie_bridge *bridge, const struct litepcie_sg *sg, int nsg);\n"
+    r += "int litepcie_bridge_write(const struct litepcie_bridge *bridge, const struct litepcie_sg *sg, int nsg);\n"
+    r += "\n#ifdef __cplusplus\n}\n#endif\n"
+    r += "\n#endif\n"
+    return r
+
+_pcie_bridge_source = """
+/* Max bytes per bridge transfer (DMA Reader: half the buffers) and timeout (without completion). */
+#define LITEPCIE_BRIDGE_PIECE_MAX  (DMA_BUFFER_COUNT/2*DMA_BUFFER_SIZE)
+#define LITEPCIE_BRIDGE_TIMEOUT_MS 1000
+
+const struct litepcie_bridge *litepcie_bridge_get(const char *name)
+{
+    int i;
+    for (i = 0; i < LITEPCIE_BRIDGES; i++)
+        if (strcmp(litepcie_bridges[i].name, name) == 0)
+            return &litepcie_bridges[i];
+    return NULL;
+}
+
+static void bridge_start(int fd, const struct litepcie_bridge *bridge, int write,
+                         uint64_t address, uint32_t length)
+{
+    const uint32_t *regs = bridge->regs;
+    uint64_t sector;
+    int r;
+
+    if (bridge->kind == LITEPCIE_BRIDGE_SATA) {
+        sector = address/bridge->unit;
+        /* 48-bit sector: 2 CSR words, MSB first. */
+        litepcie_writel(fd, regs[LITEPCIE_BRIDGE_SATA_SECTOR] + 0, sector >> 32);
+        litepcie_writel(fd, regs[LITEPCIE_BRIDGE_SATA_SECTOR] + 4, sector & 0xffffffff);
+        litepcie_writel(fd, regs[LITEPCIE_BRIDGE_SATA_COUNT], length/bridge->unit);
+        litepcie_writel(fd, regs[LITEPCIE_BRIDGE_SATA_WRITE], write);
+        litepcie_writel(fd, regs[LITEPCIE_BRIDGE_SATA_START], 1);
+    } else {
+        /* SDRAM DMA Writer (host to SDRAM) or Reader (SDRAM to host): base, length, enable. */
+        r = write ? LITEPCIE_BRIDGE_SDRAM_WRITER_BASE : LITEPCIE_BRIDGE_SDRAM_READER_BASE;
+        litepcie_writel(fd, regs[r + 0], address);
+        litepcie_writel(fd, regs[r + 1], length);
+        litepcie_writel(fd, regs[r + 2], 1);
+    }
+}
+
+static void bridge_stop(int fd, const struct litepcie_bridge *bridge, int write)
+{
+    /* SDRAM DMAs are disabled (and their data drained) between transfers. */
+    if (bridge->kind == LITEPCIE_BRIDGE_SDRAM)
+        litepcie_writel(fd, bridge->regs[write ?
+            LITEPCIE_BRIDGE_SDRAM_WRITER_ENABLE : LITEPCIE_BRIDGE_SDRAM_READER_ENABLE], 0);
+}
+
+/* Return 1 when the bridge is done, 0 when busy, -EIO on a SATA error. */
+static int bridge_status(int fd, const struct litepcie_bridge *bridge, int write)
+{
+    const uint32_t *regs = bridge->regs;
+
+    if (bridge->kind == LITEPCIE_BRIDGE_SATA) {
+        if (!litepcie_readl(fd, regs[LITEPCIE_BRIDGE_SATA_DONE]))
+            return 0;
+        return litepcie_readl(fd, regs[LITEPCIE_BRIDGE_SATA_ERROR]) ? -EIO : 1;
+    }
+    return litepcie_readl(fd, regs[write ?
+        LITEPCIE_BRIDGE_SDRAM_WRITER_DONE : LITEPCIE_BRIDGE_SDRAM_READER_DONE]) ? 1 : 0;
+}
+
+/* Wait for the bridge and, on reads, for the DMA Writer to have written nbuffers buffers: the
+ * descriptor of buffer nbuffers is only consumed once the previous buffers are written. */
+static int bridge_wait(int fd, const struct litepcie_bridge *bridge, int write, int nbuffers)
+{
+    int64_t start = get_time_ms();
+    int ret;
+
+    for (;;) {
+        ret = bridge_status(fd, bridge, write);
+        if (ret < 0)
+            return ret;
+        if (ret > 0 && (write || (litepcie_readl(fd, bridge->writer_loop_status) & 0xffff) >= nbuffers))
+            return 0;
+        if (get_time_ms() - start > LITEPCIE_BRIDGE_TIMEOUT_MS)
+            return -ETIMEDOUT;
+    }
+}
+
+static int bridge_read_piece(struct litepcie_dma_ctrl *dma, const struct litepcie_bridge *bridge,
+                             uint64_t address, char *buf, size_t length)
+{
+    int fd = dma->fds.fd;
+    int nbuffers = (length + DMA_BUFFER_SIZE - 1)/DMA_BUFFER_SIZE;
+    size_t total;
+    int64_t hw_count, sw_count;
+    int ret;
+
+    /* Read at least one more buffer than needed (in bridge units). */
+    total = (size_t)(nbuffers + 1)*DMA_BUFFER_SIZE;
+    total = (total + bridge->unit - 1)/bridge->unit*bridge->unit;
+
+    /* DMA Writer (re)started on the first buffer before the bridge (data dropped when disabled). */
+    litepcie_dma_writer(fd, 1, &hw_count, &sw_count);
+    bridge_start(fd, bridge, 0, address, total);
+    ret = bridge_wait(fd, bridge, 0, nbuffers);
+    litepcie_dma_writer(fd, 0, &hw_count, &sw_count);
+    bridge_stop(fd, bridge, 0);
+    if (ret == 0)
+        memcpy(buf, dma->buf_rd, length);
+    return ret;
+}
+
+static int bridge_write_piece(struct litepcie_dma_ctrl *dma, const struct litepcie_bridge *bridge,
+                              uint64_t address, const char *buf, size_t length)
+{
+    int fd = dma->fds.fd;
+    int64_t hw_count, sw_count;
+    int ret;
+
+    /* DMA Reader buffers filled while stopped, the Reader restarts on the first buffer. Data read
+     * beyond length is drained by the bridge (idle). */
+    memcpy(dma->buf_wr, buf, length);
+    bridge_start(fd, bridge, 1, address, length);
+    litepcie_dma_reader(fd, 1, &hw_count, &sw_count);
+    ret = bridge_wait(fd, bridge, 1, 0);
+    litepcie_dma_reader(fd, 0, &hw_count, &sw_count);
+    bridge_stop(fd, bridge, 1);
+    return ret;
+}
+
+static int bridge_transfer(const struct litepcie_bridge *bridge, const struct litepcie_sg *sg,
+                           int nsg, int write)
+{
+    struct litepcie_dma_ctrl dma;
+    char device_name[32];
+    size_t piece_max = LITEPCIE_BRIDGE_PIECE_MAX/bridge->unit*bridge->unit;
+    size_t offset, length;
+    int i, ret;
+
+    /* Segments: in bridge units (and in the 32-bit SDRAM DMAs' address space). */
+    for (i = 0; i < nsg; i++) {
+        if ((sg[i].address % bridge->unit) || (sg[i].length % bridge->unit))
+            return -EINVAL;
+        if (bridge->kind == LITEPCIE_BRIDGE_SDRAM && sg[i].address + sg[i].length > (1ULL << 32))
+            return -EINVAL;
+    }
+
+    memset(&dma, 0, sizeof(dma));
+    dma.use_reader = write;
+    dma.use_writer = !write;
+    snprintf(device_name, sizeof(device_name), "/dev/litepcie%d", bridge->dma);
+    if (litepcie_dma_init(&dma, device_name, 1) < 0)
+        return -EIO;
+
+    ret = 0;
+    for (i = 0; i < nsg && ret == 0; i++) {
+        for (offset = 0; offset < sg[i].length && ret == 0; offset += length) {
+            length = sg[i].length - offset;
+            if (length > piece_max)
+                length = piece_max;
+            if (write)
+                ret = bridge_write_piece(&dma, bridge, sg[i].address + offset,
+                                         (const char *)sg[i].buf + offset, length);
+            else
+                ret = bridge_read_piece(&dma, bridge, sg[i].address + offset,
+                                        (char *)sg[i].buf + offset, length);
+        }
+    }
+
+    litepcie_dma_cleanup(&dma);
+    return ret;
+}
+
+int litepcie_bridge_read(const struct litepcie_bridge *bridge, const struct litepcie_sg *sg, int nsg)
+{
+    return bridge_transfer(bridge, sg, nsg, 0);
+}
+
+int litepcie_bridge_write(const struct litepcie_bridge *bridge, const struct litepcie_sg *sg, int nsg)
+{
+    return bridge_transfer(bridge, sg, nsg, 1);
+}
+"""
+
+def get_pcie_bridge_source(soc):
+    r = "/* Generated by LiteX-Boards: PCIe DMA bridges (see litex_boards/soc/pcie_bridge.py). */\n"
+    r += "\n#include <errno.h>\n#include <stdio.h>\n#include <string.h>\n"
+    r += "\n#include \"liblitepcie.h\"\n#include \"litepcie_bridge.h\"\n"
+    r += "\nconst struct litepcie_bridge litepcie_bridges[LITEPCIE_BRIDGES] = {\n"
+    for bridge in _pcie_bridges(soc):
+        kind = bridge["kind"]
+        r += "    {\n"
+        r += "        .name = \"{}\",\n".format(bridge["name"])
+        r += "        .kind = LITEPCIE_BRIDGE_{},\n".format(kind.upper())
+        r += "        .dma  = {},\n".format(bridge["dma"])
+        r += "        .unit = {},\n".format(bridge["unit"])
+        r += "        .regs = {\n"
+        for reg in _pcie_bridge_regs[kind]:
+            r += "            [LITEPCIE_BRIDGE_{}_{}] = CSR_{}_{}_ADDR,\n".format(
+                kind.upper(), reg.upper(), bridge["name"].upper(), reg.upper())
+        r += "        },\n"
+        r += "        .writer_loop_status = CSR_PCIE_DMA{}_WRITER_TABLE_LOOP_STATUS_ADDR,\n".format(
+            bridge["dma"])
+        r += "    },\n"
+    r += "};\n"
+    r += _pcie_bridge_source
+    return r
+
+_pcie_bridge_util = """/* Generated by LiteX-Boards: PCIe DMA bridges utility. */
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <inttypes.h>
+
+#include "liblitepcie.h"
+#include "litepcie_bridge.h"
+
+static void help(void)
+{
+    printf("usage: litepcie_bridge_util list\\n"
+           "       litepcie_bridge_util read  <bridge> <address> <length> <file>\\n"
+           "       litepcie_bridge_util write <bridge> <address> <file>\\n");
+    exit(1);
+}
+
+int main(int argc, char **argv)
+{
+    const struct litepcie_bridge *bridge;
+    struct litepcie_sg sg;
+    size_t length;
+    FILE *f;
+    int64_t start = 0, duration = 0;
+    int i, ret = 0;
+
+    if (argc < 2)
+        help();
+
+    if (strcmp(argv[1], "list") == 0) {
+        for (i = 0; i < LITEPCIE_BRIDGES; i++)
+            printf("%-24s /dev/litepcie%d, unit: %" PRIu32 " bytes\\n",
+                litepcie_bridges[i].name, litepcie_bridges[i].dma, litepcie_bridges[i].unit);
+        return 0;
+    }
+
+    if (argc < 5)
+        help();
+    bridge = litepcie_bridge_get(argv[2]);
+    if (!bridge) {
+        fprintf(stderr, "Unknown bridge: %s\\n", argv[2]);
+        return 1;
+    }
+    sg.address = strtoull(argv[3], NULL, 0);
+
+    if (strcmp(argv[1], "read") == 0 && argc == 6) {
+        /* Read padded to the bridge's unit, only the requested length written to the file. */
+        length    = strtoull(argv[4], NULL, 0);
+        sg.length = (length + bridge->unit - 1)/bridge->unit*bridge->unit;
+        sg.buf    = malloc(sg.length);
+        if (!sg.buf) {
+            perror("malloc");
+            return 1;
+        }
+        start = get_time_ms();
+        ret = litepcie_bridge_read(bridge, &sg, 1);
+        duration = get_time_ms() - start;
+        if (ret < 0) {
+            fprintf(stderr, "%s: %s\\n", bridge->name, strerror(-ret));
+            return 1;
+        }
+        f = fopen(argv[5], "wb");
+        if (!f || fwrite(sg.buf, 1, length, f) != length) {
+            perror(argv[5]);
+            return 1;
+        }
+        fclose(f);
+        sg.length = length;
+    } else if (strcmp(argv[1], "write") == 0) {
+        f = fopen(argv[4], "rb");
+        if (!f) {
+            perror(argv[4]);
+            return 1;
+        }
+        fseek(f, 0, SEEK_END);
+        sg.length = ftell(f);
+        fseek(f, 0, SEEK_SET);
+        /* Padded to the bridge's unit. */
+        sg.length = (sg.length + bridge->unit - 1)/bridge->unit*bridge->unit;
+        sg.buf    = calloc(1, sg.length);
+        if (!sg.buf) {
+            perror("calloc");
+            return 1;
+        }
+        if (fread(sg.buf, 1, sg.length, f) == 0) {
+            perror(argv[4]);
+            return 1;
+        }
+        fclose(f);
+        start = get_time_ms();
+        ret = litepcie_bridge_write(bridge, &sg, 1);
+        duration = get_time_ms() - start;
+    } else {
+        help();
+    }
+
+    if (ret < 0) {
+        fprintf(stderr, "%s: %s\\n", bridge->name, strerror(-ret));
+        return 1;
+    }
+    printf("%zu bytes in %" PRId64 " ms\\n", sg.length, duration);
+    return 0;
+}
+"""
+
+_pcie_bridge_makefile = """CFLAGS=-O2 -Wall -g -I../../kernel -I../liblitepcie -MMD -fPIC
+LDFLAGS=-g
+CC=$(CROSS_COMPILE)gcc
+AR=ar
+
+all: litepcie_bridge_util
+
+../liblitepcie/liblitepcie.a:
+\t$(MAKE) -C .. liblitepcie/liblitepcie.a
+
+liblitepcie_bridge.a: litepcie_bridge.o
+\tar rcs $@ $+
+\tranlib $@
+
+litepcie_bridge_util: litepcie_bridge_util.o liblitepcie_bridge.a ../liblitepcie/liblitepcie.a
+\t$(CC) $(LDFLAGS) -o $@ $< -L. -llitepcie_bridge -L../liblitepcie -llitepcie
+
+clean:
+\trm -f litepcie_bridge_util *.o *.a *.d *~
+
+%.o: %.c
+\t$(CC) -c $(CFLAGS) -o $@ $<
+
+-include $(wildcard *.d)
+"""
+
+def generate_pcie_bridge_software(soc, dst):
+    """Generate the host API of the PCIe DMA bridges in the LitePCIe driver (dst/user/bridge)."""
+    if not _pcie_bridges(soc):
+        return
+    if soc.csr.data_width != 32:
+        raise ValueError("PCIe: bridges' software requires 32-bit CSRs.")
+    dst = os.path.join(dst, "user", "bridge")
+    os.makedirs(dst, exist_ok=True)
+    files = {
+        "litepcie_bridge.h"      : get_pcie_bridge_header(soc),
+        "litepcie_bridge.c"      : get_pcie_bridge_source(soc),
+        "litepcie_bridge_util.c" : _pcie_bridge_util,
+        "Makefile"               : _pcie_bridge_makefile,
+    }
+    for name, content in files.items():
+        with open(os.path.join(dst, name), "w") as f:
+            f.write(content)
@@ -0,0 +1,245 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Pin index of the platforms shared by the targets.
+
+The IOs and connectors of a platform are compiled once per platform class into a PinIndex:
+
+- resources by (name, number) and by name (in the order of the IOs).
+- connectors' pins, resolved to package pins (ex: "pmoda:0" --> "G13").
+- reverse map of the package pins to the resources using them (for the conflict checks).
+
+The requests of the platform are then done on the index (instead of linear scans of the IOs and
+parsing of the connector pins at each request/lookup_request/constraint generation):
+
+    platform = use_pin_index(kc705.Platform()) # Before the first request.
+
+Extensions/connectors added to the platform (ex: add_extension of the targets) are compiled in
+their own (per platform instance) index on top of the platform's one.
+"""
+
+from migen import Signal, Record
+
+from litex.build.generic_platform import Pins, Subsignal, Inverted, PlatformInfo
+from litex.build.generic_platform import ConstraintError, ConstraintManager, ConnectorManager
+from litex.build.generic_platform import _resource_type
+
+# Pin Index ----------------------------------------------------------------------------------------
+
+def _connector_table(connectors):
+    """Return the connector table of connectors (as parsed by LiteX: name --> pins list/dict)."""
+    if isinstance(connectors, dict):
+        return connectors
+    return ConnectorManager(connectors).connector_table
+
+def resource_pins(resource):
+    """Return the [(subsignal, identifiers)] of a resource (subsignal is None for top pins)."""
+    pins = []
+    for element in resource[2:]:
+        if isinstance(element, Pins):
+            pins.append((None, element.identifiers))
+        if isinstance(element, Subsignal):
+            for c in element.constraints:
+                if isinstance(c, Pins):
+                    pins.append((element.name, c.identifiers))
+    return pins
+
+class PinIndex:
+    """Compiled IOs/connectors of a platform (on top of a parent index for extensions)."""
+    def __init__(self, io=[], connectors={}, parent=None):
+        self.parent     = parent
+        self.io         = list(io)
+        self.resources  = {} # (name, number) --> [resource].
+        self.names      = {} # name           --> [resource].
+        self.connectors = {} # connector      --> resolved pins (list or dict).
+        self.pins       = {} # package pin    --> [(name, number, subsignal)].
+
+        # Connectors (resolved to package pins, connectors can be on connectors).
+        table = _connector_table(connectors)
+        def resolve_pin(pin):
+            if not isinstance(pin, str) or ":" not in pin:
+                return pin
+            conn, pn = pin.split(":")
+            pn = int(pn) if pn.isdigit() else pn
+            if conn in table:
+                return resolve_pin(table[conn][pn])
+            return self.parent.resolve(pin) if self.parent is not None else pin
+        for name, pins in table.items():
+            if isinstance(pins, dict):
+                self.connectors[name] = {k: resolve_pin(v) for k, v in pins.items()}
+            else:
+                self.connectors[name] = [resolve_pin(v) for v in pins]
+
+        # Resources.
+        for resource in self.io:
+            name, number = resource[0], resource[1]
+            self.resources.setdefault((name, number), []).append(resource)
+            self.names.setdefault(name, []).append(resource)
+            for subsignal, identifiers in resource_pins(resource):
+                for identifier in identifiers:
+                    try:
+                        pin = self.resolve(identifier)
+                    except (KeyError, IndexError):
+                        pin = identifier # Unknown connector: reported on the constraints generation.
+                    self.pins.setdefault(pin, []).append((name, number, subsignal))
+
+    def connector(self, name):
+        index = self
+        while index is not None:
+            if name in index.connectors:
+                return index.connectors[name]
+            index = index.parent
+        raise KeyError(name)
+
+    def resolve(self, identifier):
+        """Return the package pin of a pin identifier (ex: "pmoda:0" --> "G13")."""
+        if ":" not in identifier:
+            return identifier
+        try:
+            conn, pn = identifier.split(":")
+        except ValueError as err:
+            raise ValueError(f"\"{identifier}\" {err}") from err
+        return self.connector(conn)[int(pn) if pn.isdigit() else pn]
+
+    def lookup(self, name, number=None):
+        """Return the resources named name (with number number if not None), in order."""
+        if number is None:
+            return self.names.get(name, [])
+        return self.resources.get((name, number), [])
+
+    def chain(self):
+        """Return the indexes from the platform's one to this one."""
+        indexes = []
+        index   = self
+        while index is not None:
+            indexes.insert(0, index)
+            index = index.parent
+        return indexes
+
+    def pin_users(self):
+        """Return the package pin --> [(name, number, subsignal)] map of all the chained indexes."""
+        users = {}
+        for index in self.chain():
+            for pin, owners in index.pins.items():
+                users.setdefault(pin, []).extend(owners)
+        return users
+
+    def conflicts(self):
+        """Return the package pins used by more than one resource/subsignal."""
+        return {pin: owners for pin, owners in self.pin_users().items()
+            if pin is not None and len(owners) > 1}
+
+# Cache (per platform class) -----------------------------------------------------------------------
+
+_pin_indexes = {}
+
+def get_pin_index(platform):
+    """Return the (cached) PinIndex of the IOs/connectors a platform has been created with."""
+    cm = platform.constraint_manager
+    if isinstance(cm, IndexedConstraintManager):
+        return cm.index
+    # IOs lists are module-level ones (identified by their resources); connectors are parsed again
+    # by LiteX on each platform creation (identified by their pins).
+    key = (type(platform),
+        tuple(map(id, cm.available)),
+        tuple((name, tuple(pins.items()) if isinstance(pins, dict) else tuple(pins))
+            for name, pins in cm.connector_manager.connector_table.items()))
+    if key not in _pin_indexes:
+        _pin_indexes[key] = PinIndex(cm.available, cm.connector_manager.connector_table)
+    return _pin_indexes[key]
+
+# Constraint Manager -------------------------------------------------------------------------------
+
+class _IndexedConnectorManager(ConnectorManager):
+    def __init__(self, constraint_manager, connector_table):
+        self.constraint_manager = constraint_manager
+        self.connector_table    = connector_table
+
+    def add_connector(self, connectors):
+        ConnectorManager.add_connector(self, connectors)
+        cm = self.constraint_manager
+        cm.index = PinIndex(connectors=connectors, parent=cm.index)
+
+    def resolve_identifiers(self, identifiers):
+        return [self.constraint_manager.index.resolve(identifier) for identifier in identifiers]
+
+class IndexedConstraintManager(ConstraintManager):
+    """ConstraintManager doing the requests on a PinIndex."""
+    def __init__(self, constraint_manager, index):
+        self.index             = index
+        self.matched           = constraint_manager.matched
+        self.platform_commands = constraint_manager.platform_commands
+        self.connector_manager = _IndexedConnectorManager(self,
+            constraint_manager.connector_manager.connector_table)
+        self.requested = set() # id of the requested resources.
+        self.matches   = {}    # (name, number)/(name, None) --> obj of the first matching request.
+        for resource, obj in self.matched:
+            self._match(resource, obj)
+
+    @property
+    def available(self):
+        return [r for index in self.index.chain() for r in index.io if id(r) not in self.requested]
+
+    def _match(self, resource, obj):
+        self.requested.add(id(resource))
+        self.matches.setdefault((resource[0], resource[1]), obj)
+        self.matches.setdefault((resource[0], None), obj)
+
+    def add_extension(self, io):
+        self.index = PinIndex(io, parent=self.index)
+
+    def request(self, name, number=None, loose=False):
+        resource = None
+        for index in self.index.chain():
+            for r in index.lookup(name, number):
+                if id(r) not in self.requested:
+                    resource = r
+                    break
+            if resource is not None:
+                break
+        if resource is None:
+            if loose:
+                return None
+            raise ConstraintError("Resource not found: {}:{}".format(name, number))
+
+        # Signal/Record creation (as ConstraintManager.request).
+        rt, ri = _resource_type(resource)
+        resource_name = name if number is None else name + str(number)
+        if isinstance(rt, int):
+            obj = Signal(rt, name_override=resource_name)
+        else:
+            obj = Record(rt, name=resource_name)
+            for subname, inverted in ri:
+                if inverted:
+                    getattr(obj, subname).inverted = True
+        for element in resource[2:]:
+            if isinstance(element, Inverted):
+                if isinstance(obj, Signal):
+                    obj.inverted = True
+            if isinstance(element, PlatformInfo):
+                obj.platform_info = element.info
+                break
+
+        self._match(resource, obj)
+        self.matched.append((resource, obj))
+        return obj
+
+    def lookup_request(self, name, number=None, loose=False):
+        subname = None
+        if ":" in name: name, subname = name.split(":")
+        obj = self.matches.get((name, number), None)
+        if obj is None:
+            if loose:
+                return None
+            raise ConstraintError("Resource not found: {}:{}".format(name, number))
+        return getattr(obj, subname) if subname is not None else obj
+
+def use_pin_index(platform):
+    """Do the requests of platform on its (cached) PinIndex, return platform."""
+    if not isinstance(platform.constraint_manager, IndexedConstraintManager):
+        index = get_pin_index(platform)
+        platform.constraint_manager = IndexedConstraintManager(platform.constraint_manager, index)
+    return platform
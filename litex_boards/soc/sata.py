@@ -0,0 +1,386 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+SATA helpers shared by the targets.
+
+SATA options (--sata-gen, --sata-ports, --sata-striping, --sata-dma), checked against the
+transceivers of the device, the SATA ports of the board and the system clock:
+
+    parser = argparse.ArgumentParser()
+    sata_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **sata_argdict(args))
+
+    # In BaseSoC:
+    sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=2)
+    add_sata_ports(self, [platform.request("sfp2sata", n) for n in sata["ports"]],
+        refclk     = sata_refclk,
+        gen        = sata["gen"],
+        data_width = sata["data_width"],
+        striping   = sata["striping"],
+        dma        = sata["dma"])
+
+Without --sata-dma (one port), the port is added with LiteX's add_sata (Sector2Mem/Mem2Sector DMAs
+over the CPU bus, used by the BIOS). With --sata-dma, each port (or the striped volume with
+--sata-striping, RAID-0: stripes of one sector on each drive) gets a SATASectorStreamer moving the
+sectors to/from the SDRAM (LiteDRAM DMAs on a native port) or a PCIe DMA channel, without going
+through the CPU or its bus: the CPU (or the host) only programs the sector/count of the transfers.
+"""
+
+from migen import *
+
+from litex.gen import *
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
+
+# Constants ----------------------------------------------------------------------------------------
+
+# SATA generations and line rates.
+sata_gens = {
+    "gen1" : 1.5e9,
+    "gen2" : 3.0e9,
+    "gen3" : 6.0e9,
+}
+
+# Minimum sys_clk_freq of a generation: the core's 32-bit datapath runs in sys (linerate/40).
+sata_sys_clk_freqs = {gen: linerate/40 for gen, linerate in sata_gens.items()}
+
+# DMA targets of the sector streamers.
+sata_dmas = ["sdram", "pcie"]
+
+# Sectors per SATA command of the sector streamers (and FIFOs of 2 commands).
+sata_chunk_default = 8
+
+# Sector size (bytes) and LiteSATA's core data width (bits).
+sata_sector_size = 512
+sata_core_dw     = 32
+
+def sata_args(parser):
+    parser.add_argument("--sata-gen", default=None, type=int, choices=[1, 2, 3],
+        help="SATA generation: 1 (1.5Gbps), 2 (3Gbps) or 3 (6Gbps) (default: board's default).")
+    parser.add_argument("--sata-ports", default=None, type=int,
+        help="Number of SATA ports (default: 1).")
+    parser.add_argument("--sata-striping", action="store_const", const=True, default=None,
+        help="Stripe the SATA ports in one volume (RAID-0).")
+    parser.add_argument("--sata-dma", default=None, choices=sata_dmas,
+        help="SATA sectors streamed to/from the SDRAM or PCIe DMAs, without CPU (default: CPU bus "
+             "DMAs with one port, sdram with several).")
+
+def sata_argdict(args):
+    r = {
+        "sata_gen"      : args.sata_gen,
+        "sata_ports"    : args.sata_ports,
+        "sata_striping" : args.sata_striping,
+        "sata_dma"      : args.sata_dma,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+# SATA Parameters ----------------------------------------------------------------------------------
+
+def sata_phy_gens(device):
+    """Return the SATA generations supported by the transceivers of the device."""
+    # Artix7 GTPs: 3.75Gbps max on -1 speed grade, 6.6Gbps on -2/-3.
+    if device.startswith("xc7a") and device.split("-")[-1].startswith("1"):
+        return ["gen1", "gen2"]
+    # Kintex7 GTXs, UltraScale GTHs, UltraScale+ GTYs.
+    if device.startswith(("xc7a", "xc7k", "xcku", "xcvu")):
+        return ["gen1", "gen2", "gen3"]
+    return []
+
+def sata_params(kwargs, device, sys_clk_freq, ports=1, gen="gen2"):
+    """Return the SATA parameters (gen, data_width, ports, striping, dma) of the board.
+
+    ports is the number of SATA ports of the board; gen its default generation.
+    """
+    if "sata_gen" in kwargs:
+        gen = "gen{}".format(kwargs["sata_gen"])
+    nports   = kwargs.get("sata_ports", 1)
+    striping = kwargs.get("sata_striping", False)
+    dma      = kwargs.get("sata_dma", None)
+    gens     = sata_phy_gens(device)
+    if gen not in gens:
+        raise ValueError("SATA: {} not supported by {} transceivers, supported: {}.".format(
+            gen, device, ", ".join(gens) or "none"))
+    if sys_clk_freq < sata_sys_clk_freqs[gen]:
+        raise ValueError("SATA: {} requires a sys_clk_freq of at least {:.1f}MHz (current: "
+            "{:.1f}MHz).".format(gen, sata_sys_clk_freqs[gen]/1e6, sys_clk_freq/1e6))
+    if not (1 <= nports <= ports):
+        raise ValueError("SATA: {} ports requested, available: 1 to {}.".format(nports, ports))
+    if striping and nports < 2:
+        raise ValueError("SATA: striping requires at least 2 ports.")
+    # Striped data is converted from/to the ports' data width (integer ratio).
+    if striping and (nports & (nports - 1)):
+        raise ValueError("SATA: striping requires a power of 2 number of ports (requested: {}).".format(nports))
+    # Several ports/striping are only supported with the sector streamers.
+    if dma is None and (nports > 1 or striping):
+        dma = "sdram"
+    return {
+        "gen"        : gen,
+        # 32-bit PHY at 6Gbps (150MHz instead of 300MHz).
+        "data_width" : 32 if gen == "gen3" else 16,
+        "ports"      : list(range(nports)),
+        "striping"   : striping,
+        "dma"        : dma,
+    }
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def _swap_dwords(s):
+    # SATA dwords <-> memory byte order (as LiteSATA's DMAs).
+    return Cat(*[reverse_bytes(s[32*i:32*(i + 1)]) for i in range(len(s)//32)])
+
+# SATA Sector Streamer -----------------------------------------------------------------------------
+
+class SATASectorStreamer(Module, AutoCSR):
+    """Stream sectors from (source) or to (sink) a LiteSATA user port.
+
+    count sectors from sector are read or written (write) on start; done is set when finished and
+    error on a SATA error. Transfers are split in commands of chunk sectors, each only issued once
+    the FIFO can absorb (reads) or provide (writes) it entirely: the SATA link is never stalled by
+    the streams. On a striped port, a sector is a stripe (one sector on each drive).
+
+    While idle, the data of the sink is drained (as LiteDRAM's DMA Writer when disabled): the
+    data to write has to be provided after start, data beyond the transfer is dropped.
+    """
+    def __init__(self, port, chunk=sata_chunk_default):
+        dw = len(port.sink.data)
+        self.sink   = sink   = stream.Endpoint([("data", dw)])
+        self.source = source = stream.Endpoint([("data", dw)])
+        self.irq    = Signal()
+
+        self._sector = CSRStorage(48, name="sector", description="First sector.")
+        self._count  = CSRStorage(32, name="count",  description="Number of sectors.")
+        self._write  = CSRStorage(name="write",
+            description="Direction (0: sectors read to source, 1: sink written to sectors).")
+        self._start  = CSR(name="start")
+        self._done   = CSRStatus(name="done",  description="Transfer done.")
+        self._error  = CSRStatus(name="error", description="Transfer failed.")
+
+        # # #
+
+        beats = sata_sector_size*8//sata_core_dw # Beats of a sector (or stripe).
+        depth = 2*chunk*beats
+
+        # FIFOs.
+        self.submodules.rd_fifo = rd_fifo = stream.SyncFIFO([("data", dw)], depth, buffered=True)
+        self.submodules.wr_fifo = wr_fifo = stream.SyncFIFO([("data", dw)], depth, buffered=True)
+        self.comb += [
+            sink.connect(wr_fifo.sink),
+            rd_fifo.source.connect(source),
+        ]
+
+        # Commands.
+        sector    = Signal(48)
+        remaining = Signal(32)
+        count     = Signal(16)
+        beat      = Signal(max=chunk*beats)
+        self.comb += If(remaining > chunk,
+            count.eq(chunk)
+        ).Else(
+            count.eq(remaining)
+        )
+        cmd = [
+            port.sink.sector.eq(sector),
+            port.sink.count.eq(count),
+        ]
+        cmd_done = [
+            NextValue(sector,    sector + count),
+            NextValue(remaining, remaining - count),
+            NextState("NEXT")
+        ]
+        cmd_error = [
+            self.irq.eq(1),
+            NextValue(self._error.status, 1),
+            NextState("IDLE")
+        ]
+
+        # FSM.
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self._done.status.eq(1),
+            port.source.ready.eq(1),
+            wr_fifo.source.ready.eq(1),
+            If(self._start.re,
+                NextValue(sector,    self._sector.storage),
+                NextValue(remaining, self._count.storage),
+                NextValue(self._error.status, 0),
+                NextState("NEXT")
+            )
+        )
+        fsm.act("NEXT",
+            NextValue(beat, 0),
+            If(remaining == 0,
+                self.irq.eq(1),
+                NextState("IDLE")
+            ).Elif(self._write.storage,
+                NextState("WRITE-WAIT")
+            ).Else(
+                NextState("READ-CMD")
+            )
+        )
+        # Read: command issued when the FIFO has room for its sectors.
+        fsm.act("READ-CMD",
+            If(rd_fifo.level <= (depth - chunk*beats),
+                port.sink.valid.eq(1),
+                port.sink.last.eq(1),
+                port.sink.read.eq(1),
+                *cmd,
+                If(port.sink.ready,
+                    NextState("READ-DATA")
+                )
+            )
+        )
+        fsm.act("READ-DATA",
+            rd_fifo.sink.valid.eq(port.source.valid & ~port.source.end),
+            rd_fifo.sink.data.eq(_swap_dwords(port.source.data)),
+            port.source.ready.eq(rd_fifo.sink.ready | port.source.end),
+            If(port.source.valid & port.source.ready & port.source.end,
+                If(port.source.failed,
+                    *cmd_error
+                ).Else(
+                    *cmd_done
+                )
+            )
+        )
+        # Write: command issued when the FIFO holds its sectors.
+        fsm.act("WRITE-WAIT",
+            If(wr_fifo.level >= count*beats,
+                NextState("WRITE-DATA")
+            )
+        )
+        fsm.act("WRITE-DATA",
+            port.sink.valid.eq(wr_fifo.source.valid),
+            port.sink.last.eq(beat == (count*beats - 1)),
+            port.sink.write.eq(1),
+            *cmd,
+            port.sink.data.eq(_swap_dwords(wr_fifo.source.data)),
+            wr_fifo.source.ready.eq(port.sink.ready),
+            If(port.sink.valid & port.sink.ready,
+                NextValue(beat, beat + 1),
+                If(port.sink.last,
+                    NextState("WRITE-ACK")
+                )
+            ),
+            # Errors (before the end of the data).
+            port.source.ready.eq(1),
+            If(port.source.valid & port.source.failed,
+                *cmd_error
+            )
+        )
+        fsm.act("WRITE-ACK",
+            port.source.ready.eq(1),
+            If(port.source.valid & port.source.end,
+                If(port.source.failed,
+                    *cmd_error
+                ).Else(
+                    *cmd_done
+                )
+            )
+        )
+
+# Add SATA Ports -----------------------------------------------------------------------------------
+
+def add_sata_ports(soc, pads, gen, data_width, refclk=None, striping=False, dma=None,
+    crossbar=None, name="sata"):
+    """Add the SATA PHYs/cores of the pads (one port per pads) and their datapath.
+
+    - dma=None (one port): LiteX's add_sata (CPU bus DMAs).
+    - dma="sdram"/"pcie": a SATASectorStreamer per port (or one for the striped ports) connected
+      to its own SDRAM DMA (on crossbar, default: the SDRAM's) or next PCIe DMA channel (see
+      litex_boards.soc.pcie_bridge).
+    """
+    from litesata.phy import LiteSATAPHY
+    from litesata.core import LiteSATACore
+    from litesata.frontend.arbitration import LiteSATACrossbar
+    from litesata.frontend.identify import LiteSATAIdentify, LiteSATAIdentifyCSR
+    from litesata.frontend.raid import LiteSATAStriping
+
+    sata_clk_freq = sata_gens[gen]/20/(data_width//16)
+
+    # Single port over the CPU bus.
+    if dma is None:
+        assert len(pads) == 1 and not striping
+        setattr(soc.submodules, "{}_phy".format(name), LiteSATAPHY(soc.platform.device,
+            refclk     = refclk,
+            pads       = pads[0],
+            gen        = gen,
+            clk_freq   = soc.sys_clk_freq,
+            data_width = data_width))
+        soc.add_sata(name=name, phy=getattr(soc, "{}_phy".format(name)), mode="read+write")
+        return
+
+    if dma == "sdram" and crossbar is None:
+        if not hasattr(soc, "sdram"):
+            raise ValueError("SATA: no SDRAM for the sector streamers, use --sata-dma=pcie.")
+        crossbar = soc.sdram.crossbar
+
+    # PHYs/Cores (PHY n in sata<n>_tx/sata<n>_rx ClockDomains).
+    ports = []
+    for n, _pads in enumerate(pads):
+        phy = LiteSATAPHY(soc.platform.device,
+            refclk     = refclk,
+            pads       = _pads,
+            gen        = gen,
+            clk_freq   = soc.sys_clk_freq,
+            data_width = data_width)
+        phy = ClockDomainsRenamer({
+            "sata_tx" : "{}{}_tx".format(name, n),
+            "sata_rx" : "{}{}_rx".format(name, n),
+        })(phy)
+        core     = LiteSATACore(phy)
+        xbar     = LiteSATACrossbar(core)
+        identify = LiteSATAIdentifyCSR(LiteSATAIdentify(xbar.get_port()))
+        setattr(soc.submodules, "{}_phy{}".format(name, n),      phy)
+        setattr(soc.submodules, "{}_core{}".format(name, n),     core)
+        setattr(soc.submodules, "{}_crossbar{}".format(name, n), xbar)
+        setattr(soc.submodules, "{}_identify{}".format(name, n), identify)
+        ports.append(xbar.get_port())
+
+        # Timing constraints.
+        soc.platform.add_period_constraint(phy.crg.cd_sata_tx.clk, 1e9/sata_clk_freq)
+        soc.platform.add_period_constraint(phy.crg.cd_sata_rx.clk, 1e9/sata_clk_freq)
+        soc.platform.add_false_path_constraints(
+            soc.crg.cd_sys.clk,
+            phy.crg.cd_sata_tx.clk,
+            phy.crg.cd_sata_rx.clk)
+
+    # Striping (RAID-0).
+    if striping:
+        striped = LiteSATAStriping(ports)
+        setattr(soc.submodules, "{}_striping".format(name), striped)
+        ports = [striped]
+
+    # Sector Streamers <-> SDRAM/PCIe DMAs.
+    for n, port in enumerate(ports):
+        streamer = SATASectorStreamer(port)
+        setattr(soc.submodules, "{}_streamer{}".format(name, n), streamer)
+        dw = len(streamer.sink.data)
+        if dma == "sdram":
+            from litex_boards.soc.sdram import add_sdram_dma
+            sink, source = add_sdram_dma(soc, "{}_sdram_dma{}".format(name, n), crossbar,
+                data_width = dw)
+        else:
+            from litex_boards.soc.pcie_bridge import pcie_dma_alloc
+            if not hasattr(soc, "pcie_dma0"):
+                raise ValueError("SATA: sector streamers to PCIe DMAs require --with-pcie.")
+            pcie_dma = pcie_dma_alloc(soc, "{}_streamer{}".format(name, n),
+                kind = "sata",
+                unit = sata_sector_size*(len(pads) if striping else 1))
+            up_converter   = stream.Converter(pcie_dma.data_width, dw)
+            down_converter = stream.Converter(dw, pcie_dma.data_width)
+            soc.submodules += up_converter, down_converter
+            soc.comb += [
+                pcie_dma.source.connect(up_converter.sink),
+                down_converter.source.connect(pcie_dma.sink),
+            ]
+            sink, source = down_converter.sink, up_converter.source
+        soc.comb += [
+            streamer.source.connect(sink),
+            source.connect(streamer.sink),
+        ]
+    soc.add_constant("SATA_STREAMERS", len(ports))
@@ -0,0 +1,363 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+SDRAM helpers shared by the targets.
+
+L2 Cache options (--l2-size from soc_core_args, --no-l2, --l2-min-data-width, --l2-reverse,
+--l2-full-memory-we), with the board's defaults and checked against the board's SDRAM:
+
+    parser = argparse.ArgumentParser()
+    soc_core_args(parser)
+    l2_cache_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **l2_cache_argdict(args), **soc_core_argdict(args))
+
+    # In BaseSoC:
+    self.add_sdram("sdram", phy=self.ddrphy, ..., **l2_cache_params(kwargs, self.ddrphy, size=8192))
+
+Multi-channel SDRAM: one LiteDRAM controller per channel, all channels mapped in main_ram:
+
+    parser = argparse.ArgumentParser()
+    sdram_channels_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **sdram_channels_argdict(args))
+
+    # In BaseSoC:
+    phys = [usddrphy.USPDDRPHY(platform.request("ddram", n), ...) for n in ddram_channels]
+    add_sdram_channels(self, phys, module, size=0x40000000, mapping=ddram_mapping)
+
+- consecutive mapping: main_ram is split in one window per channel (channel 0 first).
+- interleaved mapping: consecutive blocks of main_ram (of ddram_interleaving bytes) are spread over
+  the channels.
+
+The BIOS only initializes/calibrates the first channel (sdram/ddrphy CSRs): the software commands
+and PHY settings of the first channel are broadcast to the others (same modules/PHYs), which are
+then initialized along with it. The other channels are not calibrated themselves and run with the
+first channel's delays: this requires channels with matched routing (or a margin large enough for
+the differences).
+
+The channels are checked against the platform's resources with sdram_channels_check(platform,
+ddram_channels) (the channels are numbered as in the platform, ex: 0,1,2,4 on the U250).
+"""
+
+from math import log2
+
+from migen import *
+from migen.fhdl.simplify import FullMemoryWE
+
+from litex.soc.interconnect.csr import CSR, CSRStorage
+from litex.soc.interconnect import wishbone
+from litex.soc.integration.soc import SoCRegion
+
+# Arguments ----------------------------------------------------------------------------------------
+
+sdram_mappings = ["consecutive", "interleaved"]
+
+def l2_cache_args(parser):
+    parser.add_argument("--no-l2", action="store_true",
+        help="Disable L2 cache (direct Wishbone to LiteDRAM port, lowest latency).")
+    parser.add_argument("--l2-min-data-width", default=None, type=int,
+        help="L2 cache minimum data width in bits (default: board's default, 128).")
+    parser.add_argument("--l2-reverse", dest="l2_reverse", action="store_const", const=True, default=None,
+        help="Reverse L2 cache words order (default: board's default).")
+    parser.add_argument("--no-l2-reverse", dest="l2_reverse", action="store_const", const=False,
+        help="Don't reverse L2 cache words order.")
+    parser.add_argument("--l2-full-memory-we", dest="l2_full_memory_we", action="store_const", const=True, default=None,
+        help="Split L2 cache memory in byte-wide memories (default: board's default).")
+    parser.add_argument("--no-l2-full-memory-we", dest="l2_full_memory_we", action="store_const", const=False,
+        help="Keep L2 cache memory with byte-enables.")
+
+def l2_cache_argdict(args):
+    r = {
+        "with_l2"           : False if args.no_l2 else None,
+        "l2_min_data_width" : args.l2_min_data_width,
+        "l2_reverse"        : args.l2_reverse,
+        "l2_full_memory_we" : args.l2_full_memory_we,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+def sdram_channels_args(parser):
+    parser.add_argument("--ddram-channels", default=None,
+        help="DDRAM channels to use, ex: 0,1 (default: single channel). Only the first channel is "
+             "calibrated, the others use its delays.")
+    parser.add_argument("--ddram-mapping", default="consecutive", choices=sdram_mappings,
+        help="DDRAM channels mapping: consecutive (default) or interleaved.")
+    parser.add_argument("--ddram-interleaving", default=4096, type=int,
+        help="DDRAM channels interleaving in bytes (default: 4096).")
+    parser.add_argument("--with-ddram-dma", action="store_true",
+        help="Connect PCIe DMA channels to DDRAM channels (DMA N <-> DDRAM channel N).")
+
+def sdram_channels_argdict(args):
+    r = {
+        "ddram_mapping"      : args.ddram_mapping,
+        "ddram_interleaving" : args.ddram_interleaving,
+        "with_ddram_dma"     : args.with_ddram_dma,
+    }
+    if args.ddram_channels is not None:
+        r["ddram_channels"] = [int(n, 0) for n in args.ddram_channels.split(",")]
+    return r
+
+def sdram_channels_check(platform, channels, name="ddram"):
+    """Check that the SDRAM channels are available (once) in the platform's resources."""
+    available = sorted(set(io[1] for io in platform.constraint_manager.available if io[0] == name))
+    if len(set(channels)) != len(channels):
+        raise ValueError("SDRAM: {} channels ({}) used more than once.".format(name,
+            ", ".join(str(n) for n in channels)))
+    missing = [n for n in channels if n not in available]
+    if missing:
+        raise ValueError("SDRAM: {} channel(s) {} not available, available: {}.".format(name,
+            ", ".join(str(n) for n in missing), ", ".join(str(n) for n in available)))
+
+# L2 Cache Parameters ------------------------------------------------------------------------------
+
+def l2_cache_params(kwargs, phy, size=8192, min_data_width=None, reverse=None, full_memory_we=None,
+    max_size = None):
+    """Return the L2 Cache parameters of add_sdram for the board.
+
+    size/min_data_width/reverse/full_memory_we are the board's defaults (None: LiteX's default),
+    overridden by the L2 options passed to the SoC (kwargs). max_size is the largest L2 Cache the
+    board can fit. The parameters are checked against the board and the LiteDRAM port of the PHY.
+    """
+    port_data_width = 2**int(log2(phy.settings.nphases*phy.settings.dfi_databits))
+
+    size           = kwargs.get("l2_size", size)
+    min_data_width = kwargs.get("l2_min_data_width", min_data_width)
+    reverse        = kwargs.get("l2_reverse", reverse)
+    full_memory_we = kwargs.get("l2_full_memory_we", full_memory_we)
+    if not kwargs.get("with_l2", True):
+        if any(k in kwargs for k in ["l2_min_data_width", "l2_reverse", "l2_full_memory_we"]):
+            raise ValueError("L2: options set with L2 Cache disabled.")
+        size = 0
+
+    if size != 0:
+        if size & (size - 1):
+            raise ValueError("L2: size ({}) must be a power of 2 (or 0 to disable).".format(size))
+        if size < 2*port_data_width//8:
+            raise ValueError("L2: size ({}) too small for a {}-bit SDRAM port, min: {}.".format(
+                size, port_data_width, 2*port_data_width//8))
+        if max_size is not None and size > max_size:
+            raise ValueError("L2: size ({}) too large for the board, max: {}.".format(
+                size, max_size))
+    if min_data_width is not None:
+        if min_data_width < 32 or min_data_width & (min_data_width - 1):
+            raise ValueError("L2: min data width ({}) must be a power of 2 >= 32.".format(
+                min_data_width))
+        if size != 0 and size < 2*max(port_data_width, min_data_width)//8:
+            raise ValueError("L2: size ({}) too small for a {}-bit min data width, min: {}.".format(
+                size, min_data_width, 2*min_data_width//8))
+
+    params = {"l2_cache_size": size}
+    if min_data_width is not None:
+        params["l2_cache_min_data_width"] = min_data_width
+    if reverse is not None:
+        params["l2_cache_reverse"] = reverse
+    if full_memory_we is not None:
+        params["l2_cache_full_memory_we"] = full_memory_we
+    return params
+
+# Wishbone Interleaver -----------------------------------------------------------------------------
+
+class WishboneInterleaver(Module):
+    """Spread the accesses of a Wishbone master over Wishbone slaves.
+
+    The slave is selected from the address bits just above granularity (in bytes) and these bits
+    are removed from the address presented to the slave.
+    """
+    def __init__(self, master, slaves, base_address=0x00000000, granularity=4096):
+        nslaves    = len(slaves)
+        word_bytes = len(master.dat_w)//8
+        shift      = log2_int(granularity//word_bytes)
+        bits       = bits_for(nslaves - 1)
+        assert granularity >= word_bytes
+
+        # # #
+
+        adr = Signal(len(master.adr))
+        sel = Signal(max(bits, 1))
+        self.comb += adr.eq(master.adr - (base_address//word_bytes))
+        if bits:
+            self.comb += sel.eq(adr[shift:shift+bits])
+
+        for n, slave in enumerate(slaves):
+            self.comb += [
+                slave.adr.eq(Cat(adr[:shift], adr[shift+bits:])),
+                slave.dat_w.eq(master.dat_w),
+                slave.sel.eq(master.sel),
+                slave.we.eq(master.we),
+                slave.cti.eq(master.cti),
+                slave.bte.eq(master.bte),
+                slave.cyc.eq(master.cyc & (sel == n)),
+                slave.stb.eq(master.stb & (sel == n)),
+            ]
+        self.comb += [
+            master.ack.eq(Array([slave.ack     for slave in slaves])[sel]),
+            master.err.eq(Array([slave.err     for slave in slaves])[sel]),
+            master.dat_r.eq(Array([slave.dat_r for slave in slaves])[sel]),
+        ]
+
+# SDRAM Channel ------------------------------------------------------------------------------------
+
+class SDRAMChannel(Module):
+    """Additional SDRAM channel (PHY, Controller, Crossbar) initialized with the main channel.
+
+    Commands of the main DFI injector (when in software control) and writes to the main PHY's
+    CSRs are broadcast to this channel: the channel is not calibrated and runs with the delays
+    trained on the main channel. This module is not an AutoCSR: the PHY's CSRs are not
+    exposed and are only driven from the main PHY's ones.
+    """
+    def __init__(self, phy, module, clk_freq, main_sdram, main_phy):
+        from litedram.core.controller import LiteDRAMController
+        from litedram.core.crossbar import LiteDRAMCrossbar
+
+        self.submodules.phy        = phy
+        self.submodules.controller = LiteDRAMController(
+            phy_settings    = phy.settings,
+            geom_settings   = module.geom_settings,
+            timing_settings = module.timing_settings,
+            clk_freq        = clk_freq)
+        self.submodules.crossbar   = LiteDRAMCrossbar(self.controller.interface)
+
+        # # #
+
+        # DFI: Controller in hardware control, main DFI injector in software control.
+        hw_control = main_sdram.dfii._control.storage[0]
+        for main_phase, ctrl_phase, phy_phase in zip(
+            main_sdram.dfii.master.phases,
+            self.controller.dfi.phases,
+            phy.dfi.phases):
+            self.comb += If(hw_control,
+                ctrl_phase.connect(phy_phase)
+            ).Else(
+                main_phase.connect(phy_phase, omit={"rddata", "rddata_valid"})
+            )
+
+        # PHY CSRs: Follow the main PHY's ones (PHYs without CSRs, ex: simulation models, have none).
+        main_csrs = main_phy.get_csrs() if hasattr(main_phy, "get_csrs") else []
+        csrs      = phy.get_csrs()      if hasattr(phy,      "get_csrs") else []
+        assert len(main_csrs) == len(csrs)
+        for main_csr, csr in zip(main_csrs, csrs):
+            if isinstance(csr, CSRStorage):
+                self.comb += csr.storage.eq(main_csr.storage)
+                self.comb += csr.re.eq(main_csr.re)
+            elif isinstance(csr, CSR):
+                self.comb += csr.r.eq(main_csr.r)
+                self.comb += csr.re.eq(main_csr.re)
+
+# Add SDRAM Channels -------------------------------------------------------------------------------
+
+def add_sdram_channels(soc, phys, module, origin=None, size=0x40000000, mapping="consecutive",
+    interleaving            = 4096,
+    l2_cache_size           = 8192,
+    l2_cache_min_data_width = 128,
+    l2_cache_reverse        = True,
+    l2_cache_full_memory_we = True):
+    """Add one LiteDRAM controller per PHY and map the channels to main_ram.
+
+    The first channel is added as soc.sdram (initialized by the BIOS), the others as soc.sdram1,
+    soc.sdram2, etc... main_ram has a window of size/len(phys) bytes on each channel (rounded down
+    to a power of 2); the whole channels remain accessible from their crossbars (DMAs, etc...).
+
+    Returns the crossbars of the channels.
+    """
+    from litedram.frontend.wishbone import LiteDRAMWishbone2Native
+
+    nchannels = len(phys)
+    if mapping not in sdram_mappings:
+        raise ValueError("SDRAM: {} mapping not supported, supported: {}.".format(
+            mapping, ", ".join(sdram_mappings)))
+    if mapping == "interleaved" and (nchannels & (nchannels - 1)):
+        raise ValueError("SDRAM: interleaved mapping requires a power of 2 number of channels.")
+
+    # Channels.
+    soc.add_sdram("sdram",
+        phy                   = phys[0],
+        module                = module,
+        with_soc_interconnect = False)
+    crossbars = [soc.sdram.crossbar]
+    for n, phy in enumerate(phys[1:], start=1):
+        channel = SDRAMChannel(phy, module, soc.sys_clk_freq,
+            main_sdram = soc.sdram,
+            main_phy   = phys[0])
+        setattr(soc.submodules, "sdram{}".format(n), channel)
+        crossbars.append(channel.crossbar)
+
+    # Compute windows.
+    sdram_size = 2**(module.geom_settings.bankbits +
+                     module.geom_settings.rowbits +
+                     module.geom_settings.colbits)*phys[0].settings.nranks*phys[0].settings.databits//8
+    window = 2**int(log2(min(sdram_size, size//nchannels)))
+    if mapping == "consecutive":
+        interleaving = window
+    if not (interleaving & (interleaving - 1) == 0 and interleaving <= window):
+        raise ValueError("SDRAM: interleaving ({}) must be a power of 2 <= {}.".format(
+            interleaving, window))
+
+    # main_ram region/slave.
+    main_ram_region = SoCRegion(
+        origin = soc.mem_map.get("main_ram", origin),
+        size   = nchannels*window,
+        mode   = "rwx")
+    wb_sdram = wishbone.Interface(data_width=soc.bus.data_width)
+    soc.bus.add_slave("main_ram", wb_sdram, main_ram_region)
+
+    # L2 Cache.
+    ports = [crossbar.get_port() for crossbar in crossbars]
+    for port in ports:
+        port.data_width = 2**int(log2(port.data_width)) # Round to nearest power of 2.
+    data_width = ports[0].data_width
+    if l2_cache_size != 0:
+        l2_cache_size = max(l2_cache_size, int(2*data_width/8)) # Use minimal size if lower.
+        l2_cache_size = 2**int(log2(l2_cache_size))             # Round to nearest power of 2.
+        wb_channels   = wishbone.Interface(max(data_width, l2_cache_min_data_width))
+        l2_cache = wishbone.Cache(
+            cachesize = l2_cache_size//4,
+            master    = wb_sdram,
+            slave     = wb_channels,
+            reverse   = l2_cache_reverse)
+        if l2_cache_full_memory_we:
+            l2_cache = FullMemoryWE()(l2_cache)
+        soc.submodules.l2_cache = l2_cache
+        soc.add_config("L2_SIZE", l2_cache_size)
+    else:
+        wb_channels = wishbone.Interface(data_width)
+        soc.submodules += wishbone.Converter(wb_sdram, wb_channels)
+
+    # Interleaver / Wishbone <--> LiteDRAM bridges.
+    wb_ports = [wishbone.Interface(len(wb_channels.dat_w)) for port in ports]
+    soc.submodules.sdram_interleaver = WishboneInterleaver(wb_channels, wb_ports,
+        base_address = soc.bus.regions["main_ram"].origin,
+        granularity  = interleaving)
+    for n, (wb_port, port) in enumerate(zip(wb_ports, ports)):
+        setattr(soc.submodules, "sdram_wishbone_bridge{}".format(n),
+            LiteDRAMWishbone2Native(wb_port, port))
+
+    return crossbars
+
+# Add SDRAM DMA ------------------------------------------------------------------------------------
+
+def add_sdram_dma(soc, name, crossbar, data_width, fifo_depth=16):
+    """Add a DMA Writer/Reader (with CSRs: base, length, enable, done, loop) on a crossbar.
+
+    Returns the (sink, source) streams (of data_width) written to/read from the SDRAM.
+    """
+    from litex.soc.interconnect import stream
+    from litedram.frontend.dma import LiteDRAMDMAWriter, LiteDRAMDMAReader
+
+    writer = LiteDRAMDMAWriter(crossbar.get_port("write"), fifo_depth=fifo_depth, with_csr=True)
+    reader = LiteDRAMDMAReader(crossbar.get_port("read"),  fifo_depth=fifo_depth, with_csr=True)
+    setattr(soc.submodules, "{}_writer".format(name), writer)
+    setattr(soc.submodules, "{}_reader".format(name), reader)
+
+    # Data-Width conversion.
+    up_converter   = stream.Converter(data_width, len(writer.sink.data))
+    down_converter = stream.Converter(len(reader.source.data), data_width)
+    soc.submodules += up_converter, down_converter
+    soc.comb += [
+        up_converter.source.connect(writer.sink),
+        reader.source.connect(down_converter.sink),
+    ]
+    return up_converter.sink, down_converter.source
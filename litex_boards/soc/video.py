@@ -0,0 +1,191 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Video helpers shared by the targets.
+
+Video options (--video-timings, --video-format, --video-downscale, --video-bandwidth-share) with the
+board's defaults, and the framebuffer's scanout bandwidth checked against the board's SDRAM:
+
+    parser = argparse.ArgumentParser()
+    soc_core_args(parser)
+    video_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **video_argdict(args), **soc_core_argdict(args))
+
+    # In BaseSoC:
+    video = video_params(kwargs, timings="800x600@60Hz", pix_clk=40e6,
+        sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41K128M16, "1:4", databits=16),
+        framebuffer     = with_video_framebuffer)
+    self.submodules.crg = _CRG(platform, sys_clk_freq, pix_clk=video["pix_clk"])
+    ...
+    self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], format=video["format"],
+        clock_domain = "hdmi")
+
+Video pipelines with a video clock faster than sys_clk (ex: 1080p60 at 148.5MHz with a 100MHz SoC):
+the GTP PHY runs in the video clock domain (AsyncVideoS7GTPHDMIPHY) and the framebuffer of LiteX
+crosses its DRAM data to it at the DRAM data width (clock_faster_than_sys, set by
+add_video_framebuffer when the pixel clock is faster than sys_clk):
+
+    # In BaseSoC:
+    self.submodules.videophy = AsyncVideoS7GTPHDMIPHY(platform.request("hdmi_out"),
+        clock_domain = "hdmi")
+    self.add_video_framebuffer(phy=self.videophy, timings="1920x1080@60Hz", clock_domain="hdmi")
+"""
+
+import logging
+
+from migen import *
+
+from litex.gen import colorer
+
+from litex.soc.interconnect import stream
+from litex.soc.cores.video import video_data_layout, video_timings, VideoS7GTPHDMIPHY
+
+logger = logging.getLogger("Video")
+
+# Arguments ----------------------------------------------------------------------------------------
+
+video_formats = {
+    "rgb888" : 4, # Bytes per pixel (32-bit).
+    "rgb565" : 2,
+}
+
+# Share of the SDRAM bandwidth available to the framebuffer by default (lower it to keep bandwidth
+# for the CPU/DMAs).
+video_bandwidth_share_default = 1.0
+
+# Efficiency of the SDRAM on the framebuffer's sequential reads (refresh, row changes).
+sdram_efficiency = 0.9
+
+def video_args(parser):
+    parser.add_argument("--video-timings", default=None,
+        help="Video timings (ex: 1280x720@60Hz, default: board's default), one of: {}.".format(
+            ", ".join(video_timings.keys())))
+    parser.add_argument("--video-format", default=None, choices=list(video_formats.keys()),
+        help="Video FrameBuffer pixel format (default: rgb888, rgb565 halves the SDRAM traffic).")
+    parser.add_argument("--video-downscale", action="store_true",
+        help="Fall back to the largest video timings fitting in the SDRAM bandwidth budget.")
+    parser.add_argument("--video-bandwidth-share", default=None, type=float,
+        help="Share of the SDRAM bandwidth for the Video FrameBuffer (default: {}).".format(
+            video_bandwidth_share_default))
+
+def video_argdict(args):
+    r = {
+        "video_timings"         : args.video_timings,
+        "video_format"          : args.video_format,
+        "video_downscale"       : args.video_downscale or None,
+        "video_bandwidth_share" : args.video_bandwidth_share,
+    }
+    # Only pass the arguments that are set (to keep the defaults of the target).
+    return {k: v for k, v in r.items() if v is not None}
+
+# Video Parameters ---------------------------------------------------------------------------------
+
+def sdram_bandwidth(sys_clk_freq, module, rate, databits):
+    """Return the peak bandwidth (bytes/s) of an SDRAM from its module, PHY rate and data width."""
+    nphases = int(rate.split(":")[1])
+    beats   = nphases*(1 if module.memtype == "SDR" else 2)
+    return sys_clk_freq*beats*databits/8
+
+def _get_timings(timings):
+    if isinstance(timings, str):
+        if timings not in video_timings:
+            raise ValueError("Video: unknown timings {}, available: {}.".format(
+                timings, ", ".join(video_timings.keys())))
+        return timings, video_timings[timings]
+    return timings
+
+def video_bandwidth(timings, format="rgb888", pix_clk=None):
+    """Return the scanout bandwidth (bytes/s, over the active lines) of video timings."""
+    name, t = _get_timings(timings)
+    pix_clk = t["pix_clk"] if pix_clk is None else pix_clk
+    return pix_clk*video_formats[format]*t["h_active"]/(t["h_active"] + t["h_blanking"])
+
+def video_params(kwargs, timings, pix_clk=None, sdram_bandwidth=None, framebuffer=True,
+    pix_clk_range=(0, None)):
+    """Return the video parameters (timings, format, pix_clk) of the board.
+
+    timings/pix_clk are the board's defaults (pix_clk: video clock of the board for its default
+    timings, None: the timings' one), overridden by the video options passed to the SoC (kwargs).
+    pix_clk_range is the range of video clocks the board's CRG/PHY support. With a framebuffer,
+    the scanout bandwidth is checked against the share of the SDRAM bandwidth (sdram_bandwidth,
+    bytes/s) given to video: timings that don't fit are rejected or, with video_downscale, replaced
+    by the largest ones that fit. The board's defaults are only reported when over the budget.
+    """
+    default   = _get_timings(timings)[0]
+    explicit  = any(k.startswith("video_") for k in kwargs.keys())
+    timings   = kwargs.get("video_timings", timings)
+    format    = kwargs.get("video_format", "rgb888")
+    downscale = kwargs.get("video_downscale", False)
+    share     = kwargs.get("video_bandwidth_share", video_bandwidth_share_default)
+    name, t   = _get_timings(timings)
+    if format not in video_formats:
+        raise ValueError("Video: unsupported format {}, supported: {}.".format(
+            format, ", ".join(video_formats.keys())))
+    if not (0 < share <= 1):
+        raise ValueError("Video: bandwidth share ({}) must be in ]0, 1].".format(share))
+
+    def get_pix_clk(name, t):
+        return pix_clk if (name == default and pix_clk is not None) else t["pix_clk"]
+    def pix_clk_ok(name, t):
+        pix_clk_min, pix_clk_max = pix_clk_range
+        if name == default:
+            return True
+        return t["pix_clk"] >= pix_clk_min and (pix_clk_max is None or t["pix_clk"] <= pix_clk_max)
+    if not pix_clk_ok(name, t):
+        raise ValueError("Video: {} pixel clock ({:.2f}MHz) not supported by the board.".format(
+            name, t["pix_clk"]/1e6))
+
+    # SDRAM bandwidth budget.
+    if framebuffer and sdram_bandwidth is not None:
+        budget = sdram_bandwidth*sdram_efficiency*share
+        def required(name, t, format):
+            return video_bandwidth((name, t), format, pix_clk=get_pix_clk(name, t))
+        if required(name, t, format) > budget:
+            msg = "Video: {} {} needs {:.1f}MB/s, over the SDRAM budget of {:.1f}MB/s ".format(
+                name, format, required(name, t, format)/1e6, budget/1e6)
+            msg += "({:.0%} of {:.1f}MB/s)".format(share*sdram_efficiency, sdram_bandwidth/1e6)
+            if not explicit:
+                logger.warning(msg + ".")
+            elif not downscale:
+                if format != "rgb565" and required(name, t, "rgb565") <= budget:
+                    msg += ", fits in rgb565 (--video-format=rgb565)"
+                raise ValueError(msg + ", use --video-downscale to fall back to smaller timings.")
+            else:
+                candidates = [(n, c) for n, c in video_timings.items()
+                    if pix_clk_ok(n, c) and required(n, c, format) <= budget]
+                if not candidates:
+                    raise ValueError(msg + ", no smaller timings fit.")
+                name, t = max(candidates,
+                    key=lambda c: (c[1]["h_active"]*c[1]["v_active"], c[1]["pix_clk"]))
+                logger.warning(msg + ", {} to {}.".format(colorer("downscaled", color="cyan"), name))
+
+    return {
+        "timings" : name if name in video_timings else (name, t),
+        "format"  : format,
+        "pix_clk" : get_pix_clk(name, t),
+    }
+
+# Video PHYs ---------------------------------------------------------------------------------------
+
+class AsyncVideoS7GTPHDMIPHY(Module):
+    """VideoS7GTPHDMIPHY with its GTP init/control logic in the video clock domain.
+
+    VideoS7GTPHDMIPHY runs the GTP init FSMs in sys and requires sys_clk >= video clk; they are
+    moved to the video clock domain here, so the PHY no longer depends on sys_clk.
+    """
+    def __init__(self, pads, clock_domain="hdmi", clk_freq=148.5e6, refclk=None):
+        self.sink = stream.Endpoint(video_data_layout)
+
+        # # #
+
+        phy = VideoS7GTPHDMIPHY(pads,
+            sys_clk_freq = clk_freq,
+            clock_domain = clock_domain,
+            clk_freq     = clk_freq,
+            refclk       = refclk)
+        self.submodules.phy = ClockDomainsRenamer({"sys": clock_domain})(phy)
+        self.comb += self.sink.connect(phy.sink)
@@ -0,0 +1,244 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Zynq7000 PS7 AXI HP/ACP helpers shared by the Zynq targets.
+
+The targets bridge the PS to the fabric through AXI GP0 (32-bit, single beat, PS master). For
+fabric masters streaming to/from the PS DDR, the PS7 AXI slave ports are exposed as burst-capable
+striped DMAs (litex_boards.soc.axi):
+
+- HP0-3 : 64-bit high-performance ports to the DDR controller (~1GB/s per port, not coherent).
+  The selected ports are striped in a single writer/reader (zynq_hp_dma_writer/reader).
+- ACP   : 64-bit Accelerator Coherency Port (coherent with the CPU's L1/L2 caches, through the SCU),
+  exposed as zynq_acp_dma_writer/reader.
+
+    parser = argparse.ArgumentParser()
+    zynq_axi_args(parser)
+    args = parser.parse_args()
+    soc  = BaseSoC(..., **zynq_axi_argdict(args))
+
+    # In BaseSoC (with the PS7 XCI set):
+    add_zynq_axi_dma(self, zynq_hp_ports, zynq_acp, zynq_dma_base, zynq_dma_size)
+    self.comb += adc.source.connect(self.zynq_hp_dma_writer.sink)
+
+    # After the build:
+    generate_zynq_axi_software(soc, os.path.join(builder.output_dir, "driver"))
+
+The ports are clocked by the PS7 clock (ps7, the sys clock of the Zynq targets with the zynq7000 CPU);
+the HP ports are the ones of LiteX's Zynq7000 CPU (cpu.add_axi_hp_slave). The generated
+C header gives the PS (physical) addresses of the DMAs' CSRs (through AXI GP0) and the DDR buffer
+reserved for the DMAs, the device-tree fragment reserves this buffer and exposes the DMAs as UIO
+devices to Linux.
+"""
+
+import os
+
+from migen import *
+
+from litex.soc.interconnect import axi
+
+from litex_boards.soc.axi import AXIStripedDMAWriter, AXIStripedDMAReader
+
+# Constants ----------------------------------------------------------------------------------------
+
+# PS address of the AXI GP0 port (where the SoC's bus is mapped by the targets).
+zynq_axi_gp0_base = 0x43c00000
+
+# Number of AXI HP ports of the PS7.
+zynq_axi_hp_ports_max = 4
+
+# Default DDR buffer reserved for the DMAs (top 32MB of the 512MB of the smallest boards).
+zynq_dma_base_default = 0x1e000000
+zynq_dma_size_default = 0x02000000
+
+# Arguments ----------------------------------------------------------------------------------------
+
+def zynq_axi_args(parser):
+    parser.add_argument("--zynq-hp-ports", default=0, type=int,
+        help="Number of PS7 AXI HP ports (1, 2 or 4) used by the HP DMAs (default: 0, disabled).")
+    parser.add_argument("--zynq-acp", action="store_true",
+        help="Enable the PS7 AXI ACP port (cache-coherent DMAs).")
+    parser.add_argument("--zynq-dma-base", default=zynq_dma_base_default, type=lambda x: int(x, 0),
+        help="PS DDR buffer reserved for the DMAs: base (default: 0x{:08x}).".format(zynq_dma_base_default))
+    parser.add_argument("--zynq-dma-size", default=zynq_dma_size_default, type=lambda x: int(x, 0),
+        help="PS DDR buffer reserved for the DMAs: size (default: 0x{:08x}).".format(zynq_dma_size_default))
+
+def zynq_axi_argdict(args):
+    return {
+        "zynq_hp_ports" : args.zynq_hp_ports,
+        "zynq_acp"      : args.zynq_acp,
+        "zynq_dma_base" : args.zynq_dma_base,
+        "zynq_dma_size" : args.zynq_dma_size,
+    }
+
+# PS7 AXI Slave Ports ------------------------------------------------------------------------------
+
+def _ps7_axi_acp_params(port, clk_domain):
+    prefix = "S_AXI_ACP"
+    return {
+        # Clk.
+        f"i_{prefix}_ACLK"    : ClockSignal(clk_domain),
+
+        # AW.
+        f"i_{prefix}_AWVALID" : port.aw.valid,
+        f"o_{prefix}_AWREADY" : port.aw.ready,
+        f"i_{prefix}_AWADDR"  : port.aw.addr,
+        f"i_{prefix}_AWBURST" : port.aw.burst,
+        f"i_{prefix}_AWLEN"   : port.aw.len,
+        f"i_{prefix}_AWSIZE"  : port.aw.size,
+        f"i_{prefix}_AWID"    : port.aw.id,
+        f"i_{prefix}_AWLOCK"  : port.aw.lock,
+        f"i_{prefix}_AWPROT"  : port.aw.prot,
+        f"i_{prefix}_AWCACHE" : port.aw.cache,
+        f"i_{prefix}_AWQOS"   : port.aw.qos,
+
+        # W.
+        f"i_{prefix}_WVALID"  : port.w.valid,
+        f"i_{prefix}_WLAST"   : port.w.last,
+        f"o_{prefix}_WREADY"  : port.w.ready,
+        f"i_{prefix}_WID"     : port.w.id,
+        f"i_{prefix}_WDATA"   : port.w.data,
+        f"i_{prefix}_WSTRB"   : port.w.strb,
+
+        # B.
+        f"o_{prefix}_BVALID"  : port.b.valid,
+        f"i_{prefix}_BREADY"  : port.b.ready,
+        f"o_{prefix}_BID"     : port.b.id,
+        f"o_{prefix}_BRESP"   : port.b.resp,
+
+        # AR.
+        f"i_{prefix}_ARVALID" : port.ar.valid,
+        f"o_{prefix}_ARREADY" : port.ar.ready,
+        f"i_{prefix}_ARADDR"  : port.ar.addr,
+        f"i_{prefix}_ARBURST" : port.ar.burst,
+        f"i_{prefix}_ARLEN"   : port.ar.len,
+        f"i_{prefix}_ARSIZE"  : port.ar.size,
+        f"i_{prefix}_ARID"    : port.ar.id,
+        f"i_{prefix}_ARLOCK"  : port.ar.lock,
+        f"i_{prefix}_ARPROT"  : port.ar.prot,
+        f"i_{prefix}_ARCACHE" : port.ar.cache,
+        f"i_{prefix}_ARQOS"   : port.ar.qos,
+
+        # R.
+        f"o_{prefix}_RVALID"  : port.r.valid,
+        f"i_{prefix}_RREADY"  : port.r.ready,
+        f"o_{prefix}_RLAST"   : port.r.last,
+        f"o_{prefix}_RID"     : port.r.id,
+        f"o_{prefix}_RRESP"   : port.r.resp,
+        f"o_{prefix}_RDATA"   : port.r.data,
+    }
+
+def add_zynq_axi_hp_port(cpu):
+    """Enable the next PS7 AXI HP port (64-bit, ps7 clock) and return its AXI interface."""
+    assert len(cpu.axi_hp_slaves) < zynq_axi_hp_ports_max
+    port = cpu.add_axi_hp_slave()
+    n    = len(cpu.axi_hp_slaves) - 1
+    cpu.add_ps7_config({
+        f"PCW_USE_S_AXI_HP{n}"        : 1,
+        f"PCW_S_AXI_HP{n}_DATA_WIDTH" : 64,
+    })
+    return port
+
+def add_zynq_axi_acp_port(cpu, clk_domain="ps7"):
+    """Enable PS7 AXI ACP port (64-bit, coherent accesses) and return its AXI interface."""
+    port = axi.AXIInterface(data_width=64, address_width=32, id_width=3)
+    cpu.add_ps7_config({"PCW_USE_S_AXI_ACP" : 1})
+    params = _ps7_axi_acp_params(port, clk_domain)
+    # Coherent accesses: write-back/allocate AxCACHE and AxUSER[0] (shared) set.
+    params.update({
+        "i_S_AXI_ACP_AWCACHE" : Constant(0b1111, 4),
+        "i_S_AXI_ACP_ARCACHE" : Constant(0b1111, 4),
+        "i_S_AXI_ACP_AWUSER"  : Constant(0b00001, 5),
+        "i_S_AXI_ACP_ARUSER"  : Constant(0b00001, 5),
+    })
+    cpu.cpu_params.update(params)
+    return port
+
+# PS7 AXI DMAs -------------------------------------------------------------------------------------
+
+def add_zynq_axi_dma(soc, hp_ports=0, acp=False, dma_base=zynq_dma_base_default,
+    dma_size=zynq_dma_size_default):
+    """Add the HP (striped over hp_ports) and ACP DMAs of the PS7 to the SoC."""
+    if (hp_ports or acp) and getattr(soc.cpu, "name", None) != "zynq7000":
+        raise ValueError("Zynq AXI DMAs require the zynq7000 CPU (--cpu-type=zynq7000).")
+    if hp_ports not in [0, 1, 2, 4]:
+        raise ValueError("Unsupported number of Zynq AXI HP ports ({}), supported: 1, 2 or 4.".format(
+            hp_ports))
+    if (dma_base % 4096) or (dma_size % 4096):
+        raise ValueError("Zynq DMA buffer (0x{:08x}/0x{:08x}) must be 4KB aligned.".format(
+            dma_base, dma_size))
+    soc.zynq_dma_buffer = (dma_base, dma_size)
+
+    # HP DMAs.
+    if hp_ports:
+        ports = [add_zynq_axi_hp_port(soc.cpu) for _ in range(hp_ports)]
+        soc.submodules.zynq_hp_dma_writer = AXIStripedDMAWriter(ports)
+        soc.submodules.zynq_hp_dma_reader = AXIStripedDMAReader(ports)
+
+    # ACP DMAs.
+    if acp:
+        port = add_zynq_axi_acp_port(soc.cpu)
+        soc.submodules.zynq_acp_dma_writer = AXIStripedDMAWriter([port])
+        soc.submodules.zynq_acp_dma_reader = AXIStripedDMAReader([port])
+
+# Software -----------------------------------------------------------------------------------------
+
+def _zynq_axi_dmas(soc):
+    dmas = []
+    for name in ["zynq_hp_dma_writer", "zynq_hp_dma_reader", "zynq_acp_dma_writer", "zynq_acp_dma_reader"]:
+        if name in soc.csr_regions:
+            region = soc.csr_regions[name]
+            dmas.append((name, zynq_axi_gp0_base + region.origin, region))
+    return dmas
+
+def get_zynq_axi_header(soc):
+    dma_base, dma_size = soc.zynq_dma_buffer
+    alignment = soc.constants.get("CONFIG_CSR_ALIGNMENT", 32)
+    r = "#ifndef __GENERATED_ZYNQ_AXI_H\n#define __GENERATED_ZYNQ_AXI_H\n"
+    r += "\n/* PS7 physical addresses (SoC's CSRs through AXI GP0). */\n"
+    r += "#define ZYNQ_AXI_GP0_BASE 0x{:08x}L\n".format(zynq_axi_gp0_base)
+    r += "#define ZYNQ_DMA_BUFFER_BASE 0x{:08x}L\n".format(dma_base)
+    r += "#define ZYNQ_DMA_BUFFER_SIZE 0x{:08x}L\n".format(dma_size)
+    for name, base, region in _zynq_axi_dmas(soc):
+        r += "\n/* {} */\n".format(name)
+        r += "#define {}_BASE 0x{:08x}L\n".format(name.upper(), base)
+        r += "#define {}_BURST_BYTES {}\n".format(name.upper(), getattr(soc, name).striping.burst_bytes)
+        offset = 0
+        for csr in region.obj:
+            nwords = (csr.size + region.busword - 1)//region.busword
+            r += "#define {}_{}_OFFSET 0x{:02x}\n".format(name.upper(), csr.name.upper(), offset)
+            offset += alignment//8*nwords
+    r += "\n#endif\n"
+    return r
+
+def get_zynq_axi_dtsi(soc):
+    dma_base, dma_size = soc.zynq_dma_buffer
+    r = "/ {\n"
+    r += "\treserved-memory {\n"
+    r += "\t\t#address-cells = <1>;\n"
+    r += "\t\t#size-cells = <1>;\n"
+    r += "\t\tranges;\n\n"
+    r += "\t\tlitex_dma_buffer: buffer@{:x} {{\n".format(dma_base)
+    r += "\t\t\tno-map;\n"
+    r += "\t\t\treg = <0x{:08x} 0x{:08x}>;\n".format(dma_base, dma_size)
+    r += "\t\t};\n"
+    r += "\t};\n"
+    for name, base, region in _zynq_axi_dmas(soc):
+        r += "\n\tlitex_{}: {}@{:x} {{\n".format(name, name.replace("_", "-"), base)
+        r += "\t\tcompatible = \"generic-uio\";\n"
+        r += "\t\treg = <0x{:08x} 0x{:08x}>;\n".format(base, soc.csr.paging)
+        r += "\t\tmemory-region = <&litex_dma_buffer>;\n"
+        r += "\t};\n"
+    r += "};\n"
+    return r
+
+def generate_zynq_axi_software(soc, dst):
+    """Generate the C header and device-tree fragment of the PS7 AXI DMAs in dst."""
+    os.makedirs(dst, exist_ok=True)
+    with open(os.path.join(dst, "zynq_axi.h"), "w") as f:
+        f.write(get_zynq_axi_header(soc))
+    with open(os.path.join(dst, "zynq_axi.dtsi"), "w") as f:
+        f.write(get_zynq_axi_dtsi(soc))
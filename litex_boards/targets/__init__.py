@@ -0,0 +1,8 @@
+import importlib
+
+# Resolve short names (ex: targets.arty) on attribute access, see litex_boards/__init__.py.
+def __getattr__(name):
+    from litex_boards import resolve_short_name
+    if resolve_short_name("targets", name) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
@@ -25,6 +25,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import AS4C128M16
 from litedram.phy import s7ddrphy
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(Module):
@@ -75,7 +77,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = AS4C128M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # SPI Flash --------------------------------------------------------------------------------
@@ -102,6 +104,7 @@ def main():
     parser.add_argument("--with-spi-flash",  action="store_true", help="Enable SPI Flash (MMAPed)")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -109,6 +112,7 @@ def main():
         variant        = args.variant,
         sys_clk_freq   = int(float(args.sys_clk_freq)),
         with_spi_flash = args.with_spi_flash,
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
 
@@ -59,10 +59,13 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT48LC32M8, SDRModule
 from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(Module):
-    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1"):
+    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1", pix_clk=25e6):
         self.rst = Signal()
         self.clock_domains.cd_sys = ClockDomain()
         self.clock_domains.cd_hdmi   = ClockDomain()
@@ -83,8 +86,8 @@ class CRG(Module):
         self.comb += pll.reset.eq(~rst | ~avr_ready | self.rst)
         pll.register_clkin(clk50, 50e6)
         pll.create_clkout(self.cd_sys,    sys_clk_freq)
-        pll.create_clkout(self.cd_hdmi,   25e6,  margin=0)
-        pll.create_clkout(self.cd_hdmi5x, 125e6, margin=0)
+        pll.create_clkout(self.cd_hdmi,     pix_clk, margin=1e-2)
+        pll.create_clkout(self.cd_hdmi5x, 5*pix_clk, margin=1e-2)
         if sdram_rate == "1:2":
             pll.create_clkout(self.cd_sys2x,    2*sys_clk_freq)
             pll.create_clkout(self.cd_sys2x_ps, 2*sys_clk_freq, phase=90)
@@ -106,7 +109,10 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = CRG(platform, sys_clk_freq, sdram_rate)
+        video = video_params(kwargs, timings="640x480@60Hz", pix_clk=25e6,
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT48LC32M8, sdram_rate, databits=8),
+            framebuffer     = with_video_framebuffer)
+        self.submodules.crg = CRG(platform, sys_clk_freq, sdram_rate, pix_clk=video["pix_clk"])
 
         # HDMI Shield ------------------------------------------------------------------------------
         if with_hdmi_shield:
@@ -126,18 +132,19 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = MT48LC32M8(sys_clk_freq, sdram_rate),
-                l2_cache_size = kwargs.get("l2_size", 1024)
+                **l2_cache_params(kwargs, self.sdrphy, size=1024)
             )
         
         # HDMI Options -----------------------------------------------------------------------------
         if with_hdmi_shield and (with_video_colorbars or with_video_framebuffer or with_video_terminal):
             self.submodules.videophy = VideoS6HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_colorbars:
-                self.add_video_colorbars(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_colorbars(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="640x480@60Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="hdmi",
+                    format = video["format"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -159,9 +166,11 @@ def main():
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
     viopts.add_argument("--with-video-colorbars",   action="store_true", help="Enable Video Colorbars (HDMI)")
+    video_args(parser)
 
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     # Note: baudrate is fixed because regardless of USB->TTL baud, the AVR <-> FPGA baudrate is
@@ -174,7 +183,9 @@ def main():
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
         with_video_colorbars   = args.with_video_colorbars,
+        **video_argdict(args),
         uart_baudrate          = 500000,
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
 
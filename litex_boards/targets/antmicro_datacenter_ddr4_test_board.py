@@ -25,6 +25,9 @@ from litedram.phy.s7ddrphy import K7DDRPHY
 from liteeth.phy import LiteEthS7PHYRGMII
 from litehyperbus.core.hyperbus import HyperRAM
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -74,8 +77,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy                     = self.ddrphy,
                 module                  = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
-                l2_cache_size           = kwargs.get("l2_size", 8192),
-                l2_cache_min_data_width = 256,
+                **l2_cache_params(kwargs, self.ddrphy, min_data_width=256),
                 size                    = 0x40000000,
             )
 
@@ -101,7 +103,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # UartBone ---------------------------------------------------------------------------------
         if with_uartbone:
@@ -135,6 +138,8 @@ def main():
     parser.add_argument("--no-ident-version", action="store_false",   help="Disable build time output")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -152,6 +157,8 @@ def main():
         with_jtagbone     = args.with_jtagbone,
         with_uartbone     = args.with_uartbone,
         ident_version     = args.no_ident_version,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args))
     vns = builder.build(**vivado_build_argdict(args), run=args.build)
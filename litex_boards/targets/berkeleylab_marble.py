@@ -42,6 +42,9 @@ from litedram.phy import s7ddrphy
 
 from liteeth.phy.s7rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -117,7 +120,7 @@ class BaseSoC(SoCCore):
                 phy = self.ddrphy,
                 module = ram_module,
                 # size=0x40000000,  # Limit its size to 1 GB
-                l2_cache_size = kwargs.get("l2_size", 8192),
+                **l2_cache_params(kwargs, self.ddrphy),
                 with_bist = kwargs.get("with_bist", False)
             )
 
@@ -137,7 +140,8 @@ class BaseSoC(SoCCore):
             )
 
         if with_etherbone:
-            self.add_etherbone(phy=self.ethphy, buffer_depth=255)
+            add_etherbone(self, phy=self.ethphy,
+                **etherbone_params(kwargs, self.ethphy, buffer_depth=255))
 
         # System I2C (behing multiplexer) ----------------------------------------------------------
         i2c_pads = platform.request('i2c_fpga')
@@ -166,6 +170,8 @@ def main():
     parser.add_argument("--spd-dump", type=str, help="DDR3 configuration file, dumped using the `spdread` command in LiteX BIOS")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -174,6 +180,8 @@ def main():
         with_etherbone = args.with_etherbone,
         with_bist = args.with_bist,
         spd_dump = args.spd_dump,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
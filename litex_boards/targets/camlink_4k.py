@@ -24,6 +24,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT41K64M16
 from litedram.phy import ECP5DDRPHY
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -94,7 +96,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41K64M16(sys_clk_freq, "1:2"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -114,12 +116,14 @@ def main():
     parser.add_argument("--toolchain",    default="trellis",   help="FPGA toolchain: trellis (default) or diamond")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
         toolchain    = args.toolchain,
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -63,6 +63,9 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -154,8 +157,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy                     = self.sdrphy,
                 module                  = sdram_cls(sys_clk_freq, sdram_rate),
-                l2_cache_size           = kwargs.get("l2_size", 8192),
-                l2_cache_full_memory_we = False,
+                **l2_cache_params(kwargs, self.sdrphy, full_memory_we=False),
 
             )
 
@@ -168,7 +170,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Leds -------------------------------------------------------------------------------------
         # Disable leds when serial is used.
@@ -195,6 +198,8 @@ def main():
     parser.add_argument("--sdram-rate",        default="1:1",                    help="SDRAM Rate: 1:1 Full Rate (default), 1:2 Half Rate")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -206,6 +211,8 @@ def main():
         eth_phy          = args.eth_phy,
         use_internal_osc = args.use_internal_osc,
         sdram_rate       = args.sdram_rate,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -31,10 +31,14 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, use_internal_osc=False, with_usb_pll=False, with_video_pll=False, sdram_rate="1:1"):
+    def __init__(self, platform, sys_clk_freq, use_internal_osc=False, with_usb_pll=False, with_video_pll=False, sdram_rate="1:1", pix_clk=40e6):
         self.rst = Signal()
         self.clock_domains.cd_sys    = ClockDomain()
         if sdram_rate == "1:2":
@@ -87,8 +91,8 @@ class _CRG(Module):
             video_pll.register_clkin(clk, clk_freq)
             self.clock_domains.cd_hdmi   = ClockDomain()
             self.clock_domains.cd_hdmi5x = ClockDomain()
-            video_pll.create_clkout(self.cd_hdmi,    40e6, margin=0)
-            video_pll.create_clkout(self.cd_hdmi5x, 200e6, margin=0)
+            video_pll.create_clkout(self.cd_hdmi,     pix_clk, margin=1e-2)
+            video_pll.create_clkout(self.cd_hdmi5x, 5*pix_clk, margin=1e-2)
 
         # SDRAM clock
         sdram_clk = ClockSignal("sys2x_ps" if sdram_rate == "1:2" else "sys_ps")
@@ -115,7 +119,11 @@ class BaseSoC(SoCCore):
         # CRG --------------------------------------------------------------------------------------
         with_usb_pll = kwargs.get("uart_name", None) == "usb_acm"
         with_video_pll = with_video_terminal or with_video_framebuffer
-        self.submodules.crg = _CRG(platform, sys_clk_freq, use_internal_osc=use_internal_osc, with_usb_pll=with_usb_pll, with_video_pll=with_video_pll, sdram_rate=sdram_rate)
+        video = video_params(kwargs, timings="800x600@60Hz",
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, M12L64322A, sdram_rate, databits=32),
+            framebuffer     = with_video_framebuffer)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, use_internal_osc=use_internal_osc, with_usb_pll=with_usb_pll, with_video_pll=with_video_pll, sdram_rate=sdram_rate,
+            pix_clk=video["pix_clk"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -134,7 +142,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = M12L64322A(sys_clk_freq, sdram_rate),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.sdrphy)
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
@@ -146,7 +154,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
 
         if local_ip:
             local_ip = local_ip.split(".")
@@ -166,9 +175,10 @@ class BaseSoC(SoCCore):
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoHDMIPHY(platform.request("gpdi"), clock_domain="hdmi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="hdmi",
+                    format = video["format"])
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -193,8 +203,11 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
+    video_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -210,6 +223,9 @@ def main():
         l2_size	               = args.l2_size,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     soc.platform.add_extension(colorlight_i5._sdcard_pmod_io)
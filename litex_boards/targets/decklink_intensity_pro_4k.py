@@ -24,6 +24,8 @@ from litex.soc.integration.builder import *
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -41,7 +43,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = intensity_pro_4k.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -56,10 +59,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -70,6 +74,7 @@ def main():
     parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency (default: 125MHz)")
     parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver")
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
     vivado_build_args(parser)
@@ -78,6 +83,7 @@ def main():
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
         with_pcie    = args.with_pcie | True, # FIXME: Always enable PCIe for now.
+        **pcie_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
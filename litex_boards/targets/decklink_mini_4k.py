@@ -18,7 +18,6 @@ from litex.soc.cores.clock import *
 from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
-from litex.soc.cores.video import VideoS7GTPHDMIPHY
 
 from litedram.modules import MT41K128M16
 from litedram.phy import s7ddrphy
@@ -26,39 +25,52 @@ from litedram.phy import s7ddrphy
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import AsyncVideoS7GTPHDMIPHY
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq):
+    def __init__(self, platform, sys_clk_freq, with_video_pll=False):
         self.rst = Signal()
         self.clock_domains.cd_sys       = ClockDomain()
         self.clock_domains.cd_sys4x     = ClockDomain(reset_less=True)
         self.clock_domains.cd_sys4x_dqs = ClockDomain(reset_less=True)
         self.clock_domains.cd_idelay    = ClockDomain()
-        self.clock_domains.cd_hdmi      = ClockDomain()
 
         # # #
 
+        clk100 = platform.request("clk100")
+
         self.submodules.pll = pll = S7PLL(speedgrade=-1)
         self.comb += pll.reset.eq(self.rst)
-        pll.register_clkin(platform.request("clk100"), 100e6)
+        pll.register_clkin(clk100, 100e6)
         pll.create_clkout(self.cd_sys, sys_clk_freq)
         pll.create_clkout(self.cd_sys4x,     4*sys_clk_freq)
         pll.create_clkout(self.cd_sys4x_dqs, 4*sys_clk_freq, phase=90)
         pll.create_clkout(self.cd_idelay,    200e6, margin=1e-1)   # FIXME: Re-arrange clocking.
-        pll.create_clkout(self.cd_hdmi,      148.5e6, margin=2e-2) # FIXME: Use a second PLL or move to clkout0 that has fractional support.
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
         self.submodules.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
 
+        # Video MMCM (Video Clk independent of sys_clk, 148.5MHz on fractional clkout0: 148.39MHz).
+        if with_video_pll:
+            self.clock_domains.cd_hdmi = ClockDomain()
+            self.submodules.video_pll = video_pll = S7MMCM(speedgrade=-1)
+            self.comb += video_pll.reset.eq(self.rst)
+            video_pll.register_clkin(clk100, 100e6)
+            video_pll.create_clkout(self.cd_hdmi, 148.5e6, margin=1e-3)
+            platform.add_false_path_constraints(self.cd_sys.clk, self.cd_hdmi.clk)
+
         platform.add_platform_command("set_property CLOCK_DEDICATED_ROUTE FALSE [get_nets clk100_IBUF]")
 
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCMini):
-    def __init__(self, sys_clk_freq=int(100e6), with_pcie=False, with_video_terminal=False, with_video_framebuffer=False, **kwargs):
-        if with_video_terminal or with_video_framebuffer:
-            sys_clk_freq = int(148.5e6) # FIXME: For now requires sys_clk >= video_clk.
+    def __init__(self, sys_clk_freq=int(100e6), with_pcie=False, with_video_terminal=False, with_video_framebuffer=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = mini_4k.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -69,7 +81,8 @@ class BaseSoC(SoCMini):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq)
+        self.submodules.crg = _CRG(platform, sys_clk_freq,
+            with_video_pll = with_video_terminal or with_video_framebuffer)
 
         # DDR3 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
@@ -80,26 +93,33 @@ class BaseSoC(SoCMini):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41K128M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
         # Video ------------------------------------------------------------------------------------
+        # GTP PHY/Video MMCM at 148.5MHz: only timings with this pixel clock are supported.
+        video = video_params(kwargs, timings="1920x1080@60Hz", pix_clk_range=(148.5e6, 148.5e6),
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41K128M16, "1:4", databits=16),
+            framebuffer     = with_video_framebuffer)
         if with_video_terminal or with_video_framebuffer:
-            self.submodules.videophy = VideoS7GTPHDMIPHY(platform.request("hdmi_out"),
-                sys_clk_freq = sys_clk_freq,
+            # Video PHY/Scanout in hdmi ClockDomain, decoupled from sys_clk.
+            self.submodules.videophy = AsyncVideoS7GTPHDMIPHY(platform.request("hdmi_out"),
                 clock_domain = "hdmi"
             )
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="1920x1080@60Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="1920x1080@60Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"],
+                    clock_domain = "hdmi",
+                    format       = video["format"])
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks REQP-49]") # FIXME: Use GTP refclk.
 
 # Build --------------------------------------------------------------------------------------------
@@ -108,14 +128,17 @@ def main():
     parser = argparse.ArgumentParser(description="LiteX SoC Blackmagic Decklink Mini 4K.")
     parser.add_argument("--build",                  action="store_true", help="Build bitstream")
     parser.add_argument("--load",                   action="store_true", help="Load bitstream")
-    parser.add_argument("--sys-clk-freq",           default=148.5e6,       help="System clock frequency (default: 100MHz)")
+    parser.add_argument("--sys-clk-freq",           default=100e6,       help="System clock frequency (default: 100MHz)")
     parser.add_argument("--with-pcie",              action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",                 action="store_true", help="Generate PCIe driver")
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
+    video_args(parser)
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -124,6 +147,9 @@ def main():
         with_pcie              = args.with_pcie,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **pcie_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
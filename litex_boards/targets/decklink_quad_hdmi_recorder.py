@@ -20,6 +20,8 @@ from migen import *
 
 from litex_boards.platforms import quad_hdmi_recorder
 
+from litex.build.generic_platform import ConstraintError
+
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
@@ -31,6 +33,12 @@ from litedram.phy import usddrphy
 from litepcie.phy.uspciephy import USPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import sdram_bandwidth
+from litex_boards.soc.capture import capture_args, capture_argdict, capture_params
+from litex_boards.soc.capture import HDMIRXGTHPHY, VideoPatternSource, add_video_capture
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -59,7 +67,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(200e6), with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(200e6), with_pcie=False, with_hdmi_capture=False, ddram_width=None,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=None, pcie_dma_buffering_depth=1024, **kwargs):
         platform = quad_hdmi_recorder.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -76,29 +85,85 @@ class BaseSoC(SoCCore):
         self.add_jtagbone()
 
         # DDR3 SDRAM -------------------------------------------------------------------------------
+        # 32-bit (2 of the 4 chips) or 64-bit (full width, 2x bandwidth for the capture, default with it).
+        if ddram_width is None:
+            ddram_width = 64 if with_hdmi_capture else 32
+        if ddram_width not in [32, 64]:
+            raise ValueError("DDR3: unsupported width {}, supported: 32, 64.".format(ddram_width))
         if not self.integrated_main_ram_size:
+            ddram = platform.request("ddram")
+            if ddram_width == 32:
+                ddram = PHYPadsReducer(ddram, [0, 1, 2, 3])
             self.submodules.ddrphy = usddrphy.USDDRPHY(
-                pads             = PHYPadsReducer(platform.request("ddram"), [0, 1, 2, 3]),
+                pads             = ddram,
                 memtype          = "DDR3",
                 sys_clk_freq     = sys_clk_freq,
                 iodelay_clk_freq = 200e6)
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41J256M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                size          = 0x40000000,
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
+        # HDMI Capture parameters -----------------------------------------------------------------
+        if with_hdmi_capture:
+            # HDMI RX not wired yet (GTH refclk undocumented): pattern source by default.
+            capture = capture_params(kwargs, ninputs=4,
+                sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41J256M16, "1:4", databits=ddram_width),
+                source          = "pattern")
+            # One DMA channel per captured input.
+            if pcie_dmas is None:
+                pcie_dmas = len(capture["inputs"])
+            if with_pcie and pcie_dmas < len(capture["inputs"]):
+                raise ValueError("Capture: {} inputs captured, {} PCIe DMA channels: at least {} are "
+                    "required.".format(len(capture["inputs"]), pcie_dmas, len(capture["inputs"])))
+        if pcie_dmas is None:
+            pcie_dmas = 1
+
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPCIEPHY(platform, platform.request("pcie_x4"),
-                speed      = "gen3",
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
             # False Paths (FIXME: Improve integration).
             platform.toolchain.pre_placement_commands.append("set_false_path -from [get_clocks sys_clk] -to [get_clocks pcie_clk_1]")
             platform.toolchain.pre_placement_commands.append("set_false_path -from [get_clocks pcie_clk_1] -to [get_clocks sys_clk]")
 
+        # HDMI Capture -----------------------------------------------------------------------------
+        if with_hdmi_capture:
+            sources = []
+            if capture["source"] == "hdmi":
+                # GTH reference clock (from the SI5338A) not documented yet: provided by the platform
+                # as hdmi_refclk when available.
+                try:
+                    refclk_pads = platform.request("hdmi_refclk")
+                except ConstraintError:
+                    raise ValueError("Capture: no hdmi_refclk resource on the platform (GTH reference "
+                        "clock), use --hdmi-capture-source=pattern.")
+                refclk = Signal()
+                self.specials += Instance("IBUFDS_GTE3",
+                    i_CEB = 0,
+                    i_I   = refclk_pads.p,
+                    i_IB  = refclk_pads.n,
+                    o_O   = refclk)
+                for n in capture["inputs"]:
+                    sources.append(HDMIRXGTHPHY(platform.request("hdmi_in", n),
+                        refclk              = refclk,
+                        refclk_freq         = 148.5e6,
+                        sys_clk_freq        = sys_clk_freq,
+                        timings             = capture["timings"],
+                        clock_domain_prefix = "hdmi_in{}".format(n)))
+            else:
+                for n in capture["inputs"]:
+                    sources.append(VideoPatternSource(capture["timings"], sys_clk_freq))
+            add_video_capture(self, sources,
+                timings = capture["timings"],
+                nframes = capture["frames"],
+                dmas    = [getattr(self, "pcie_dma{}".format(i)) for i in range(len(sources))] if with_pcie else [])
+
 # Build --------------------------------------------------------------------------------------------
 
 def main():
@@ -108,13 +173,23 @@ def main():
     parser.add_argument("--sys-clk-freq", default=200e6,       help="System clock frequency (default: 200MHz)")
     parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver")
+    parser.add_argument("--ddram-width",  default=None, type=int, choices=[32, 64], help="DDR3 data width (default: 32, 64 with HDMI capture)")
+    parser.add_argument("--with-hdmi-capture", action="store_true", help="Enable HDMI capture (DRAM rings, PCIe DMA, pattern source: HDMI RX not wired yet)")
+    capture_args(parser)
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq   = int(float(args.sys_clk_freq)),
         with_pcie      = args.with_pcie,
+        with_hdmi_capture = args.with_hdmi_capture,
+        ddram_width    = args.ddram_width,
+        **capture_argdict(args),
+        **pcie_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
@@ -27,6 +27,9 @@ from litedram.phy import s7ddrphy
 
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -81,7 +84,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41K128M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
@@ -92,7 +95,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Jtagbone ---------------------------------------------------------------------------------
         if with_jtagbone:
@@ -139,6 +143,8 @@ def main():
     parser.add_argument("--with-pmod-gpio",      action="store_true",              help="Enable GPIOs through PMOD") # FIXME: Temporary test.
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -156,6 +162,8 @@ def main():
         with_jtagbone  = args.with_jtagbone,
         with_spi_flash = args.with_spi_flash,
         with_pmod_gpio = args.with_pmod_gpio,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     if args.sdcard_adapter == "numato":
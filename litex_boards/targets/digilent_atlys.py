@@ -27,6 +27,9 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT47H64M16
 from litedram.phy import s6ddrphy
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -177,7 +180,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT47H64M16(sys_clk_freq, "1:2"),
-                l2_cache_size = kwargs.get("l2_size", 8192),
+                **l2_cache_params(kwargs, self.ddrphy),
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
@@ -190,7 +193,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
             self.ethphy.crg.cd_eth_rx.clk.attr.add("keep")
             self.ethphy.crg.cd_eth_tx.clk.attr.add("keep")
             self.platform.add_platform_command("""
@@ -218,9 +222,11 @@ def main():
 
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
-    soc = BaseSoC(**soc_core_argdict(args))
+    soc = BaseSoC(**etherbone_argdict(args), **l2_cache_argdict(args), **soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args), )
     builder.build(run=args.build)
 
@@ -28,11 +28,14 @@ from litex.soc.integration.soc import colorer
 from litex.soc.cores.video import VideoVGAPHY
 from liteeth.phy.rmii import LiteEthPHYRMII
 
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+from litex_boards.soc.video import video_args, video_argdict, video_params
+
 
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq):
+    def __init__(self, platform, sys_clk_freq, pix_clk=40e6):
         self.rst = Signal()
         self.clock_domains.cd_sys       = ClockDomain()
         self.clock_domains.cd_sys2x     = ClockDomain(reset_less=True)
@@ -50,7 +53,7 @@ class _CRG(Module):
         pll.create_clkout(self.cd_sys2x_dqs, 2*sys_clk_freq, phase=90)
         pll.create_clkout(self.cd_idelay,    200e6)
         pll.create_clkout(self.cd_eth,       50e6)
-        pll.create_clkout(self.cd_vga,       40e6)
+        pll.create_clkout(self.cd_vga,       pix_clk)
         platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
         self.submodules.idelayctrl = S7IDELAYCTRL(self.cd_idelay)
@@ -176,7 +179,8 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq)
+        video = video_params(kwargs, timings="800x600@60Hz", framebuffer=with_video_framebuffer)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, pix_clk=video["pix_clk"])
 
         # Cellular RAM -------------------------------------------------------------------------------
         addCellularRAM(self,platform,"main_ram",0x40000000)        
@@ -189,15 +193,17 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoVGAPHY(platform.request("vga"), clock_domain="vga")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="vga")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="vga",
+                    format = video["format"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -221,8 +227,10 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (VGA)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (VGA)")
+    video_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -231,6 +239,8 @@ def main():
         with_etherbone         = args.with_etherbone,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **etherbone_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -25,10 +25,14 @@ from litedram.phy import s7ddrphy
 
 from liteeth.phy.s7rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sata import sata_args, sata_argdict, sata_params, add_sata_ports
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, toolchain, with_video_pll=False):
+    def __init__(self, platform, sys_clk_freq, toolchain, with_video_pll=False, pix_clk=40e6):
         self.rst = Signal()
         self.clock_domains.cd_sys       = ClockDomain()
         self.clock_domains.cd_sys4x     = ClockDomain(reset_less=True)
@@ -65,8 +69,8 @@ class _CRG(Module):
             self.submodules.video_pll = video_pll = S7MMCM(speedgrade=-1)
             video_pll.reset.eq(~rst_n | self.rst)
             video_pll.register_clkin(clk100, 100e6)
-            video_pll.create_clkout(self.cd_hdmi,   40e6)
-            video_pll.create_clkout(self.cd_hdmi5x, 5*40e6)
+            video_pll.create_clkout(self.cd_hdmi,   pix_clk)
+            video_pll.create_clkout(self.cd_hdmi5x, 5*pix_clk)
 
 # BaseSoC ------------------------------------------------------------------------------------------
 
@@ -83,8 +87,12 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
+        video = video_params(kwargs, timings="800x600@60Hz",
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41K256M16, "1:4", databits=16),
+            framebuffer     = with_video_framebuffer)
         with_video_pll = (with_video_terminal or with_video_framebuffer)
-        self.submodules.crg = _CRG(platform, sys_clk_freq, toolchain, with_video_pll=with_video_pll)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, toolchain, with_video_pll=with_video_pll,
+            pix_clk = video["pix_clk"])
 
         # DDR3 SDRAM -------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
@@ -95,7 +103,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41K256M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet ---------------------------------------------------------------------------------
@@ -108,7 +116,9 @@ class BaseSoC(SoCCore):
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
             from litex.build.generic_platform import Subsignal, Pins
-            from litesata.phy import LiteSATAPHY
+
+            # Parameters
+            sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=1)
 
             # IOs
             _sata_io = [
@@ -124,23 +134,21 @@ class BaseSoC(SoCCore):
             ]
             platform.add_extension(_sata_io)
 
-            # PHY
-            self.submodules.sata_phy = LiteSATAPHY(platform.device,
-                pads       = platform.request("fmc2sata"),
-                gen        = "gen2",
-                clk_freq   = sys_clk_freq,
-                data_width = 16)
-
-            # Core
-            self.add_sata(phy=self.sata_phy, mode="read+write")
+            # PHYs/Cores
+            add_sata_ports(self, [platform.request("fmc2sata", n) for n in sata["ports"]],
+                gen        = sata["gen"],
+                data_width = sata["data_width"],
+                striping   = sata["striping"],
+                dma        = sata["dma"])
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoS7HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="800x600@60Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="hdmi",
+                    format = video["format"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -169,8 +177,11 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
+    video_args(parser)
+    sata_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -182,6 +193,9 @@ def main():
         vadj                   = args.vadj,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **sata_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -23,6 +23,8 @@ from litex.soc.interconnect import axi
 
 from liteeth.phy.trionrgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -101,7 +103,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, software_debug=False)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
 
             # FIXME: Avoid this.
             platform.toolchain.excluded_ios.append(platform.lookup_request("eth_clocks").tx)
@@ -354,6 +357,7 @@ def main():
     parser.add_argument("--eth-phy",         default=0, type=int,              help="Ethernet PHY: 0 (default) or 1")
     builder_args(parser)
     soc_core_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -363,6 +367,7 @@ def main():
         with_etherbone = args.with_etherbone,
         eth_ip         = args.eth_ip,
         eth_phy        = args.eth_phy,
+        **etherbone_argdict(args),
         **soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args))
     builder.build(run=args.build)
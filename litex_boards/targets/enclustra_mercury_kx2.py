@@ -21,6 +21,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import H5TC4G63CFR
 from litedram.phy import s7ddrphy
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -67,7 +69,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = H5TC4G63CFR(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -85,10 +87,12 @@ def main():
     parser.add_argument("--sys-clk-freq", default=100e6,       help="System clock frequency (default: 125MHz)")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -22,6 +22,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT40A256M16
 from litedram.phy import usddrphy
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -75,7 +77,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT40A256M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -93,10 +95,12 @@ def main():
     parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency (default: 125MHz)")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
          sys_clk_freq = int(float(args.sys_clk_freq)),
+         **l2_cache_argdict(args),
          **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -41,6 +41,8 @@ from litex.soc.cores.clock import *
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(Module):
@@ -63,7 +65,8 @@ class CRG(Module):
 # BaseSoC -----------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False, with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_pcie=False, with_led_chaser=True,
+                 pcie_lanes=2, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = fairwaves_xtrx.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -79,10 +82,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x2"),
-                data_width = 64,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
             # ICAP (For FPGA reload over PCIe).
             from litex.soc.cores.icap import ICAP
@@ -113,6 +117,7 @@ def main():
     parser.add_argument("--sys-clk-freq",    default=125e6,       help="System clock frequency (default: 125MHz)")
     parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver")
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
@@ -120,6 +125,7 @@ def main():
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
         with_pcie    = args.with_pcie,
+        **pcie_argdict(args),
         **soc_core_argdict(args)
     )
     builder  = Builder(soc, **builder_argdict(args))
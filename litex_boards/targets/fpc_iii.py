@@ -26,6 +26,9 @@ from litedram.phy import ECP5DDRPHY
 
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -109,7 +112,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = IS43TR16256A(sys_clk_freq, "1:2"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
         self.comb += platform.request("dram_vtt_en").eq(0 if self.integrated_main_ram_size else 1)
 
@@ -121,7 +124,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -145,6 +149,8 @@ def main():
     sdopts.add_argument("--with-sdcard",     action="store_true", help="Enable SDCard support")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -152,6 +158,8 @@ def main():
         sys_clk_freq = int(float(args.sys_clk_freq)),
         with_ethernet = args.with_ethernet,
         with_etherbone = args.with_etherbone,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args))
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
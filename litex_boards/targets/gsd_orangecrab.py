@@ -7,7 +7,6 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
-import sys
 import argparse
 
 from migen import *
@@ -26,6 +25,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import MT41K64M16, MT41K128M16, MT41K256M16, MT41K512M16
 from litedram.phy import ECP5DDRPHY
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ---------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -153,9 +154,9 @@ class BaseSoC(SoCCore):
         # Serial -----------------------------------------------------------------------------------
         if kwargs["uart_name"] in ["serial", "usb_acm"]:
             kwargs["uart_name"] = "usb_acm"
-            # Defaults to USB ACM through ValentyUSB.
-            os.system("git clone https://github.com/litex-hub/valentyusb -b hw_cdc_eptri")
-            sys.path.append("valentyusb")
+            # Defaults to USB ACM through ValentyUSB (from the provision cache).
+            from litex_boards.tools.provision import provision_python_path
+            provision_python_path("valentyusb")
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -193,7 +194,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = sdram_module(sys_clk_freq, "1:2"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -216,6 +217,7 @@ def main():
     parser.add_argument("--with-spi-sdcard", action="store_true",  help="Enable SPI-mode SDCard support")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -225,6 +227,7 @@ def main():
         device       = args.device,
         sdram_device = args.sdram_device,
         sys_clk_freq = int(float(args.sys_clk_freq)),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args))
     if args.with_spi_sdcard:
         soc.add_spi_sdcard()
@@ -30,6 +30,8 @@ from litedram import modules as litedram_modules
 from litedram.phy import GENSDRPHY
 from litedram.modules import AS4C32M8
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -75,7 +77,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = AS4C32M8(sys_clk_freq, "1:1"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.sdrphy)
             )
 
 # Build --------------------------------------------------------------------------------------------
@@ -87,12 +89,14 @@ def main():
     parser.add_argument("--sys-clk-freq", default=48e6,        help="System clock frequency (default: 48MHz)")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         toolchain    = args.toolchain,
         sys_clk_freq = int(float(args.sys_clk_freq)),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args))
     builder_kargs = trellis_argdict(args) if args.toolchain == "trellis" else {}
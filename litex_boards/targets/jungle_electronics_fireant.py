@@ -106,6 +106,7 @@ def main():
     parser.add_argument("--build", action="store_true", help="Build bitstream")
     parser.add_argument("--load",  action="store_true", help="Load bitstream")
     parser.add_argument("--flash", action="store_true", help="Flash Bitstream")
+    parser.add_argument("--flash-diff", action="store_true", help="Only flash the sectors changed since the last flash of the board (with --flash)")
     parser.add_argument("--sys-clk-freq",      default=33.333e6, help="System clock frequency (default: 33.333MHz)")
     parser.add_argument("--bios-flash-offset", default=0x40000,  help="BIOS offset in SPI Flash (default: 0x40000)")
 
@@ -125,9 +126,15 @@ def main():
         prog.load_bitstream(os.path.join(builder.gateware_dir, f"{soc.build_name}.hex"))
 
     if args.flash:
+        from litex_boards.tools.flash_image import FlashImage, FlashState, board_id
+        image = FlashImage(flash_size=1*mB) # W25Q80BV.
+        image.add("bitstream", 0, os.path.join(builder.gateware_dir, f"{soc.build_name}.hex"),
+            max_size = args.bios_flash_offset)
+        image.add("bios", args.bios_flash_offset, os.path.join(builder.software_dir, "bios/bios.bin"))
         prog = soc.platform.create_programmer()
-        prog.flash(0, os.path.join(builder.gateware_dir, f"{soc.build_name}.hex"))
-        prog.flash(args.bios_flash_offset, os.path.join(builder.software_dir, "bios/bios.bin"))
+        image.flash(prog, os.path.join(builder.output_dir, "image.hex"),
+            state = FlashState(soc.build_name, board=board_id(prog)),
+            diff  = args.flash_diff)
 
 if __name__ == "__main__":
     main()
@@ -8,8 +8,6 @@
 # Copyright (c) 2020 Florent Kermarrec <florent@enjoy-digital.fr>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import os
-import sys
 import argparse
 
 from migen import *
@@ -82,9 +80,9 @@ class BaseSoC(SoCCore):
         kwargs["cpu_reset_address"] = self.mem_map["spiflash"] + bios_flash_offset
 
         # Serial -----------------------------------------------------------------------------------
-        # FIXME: do proper install of ValentyUSB.
-        os.system("git clone https://github.com/litex-hub/valentyusb -b hw_cdc_eptri")
-        sys.path.append("valentyusb")
+        # ValentyUSB (from the provision cache).
+        from litex_boards.tools.provision import provision_python_path
+        provision_python_path("valentyusb")
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -140,29 +138,14 @@ class BaseSoC(SoCCore):
 
 def flash(build_dir, build_name, bios_flash_offset):
     from litex.build.dfu import DFUProg
-    prog = DFUProg(vid="1209", pid="5bf0")
-    bitstream = open(f"{build_dir}/gateware/{build_name}.bin",  "rb")
-    bios      = open(f"{build_dir}/software/bios/bios.bin", "rb")
-    image     = open(f"{build_dir}/image.bin", "wb")
-    # Copy bitstream at 0.
+    from litex_boards.tools.flash_image import FlashImage
+    prog  = DFUProg(vid="1209", pid="5bf0")
+    # DFU region of the 2MB SPI Flash (after the bootloader), image offsets are relative to it.
+    image = FlashImage(flash_size=2*mB - 0x40000)
     assert bios_flash_offset >= 128*kB
-    for i in range(0, bios_flash_offset):
-        b = bitstream.read(1)
-        if not b:
-            image.write(0xff.to_bytes(1, "big"))
-        else:
-            image.write(b)
-    # Copy bios at bios_flash_offset.
-    for i in range(0, 32*kB):
-        b = bios.read(1)
-        if not b:
-            image.write(0xff.to_bytes(1, "big"))
-        else:
-            image.write(b)
-    bitstream.close()
-    bios.close()
-    image.close()
-    prog.load_bitstream(f"{build_dir}/image.bin")
+    image.add("bitstream", 0,                 f"{build_dir}/gateware/{build_name}.bin", max_size=bios_flash_offset)
+    image.add("bios",      bios_flash_offset, f"{build_dir}/software/bios/bios.bin")
+    prog.load_bitstream(image.write(f"{build_dir}/image.bin"))
 
 # Build --------------------------------------------------------------------------------------------
 
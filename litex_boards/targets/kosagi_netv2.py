@@ -29,6 +29,9 @@ from liteeth.phy.rmii import LiteEthPHYRMII
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -62,7 +65,8 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, variant="a7-35", sys_clk_freq=int(100e6), with_pcie=False,
-                 with_ethernet=False, with_led_chaser=True, **kwargs):
+                 with_ethernet=False, with_led_chaser=True,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = netv2.Platform(variant=variant)
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -83,7 +87,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = K4B2G1646F(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet ---------------------------------------------------------------------------------
@@ -95,10 +99,11 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -121,8 +126,10 @@ def main():
     sdopts.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support")
     sdopts.add_argument("--with-sdcard",     action="store_true", help="Enable SDCard support")
 
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -130,6 +137,8 @@ def main():
         sys_clk_freq  = int(float(args.sys_clk_freq)),
         with_ethernet = args.with_ethernet,
         with_pcie     = args.with_pcie,
+        **pcie_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -12,8 +12,6 @@ import os
 import sys
 import argparse
 
-target="lattice_ice40up5k_evn"
-
 from migen import *
 from migen.genlib.resetsync import AsyncResetSynchronizer
 
@@ -27,6 +25,8 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.tools.flash_image import FlashImage, FlashState, board_id
+
 kB = 1024
 mB = 1024*kB
 
@@ -117,31 +117,13 @@ class BaseSoC(SoCCore):
 
 # Flash --------------------------------------------------------------------------------------------
 
-def flash(bios_flash_offset):
-    from litex.build.dfu import DFUProg
-    prog = IceStormProgrammer()
-    bitstream  = open("build/"+target+"/gateware/"+target+".bin",  "rb")
-    bios       = open("build/"+target+"/software/bios/bios.bin", "rb")
-    image      = open("build/"+target+"/image.bin", "wb")
-    # Copy bitstream at 0x00000000
-    for i in range(0x00000000, 0x0020000):
-        b = bitstream.read(1)
-        if not b:
-            image.write(0xff.to_bytes(1, "big"))
-        else:
-            image.write(b)
-    # Copy bios at 0x00020000
-    for i in range(0x00000000, 0x00010000):
-        b = bios.read(1)
-        if not b:
-            image.write(0xff.to_bytes(1, "big"))
-        else:
-            image.write(b)
-    bitstream.close()
-    bios.close()
-    image.close()
+def flash(build_dir, build_name, bios_flash_offset, diff=False):
+    prog  = IceStormProgrammer()
+    image = FlashImage(flash_size=4*mB) # N25Q032A.
+    image.add("bitstream", 0x00000000,        f"{build_dir}/gateware/{build_name}.bin", max_size=bios_flash_offset)
+    image.add("bios",      bios_flash_offset, f"{build_dir}/software/bios/bios.bin")
     print("Flashing bitstream (+bios)")
-    prog.flash(0x0, "build/"+target+"/image.bin")
+    image.flash(prog, f"{build_dir}/image.bin", state=FlashState(build_name, board=board_id(prog)), diff=diff)
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -151,6 +133,7 @@ def main():
     parser.add_argument("--sys-clk-freq",      default=12e6,        help="System clock frequency (default: 12MHz)")
     parser.add_argument("--bios-flash-offset", default=0x20000,     help="BIOS offset in SPI Flash (default: 0x20000)")
     parser.add_argument("--flash",             action="store_true", help="Flash Bitstream")
+    parser.add_argument("--flash-diff",        action="store_true", help="Only flash the sectors changed since the last flash of the board (with --flash)")
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
@@ -164,7 +147,7 @@ def main():
     builder.build(run=args.build)
 
     if args.flash:
-        flash(args.bios_flash_offset)
+        flash(builder.output_dir, soc.build_name, args.bios_flash_offset, args.flash_diff)
 
 if __name__ == "__main__":
     main()
@@ -24,6 +24,8 @@ from litex.soc.cores.bitbang import I2CMaster
 
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -97,7 +99,8 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy)
+                add_etherbone(self, phy=self.ethphy,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal:
@@ -145,6 +148,7 @@ def main():
 
     builder_args(parser)
     soc_core_args(parser)
+    etherbone_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -156,6 +160,7 @@ def main():
         with_video_terminal = args.with_video_terminal,
         with_lcd            = args.with_lcd,
         with_ws2812         = args.with_ws2812,
+        **etherbone_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
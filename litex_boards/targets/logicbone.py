@@ -7,7 +7,6 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import os
-import sys
 import argparse
 from migen import *
 from migen.genlib.resetsync import AsyncResetSynchronizer
@@ -25,6 +24,8 @@ from litedram.modules import MT41K512M16
 from litedram.phy import ECP5DDRPHY
 from liteeth.phy.ecp5rgmii import LiteEthPHYRGMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # _CRG ---------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -101,9 +102,9 @@ class BaseSoC(SoCCore):
 
         # Serial -----------------------------------------------------------------------------------
         if kwargs["uart_name"] == "usb_acm":
-            # FIXME: do proper install of ValentyUSB.
-            os.system("git clone https://github.com/litex-hub/valentyusb -b hw_cdc_eptri")
-            sys.path.append("valentyusb")
+            # ValentyUSB (from the provision cache).
+            from litex_boards.tools.provision import provision_python_path
+            provision_python_path("valentyusb")
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -131,7 +132,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = sdram_module(sys_clk_freq, "1:2"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet ---------------------------------------------------------------------------------
@@ -162,6 +163,7 @@ def main():
     parser.add_argument("--with-sdcard",    action="store_true",   help="Enable SDCard support")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     trellis_args(parser)
     args = parser.parse_args()
 
@@ -171,6 +173,7 @@ def main():
         sys_clk_freq  = int(float(args.sys_clk_freq)),
         sdram_device  = args.sdram_device,
         with_ethernet = args.with_ethernet,
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_sdcard:
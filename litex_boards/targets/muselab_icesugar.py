@@ -104,11 +104,14 @@ class BaseSoC(SoCCore):
 
 # Flash --------------------------------------------------------------------------------------------
 
-def flash(bios_flash_offset):
+def flash(build_dir, build_name, bios_flash_offset, diff=False):
     from litex.build.lattice.programmer import IceSugarProgrammer
-    prog = IceSugarProgrammer()
-    prog.flash(bios_flash_offset, "build/muselab_icesugar/software/bios/bios.bin")
-    prog.flash(0x00000000,        "build/muselab_icesugar/gateware/muselab_icesugar.bin")
+    from litex_boards.tools.flash_image import FlashImage, FlashState, board_id
+    prog  = IceSugarProgrammer()
+    image = FlashImage(flash_size=8*mB) # W25Q64FV.
+    image.add("bitstream", 0x00000000,        f"{build_dir}/gateware/{build_name}.bin", max_size=bios_flash_offset)
+    image.add("bios",      bios_flash_offset, f"{build_dir}/software/bios/bios.bin")
+    image.flash(prog, f"{build_dir}/image.bin", state=FlashState(build_name, board=board_id(prog)), diff=diff)
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -117,6 +120,7 @@ def main():
     parser.add_argument("--build",               action="store_true", help="Build bitstream")
     parser.add_argument("--load",                action="store_true", help="Load bitstream")
     parser.add_argument("--flash",               action="store_true", help="Flash Bitstream")
+    parser.add_argument("--flash-diff",          action="store_true", help="Only flash the sectors changed since the last flash of the board (with --flash)")
     parser.add_argument("--sys-clk-freq",        default=24e6,        help="System clock frequency (default: 24MHz)")
     parser.add_argument("--bios-flash-offset",   default=0x40000,     help="BIOS offset in SPI Flash (default: 0x40000)")
     builder_args(parser)
@@ -136,7 +140,7 @@ def main():
         prog.load_bitstream(os.path.join(builder.gateware_dir, soc.build_name + ".bin"))
 
     if args.flash:
-        flash(args.bios_flash_offset)
+        flash(builder.output_dir, soc.build_name, args.bios_flash_offset, args.flash_diff)
 
 if __name__ == "__main__":
     main()
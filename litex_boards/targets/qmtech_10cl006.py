@@ -27,6 +27,8 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 from litex.soc.cores.video import VideoVGAPHY
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -95,7 +97,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = W9825G6KH6(sys_clk_freq, sdram_rate),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.sdrphy)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -121,6 +123,7 @@ def main():
 
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -129,6 +132,7 @@ def main():
         ident_version          = args.no_ident_version,
         with_spi_flash         = args.with_spi_flash,
         sdram_rate             = args.sdram_rate,
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
 
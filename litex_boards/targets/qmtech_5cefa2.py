@@ -28,10 +28,14 @@ from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 from litex.soc.cores.video import VideoVGAPHY
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, with_ethernet, with_vga, sdram_rate="1:1"):
+    def __init__(self, platform, sys_clk_freq, with_ethernet, with_vga, sdram_rate="1:1", pix_clk=40e6):
         self.rst = Signal()
         self.clock_domains.cd_sys          = ClockDomain()
 
@@ -68,7 +72,7 @@ class _CRG(Module):
         if with_ethernet:
             pll.create_clkout(self.cd_eth,   25e6)
         if with_vga:
-            pll.create_clkout(self.cd_vga,   40e6)
+            pll.create_clkout(self.cd_vga,   pix_clk)
 
         # SDRAM clock
         sdram_clk = ClockSignal("sys2x_ps" if sdram_rate == "1:2" else "sys_ps")
@@ -90,10 +94,14 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
+        video = video_params(kwargs, timings="800x600@60Hz",
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, W9825G6KH6, sdram_rate, databits=16),
+            framebuffer     = with_video_framebuffer)
         self.submodules.crg = _CRG(platform,
                                    sys_clk_freq, with_ethernet or with_etherbone,
                                    with_video_terminal or with_video_framebuffer,
-                                   sdram_rate=sdram_rate)
+                                   sdram_rate=sdram_rate,
+                                   pix_clk=video["pix_clk"])
 
         # SDR SDRAM --------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
@@ -102,7 +110,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = W9825G6KH6(sys_clk_freq, sdram_rate),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.sdrphy)
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
@@ -113,15 +121,17 @@ class BaseSoC(SoCCore):
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy, dynamic_ip=eth_dynamic_ip)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoVGAPHY(platform.request("vga"), clock_domain="vga")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="vga")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="800x600@60Hz", clock_domain="vga")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="vga",
+                    format = video["format"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -151,9 +161,12 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (VGA)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (VGA)")
+    video_args(parser)
 
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -166,8 +179,11 @@ def main():
         ident_version          = args.no_ident_version,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
         with_spi_flash         = args.with_spi_flash,
         sdram_rate             = args.sdram_rate,
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
 
@@ -28,6 +28,8 @@ from litex.soc.cores.uart import UARTWishboneBridge
 from litedram.phy import GENSDRPHY
 from litedram.modules import MT48LC32M8
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 kB = 1024
 mB = 1024*kB
 
@@ -92,7 +94,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy                     = self.sdrphy,
                 module                  = MT48LC32M8(sys_clk_freq, "1:1"),
-                l2_cache_size           = kwargs.get("l2_size", 1024)
+                **l2_cache_params(kwargs, self.sdrphy, size=1024)
             )
 
         # SPI Flash --------------------------------------------------------------------------------
@@ -121,11 +123,13 @@ def main():
     parser.add_argument("--csr_csv",           default="build/csr.csv", help="csr.csv")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
          bios_flash_offset = args.bios_flash_offset,
          sys_clk_freq      = int(float(args.sys_clk_freq)),
+         **l2_cache_argdict(args),
          **soc_core_argdict(args)
     )
     builder = Builder(soc,  **builder_argdict(args))
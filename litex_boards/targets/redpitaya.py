@@ -10,18 +10,24 @@ import os
 import argparse
 
 from migen import *
+from migen.genlib.resetsync import AsyncResetSynchronizer
 
 from litex_boards.platforms import redpitaya
 from litex.build.xilinx.vivado import vivado_build_args, vivado_build_argdict
+from litex.build.io import DifferentialInput
 
 from litex.soc.interconnect import axi
 from litex.soc.interconnect import wishbone
+from litex.soc.interconnect import stream
 
 from litex.soc.cores.clock import *
 from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.soc.zynq import zynq_axi_args, zynq_axi_argdict, add_zynq_axi_dma
+from litex_boards.soc.zynq import generate_zynq_axi_software
+
 # CRG ----------------------------------------------------------------------------------------------
 
 
@@ -43,11 +49,48 @@ class _CRG(Module):
             pll.create_clkout(self.cd_sys,      sys_clk_freq)
             platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
 
+# ADC Capture --------------------------------------------------------------------------------------
+
+class _ADCCapture(Module):
+    """Capture the 2 ADC channels (MSB-aligned, A in [15:0], B in [31:16]) to a sys stream."""
+    def __init__(self, platform, pads, clk_pads, clk_freq):
+        self.source = stream.Endpoint([("data", 32)])
+        self.clock_domains.cd_adc = ClockDomain()
+
+        # # #
+
+        # ADC Clk (from the ADC's clock output).
+        self.specials += DifferentialInput(clk_pads.p, clk_pads.n, self.cd_adc.clk)
+        self.specials += AsyncResetSynchronizer(self.cd_adc, ResetSignal("sys"))
+        platform.add_period_constraint(self.cd_adc.clk, 1e9/clk_freq)
+
+        # Enable ADC's Duty Cycle Stabilizer.
+        self.comb += pads.cdcs.eq(1)
+
+        # Sample ADC data.
+        data = Signal(32)
+        self.sync.adc += [
+            data[0:16].eq( pads.data_a << (16 - len(pads.data_a))),
+            data[16:32].eq(pads.data_b << (16 - len(pads.data_b))),
+        ]
+
+        # Clock Domain Crossing (samples are dropped when the FIFO is full).
+        cdc = stream.AsyncFIFO([("data", 32)], depth=16)
+        cdc = ClockDomainsRenamer({"write": "adc", "read": "sys"})(cdc)
+        self.submodules += cdc
+        self.comb += [
+            cdc.sink.valid.eq(1),
+            cdc.sink.data.eq(data),
+            cdc.source.connect(self.source),
+        ]
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 
 class BaseSoC(SoCCore):
-    def __init__(self, board, sys_clk_freq=int(100e6), with_led_chaser=True, **kwargs):
+    def __init__(self, board, sys_clk_freq=int(100e6), with_led_chaser=True, with_adc_dma=False,
+        zynq_hp_ports=0, zynq_acp=False, zynq_dma_base=0x1e000000, zynq_dma_size=0x02000000,
+        **kwargs):
         platform = redpitaya.Platform(board)
 
         if kwargs["uart_name"] == "serial":
@@ -63,11 +106,9 @@ class BaseSoC(SoCCore):
 
         # Zynq7000 Integration ---------------------------------------------------------------------
         if kwargs.get("cpu_type", None) == "zynq7000":
-            # Get and set the pre-generated .xci FIXME: change location? add it to the repository?
-            os.system("wget https://kmf2.trabucayre.com/redpitaya_ps7.txt")
-            os.makedirs("xci", exist_ok=True)
-            os.system("cp redpitaya_ps7.txt xci/redpitaya_ps7.xci")
-            self.cpu.set_ps7_xci("xci/redpitaya_ps7.xci")
+            # Get and set the pre-generated .xci (from the provision cache).
+            from litex_boards.tools.provision import provision_ip
+            self.cpu.set_ps7_xci(provision_ip(self, "redpitaya_ps7_xci"))
 
             # Connect AXI GP0 to the SoC with base address of 0x43c00000 (default one)
             wb_gp0  = wishbone.Interface()
@@ -79,6 +120,23 @@ class BaseSoC(SoCCore):
             use_ps7_clk = True
             sys_clk_freq = 125e6
 
+        # Zynq7000 AXI HP/ACP DMAs -----------------------------------------------------------------
+        add_zynq_axi_dma(self, zynq_hp_ports, zynq_acp, zynq_dma_base, zynq_dma_size)
+
+        # ADC Capture (to PS DDR through AXI HP) ---------------------------------------------------
+        if with_adc_dma:
+            if not zynq_hp_ports:
+                raise ValueError("ADC DMA requires Zynq AXI HP ports (--zynq-hp-ports).")
+            self.submodules.adc = _ADCCapture(platform,
+                pads     = platform.request("adc"),
+                clk_pads = platform.request(platform.default_clk_name),
+                clk_freq = platform.default_clk_freq)
+            self.submodules.adc_converter = stream.Converter(32, 64)
+            self.comb += [
+                self.adc.source.connect(self.adc_converter.sink),
+                self.adc_converter.source.connect(self.zynq_hp_dma_writer.sink),
+            ]
+
         # CRG --------------------------------------------------------------------------------------
         self.submodules.crg = _CRG(platform, sys_clk_freq, use_ps7_clk)
 
@@ -97,19 +155,27 @@ def main():
     parser.add_argument("--load",         action="store_true", help="Load bitstream")
     parser.add_argument("--sys-clk-freq", default=100e6,       help="System clock frequency (default: 100MHz)")
     parser.add_argument("--board",        default="redpitaya14", help="Board type: redpitaya14 (default) or redpitaya16")
+    parser.add_argument("--with-adc-dma", action="store_true", help="Capture the ADC to PS DDR (through Zynq AXI HP DMA)")
+    parser.add_argument("--driver",       action="store_true", help="Generate Zynq AXI DMAs header/device-tree fragment")
     builder_args(parser)
     soc_core_args(parser)
+    zynq_axi_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         board = args.board,
         sys_clk_freq = int(float(args.sys_clk_freq)),
+        with_adc_dma = args.with_adc_dma,
+        **zynq_axi_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
     builder.build(**vivado_build_argdict(args), run=args.build)
 
+    if args.driver:
+        generate_zynq_axi_software(soc, os.path.join(builder.output_dir, "driver"))
+
     if args.load:
         prog = soc.platform.create_programmer()
         prog.load_bitstream(os.path.join(builder.gateware_dir, soc.build_name + ".bit"), device=1)
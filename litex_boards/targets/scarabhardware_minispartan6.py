@@ -28,10 +28,13 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import AS4C16M16
 from litedram.phy import GENSDRPHY, HalfRateGENSDRPHY
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
-    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1"):
+    def __init__(self, platform, sys_clk_freq, sdram_rate="1:1", pix_clk=24e6):
         self.rst = Signal()
         self.clock_domains.cd_sys    = ClockDomain()
         if sdram_rate == "1:2":
@@ -58,8 +61,8 @@ class _CRG(Module):
         else:
             pll.create_clkout(self.cd_sys_ps, sys_clk_freq, phase=90)
         #platform.add_false_path_constraints(self.cd_sys.clk, pll.clkin) # Ignore sys_clk to pll.clkin path created by SoC's rst.
-        pll.create_clkout(self.cd_hdmi,   1*24e6, margin=0)
-        pll.create_clkout(self.cd_hdmi5x, 5*24e6, margin=0)
+        pll.create_clkout(self.cd_hdmi,   1*pix_clk, margin=1e-2)
+        pll.create_clkout(self.cd_hdmi5x, 5*pix_clk, margin=1e-2)
 
         # SDRAM clock
         sdram_clk = ClockSignal("sys2x_ps" if sdram_rate == "1:2" else "sys_ps")
@@ -79,7 +82,10 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq, sdram_rate=sdram_rate)
+        video = video_params(kwargs, timings="640x480@75Hz", pix_clk=24e6,
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, AS4C16M16, sdram_rate, databits=16),
+            framebuffer     = with_video_framebuffer)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, sdram_rate=sdram_rate, pix_clk=video["pix_clk"])
 
         # SDR SDRAM --------------------------------------------------------------------------------
         if not self.integrated_main_ram_size:
@@ -88,17 +94,17 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy              = self.sdrphy,
                 module           = AS4C16M16(sys_clk_freq, sdram_rate),
-                l2_cache_size    = kwargs.get("l2_size", 8192),
-                l2_cache_reverse = False
+                **l2_cache_params(kwargs, self.sdrphy, reverse=False)
             )
 
         # Video ------------------------------------------------------------------------------------
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoS6HDMIPHY(platform.request("hdmi_out"), clock_domain="hdmi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings="640x480@75Hz", clock_domain="hdmi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="hdmi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings="640x480@75Hz", clock_domain="hdmi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="hdmi",
+                    format = video["format"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -117,8 +123,10 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
+    video_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -126,6 +134,8 @@ def main():
         sdram_rate   = args.sdram_rate,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
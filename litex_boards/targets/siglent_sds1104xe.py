@@ -36,6 +36,10 @@ from litedram.phy import s7ddrphy
 
 from liteeth.phy.mii import LiteEthPHYMII
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, UDPMemoryStreamer
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -90,8 +94,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy              = self.ddrphy,
                 module           = MT41K64M16(sys_clk_freq, "1:4"),
-                l2_cache_size    = kwargs.get("l2_size", 8192),
-                l2_cache_reverse = False,
+                **l2_cache_params(kwargs, self.ddrphy, reverse=False),
             )
 
         # Etherbone --------------------------------------------------------------------------------
@@ -133,9 +136,16 @@ class BaseSoC(SoCCore):
             self.add_constant("ETH_PHY_NO_RESET") # Disable reset from BIOS to avoid disabling Hardware Interface.
 
             # Etherbone
-            self.submodules.etherbone = LiteEthEtherbone(self.udp, 1234, mode="master")
+            eb_params = etherbone_params(kwargs, self.ethphy, data_widths=[8]) # Hybrid MAC: 8-bit only.
+            eb_kwargs = {"buffer_depth": eb_params["buffer_depth"]} if "buffer_depth" in eb_params else {}
+            self.submodules.etherbone = LiteEthEtherbone(self.udp, 1234, mode="master", **eb_kwargs)
             self.add_wb_master(self.etherbone.wishbone.bus)
 
+            # UDP Streamer
+            if eb_params.get("with_udp_streamer", False):
+                self.submodules.etherbone_udp_streamer = UDPMemoryStreamer(self.udp, eb_params["udp_streamer_port"])
+                self.add_wb_master(self.etherbone_udp_streamer.bus)
+
             # Timing constraints
             eth_rx_clk = self.ethphy.crg.cd_eth_rx.clk
             eth_tx_clk = self.ethphy.crg.cd_eth_tx.clk
@@ -155,12 +165,17 @@ class BaseSoC(SoCCore):
             "v_sync_offset" : 22,
             "v_sync_width"  : 1,
         })
+        # LCD Panel: only its own timings (pixel clock) are supported.
+        video = video_params(kwargs, timings=video_timings, pix_clk_range=(33.3e6, 33.3e6),
+            sdram_bandwidth = sdram_bandwidth(sys_clk_freq, MT41K64M16, "1:4", databits=16),
+            framebuffer     = with_video_framebuffer)
         if with_video_terminal or with_video_framebuffer:
             self.submodules.videophy = VideoVGAPHY(platform.request("lcd"), clock_domain="dvi")
             if with_video_terminal:
-                self.add_video_terminal(phy=self.videophy, timings=video_timings, clock_domain="dvi")
+                self.add_video_terminal(phy=self.videophy, timings=video["timings"], clock_domain="dvi")
             if with_video_framebuffer:
-                self.add_video_framebuffer(phy=self.videophy, timings=video_timings, clock_domain="dvi")
+                self.add_video_framebuffer(phy=self.videophy, timings=video["timings"], clock_domain="dvi",
+                    format = video["format"])
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -174,8 +189,11 @@ def main():
     viopts = parser.add_mutually_exclusive_group()
     viopts.add_argument("--with-video-terminal",    action="store_true", help="Enable Video Terminal (HDMI)")
     viopts.add_argument("--with-video-framebuffer", action="store_true", help="Enable Video Framebuffer (HDMI)")
+    video_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
@@ -185,6 +203,9 @@ def main():
         eth_ip         = args.eth_ip,
         with_video_terminal    = args.with_video_terminal,
         with_video_framebuffer = args.with_video_framebuffer,
+        **video_argdict(args),
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
 
@@ -20,6 +20,8 @@ from litex.soc.integration.builder import *
 
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.soc.pins import use_pin_index
+
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
@@ -60,7 +62,7 @@ def main():
     platform_kwargs = {}
     if args.toolchain is not None:
         platform_kwargs["toolchain"] = args.toolchain
-    platform = platform_module.Platform(**platform_kwargs)
+    platform = use_pin_index(platform_module.Platform(**platform_kwargs))
     soc = BaseSoC(platform,**soc_core_argdict(args))
     builder = Builder(soc, **builder_argdict(args))
     builder.build(run=args.build)
@@ -22,6 +22,12 @@
 # ./litepcie_util scratch_test
 # ./litepcie_util dma_test
 # ./litepcie_util uart_test
+#
+# PCIe x1 + SATA (on PCIe lanes 1-3) with direct PCIe <-> SATA/DDRAM DMAs:
+# ./sqrl_acorn.py --with-pcie --pcie-lanes=1 --pcie-dmas=2 --with-sata --sata-dma=pcie --with-ddram-dma --build --driver
+# cd build/<platform>/driver/user/bridge
+# make
+# ./litepcie_bridge_util list
 
 import os
 import argparse
@@ -44,6 +50,11 @@ from litedram.phy import s7ddrphy
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sata import sata_args, sata_argdict, sata_params, add_sata_ports
+from litex_boards.soc.pcie_bridge import add_pcie_sdram_dmas, generate_pcie_bridge_software
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class CRG(Module):
@@ -73,7 +84,8 @@ class CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, variant="cle-215+", sys_clk_freq=int(100e6), with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
+                 with_pcie=False, with_sata=False, with_ddram_dma=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = acorn.Platform(variant=variant)
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -95,15 +107,16 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT41K512M16(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
             # FIXME: Apply it to all targets (integrate it in LitePCIe?).
             platform.add_period_constraint(self.crg.cd_sys.clk, 1e9/sys_clk_freq)
             platform.toolchain.pre_placement_commands.add("set_clock_groups -group [get_clocks {sys_clk}] -group [get_clocks userclk2] -asynchronous", sys_clk=self.crg.cd_sys.clk)
@@ -126,7 +139,12 @@ class BaseSoC(SoCCore):
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
             from litex.build.generic_platform import Subsignal, Pins
-            from litesata.phy import LiteSATAPHY
+
+            # Parameters (With PCIe, PCIe x1 on lane 0 and SATA on lanes 1-3).
+            if with_pcie and pcie_lanes != 1:
+                raise ValueError("SATA: PCIe lanes shared with SATA, use --pcie-lanes=1.")
+            sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=3 if with_pcie else 4)
+            sata_first = 1 if with_pcie else 0
 
             # IOs
             _sata_io = [
@@ -137,6 +155,24 @@ class BaseSoC(SoCCore):
                     Subsignal("rx_p",  Pins("B10")),
                     Subsignal("rx_n",  Pins("A10")),
                 ),
+                ("pcie2sata", 1,
+                    Subsignal("tx_p",  Pins("B4")),
+                    Subsignal("tx_n",  Pins("A4")),
+                    Subsignal("rx_p",  Pins("B8")),
+                    Subsignal("rx_n",  Pins("A8")),
+                ),
+                ("pcie2sata", 2,
+                    Subsignal("tx_p",  Pins("D5")),
+                    Subsignal("tx_n",  Pins("C5")),
+                    Subsignal("rx_p",  Pins("D11")),
+                    Subsignal("rx_n",  Pins("C11")),
+                ),
+                ("pcie2sata", 3,
+                    Subsignal("tx_p",  Pins("D7")),
+                    Subsignal("tx_n",  Pins("C7")),
+                    Subsignal("rx_p",  Pins("D9")),
+                    Subsignal("rx_n",  Pins("C9")),
+                ),
             ]
             platform.add_extension(_sata_io)
 
@@ -146,16 +182,19 @@ class BaseSoC(SoCCore):
             sata_refclk = ClockSignal("sata_refclk")
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks REQP-49]")
 
-            # PHY
-            self.submodules.sata_phy = LiteSATAPHY(platform.device,
+            # PHYs/Cores
+            add_sata_ports(self, [platform.request("pcie2sata", sata_first + n) for n in sata["ports"]],
                 refclk     = sata_refclk,
-                pads       = platform.request("pcie2sata"),
-                gen        = "gen2",
-                clk_freq   = sys_clk_freq,
-                data_width = 16)
+                gen        = sata["gen"],
+                data_width = sata["data_width"],
+                striping   = sata["striping"],
+                dma        = sata["dma"])
 
-            # Core
-            self.add_sata(phy=self.sata_phy, mode="read+write")
+        # PCIe DMAs <-> DDR3 SDRAM -----------------------------------------------------------------
+        if with_ddram_dma:
+            if not (with_pcie and hasattr(self, "sdram")):
+                raise ValueError("DDRAM DMA requires --with-pcie and the DDR3 SDRAM.")
+            add_pcie_sdram_dmas(self, [self.sdram.crossbar])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -172,20 +211,27 @@ def main():
     parser.add_argument("--flash",           action="store_true", help="Flash bitstream")
     parser.add_argument("--variant",         default="cle-215+",  help="Board variant: cle-215+ (default), cle-215 or cle-101")
     parser.add_argument("--sys-clk-freq",    default=100e6,       help="System clock frequency (default: 100MHz)")
-    pcieopts = parser.add_mutually_exclusive_group()
-    pcieopts.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support")
+    parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver")
     parser.add_argument("--with-spi-sdcard", action="store_true", help="Enable SPI-mode SDCard support (requires SDCard adapter on P2)")
-    pcieopts.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over PCIe2SATA)")
+    parser.add_argument("--with-sata",       action="store_true", help="Enable SATA support (over PCIe2SATA, lanes 1-3 with PCIe x1)")
+    parser.add_argument("--with-ddram-dma",  action="store_true", help="Connect a PCIe DMA channel to the DDR3 SDRAM")
+    pcie_args(parser)
+    sata_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        variant      = args.variant,
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
-        with_sata    = args.with_sata,
+        variant        = args.variant,
+        sys_clk_freq   = int(float(args.sys_clk_freq)),
+        with_pcie      = args.with_pcie,
+        with_sata      = args.with_sata,
+        with_ddram_dma = args.with_ddram_dma,
+        **pcie_argdict(args),
+        **sata_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     if args.with_spi_sdcard:
@@ -196,6 +242,7 @@ def main():
 
     if args.driver:
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+        generate_pcie_bridge_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
         prog = soc.platform.create_programmer()
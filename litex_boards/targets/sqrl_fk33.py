@@ -25,6 +25,8 @@ from litepcie.frontend.dma import LitePCIeDMA
 from litepcie.frontend.wishbone import LitePCIeWishboneBridge
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -43,7 +45,8 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
         platform = fk33.Platform()
 
         # SoCCore ----------------------------------------------------------------------------------
@@ -61,9 +64,9 @@ class BaseSoC(SoCCore):
         if with_pcie:
             assert self.csr_data_width == 32
             # PHY
-            self.submodules.pcie_phy = USPHBMPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
+            self.submodules.pcie_phy = USPHBMPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPHBMPCIEPHY, pcie_lanes, pcie_speed))
 
             # Endpoint
             self.submodules.pcie_endpoint = LitePCIeEndpoint(self.pcie_phy, max_pending_requests=8)
@@ -73,20 +76,23 @@ class BaseSoC(SoCCore):
                 base_address = self.mem_map["csr"])
             self.add_wb_master(self.pcie_bridge.wishbone)
 
-            # DMA0
-            self.submodules.pcie_dma0 = LitePCIeDMA(self.pcie_phy, self.pcie_endpoint,
-                with_buffering = True, buffering_depth=1024,
-                with_loopback  = True)
+            # DMAs
+            dma_params = pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth)
+            self.interrupts = {}
+            for i in range(dma_params["ndmas"]):
+                pcie_dma = LitePCIeDMA(self.pcie_phy, self.pcie_endpoint,
+                    with_buffering  = dma_params["with_dma_buffering"],
+                    buffering_depth = dma_params["dma_buffering_depth"],
+                    with_loopback   = True)
+                setattr(self.submodules, f"pcie_dma{i}", pcie_dma)
+                self.interrupts[f"PCIE_DMA{i}_WRITER"] = pcie_dma.writer.irq
+                self.interrupts[f"PCIE_DMA{i}_READER"] = pcie_dma.reader.irq
 
-            self.add_constant("DMA_CHANNELS", 1)
+            self.add_constant("DMA_CHANNELS", dma_params["ndmas"])
 
             # MSI
             self.submodules.pcie_msi = LitePCIeMSI()
             self.comb += self.pcie_msi.source.connect(self.pcie_phy.msi)
-            self.interrupts = {
-                "PCIE_DMA0_WRITER":    self.pcie_dma0.writer.irq,
-                "PCIE_DMA0_READER":    self.pcie_dma0.reader.irq,
-            }
             for i, (k, v) in enumerate(sorted(self.interrupts.items())):
                 self.comb += self.pcie_msi.irqs[i].eq(v)
                 self.add_constant(k + "_INTERRUPT", i)
@@ -106,6 +112,7 @@ def main():
     parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency (default: 125MHz)")
     parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver")
+    pcie_args(parser)
     builder_args(parser)
     soc_core_args(parser)
     args = parser.parse_args()
@@ -113,6 +120,7 @@ def main():
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
         with_pcie=args.with_pcie,
+        **pcie_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
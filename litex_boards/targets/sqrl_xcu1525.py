@@ -25,6 +25,15 @@ from litedram.phy import usddrphy
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sdram import sdram_channels_args, sdram_channels_argdict, sdram_channels_check
+from litex_boards.soc.sdram import add_sdram_channels
+from litex_boards.soc.pcie_bridge import add_pcie_sdram_dmas, generate_pcie_bridge_software
+from litex_boards.soc.sata import sata_args, sata_argdict, sata_params, add_sata_ports
+from litex_boards.soc.ethernet import eth_phy_args, eth_phy_argdict, etherbone_args, etherbone_argdict
+from litex_boards.soc.ethernet import etherbone_params, add_etherbone, USXXVEthernetPHY
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -58,8 +67,14 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(125e6), ddram_channel=0, with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
+                 with_pcie=False, with_sata=False,
+                 ddram_channels=None, ddram_mapping="consecutive", ddram_interleaving=4096, with_ddram_dma=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024,
+                 with_etherbone=False, eth_ip="192.168.1.50", eth_rate=10, eth_port=0, **kwargs):
         platform = xcu1525.Platform()
+        if ddram_channels is None:
+            ddram_channels = [ddram_channel]
+        sdram_channels_check(platform, ddram_channels)
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -68,45 +83,80 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channels[0])
 
         # DDR4 SDRAM -------------------------------------------------------------------------------
+        sdram_crossbars = []
         if not self.integrated_main_ram_size:
-            self.submodules.ddrphy = usddrphy.USPDDRPHY(
-                pads             = platform.request("ddram", ddram_channel),
+            ddrphys = [usddrphy.USPDDRPHY(
+                pads             = platform.request("ddram", n),
                 memtype          = "DDR4",
                 sys_clk_freq     = sys_clk_freq,
-                iodelay_clk_freq = 500e6)
-            self.add_sdram("sdram",
-                phy           = self.ddrphy,
-                module        = MT40A512M8(sys_clk_freq, "1:4"),
-                size          = 0x40000000,
-                l2_cache_size = kwargs.get("l2_size", 8192)
-            )
+                iodelay_clk_freq = 500e6) for n in ddram_channels]
+            self.submodules.ddrphy = ddrphys[0]
+            if len(ddrphys) == 1:
+                self.add_sdram("sdram",
+                    phy           = self.ddrphy,
+                    module        = MT40A512M8(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    **l2_cache_params(kwargs, self.ddrphy)
+                )
+                sdram_crossbars = [self.sdram.crossbar]
+            # One controller per channel, channels mapped in main_ram.
+            else:
+                sdram_crossbars = add_sdram_channels(self, ddrphys,
+                    module        = MT40A512M8(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    mapping       = ddram_mapping,
+                    interleaving  = ddram_interleaving,
+                    **l2_cache_params(kwargs, ddrphys[0])
+                )
             # Workadound for Vivado 2018.2 DRC, can be ignored and probably fixed on newer Vivado versions.
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks PDCN-2736]")
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPPCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
             from litex.build.generic_platform import Subsignal, Pins
-            from litesata.phy import LiteSATAPHY
+
+            # Parameters
+            sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=4)
 
             # IOs
             _sata_io = [
                 # SFP 2 SATA Adapter / https://shop.trenz-electronic.de/en/TE0424-01-SFP-2-SATA-Adapter
+                # (On QSFP28 0 lanes, with a QSFP28 to 4x SFP breakout for several ports).
                 ("qsfp2sata", 0,
                     Subsignal("tx_p", Pins("N9")),
                     Subsignal("tx_n", Pins("N8")),
                     Subsignal("rx_p", Pins("N4")),
                     Subsignal("rx_n", Pins("N3")),
                 ),
+                ("qsfp2sata", 1,
+                    Subsignal("tx_p", Pins("M7")),
+                    Subsignal("tx_n", Pins("M6")),
+                    Subsignal("rx_p", Pins("M2")),
+                    Subsignal("rx_n", Pins("M1")),
+                ),
+                ("qsfp2sata", 2,
+                    Subsignal("tx_p", Pins("L9")),
+                    Subsignal("tx_n", Pins("L8")),
+                    Subsignal("rx_p", Pins("L4")),
+                    Subsignal("rx_n", Pins("L3")),
+                ),
+                ("qsfp2sata", 3,
+                    Subsignal("tx_p", Pins("K7")),
+                    Subsignal("tx_n", Pins("K6")),
+                    Subsignal("rx_p", Pins("K2")),
+                    Subsignal("rx_n", Pins("K1")),
+                ),
             ]
             platform.add_extension(_sata_io)
 
@@ -115,16 +165,38 @@ class BaseSoC(SoCCore):
             self.crg.pll.create_clkout(self.cd_sata_refclk, 150e6)
             sata_refclk = ClockSignal("sata_refclk")
 
-            # PHY
-            self.submodules.sata_phy = LiteSATAPHY(platform.device,
+            # PHYs/Cores
+            add_sata_ports(self, [platform.request("qsfp2sata", n) for n in sata["ports"]],
                 refclk     = sata_refclk,
-                pads       = platform.request("qsfp2sata"),
-                gen        = "gen2",
-                clk_freq   = sys_clk_freq,
-                data_width = 16)
+                gen        = sata["gen"],
+                data_width = sata["data_width"],
+                striping   = sata["striping"],
+                dma        = sata["dma"],
+                crossbar   = sdram_crossbars[0] if not self.integrated_main_ram_size else None)
+
+        # PCIe DMAs <-> DDR4 SDRAM -----------------------------------------------------------------
+        # (After the SATA ones: next PCIe DMA N <-> DDR4 channel N).
+        if with_pcie and with_ddram_dma:
+            add_pcie_sdram_dmas(self, sdram_crossbars)
 
-            # Core
-            self.add_sata(phy=self.sata_phy, mode="read+write")
+        # Etherbone (10G/25G on QSFP28) ------------------------------------------------------------
+        if with_etherbone:
+            if with_sata and eth_port == 0:
+                raise ValueError("Etherbone: QSFP28 0 already used by SATA, use --eth-port=1.")
+            qsfp = platform.request("qsfp28", eth_port)
+            self.comb += [
+                qsfp.fs0.eq(0), # RefClk: 161.1328125MHz.
+                qsfp.fs1.eq(1),
+                qsfp.refclk_reset.eq(0),
+            ]
+            self.submodules.ethphy = USXXVEthernetPHY(platform,
+                pads         = qsfp,
+                refclk_pads  = qsfp,
+                refclk_freq  = 161.1328125e6,
+                sys_clk_freq = sys_clk_freq,
+                line_rate    = eth_rate)
+            add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                **etherbone_params(kwargs, self.ethphy))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -143,15 +215,31 @@ def main():
     parser.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",        action="store_true", help="Generate PCIe driver")
     parser.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over SFP2SATA)")
+    parser.add_argument("--with-etherbone", action="store_true", help="Enable Etherbone support (10G/25G on QSFP28)")
+    parser.add_argument("--eth-ip",         default="192.168.1.50", help="Etherbone IP address")
+    sdram_channels_args(parser)
+    pcie_args(parser)
+    eth_phy_args(parser, rates=[10, 25], ports=[0, 1])
+    sata_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq  = int(float(args.sys_clk_freq)),
-        ddram_channel = int(args.ddram_channel, 0),
-        with_pcie     = args.with_pcie,
-        with_sata     = args.with_sata,
+        sys_clk_freq   = int(float(args.sys_clk_freq)),
+        ddram_channel  = int(args.ddram_channel, 0),
+        with_pcie      = args.with_pcie,
+        with_sata      = args.with_sata,
+        with_etherbone = args.with_etherbone,
+        eth_ip         = args.eth_ip,
+        **sdram_channels_argdict(args),
+        **pcie_argdict(args),
+        **eth_phy_argdict(args),
+        **etherbone_argdict(args),
+        **sata_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
@@ -159,6 +247,7 @@ def main():
 
     if args.driver:
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+        generate_pcie_bridge_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
         prog = soc.platform.create_programmer()
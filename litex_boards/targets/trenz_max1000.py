@@ -21,6 +21,8 @@ from litex.soc.cores.led import LedChaser
 from litedram.modules import M12L64322A
 from litedram.phy import GENSDRPHY
 
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -68,7 +70,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.sdrphy,
                 module        = M12L64322A(sys_clk_freq, "1:1"), # Winbond W9864G6JT
-                l2_cache_size = kwargs.get("l2_size", 0)
+                **l2_cache_params(kwargs, self.sdrphy, size=0)
             )
 
         # Leds -------------------------------------------------------------------------------------
@@ -86,10 +88,12 @@ def main():
     parser.add_argument("--sys-clk-freq",  default=50e6,        help="System clock frequency (default: 50MHz)")
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq  = int(float(args.sys_clk_freq)),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
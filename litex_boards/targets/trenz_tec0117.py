@@ -125,7 +125,7 @@ class BaseSoC(SoCCore):
 
 # Flash --------------------------------------------------------------------------------------------
 
-def flash(bios_flash_offset):
+def flash(build_dir, bios_flash_offset, diff=False):
     # Create FTDI <--> SPI Flash proxy bitstream and load it.
     # -------------------------------------------------------
     platform = tec0117.Platform()
@@ -147,12 +147,27 @@ def flash(bios_flash_offset):
     from spiflash.serialflash import SerialFlashManager
     dev = SerialFlashManager.get_flash_device("ftdi://ftdi:2232/2")
     dev.TIMINGS["chip"] = (4, 60) # Chip is too slow
-    print("Erasing flash...")
-    dev.erase(0, -1)
-    with open("build/trenz_tec0117/software/bios/bios.bin", "rb") as f:
-        bios = f.read()
-    print("Programming flash...")
-    dev.write(bios_flash_offset, bios)
+    from litex_boards.tools.flash_image import FlashImage, sector_hashes, changed_sectors
+    image = FlashImage(flash_size=8*mB) # W74M64FV.
+    image.add("bios", bios_flash_offset, f"{build_dir}/software/bios/bios.bin")
+    data  = image.get_image()
+    if not diff:
+        print("Erasing flash...")
+        dev.erase(0, -1)
+        print("Programming flash...")
+        dev.write(0, data)
+        return
+
+    # Differential: Read back Flash and only erase/program the changed 4KB sectors.
+    sector_size = 4*kB
+    runs = changed_sectors(data, sector_size, sector_hashes(bytes(dev.read(0, len(data))), sector_size))
+    print(f"Programming {len(runs)} run(s) of changed sectors...")
+    for offset, length in runs:
+        dev.erase(offset, (length + sector_size - 1)//sector_size*sector_size)
+        dev.write(offset, data[offset:offset + length])
+    for offset, length in runs:
+        if sector_hashes(bytes(dev.read(offset, length)), length) != sector_hashes(data[offset:offset + length], length):
+            raise OSError(f"SPI Flash verification failed at 0x{offset:08x}.")
 
 # Build --------------------------------------------------------------------------------------------
 
@@ -162,6 +177,7 @@ def main():
     parser.add_argument("--load",              action="store_true", help="Load bitstream")
     parser.add_argument("--bios-flash-offset", default=0x0000,      help="BIOS offset in SPI Flash (0x00000 default)")
     parser.add_argument("--flash",             action="store_true", help="Flash Bitstream and BIOS")
+    parser.add_argument("--flash-diff",        action="store_true", help="Only flash what changed since the last flash of the board (with --flash)")
     parser.add_argument("--sys-clk-freq",      default=25e6,        help="System clock frequency (default: 25MHz)")
     sdopts = parser.add_mutually_exclusive_group()
     sdopts.add_argument("--with-spi-sdcard",     action="store_true", help="Enable SPI-mode SDCard support")
@@ -189,9 +205,16 @@ def main():
         prog.load_bitstream(os.path.join(builder.gateware_dir, "impl", "pnr", "project.fs"))
 
     if args.flash:
+        from litex_boards.tools.flash_image import FlashImage, FlashState, board_id
+        # Bitstream in internal Flash: only programmed as a whole (skipped if unchanged with --flash-diff).
+        bitstream = FlashImage()
+        bitstream.add("bitstream", 0, os.path.join(builder.gateware_dir, "impl", "pnr", "project.fs"))
         prog = soc.platform.create_programmer()
-        prog.flash(0, os.path.join(builder.gateware_dir, "impl", "pnr", "project.fs"))
-        flash(args.bios_flash_offset)
+        bitstream.flash(prog, os.path.join(builder.output_dir, "bitstream.fs"),
+            sector_size = bitstream.size,
+            state       = FlashState(soc.build_name + "_internal", board=board_id(prog)),
+            diff        = args.flash_diff)
+        flash(builder.output_dir, args.bios_flash_offset, args.flash_diff)
 
 if __name__ == "__main__":
     main()
@@ -26,6 +26,14 @@ from litedram.phy import usddrphy
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sdram import sdram_channels_args, sdram_channels_argdict, sdram_channels_check
+from litex_boards.soc.sdram import add_sdram_channels, add_sdram_dma
+from litex_boards.soc.ethernet import eth_phy_args, eth_phy_argdict, etherbone_args, etherbone_argdict
+from litex_boards.soc.ethernet import etherbone_params, add_etherbone, USXXVEthernetPHY
+from litex_boards.soc.pins import use_pin_index
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -58,8 +66,14 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False, **kwargs):
-        platform = alveo_u250.Platform()
+    def __init__(self, sys_clk_freq=int(125e6), with_led_chaser=True, with_pcie=False,
+                 ddram_channels=None, ddram_mapping="consecutive", ddram_interleaving=4096, with_ddram_dma=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024,
+                 with_etherbone=False, eth_ip="192.168.1.50", eth_rate=10, eth_port=0, **kwargs):
+        platform = use_pin_index(alveo_u250.Platform())
+        if ddram_channels is None:
+            ddram_channels = [0]
+        sdram_channels_check(platform, ddram_channels)
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -71,28 +85,67 @@ class BaseSoC(SoCCore):
         self.submodules.crg = _CRG(platform, sys_clk_freq)
 
         # DDR4 SDRAM -------------------------------------------------------------------------------
+        sdram_crossbars = []
         if not self.integrated_main_ram_size:
-            self.submodules.ddrphy = usddrphy.USPDDRPHY(platform.request("ddram"),
+            ddrphys = [usddrphy.USPDDRPHY(platform.request("ddram", n),
                 memtype          = "DDR4",
                 sys_clk_freq     = sys_clk_freq,
                 iodelay_clk_freq = 500e6,
-                is_rdimm         = True)
-            self.add_sdram("sdram",
-                phy           = self.ddrphy,
-                module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
-                size          = 0x40000000,
-                l2_cache_size = kwargs.get("l2_size", 8192)
-            )
+                is_rdimm         = True) for n in ddram_channels]
+            self.submodules.ddrphy = ddrphys[0]
+            if len(ddrphys) == 1:
+                self.add_sdram("sdram",
+                    phy           = self.ddrphy,
+                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    **l2_cache_params(kwargs, self.ddrphy)
+                )
+                sdram_crossbars = [self.sdram.crossbar]
+            # One controller per channel, channels mapped in main_ram.
+            else:
+                sdram_crossbars = add_sdram_channels(self, ddrphys,
+                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                    size          = 0x40000000,
+                    mapping       = ddram_mapping,
+                    interleaving  = ddram_interleaving,
+                    **l2_cache_params(kwargs, ddrphys[0])
+                )
 
         # Firmware RAM (To ease initial LiteDRAM calibration support) ------------------------------
         self.add_ram("firmware_ram", 0x20000000, 0x8000)
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPPCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
+
+            # PCIe DMA N <-> DDR4 channel N.
+            if with_ddram_dma:
+                for n, crossbar in enumerate(sdram_crossbars[:pcie_dmas]):
+                    sink, source = add_sdram_dma(self, f"sdram_dma{n}", crossbar, self.pcie_phy.data_width)
+                    pcie_dma = getattr(self, f"pcie_dma{n}")
+                    self.comb += pcie_dma.source.connect(sink)
+                    self.comb += source.connect(pcie_dma.sink)
+
+        # Etherbone (10G/25G on QSFP28) ------------------------------------------------------------
+        if with_etherbone:
+            qsfp = platform.request("qsfp28", eth_port)
+            self.comb += [
+                qsfp.fs0.eq(0), # RefClk: 161.1328125MHz.
+                qsfp.fs1.eq(1),
+                qsfp.refclk_reset.eq(0),
+            ]
+            self.submodules.ethphy = USXXVEthernetPHY(platform,
+                pads         = qsfp,
+                refclk_pads  = qsfp,
+                refclk_freq  = 161.1328125e6,
+                sys_clk_freq = sys_clk_freq,
+                line_rate    = eth_rate)
+            add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                **etherbone_params(kwargs, self.ethphy))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -109,13 +162,27 @@ def main():
     parser.add_argument("--sys-clk-freq", default=125e6,       help="System clock frequency (default: 125MHz)")
     parser.add_argument("--with-pcie",    action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",       action="store_true", help="Generate PCIe driver")
+    parser.add_argument("--with-etherbone", action="store_true", help="Enable Etherbone support (10G/25G on QSFP28)")
+    parser.add_argument("--eth-ip",         default="192.168.1.50", help="Etherbone IP address")
+    sdram_channels_args(parser)
+    pcie_args(parser)
+    eth_phy_args(parser, rates=[10, 25], ports=[0, 1])
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
-        sys_clk_freq = int(float(args.sys_clk_freq)),
-        with_pcie    = args.with_pcie,
+        sys_clk_freq   = int(float(args.sys_clk_freq)),
+        with_pcie      = args.with_pcie,
+        with_etherbone = args.with_etherbone,
+        eth_ip         = args.eth_ip,
+        **sdram_channels_argdict(args),
+        **pcie_argdict(args),
+        **eth_phy_argdict(args),
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
@@ -22,6 +22,7 @@ from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.interconnect.axi import *
 from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import stream
 
 from litex.soc.cores.led import LedChaser
 from litedram.modules import MTA18ASF2G72PZ
@@ -30,6 +31,14 @@ from litedram.phy import usddrphy
 from litepcie.phy.usppciephy import USPPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sdram import sdram_channels_args, sdram_channels_argdict, sdram_channels_check
+from litex_boards.soc.sdram import add_sdram_channels, add_sdram_dma
+from litex_boards.soc.axi import AXIStripedDMAWriter, AXIStripedDMAReader
+from litex_boards.soc.ethernet import eth_phy_args, eth_phy_argdict, etherbone_args, etherbone_argdict
+from litex_boards.soc.ethernet import etherbone_params, add_etherbone, USXXVEthernetPHY
+
 from litedram.common import *
 from litedram.frontend.axi import *
 
@@ -39,9 +48,16 @@ from litescope import LiteScopeAnalyzer
 
 class HBMIP(Module, AutoCSR):
     """Xilinx Virtex US+ High Bandwidth Memory 2 IP wrapper"""
-    def __init__(self, platform, hbm_ip_name="hbm_0"):
-        self.platform = platform
-        self.hbm_name = hbm_ip_name
+    def __init__(self, platform, hbm_ip_name="hbm_0", axi_clk_freq=250e6, nports=32, xci_filename=None,
+        ip_cache_dir=os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "vivado_ip")):
+        assert 225e6 <= axi_clk_freq <= 450e6
+        assert 1 <= nports <= 32
+        self.platform     = platform
+        self.hbm_name     = hbm_ip_name
+        self.axi_clk_freq = axi_clk_freq
+        self.nports       = nports
+        self.xci_filename = xci_filename
+        self.ip_cache_dir = ip_cache_dir
 
         self.axi = []
         self.apb = []
@@ -65,12 +81,12 @@ class HBMIP(Module, AutoCSR):
             self.hbm_params[f"i_APB_{i:1d}_PRESET_N"] = ~ResetSignal("apb")
 
         # AXI: 450 (225-450) MHz
-        for i in range(32):
+        for i in range(nports):
             self.hbm_params[f"i_AXI_{i:02d}_ACLK"]     = ClockSignal("axi")
             self.hbm_params[f"i_AXI_{i:02d}_ARESET_N"] = ~ResetSignal("apb")
 
         # AXI --------------------------------------------------------------------------------------
-        for i in range(32):
+        for i in range(nports):
             axi = AXIInterface(data_width=256, address_width=33, id_width=6)
             self.axi.append(axi)
 
@@ -138,11 +154,44 @@ class HBMIP(Module, AutoCSR):
             self.hbm_params[f"o_DRAM_{i:1d}_STAT_TEMP"]    = Open()
 
     def add_sources(self, platform):
-        this_dir = os.path.dirname(os.path.abspath(os.path.realpath(__file__)))
-        os.system("wget https://github.com/litex-hub/litex-boards/files/6893157/hbm_0.xci.txt")
-        os.makedirs("ip/hbm", exist_ok=True)
-        os.system("mv hbm_0.xci.txt ip/hbm/hbm_0.xci")
-        platform.add_ip(os.path.join(this_dir, "ip", "hbm", self.hbm_name + ".xci"))
+        # Use provided XCI when specified.
+        if self.xci_filename is not None:
+            platform.add_ip(self.xci_filename)
+            return
+
+        # Else generate the IP from its configuration (no external file required).
+        config = {
+            "USER_HBM_DENSITY"        : "8GB",
+            "USER_HBM_STACK"          : 2,
+            "USER_MEMORY_DISPLAY"     : 8192,
+            "USER_SWITCH_ENABLE_00"   : True, # Global addressing: each AXI port can access all PCs.
+            "USER_SWITCH_ENABLE_01"   : True,
+            "USER_HBM_REF_CLK_0"      : 100,
+            "USER_HBM_REF_CLK_1"      : 100,
+            "USER_APB_PCLK_0"         : 100,
+            "USER_APB_PCLK_1"         : 100,
+            "USER_AXI_CLK_FREQ"       : int(self.axi_clk_freq/1e6),
+            "USER_AXI_INPUT_CLK_FREQ" : int(self.axi_clk_freq/1e6),
+            "USER_CLK_SEL_LIST0"      : "AXI_00_ACLK",
+            "USER_CLK_SEL_LIST1"      : "AXI_16_ACLK",
+        }
+        for i in range(16):
+            config[f"USER_MC_ENABLE_{i:02d}"] = True
+        for i in range(32):
+            config[f"USER_SAXI_{i:02d}"] = (i < self.nports)
+        ip_tcl = []
+        if self.ip_cache_dir is not None:
+            # Share IP synthesis results between builds (the IP is only synthesized once per config).
+            os.makedirs(self.ip_cache_dir, exist_ok=True)
+            ip_tcl.append(f"config_ip_cache -use_cache_location {self.ip_cache_dir}")
+        ip_tcl.append(f"create_ip -vendor xilinx.com -name hbm -module_name {self.hbm_name}")
+        ip_tcl.append(f"set obj [get_ips {self.hbm_name}]")
+        ip_tcl.append("set_property -dict [list \\")
+        for key, value in config.items():
+            ip_tcl.append("CONFIG.{} {} \\".format(key, "{{" + str(value).upper() + "}}"))
+        ip_tcl.append("] $obj")
+        ip_tcl.append("synth_ip $obj")
+        platform.toolchain.pre_synthesis_commands += ip_tcl
 
     def do_finalize(self):
         self.add_sources(self.platform)
@@ -194,10 +243,18 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(150e6), ddram_channel=0, with_pcie=False, with_led_chaser=False, with_hbm=False, **kwargs):
+    def __init__(self, sys_clk_freq=int(150e6), ddram_channel=0, with_pcie=False, with_led_chaser=False, with_hbm=False,
+        hbm_dma_ports=0, hbm_xci=None,
+        ddram_channels=None, ddram_mapping="consecutive", ddram_interleaving=4096, with_ddram_dma=False,
+        pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024,
+        with_etherbone=False, eth_ip="192.168.1.50", eth_rate=10, eth_port=0, **kwargs):
         platform = alveo_u280.Platform()
+        if ddram_channels is None:
+            ddram_channels = [ddram_channel]
+        sdram_channels_check(platform, ddram_channels)
         if with_hbm:
             assert 225e6 <= sys_clk_freq <= 450e6
+            assert hbm_dma_ports in [0, 1, 2, 4, 8, 16, 32]
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -206,46 +263,106 @@ class BaseSoC(SoCCore):
             **kwargs)
 
         # CRG --------------------------------------------------------------------------------------
-        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channel, with_hbm)
+        self.submodules.crg = _CRG(platform, sys_clk_freq, ddram_channels[0], with_hbm)
 
+        sdram_crossbars = []
         if with_hbm:
             # JTAGBone --------------------------------------------------------------------------------
             #self.add_jtagbone(chain=2) # Chain 1 already used by HBM2 debug probes.
 
             # Add HBM Core.
-            self.submodules.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(HBMIP(platform))
+            self.submodules.hbm = hbm = ClockDomainsRenamer({"axi": "sys"})(HBMIP(platform,
+                axi_clk_freq = sys_clk_freq,
+                xci_filename = hbm_xci))
 
-            # Connect four of the HBM's AXI interfaces to the main bus of the SoC.
-            for i in range(4):
+            # Connect four of the HBM's AXI interfaces to the main bus of the SoC (when not used by
+            # the DMAs).
+            for i in range(min(4, 32 - hbm_dma_ports)):
                 axi_hbm      = hbm.axi[i]
                 axi_lite_hbm = AXILiteInterface(data_width=256, address_width=33)
                 self.submodules += AXILite2AXI(axi_lite_hbm, axi_hbm)
                 self.bus.add_slave(f"hbm{i}", axi_lite_hbm, SoCRegion(origin=0x4000_0000 + 0x1000_0000*i, size=0x1000_0000)) # 256MB.
+
+            # Connect the last hbm_dma_ports HBM's AXI interfaces to Striped DMAs (AXI bursts over
+            # a flat address space interleaved on the ports, for PCIe or user streams).
+            if hbm_dma_ports:
+                dma_port_offset = 32 - hbm_dma_ports
+                dma_ports       = hbm.axi[dma_port_offset:]
+                self.submodules.hbm_dma_writer = AXIStripedDMAWriter(dma_ports,
+                    port_offset = dma_port_offset,
+                    port_size   = 0x1000_0000) # 256MB pseudo-channels.
+                self.submodules.hbm_dma_reader = AXIStripedDMAReader(dma_ports,
+                    port_offset = dma_port_offset,
+                    port_size   = 0x1000_0000) # 256MB pseudo-channels.
         else:
             # DDR4 SDRAM -------------------------------------------------------------------------------
             if not self.integrated_main_ram_size:
-                self.submodules.ddrphy = usddrphy.USPDDRPHY(platform.request("ddram", ddram_channel),
+                ddrphys = [usddrphy.USPDDRPHY(platform.request("ddram", n),
                     memtype          = "DDR4",
                     cmd_latency      = 1, # seems to work better with cmd_latency=1
                     sys_clk_freq     = sys_clk_freq,
                     iodelay_clk_freq = 600e6,
-                    is_rdimm         = True)
-                self.add_sdram("sdram",
-                    phy           = self.ddrphy,
-                    module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
-                    size          = 0x40000000,
-                    l2_cache_size = kwargs.get("l2_size", 8192)
-                )
+                    is_rdimm         = True) for n in ddram_channels]
+                self.submodules.ddrphy = ddrphys[0]
+                if len(ddrphys) == 1:
+                    self.add_sdram("sdram",
+                        phy           = self.ddrphy,
+                        module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                        size          = 0x40000000,
+                        **l2_cache_params(kwargs, self.ddrphy)
+                    )
+                    sdram_crossbars = [self.sdram.crossbar]
+                # One controller per channel, channels mapped in main_ram.
+                else:
+                    sdram_crossbars = add_sdram_channels(self, ddrphys,
+                        module        = MTA18ASF2G72PZ(sys_clk_freq, "1:4"),
+                        size          = 0x40000000,
+                        mapping       = ddram_mapping,
+                        interleaving  = ddram_interleaving,
+                        **l2_cache_params(kwargs, ddrphys[0])
+                    )
 
             # Firmware RAM (To ease initial LiteDRAM calibration support) ------------------------------
             self.add_ram("firmware_ram", 0x20000000, 0x8000)
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPPCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
+
+            # PCIe DMA <-> HBM Striped DMAs.
+            if with_hbm and hbm_dma_ports:
+                self.submodules.hbm_dma_up_converter   = stream.Converter(self.pcie_phy.data_width, 256)
+                self.submodules.hbm_dma_down_converter = stream.Converter(256, self.pcie_phy.data_width)
+                self.comb += [
+                    self.pcie_dma0.source.connect(self.hbm_dma_up_converter.sink),
+                    self.hbm_dma_up_converter.source.connect(self.hbm_dma_writer.sink),
+                    self.hbm_dma_reader.source.connect(self.hbm_dma_down_converter.sink),
+                    self.hbm_dma_down_converter.source.connect(self.pcie_dma0.sink),
+                ]
+
+            # PCIe DMA N <-> DDR4 channel N.
+            if with_ddram_dma:
+                for n, crossbar in enumerate(sdram_crossbars[:pcie_dmas]):
+                    sink, source = add_sdram_dma(self, f"sdram_dma{n}", crossbar, self.pcie_phy.data_width)
+                    pcie_dma = getattr(self, f"pcie_dma{n}")
+                    self.comb += pcie_dma.source.connect(sink)
+                    self.comb += source.connect(pcie_dma.sink)
+
+        # Etherbone (10G/25G on QSFP28) ------------------------------------------------------------
+        if with_etherbone:
+            qsfp = platform.request("qsfp28", eth_port)
+            self.submodules.ethphy = USXXVEthernetPHY(platform,
+                pads         = qsfp,
+                refclk_pads  = qsfp,
+                refclk_freq  = 161.1328125e6,
+                sys_clk_freq = sys_clk_freq,
+                line_rate    = eth_rate)
+            add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                **etherbone_params(kwargs, self.ethphy))
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -264,10 +381,19 @@ def main():
     parser.add_argument("--with-pcie",       action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",          action="store_true", help="Generate PCIe driver")
     parser.add_argument("--with-hbm",        action="store_true", help="Use HBM2")
+    parser.add_argument("--hbm-xci",         default=None,        help="Use HBM2 IP from XCI file (default: generated)")
+    parser.add_argument("--hbm-dma-ports",   default=0, type=int, help="Number of HBM2 AXI ports (1-32, power of 2) used by the Striped DMAs (default: 0, disabled)")
     parser.add_argument("--with-analyzer",   action="store_true", help="Enable Analyzer.")
     parser.add_argument("--with-led-chaser", action="store_true", help="Enable LED Chaser")
+    parser.add_argument("--with-etherbone",  action="store_true", help="Enable Etherbone support (10G/25G on QSFP28)")
+    parser.add_argument("--eth-ip",          default="192.168.1.50", help="Etherbone IP address")
+    sdram_channels_args(parser)
+    pcie_args(parser)
+    eth_phy_args(parser, rates=[10, 25], ports=[0, 1])
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     if args.with_hbm:
@@ -279,7 +405,16 @@ def main():
         with_pcie    = args.with_pcie,
         with_led_chaser = args.with_led_chaser,
         with_hbm = args.with_hbm,
+        hbm_dma_ports = args.hbm_dma_ports,
+        hbm_xci = args.hbm_xci,
         with_analyzer = args.with_analyzer,
+        with_etherbone  = args.with_etherbone,
+        eth_ip          = args.eth_ip,
+        **sdram_channels_argdict(args),
+        **pcie_argdict(args),
+        **eth_phy_argdict(args),
+        **etherbone_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
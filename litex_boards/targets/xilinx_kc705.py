@@ -28,6 +28,11 @@ from liteeth.phy import LiteEthPHY
 from litepcie.phy.s7pciephy import S7PCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sata import sata_args, sata_argdict, sata_params, add_sata_ports
+from litex_boards.soc.pins import use_pin_index
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -53,8 +58,9 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(125e6), with_ethernet=False, with_led_chaser=True,
-                 with_pcie=False, with_sata=False, **kwargs):
-        platform = kc705.Platform()
+                 with_pcie=False, with_sata=False,
+                 pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
+        platform = use_pin_index(kc705.Platform())
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -74,7 +80,7 @@ class BaseSoC(SoCCore):
             self.add_sdram("sdram",
                 phy           = self.ddrphy,
                 module        = MT8JTF12864(sys_clk_freq, "1:4"),
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet ---------------------------------------------------------------------------------
@@ -87,15 +93,18 @@ class BaseSoC(SoCCore):
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = S7PCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = S7PCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, S7PCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
             from litex.build.generic_platform import Subsignal, Pins
-            from litesata.phy import LiteSATAPHY
+
+            # Parameters
+            sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=1)
 
             # IOs
             _sata_io = [
@@ -115,16 +124,13 @@ class BaseSoC(SoCCore):
             sata_refclk = ClockSignal("sata_refclk")
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks REQP-52]")
 
-            # PHY
-            self.submodules.sata_phy = LiteSATAPHY(platform.device,
+            # PHYs/Cores
+            add_sata_ports(self, [platform.request("sfp2sata", n) for n in sata["ports"]],
                 refclk     = sata_refclk,
-                pads       = platform.request("sfp2sata"),
-                gen        = "gen2",
-                clk_freq   = sys_clk_freq,
-                data_width = 16)
-
-            # Core
-            self.add_sata(phy=self.sata_phy, mode="read+write")
+                gen        = sata["gen"],
+                data_width = sata["data_width"],
+                striping   = sata["striping"],
+                dma        = sata["dma"])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -143,8 +149,11 @@ def main():
     parser.add_argument("--with-pcie",     action="store_true", help="Enable PCIe support")
     parser.add_argument("--driver",        action="store_true", help="Generate PCIe driver")
     parser.add_argument("--with-sata",     action="store_true", help="Enable SATA support (over SFP2SATA)")
+    pcie_args(parser)
+    sata_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -152,6 +161,9 @@ def main():
         with_ethernet = args.with_ethernet,
         with_pcie     = args.with_pcie,
         with_sata     = args.with_sata,
+        **pcie_argdict(args),
+        **sata_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
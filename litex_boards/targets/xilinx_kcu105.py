@@ -27,6 +27,14 @@ from liteeth.phy.ku_1000basex import KU_1000BASEX
 from litepcie.phy.uspciephy import USPCIEPHY
 from litepcie.software import generate_litepcie_software
 
+from litex_boards.soc.pcie import pcie_args, pcie_argdict, pcie_phy_params, pcie_dma_params
+from litex_boards.soc.sdram import l2_cache_args, l2_cache_argdict, l2_cache_params
+from litex_boards.soc.sata import sata_args, sata_argdict, sata_params, add_sata_ports
+from litex_boards.soc.pcie_bridge import add_pcie_sdram_dmas, generate_pcie_bridge_software
+from litex_boards.soc.ethernet import etherbone_args, etherbone_argdict, etherbone_params, add_etherbone
+from litex_boards.soc.ethernet import eth_phy_args, eth_phy_argdict, USXXVEthernetPHY
+from litex_boards.soc.pins import use_pin_index
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -62,9 +70,9 @@ class _CRG(Module):
 
 class BaseSoC(SoCCore):
     def __init__(self, sys_clk_freq=int(125e6), with_ethernet=False, with_etherbone=False,
-                 eth_ip="192.168.1.50", with_led_chaser=True, with_pcie=False, with_sata=False,
-                 **kwargs):
-        platform = kcu105.Platform()
+                 eth_ip="192.168.1.50", eth_rate=1, eth_port=0, with_led_chaser=True, with_pcie=False, with_sata=False,
+                 with_ddram_dma=False, pcie_lanes=4, pcie_speed=None, pcie_dmas=1, pcie_dma_buffering_depth=1024, **kwargs):
+        platform = use_pin_index(kcu105.Platform())
 
         # SoCCore ----------------------------------------------------------------------------------
         SoCCore.__init__(self, platform, sys_clk_freq,
@@ -85,42 +93,67 @@ class BaseSoC(SoCCore):
                 phy           = self.ddrphy,
                 module        = EDY4016A(sys_clk_freq, "1:4"),
                 size          = 0x40000000,
-                l2_cache_size = kwargs.get("l2_size", 8192)
+                **l2_cache_params(kwargs, self.ddrphy)
             )
 
         # Ethernet / Etherbone ---------------------------------------------------------------------
         if with_ethernet or with_etherbone:
-            self.submodules.ethphy = KU_1000BASEX(self.crg.cd_eth.clk,
-                data_pads    = self.platform.request("sfp", 0),
-                sys_clk_freq = self.clk_freq)
-            self.comb += self.platform.request("sfp_tx_disable_n", 0).eq(1)
+            # 1000BASE-X.
+            if eth_rate == 1:
+                self.submodules.ethphy = KU_1000BASEX(self.crg.cd_eth.clk,
+                    data_pads    = self.platform.request("sfp", eth_port),
+                    sys_clk_freq = self.clk_freq)
+            # 10GBASE-R (Etherbone only, LiteX's Ethernet MAC is limited to 32-bit).
+            else:
+                if with_ethernet:
+                    raise ValueError("Ethernet: only supported at 1G, use --with-etherbone at 10G.")
+                self.submodules.ethphy = USXXVEthernetPHY(platform,
+                    pads         = self.platform.request("sfp", eth_port),
+                    refclk_pads  = self.platform.request("si570_refclk"),
+                    refclk_freq  = 156.25e6, # Si570's default frequency.
+                    sys_clk_freq = sys_clk_freq,
+                    line_rate    = eth_rate,
+                    gt_type      = "GTH")
+            self.comb += self.platform.request("sfp_tx_disable_n", eth_port).eq(1)
             self.platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks REQP-1753]")
             if with_ethernet:
                 self.add_ethernet(phy=self.ethphy)
             if with_etherbone:
-                self.add_etherbone(phy=self.ethphy, ip_address=eth_ip)
+                add_etherbone(self, phy=self.ethphy, ip_address=eth_ip,
+                    **etherbone_params(kwargs, self.ethphy))
 
         # PCIe -------------------------------------------------------------------------------------
         if with_pcie:
-            self.submodules.pcie_phy = USPCIEPHY(platform, platform.request("pcie_x4"),
-                data_width = 128,
-                bar0_size  = 0x20000)
-            self.add_pcie(phy=self.pcie_phy, ndmas=1)
+            self.submodules.pcie_phy = USPCIEPHY(platform,
+                bar0_size = 0x20000,
+                **pcie_phy_params(platform, USPCIEPHY, pcie_lanes, pcie_speed))
+            self.add_pcie(phy=self.pcie_phy,
+                **pcie_dma_params(self.pcie_phy, pcie_dmas, pcie_dma_buffering_depth))
 
         # SATA -------------------------------------------------------------------------------------
         if with_sata:
             from litex.build.generic_platform import Subsignal, Pins
-            from litesata.phy import LiteSATAPHY
+
+            # Parameters
+            sata = sata_params(kwargs, platform.device, sys_clk_freq, ports=2)
+            if (with_ethernet or with_etherbone) and eth_port in sata["ports"]:
+                raise ValueError("SATA: SFP {} already used by Ethernet/Etherbone.".format(eth_port))
 
             # IOs
             _sata_io = [
-                # SFP 2 SATA Adapter / https://shop.trenz-electronic.de/en/TE0424-01-SFP-2-SATA-Adapter
+                # SFP 2 SATA Adapters (on SFP 0/1) / https://shop.trenz-electronic.de/en/TE0424-01-SFP-2-SATA-Adapter
                 ("sfp2sata", 0,
                     Subsignal("tx_p", Pins("U4")),
                     Subsignal("tx_n", Pins("U3")),
                     Subsignal("rx_p", Pins("T2")),
                     Subsignal("rx_n", Pins("T1")),
                 ),
+                ("sfp2sata", 1,
+                    Subsignal("tx_p", Pins("W4")),
+                    Subsignal("tx_n", Pins("W3")),
+                    Subsignal("rx_p", Pins("V2")),
+                    Subsignal("rx_n", Pins("V1")),
+                ),
             ]
             platform.add_extension(_sata_io)
 
@@ -130,16 +163,19 @@ class BaseSoC(SoCCore):
             sata_refclk = ClockSignal("sata_refclk")
             platform.add_platform_command("set_property SEVERITY {{Warning}} [get_drc_checks REQP-1753]")
 
-            # PHY
-            self.submodules.sata_phy = LiteSATAPHY(platform.device,
+            # PHYs/Cores
+            add_sata_ports(self, [platform.request("sfp2sata", n) for n in sata["ports"]],
                 refclk     = sata_refclk,
-                pads       = platform.request("sfp2sata"),
-                gen        = "gen2",
-                clk_freq   = sys_clk_freq,
-                data_width = 16)
+                gen        = sata["gen"],
+                data_width = sata["data_width"],
+                striping   = sata["striping"],
+                dma        = sata["dma"])
 
-            # Core
-            self.add_sata(phy=self.sata_phy, mode="read+write")
+        # PCIe DMAs <-> DDR4 SDRAM -----------------------------------------------------------------
+        if with_ddram_dma:
+            if not (with_pcie and hasattr(self, "sdram")):
+                raise ValueError("DDRAM DMA requires --with-pcie and the DDR4 SDRAM.")
+            add_pcie_sdram_dmas(self, [self.sdram.crossbar])
 
         # Leds -------------------------------------------------------------------------------------
         if with_led_chaser:
@@ -161,8 +197,14 @@ def main():
     parser.add_argument("--with-pcie",       action="store_true",              help="Enable PCIe support")
     parser.add_argument("--driver",          action="store_true",              help="Generate PCIe driver")
     parser.add_argument("--with-sata",       action="store_true",              help="Enable SATA support (over SFP2SATA)")
+    parser.add_argument("--with-ddram-dma",  action="store_true",              help="Connect a PCIe DMA channel to the DDR4 SDRAM")
+    pcie_args(parser)
+    eth_phy_args(parser, rates=[1, 10], ports=[0, 1])
+    sata_args(parser)
     builder_args(parser)
     soc_core_args(parser)
+    l2_cache_args(parser)
+    etherbone_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
@@ -172,6 +214,12 @@ def main():
         eth_ip         = args.eth_ip,
         with_pcie      = args.with_pcie,
         with_sata      = args.with_sata,
+        with_ddram_dma = args.with_ddram_dma,
+        **pcie_argdict(args),
+        **eth_phy_argdict(args),
+        **etherbone_argdict(args),
+        **sata_argdict(args),
+        **l2_cache_argdict(args),
         **soc_core_argdict(args)
 	)
     builder = Builder(soc, **builder_argdict(args))
@@ -179,6 +227,7 @@ def main():
 
     if args.driver:
         generate_litepcie_software(soc, os.path.join(builder.output_dir, "driver"))
+        generate_pcie_bridge_software(soc, os.path.join(builder.output_dir, "driver"))
 
     if args.load:
         prog = soc.platform.create_programmer()
@@ -22,6 +22,9 @@ from litex.soc.integration.soc_core import *
 from litex.soc.integration.builder import *
 from litex.soc.cores.led import LedChaser
 
+from litex_boards.soc.zynq import zynq_axi_args, zynq_axi_argdict, add_zynq_axi_dma
+from litex_boards.soc.zynq import generate_zynq_axi_software
+
 # CRG ----------------------------------------------------------------------------------------------
 
 class _CRG(Module):
@@ -45,7 +48,9 @@ class _CRG(Module):
 # BaseSoC ------------------------------------------------------------------------------------------
 
 class BaseSoC(SoCCore):
-    def __init__(self, sys_clk_freq=int(100e6), with_led_chaser=True, **kwargs):
+    def __init__(self, sys_clk_freq=int(100e6), with_led_chaser=True,
+        zynq_hp_ports=0, zynq_acp=False, zynq_dma_base=0x1e000000, zynq_dma_size=0x02000000,
+        **kwargs):
         platform = zybo_z7.Platform()
 
         if kwargs["uart_name"] == "serial": kwargs["uart_name"] = "usb_uart" # Use USB-UART Pmod on JB.
@@ -58,11 +63,9 @@ class BaseSoC(SoCCore):
 
         # Zynq7000 Integration ---------------------------------------------------------------------
         if kwargs.get("cpu_type", None) == "zynq7000":
-            # Get and set the pre-generated .xci FIXME: change location? add it to the repository?
-            os.system("wget https://github.com/litex-hub/litex-boards/files/4967144/zybo_z7_ps7.txt")
-            os.makedirs("xci", exist_ok=True)
-            os.system("mv zybo_z7_ps7.txt xci/zybo_z7_ps7.xci")
-            self.cpu.set_ps7_xci("xci/zybo_z7_ps7.xci")
+            # Get and set the pre-generated .xci (from the provision cache).
+            from litex_boards.tools.provision import provision_ip
+            self.cpu.set_ps7_xci(provision_ip(self, "zybo_z7_ps7_xci"))
 
             # Connect AXI GP0 to the SoC with base address of 0x43c00000 (default one)
             wb_gp0  = wishbone.Interface()
@@ -72,6 +75,9 @@ class BaseSoC(SoCCore):
                 base_address = 0x43c00000)
             self.add_wb_master(wb_gp0)
 
+        # Zynq7000 AXI HP/ACP DMAs -----------------------------------------------------------------
+        add_zynq_axi_dma(self, zynq_hp_ports, zynq_acp, zynq_dma_base, zynq_dma_size)
+
         # CRG --------------------------------------------------------------------------------------
         self.submodules.crg = _CRG(platform, sys_clk_freq)
 
@@ -88,18 +94,24 @@ def main():
     parser.add_argument("--build",        action="store_true", help="Build bitstream")
     parser.add_argument("--load",         action="store_true", help="Load bitstream")
     parser.add_argument("--sys-clk-freq", default=100e6,       help="System clock frequency (default: 100MHz)")
+    parser.add_argument("--driver",       action="store_true", help="Generate Zynq AXI DMAs header/device-tree fragment")
     builder_args(parser)
     soc_core_args(parser)
+    zynq_axi_args(parser)
     vivado_build_args(parser)
     args = parser.parse_args()
 
     soc = BaseSoC(
         sys_clk_freq = int(float(args.sys_clk_freq)),
+        **zynq_axi_argdict(args),
         **soc_core_argdict(args)
     )
     builder = Builder(soc, **builder_argdict(args))
     builder.build(**vivado_build_argdict(args), run=args.build)
 
+    if args.driver:
+        generate_zynq_axi_software(soc, os.path.join(builder.output_dir, "driver"))
+
     if args.load:
         prog = soc.platform.create_programmer()
         prog.load_bitstream(os.path.join(builder.gateware_dir, soc.build_name + ".bit"), device=1)
@@ -0,0 +1,530 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+"""
+Host bridge client of the LiteX-Boards targets.
+
+Accesses the SoC's bus over the targets' host bridges with one pooled connection per board, batching
+the register accesses in bulk Etherbone transactions:
+- udp://ip[:port]    : Etherbone (--with-etherbone), pipelined UDP packets of up to max_burst accesses
+                       (--etherbone-buffer-depth).
+- tcp://host[:port]  : litex_server (UARTBone, JTAGBone, PCIe BAR0 or Etherbone), up to 255 accesses
+                       per packet, merged in bursts by the server.
+- pcie://[domain:]bus:device.function : PCIe BAR0 (LitePCIe), mapped in the host's memory.
+
+CSRs are resolved by name from the build's csr.csv/csr.json (or its build directory).
+
+Ex (blocking):
+    bridge = open_bridge("udp://192.168.1.50", csr="build/xilinx_kcu105")
+    values = bridge.read_csrs(["ctrl_scratch", "ctrl_bus_errors"]) # Single transaction.
+    with bridge.batch() as batch:
+        batch.write_csr("leds_out", 0x5)
+        scratch = batch.read_csr("ctrl_scratch")
+    print(scratch.value)
+    bridge.close()
+
+Ex (asyncio, concurrent accesses of the tasks coalesced in single transactions):
+    abridge = AsyncBridge(open_bridge("tcp://localhost:1234", csr="build/xilinx_kcu105/csr.csv"))
+    values  = await asyncio.gather(*[abridge.read_csr(name) for name in names])
+"""
+
+import os
+import csv
+import json
+import mmap
+import socket
+import struct
+import asyncio
+import argparse
+import threading
+import concurrent.futures
+from collections import namedtuple
+
+from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord
+from litex.tools.remote.etherbone import EtherboneReads, EtherboneWrites, EtherboneIPC
+
+# CSR Map ------------------------------------------------------------------------------------------
+
+CSRRegister = namedtuple("CSRRegister", ["addr", "size", "mode"])
+MemoryRegion = namedtuple("MemoryRegion", ["base", "size", "type"])
+
+class CSRMap:
+    """CSRs/constants/memory regions of a build, from its csr.csv or csr.json (or build directory)."""
+    def __init__(self, filename):
+        if os.path.isdir(filename):
+            for name in ["csr.json", "csr.csv"]:
+                if os.path.exists(os.path.join(filename, name)):
+                    filename = os.path.join(filename, name)
+                    break
+            else:
+                raise FileNotFoundError(f"No csr.json/csr.csv in {filename}.")
+        self.filename  = filename
+        self.bases     = {}
+        self.registers = {}
+        self.constants = {}
+        self.memories  = {}
+        if filename.endswith(".json"):
+            self._load_json(filename)
+        else:
+            self._load_csv(filename)
+        self.data_width = int(self.constants.get("config_csr_data_width", 32))
+        self.ordering   = self.constants.get("config_csr_ordering", "big")
+
+    def _load_csv(self, filename):
+        with open(filename) as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith("#"):
+                    continue
+                kind, name = row[0], row[1]
+                if kind == "csr_base":
+                    self.bases[name] = int(row[2], 0)
+                elif kind == "csr_register":
+                    self.registers[name] = CSRRegister(int(row[2], 0), int(row[3], 0), row[4])
+                elif kind == "constant":
+                    self.constants[name] = _constant(row[2])
+                elif kind == "memory_region":
+                    self.memories[name] = MemoryRegion(int(row[2], 0), int(row[3], 0), row[4])
+
+    def _load_json(self, filename):
+        with open(filename) as f:
+            d = json.load(f)
+        self.bases     = dict(d.get("csr_bases", {}))
+        self.registers = {k: CSRRegister(v["addr"], v["size"], v["type"])
+            for k, v in d.get("csr_registers", {}).items()}
+        self.constants = {k: (v.lower() if isinstance(v, str) else v)
+            for k, v in d.get("constants", {}).items()}
+        self.memories  = {k: MemoryRegion(v["base"], v["size"], v["type"])
+            for k, v in d.get("memories", {}).items()}
+
+    def register(self, name):
+        try:
+            return self.registers[name]
+        except KeyError:
+            raise KeyError(f"Unknown CSR {name} in {self.filename}.") from None
+
+    def addresses(self, name):
+        """Return the addresses of the CSR's words."""
+        register = self.register(name)
+        return [register.addr + 4*i for i in range(register.size)]
+
+    def decode(self, name, datas):
+        """Return the value of the CSR from its words."""
+        words = datas if self.ordering == "big" else reversed(datas)
+        value = 0
+        for word in words:
+            value = (value << self.data_width) | (word & (2**self.data_width - 1))
+        return value
+
+    def encode(self, name, value):
+        """Return the words of the CSR for value."""
+        size  = self.register(name).size
+        mask  = 2**self.data_width - 1
+        datas = [(value >> (self.data_width*(size - 1 - i))) & mask for i in range(size)]
+        return datas if self.ordering == "big" else datas[::-1]
+
+def _constant(value):
+    try:
+        return int(value, 0)
+    except ValueError:
+        return value.lower()
+
+# Transports ---------------------------------------------------------------------------------------
+
+class _EtherboneTransport:
+    """Etherbone transport: transaction split in packets of one record of up to max_burst accesses."""
+    max_burst = 255
+
+    def packets(self, writes, reads):
+        packets = []
+        # Writes (runs of consecutive addresses).
+        for addr, datas in writes:
+            for i in range(0, len(datas), self.max_burst):
+                record = EtherboneRecord()
+                record.writes = EtherboneWrites(base_addr=addr + 4*i, datas=datas[i:i + self.max_burst])
+                record.wcount = len(record.writes)
+                packets.append((record, False))
+        # Reads.
+        for i in range(0, len(reads), self.max_burst):
+            record = EtherboneRecord()
+            record.reads  = EtherboneReads(addrs=reads[i:i + self.max_burst])
+            record.rcount = len(record.reads)
+            packets.append((record, True))
+        return packets
+
+    @staticmethod
+    def encode(record, tag=0):
+        if record.reads is not None:
+            record.reads.base_ret_addr = tag
+        packet = EtherbonePacket()
+        packet.records = [record]
+        packet.encode()
+        return packet.bytes
+
+    @staticmethod
+    def decode(data):
+        packet = EtherbonePacket(data)
+        packet.decode()
+        record = packet.records.pop()
+        return record.writes.base_addr, record.writes.get_datas()
+
+class EtherboneUDPTransport(_EtherboneTransport):
+    """Etherbone over UDP, up to window read packets in flight (lost packets are sent again)."""
+    def __init__(self, host, port=1234, max_burst=4, window=8, timeout=0.5, retries=4):
+        self.host      = host
+        self.port      = port
+        self.max_burst = max_burst
+        self.window    = window
+        self.retries   = retries
+        self.tag       = 0
+        self.socket    = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.settimeout(timeout)
+
+    def transact(self, writes, reads):
+        results = {}
+        pending = []
+        for record, is_read in self.packets(writes, reads):
+            if not is_read:
+                self.socket.sendto(self.encode(record), (self.host, self.port))
+            else:
+                pending.append(record)
+        # Reads (tagged with their return address).
+        tags = []
+        for record in pending:
+            self.tag = (self.tag + 1) & 0xffffffff
+            tags.append((self.tag, self.encode(record, self.tag)))
+        order    = [tag for tag, _ in tags]
+        inflight = {}
+        retries  = 0
+        while tags or inflight:
+            while tags and len(inflight) < self.window:
+                tag, packet = tags.pop(0)
+                inflight[tag] = packet
+                self.socket.sendto(packet, (self.host, self.port))
+            try:
+                data, _ = self.socket.recvfrom(8192)
+            except socket.timeout:
+                if retries == self.retries:
+                    raise TimeoutError(f"Etherbone: no answer from {self.host}:{self.port}.")
+                retries += 1
+                tags     = list(inflight.items()) + tags
+                inflight = {}
+                continue
+            tag, datas = self.decode(data)
+            if tag in inflight:
+                del inflight[tag]
+                results[tag] = datas
+        return [data for tag in order for data in results[tag]]
+
+    def close(self):
+        self.socket.close()
+
+class EtherboneTCPTransport(_EtherboneTransport, EtherboneIPC):
+    """Etherbone over TCP to litex_server, packets pipelined on the connection."""
+    def __init__(self, host="localhost", port=1234, timeout=5.0):
+        self.socket = socket.create_connection((host, port), timeout)
+        self.socket.settimeout(timeout)
+        self.info   = self.socket.recv(128).decode(errors="ignore")
+        self.pcie   = "CommPCIe" in self.info
+
+    def transact(self, writes, reads):
+        packets = self.packets(writes, reads)
+        self.socket.sendall(b"".join(self.encode(record) for record, _ in packets))
+        results = []
+        for record, is_read in packets:
+            if is_read:
+                packet = self.receive_packet(self.socket)
+                if packet == 0:
+                    raise ConnectionError("Etherbone: connection closed by litex_server.")
+                results += self.decode(packet)[1]
+        return results
+
+    def close(self):
+        self.socket.close()
+
+class PCIeBARTransport:
+    """PCIe BAR0 (LitePCIe) mapped in the host's memory through sysfs."""
+    pcie = True
+
+    def __init__(self, device, bar=0):
+        if device.count(":") == 1:
+            device = "0000:" + device
+        self.file = open(f"/sys/bus/pci/devices/{device}/resource{bar}", "r+b")
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+
+    def transact(self, writes, reads):
+        for addr, datas in writes:
+            for i, data in enumerate(datas):
+                self.mmap[addr + 4*i:addr + 4*i + 4] = struct.pack("<I", data)
+        return [struct.unpack("<I", self.mmap[addr:addr + 4])[0] for addr in reads]
+
+    def close(self):
+        self.mmap.close()
+        self.file.close()
+
+def _transport(uri, **kwargs):
+    scheme, _, address = uri.partition("://")
+    if scheme == "pcie":
+        return PCIeBARTransport(address, **kwargs)
+    host, _, port = address.partition(":")
+    port = int(port) if port else 1234
+    if scheme == "udp":
+        return EtherboneUDPTransport(host, port, **kwargs)
+    if scheme == "tcp":
+        return EtherboneTCPTransport(host, port, **kwargs)
+    raise ValueError(f"Bridge: unsupported URI {uri} (udp://, tcp:// or pcie://).")
+
+# Bridge -------------------------------------------------------------------------------------------
+
+class BridgeResult:
+    """Result of a read of a batch (value available once the batch is executed)."""
+    def __init__(self):
+        self.value = None
+
+class Batch:
+    """Accesses executed in order in a minimum of transactions (on exit of the with block)."""
+    def __init__(self, bridge):
+        self.bridge = bridge
+        self.ops    = []
+
+    def write(self, addr, datas):
+        self.ops.append(("w", addr, datas if isinstance(datas, list) else [datas], None))
+
+    def read(self, addr, length=1):
+        return self.read_addrs([addr + 4*i for i in range(length)])
+
+    def read_addrs(self, addrs):
+        result = BridgeResult()
+        self.ops.append(("r", list(addrs), None, result))
+        return result
+
+    def write_csr(self, name, value):
+        csr_map = self.bridge.csr_map
+        self.ops.append(("w", csr_map.register(name).addr, csr_map.encode(name, value), None))
+
+    def read_csr(self, name):
+        result = BridgeResult()
+        self.ops.append(("r", self.bridge.csr_map.addresses(name), name, result))
+        return result
+
+    def execute(self):
+        ops, self.ops = self.ops, []
+        for (kind, _, name, result), datas in zip(ops, self.bridge.execute(ops)):
+            if kind == "r":
+                result.value = datas if name is None else self.bridge.csr_map.decode(name, datas)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.execute()
+
+class Bridge:
+    """Host bridge of a board: batched bus/CSR accesses over a transport (see open_bridge)."""
+    def __init__(self, transport, csr=None):
+        self.transport    = transport
+        self.csr_map      = CSRMap(csr) if isinstance(csr, str) else csr
+        self.lock         = threading.Lock()
+        self.refs         = 1
+        self.uri          = None
+        self.base_address = 0
+        # With LitePCIe, CSRs are translated to 0 in BAR0.
+        if getattr(transport, "pcie", False) and self.csr_map is not None:
+            self.base_address = -self.csr_map.memories["csr"].base
+
+    def execute(self, ops):
+        """Execute ops (kind "w"/"r", addr(s), datas/name, result) in order, return their datas.
+
+        Consecutive ops are grouped in transactions (writes then reads): a transaction is only
+        closed by a write following a read.
+        """
+        results      = []
+        transactions = []
+        writes, reads, nreads = [], [], []
+        for kind, addrs, datas, _ in ops:
+            if kind == "w":
+                if reads:
+                    transactions.append((writes, reads, nreads))
+                    writes, reads, nreads = [], [], []
+                writes.append((addrs + self.base_address, datas))
+            else:
+                reads  += [addr + self.base_address for addr in addrs]
+                nreads.append(len(addrs))
+        transactions.append((writes, reads, nreads))
+        with self.lock:
+            for writes, reads, nreads in transactions:
+                datas = self.transport.transact(writes, reads)
+                for n in nreads:
+                    results.append(datas[:n])
+                    datas = datas[n:]
+        # Align results on ops (None for writes).
+        results = iter(results)
+        return [next(results) if kind == "r" else None for kind, *_ in ops]
+
+    def batch(self):
+        return Batch(self)
+
+    # Bus.
+    def read(self, addr, length=None):
+        with self.batch() as batch:
+            result = batch.read(addr, 1 if length is None else length)
+        return result.value[0] if length is None else result.value
+
+    def read_addrs(self, addrs):
+        with self.batch() as batch:
+            result = batch.read_addrs(addrs)
+        return result.value
+
+    def write(self, addr, datas):
+        with self.batch() as batch:
+            batch.write(addr, datas)
+
+    # CSRs.
+    def read_csr(self, name):
+        return self.read_csrs([name])[name]
+
+    def read_csrs(self, names):
+        with self.batch() as batch:
+            results = {name: batch.read_csr(name) for name in names}
+        return {name: result.value for name, result in results.items()}
+
+    def write_csr(self, name, value):
+        self.write_csrs({name: value})
+
+    def write_csrs(self, values):
+        with self.batch() as batch:
+            for name, value in values.items():
+                batch.write_csr(name, value)
+
+    # Pool.
+    def close(self):
+        with _pool_lock:
+            self.refs -= 1
+            if self.refs:
+                return
+            _pool.pop(self.uri, None)
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Pool ---------------------------------------------------------------------------------------------
+
+_pool      = {}
+_pool_lock = threading.Lock()
+
+def open_bridge(uri, csr=None, **kwargs):
+    """Return the Bridge of the board at uri, shared by all the callers (one connection per board).
+
+    csr is the build's csr.csv/csr.json or build directory; kwargs are passed to the transport
+    (ex: max_burst/window for udp://) and have to be the same for all the callers of a board.
+    Each open_bridge has to be balanced with a close.
+    """
+    with _pool_lock:
+        bridge = _pool.get(uri, None)
+        if bridge is not None:
+            if kwargs != bridge.kwargs:
+                raise ValueError(f"Bridge: {uri} already open with {bridge.kwargs}, not {kwargs}.")
+            bridge.refs += 1
+            if bridge.csr_map is None and csr is not None:
+                bridge.csr_map = CSRMap(csr)
+            return bridge
+        bridge = Bridge(_transport(uri, **kwargs), csr)
+        bridge.uri    = uri
+        bridge.kwargs = kwargs
+        _pool[uri] = bridge
+        return bridge
+
+# Async Bridge -------------------------------------------------------------------------------------
+
+class AsyncBridge:
+    """asyncio frontend of a Bridge: accesses issued concurrently are coalesced in transactions.
+
+    The accesses submitted during an iteration of the event loop are executed (in order) in a single
+    batch, in a worker thread; they complete in submission order.
+    """
+    def __init__(self, bridge):
+        self.bridge   = bridge
+        self.ops      = []
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+    def _submit(self, kind, addrs, datas):
+        loop   = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self.ops:
+            loop.call_soon(self._flush, loop)
+        self.ops.append((kind, addrs, datas, future))
+        return future
+
+    def _flush(self, loop):
+        ops, self.ops = self.ops, []
+        def done(f):
+            try:
+                results = f.result()
+            except Exception as e:
+                for *_, future in ops:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            for (*_, future), datas in zip(ops, results):
+                if not future.done():
+                    future.set_result(datas)
+        task = loop.run_in_executor(self.executor, self.bridge.execute, ops)
+        task.add_done_callback(done)
+
+    # Bus.
+    async def read(self, addr, length=None):
+        datas = await self._submit("r", [addr + 4*i for i in range(1 if length is None else length)], None)
+        return datas[0] if length is None else datas
+
+    async def write(self, addr, datas):
+        await self._submit("w", addr, datas if isinstance(datas, list) else [datas])
+
+    # CSRs.
+    async def read_csr(self, name):
+        csr_map = self.bridge.csr_map
+        return csr_map.decode(name, await self._submit("r", csr_map.addresses(name), None))
+
+    async def read_csrs(self, names):
+        values = await asyncio.gather(*[self.read_csr(name) for name in names])
+        return dict(zip(names, values))
+
+    async def write_csr(self, name, value):
+        csr_map = self.bridge.csr_map
+        await self._submit("w", csr_map.register(name).addr, csr_map.encode(name, value))
+
+    def close(self):
+        self.executor.shutdown()
+        self.bridge.close()
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards host bridge client (CSR reads/writes).")
+    parser.add_argument("--uri",     default="tcp://localhost:1234", help="Bridge URI (udp://ip[:port], tcp://host[:port] or pcie://bus:device.function).")
+    parser.add_argument("--csr",     required=True,                  help="csr.csv/csr.json or build directory.")
+    parser.add_argument("accesses",  nargs="+",                      help="CSR reads (name) or writes (name=value), in one transaction.")
+    args = parser.parse_args()
+
+    bridge = open_bridge(args.uri, csr=args.csr)
+    with bridge.batch() as batch:
+        results = []
+        for access in args.accesses:
+            name, _, value = access.partition("=")
+            if value:
+                batch.write_csr(name, int(value, 0))
+            else:
+                results.append((name, batch.read_csr(name)))
+    for name, result in results:
+        print("{}: 0x{:x}".format(name, result.value))
+    bridge.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import importlib
+import importlib.util
+import subprocess
+
+"""
+Content-addressed build cache for the targets.
+
+Runs a target with its usual arguments and caches its output directory (Verilog, constraints, build
+scripts, software, and optionally the bitstream). The cache key is a hash of:
+- The sources of the target and of the litex_boards modules it imports (platform, etc...).
+- The resolved arguments of the target (argparse namespace).
+- The versions/sources of the installed Migen/LiteX/cores packages.
+
+On a hit, the SoC is not elaborated: the output directory is restored from the cache and, when
+--build is requested without a cached bitstream, the restored toolchain build script is run.
+--load/--flash (that require the SoC) bypass the cache.
+
+Ex:
+    ./build_cache.py arty --cpu-type=vexriscv --no-compile-gateware
+    ./build_cache.py --cache-bitstream arty --with-ethernet --build
+"""
+
+cache_dir_default = os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "build")
+
+# Packages whose version/sources are part of the cache key.
+cache_packages = [
+    "migen",
+    "litex",
+    "litedram",
+    "liteeth",
+    "litepcie",
+    "litesata",
+    "litesdcard",
+    "litescope",
+    "litespi",
+    "liteiclink",
+    "litehyperbus",
+    "litejesd204b",
+    "litevideo",
+    "pythondata_software_compiler_rt",
+    "pythondata_cpu_vexriscv",
+]
+
+# Arguments that don't change the generated files.
+uncached_arguments = ["build", "load", "flash"]
+
+# Bitstream extensions (only cached with --cache-bitstream).
+bitstream_extensions = [".bit", ".bin", ".svf", ".sof", ".rbf", ".fs", ".mcs", ".jed"]
+
+class _CacheHit(Exception): pass
+
+# Fingerprints -------------------------------------------------------------------------------------
+
+def _package_fingerprint(name):
+    """Version of the package + stat of its Python sources (develop installs keep their version)."""
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    h = hashlib.sha256()
+    try:
+        from importlib.metadata import version
+        h.update(version(name.replace("_", "-")).encode())
+    except Exception:
+        pass
+    for path in (spec.submodule_search_locations or [spec.origin]):
+        for f in sorted(glob.glob(os.path.join(path, "**", "*.py"), recursive=True) or [path]):
+            st = os.stat(f)
+            h.update(f"{f}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+def _sources_fingerprint():
+    """Hash of the sources of the litex_boards modules imported (target, platform, etc...)."""
+    h = hashlib.sha256()
+    for name in sorted(sys.modules.keys()):
+        module = sys.modules[name]
+        if name.split(".")[0] == "litex_boards" and getattr(module, "__file__", None):
+            h.update(name.encode())
+            h.update(open(module.__file__, "rb").read())
+    return h.hexdigest()
+
+def cache_key(target, args):
+    h = hashlib.sha256()
+    h.update(target.encode())
+    h.update(_sources_fingerprint().encode())
+    h.update(json.dumps({k: repr(v) for k, v in sorted(vars(args).items())
+        if k not in uncached_arguments}).encode())
+    for name in cache_packages:
+        h.update(f"{name}:{_package_fingerprint(name)}".encode())
+    return h.hexdigest()
+
+# Cache --------------------------------------------------------------------------------------------
+
+def _default_output_dir(output_dir, platform):
+    """Output directory to record: the Builder's default (build/<platform>, relative to the working
+    directory of the run, as for the target itself) or the absolute output directory."""
+    default_output_dir = os.path.join("build", platform)
+    if os.path.abspath(output_dir) == os.path.abspath(default_output_dir):
+        return default_output_dir
+    return os.path.abspath(output_dir)
+
+class BuildCache:
+    def __init__(self, cache_dir=cache_dir_default, cache_bitstream=False):
+        self.cache_dir       = cache_dir
+        self.cache_bitstream = cache_bitstream
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def lookup(self, key, need_bitstream=False):
+        meta = os.path.join(self._entry_dir(key), "meta.json")
+        if not os.path.exists(meta):
+            return None
+        with open(meta) as f:
+            meta = json.load(f)
+        # A hit with --build requires a cached bitstream or the toolchain build script.
+        if need_bitstream and not meta["bitstream"] and not meta["build_scripts"]:
+            return None
+        return meta
+
+    def restore(self, key, output_dir):
+        shutil.rmtree(output_dir, ignore_errors=True)
+        shutil.copytree(os.path.join(self._entry_dir(key), "files"), output_dir)
+
+    def store(self, key, output_dir, gateware_dir, platform):
+        def ignore(path, names):
+            if self.cache_bitstream:
+                return []
+            return [n for n in names if os.path.splitext(n)[1] in bitstream_extensions]
+        entry_dir = self._entry_dir(key)
+        if os.path.exists(entry_dir):
+            return
+        # Fill a temporary directory and rename it to make the store atomic for concurrent builds.
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        shutil.copytree(output_dir, os.path.join(tmp_dir, "files"), ignore=ignore)
+        gateware_rel = os.path.relpath(gateware_dir, output_dir)
+        bitstreams   = [f for f in os.listdir(gateware_dir)
+            if os.path.splitext(f)[1] in bitstream_extensions]
+        meta = {
+            "created"       : time.time(),
+            "output_dir"    : _default_output_dir(output_dir, platform),
+            "gateware_dir"  : gateware_rel,
+            "bitstream"     : self.cache_bitstream and len(bitstreams) > 0,
+            "build_scripts" : [os.path.join(gateware_rel, os.path.basename(f))
+                for f in glob.glob(os.path.join(gateware_dir, "build_*.sh"))],
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=1)
+        try:
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # Already stored by a concurrent build.
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+# Run ----------------------------------------------------------------------------------------------
+
+def run_target(target, target_args, cache):
+    """Run target's main() with target_args, using cache for its outputs."""
+    from litex.soc.integration.builder import Builder
+
+    module = importlib.import_module(f"litex_boards.targets.{target}")
+    state  = {}
+
+    # Compute key once the target's arguments are parsed and stop here on a hit.
+    parse_args = argparse.ArgumentParser.parse_args
+    def cached_parse_args(parser, *args, **kwargs):
+        ns = parse_args(parser, *args, **kwargs)
+        if "key" not in state:
+            state["args"] = ns
+            state["key"]  = cache_key(target, ns)
+            bypass = getattr(ns, "load", False) or getattr(ns, "flash", False)
+            meta   = None if bypass else cache.lookup(state["key"], getattr(ns, "build", False))
+            if meta is not None:
+                state["meta"] = meta
+                raise _CacheHit
+        return ns
+
+    # Record output directories of the Builder.
+    build = Builder.build
+    def cached_build(builder, *args, **kwargs):
+        state["output_dir"]   = builder.output_dir
+        state["gateware_dir"] = builder.gateware_dir
+        state["platform"]     = builder.soc.platform.name
+        return build(builder, *args, **kwargs)
+
+    argv = sys.argv
+    argparse.ArgumentParser.parse_args = cached_parse_args
+    Builder.build                      = cached_build
+    sys.argv = [module.__file__] + target_args
+    try:
+        module.main()
+    except _CacheHit:
+        pass
+    finally:
+        argparse.ArgumentParser.parse_args = parse_args
+        Builder.build                      = build
+        sys.argv                           = argv
+
+    key = state.get("key", None)
+    if "meta" in state:
+        meta = state["meta"]
+        args = state["args"]
+        # Default output directory (build/<platform>) is only known from the previous run.
+        output_dir = os.path.abspath(getattr(args, "output_dir", None) or meta["output_dir"])
+        cache.restore(key, output_dir)
+        print(f"Build cache: hit ({key[:16]}), restored to {output_dir}.")
+        if args.build and not meta["bitstream"]:
+            for script in meta["build_scripts"]:
+                subprocess.check_call(["bash", os.path.basename(script)],
+                    cwd=os.path.join(output_dir, os.path.dirname(script)))
+    elif key is not None and "output_dir" in state:
+        cache.store(key, state["output_dir"], state["gateware_dir"], state["platform"])
+        print(f"Build cache: miss ({key[:16]}), stored.")
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards build cache.")
+    parser.add_argument("--cache-dir",       default=cache_dir_default, help="Cache directory.")
+    parser.add_argument("--cache-bitstream", action="store_true",       help="Also cache bitstreams.")
+    parser.add_argument("--clear",           action="store_true",       help="Clear cache.")
+    parser.add_argument("target", nargs="?",              help="Target name (ex: arty or digilent_arty).")
+    parser.add_argument("args",   nargs=argparse.REMAINDER, help="Target arguments.")
+    args = parser.parse_args()
+
+    if args.clear:
+        shutil.rmtree(args.cache_dir, ignore_errors=True)
+    if args.target is not None:
+        cache = BuildCache(cache_dir=args.cache_dir, cache_bitstream=args.cache_bitstream)
+        run_target(args.target, args.args, cache)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import re
+import ast
+import sys
+import argparse
+import importlib
+import concurrent.futures
+
+from litex.build.generic_platform import Pins, Subsignal, IOStandard, Drive, Misc, Inverted
+
+from litex_boards.tools.registry import load_registry
+from litex_boards.soc.pins import PinIndex, get_pin_index
+
+"""
+Static pin checker of the platforms: package pins claimed by several resources and incompatible
+IOStandards in a bank, found before place and route.
+
+Each platform (and each of its variants) is compiled in its PinIndex (see litex_boards/soc/pins.py)
+and, with --targets, each extension added by the targets (platform.add_extension(...)) is checked
+on top of the PinIndex of its platform. Platforms/targets are checked in parallel in a process pool.
+
+Resources that are alternative views of the same pins (ex: spiflash/spiflash4x, sdcard/spisdcard,
+pcie_x1/pcie_x4) and the resources of the platforms sharing pins by design (ex: VGA on the GPIO header
+of the DE1-SoC, see shared_resources) are not reported as conflicts (unless --all). Platforms that
+can't be created here (ex: toolchain required) and target extensions that are not literal IO lists
+are reported as skipped.
+
+Bank checks require the package files of the devices (Xilinx <device><package>pkg.txt files or
+pin,bank CSV files) in the --packages directory; only single-ended IOStandards are checked since
+differential inputs can be placed in banks of any VCCO.
+
+Ex:
+    ./check_pins.py
+    ./check_pins.py --targets --packages ~/xilinx/packages arty kc705
+"""
+
+# Alternatives -------------------------------------------------------------------------------------
+
+# Resource names (regexps) sharing their pins by design: resources of a group are alternatives.
+alternatives = [
+    r"(spi)?flash(\dx)?",
+    r"(spi)?sdcard",
+    r"pcie_x\d+|pcie2sata",        # SATA adapters on the PCIe/SFP/QSFP transceivers.
+    r"(user|rgb)_led[rgb]?(_n)?", # RGB LEDs also exposed as user LEDs.
+    r"sfp(_tx|_rx|2sata)?",
+    r"qsfp(28)?|qsfp2sata",
+    r"serial|usb_fifo",           # FTDI chips in UART or FIFO mode.
+]
+
+# Resources sharing pins by design on a platform (or known platform issues): {platform: [names]}.
+shared_resources = {
+    "camlink_4k"                  : [{"user_led", "serial"}],
+    "colorlight_5a_75b"           : [{"user_led_n", "serial"}, {"user_btn_n", "serial"},
+                                     {"eth"},                  # MDIO/reset shared by the PHYs.
+                                     {"eth", "eth_clocks"}],   # FIXME: rx_ctl/rx_data of rev 6.1.
+    "colorlight_5a_75e"           : [{"user_led_n", "serial"}, {"user_btn_n", "serial"}, {"eth"}],
+    "colorlight_i5"               : [{"eth"}],
+    "decklink_mini_4k"            : [{"sdi_data", "hdmi_out"}, {"debug", "serial"}],
+    "decklink_quad_hdmi_recorder" : [{"clk200", "clk"}],
+    "digilent_nexys_video"        : [{"cpu_reset", "user_btn"}],
+    "enclustra_mercury_xu5"       : [{"clk100", "clk33"}],
+    "lattice_versa_ecp5"          : [{"pcie_x1", "refclk"}],
+    "mist"                        : [{"clk27"}],                # FIXME: clk27:0 declared twice.
+    "pano_logic_g2"               : [{"eth_rst_n", "eth"}],
+    "qmtech_ep4ce15"              : [{"spiflash"}],             # FIXME: cs_n/miso on the same pin.
+    "radiona_ulx3s"               : [{"gpio", "ext0p"}, {"gpio", "ext1p"}],
+    "siglent_sds1104xe"           : [{"clk25", "eth_clocks"}],
+    "sqrl_acorn"                  : [{"serial", "spisdcard"}],
+    "terasic_de0nano"             : [{"serial", "gpio_0"}],
+    "terasic_de1soc"              : [{"vga", "gpio_0"}, {"vga", "gpio_1"}],
+    "terasic_deca"                : [{"camera"}, {"gpio", "gpio_serial"}],
+    "terasic_sockit"              : [{"ddram", "temperature"}],
+    "trenz_c10lprefkit"           : [{"eth_clocks"}],           # RX clock shared by the PHYs.
+    "trenz_max1000"               : [{"user_led", "bbio"}, {"user_btn", "bbio"}],
+    "trenz_tec0117"               : [{"serial", "spiflash"}],
+}
+
+def _alternative_group(name):
+    for n, alternative in enumerate(alternatives):
+        if re.fullmatch(alternative, name) is not None:
+            return n
+    # Single-ended/differential views (ex: user_sma_clock/_p).
+    return re.sub(r"_[pn]$", "", name)
+
+def is_alternative(owners, shared=[]):
+    """True if the owners [(name, number, subsignal)] of a pin are alternative/shared resources."""
+    names = {name for name, number, subsignal in owners}
+    if any(names <= resources for resources in shared):
+        return True
+    if len(names) < 2:
+        return False
+    return len({_alternative_group(name) for name in names}) == 1
+
+# Banks --------------------------------------------------------------------------------------------
+
+# VCCO of the single-ended IOStandards.
+iostandard_vcco = {
+    "LVTTL"    : 3.3,
+    "LVCMOS33" : 3.3,
+    "TMDS_33"  : 3.3,
+    "LVCMOS25" : 2.5,
+    "LVCMOS18" : 1.8,
+    "SSTL18"   : 1.8,
+    "HSTL_I_18": 1.8,
+    "LVCMOS15" : 1.5,
+    "SSTL15"   : 1.5,
+    "HSTL_I"   : 1.5,
+    "SSTL135"  : 1.35,
+    "LVCMOS12" : 1.2,
+    "SSTL12"   : 1.2,
+    "POD12"    : 1.2,
+}
+
+def get_vcco(iostandard):
+    """Return the VCCO of an IOStandard (None for differential/unknown IOStandards)."""
+    if iostandard is None or iostandard.startswith("DIFF_"):
+        return None
+    return iostandard_vcco.get(re.sub(r"(_R|_T_DCI|_DCI|_F|_S)$", "", iostandard), None)
+
+def load_package(filename):
+    """Return the pin --> bank map of a package file (Xilinx pkg.txt or pin,bank CSV file)."""
+    banks  = {}
+    column = None
+    with open(filename) as f:
+        for line in f:
+            if "," in line:
+                fields = [field.strip() for field in line.split(",")]
+                if len(fields) >= 2 and fields[1].isdigit():
+                    banks[fields[0]] = int(fields[1])
+                continue
+            fields = line.split()
+            if fields[:1] == ["Pin"]:
+                # Header: "Pin  Pin Name  Memory Byte Group  Bank  ..." (2+ spaces separated).
+                header = re.split(r"\s{2,}", line.strip())
+                column = header.index("Bank") if "Bank" in header else None
+                continue
+            if column is not None and len(fields) > column and fields[column].isdigit():
+                banks[fields[0]] = int(fields[column])
+    return banks
+
+def find_package(device, packages_dir):
+    """Return the package file of a device in packages_dir (ex: xc7a35tcsg324pkg.txt for
+    xc7a35ticsg324-1L)."""
+    if packages_dir is None or device is None:
+        return None
+    base = device.lower().split("-")[0]
+    # Device names can have a temperature grade that the package file names don't have.
+    candidates = {base} | {base[:i] + base[i+1:] for i in range(len(base))}
+    for f in sorted(os.listdir(packages_dir)):
+        name, ext = os.path.splitext(f)
+        if name.endswith("pkg"):
+            name = name[:-3]
+        if ext in [".txt", ".csv"] and name.lower() in candidates:
+            return os.path.join(packages_dir, f)
+    return None
+
+# Checks -------------------------------------------------------------------------------------------
+
+# Pins of the resources that are not package pins (ex: Zynq PS7 ("-") and Gowin embedded SDRAM resources).
+placeholder_pins = [None, "X", "-"]
+
+def _pin_standards(index):
+    """Return the [(pin, (name, number, subsignal), iostandard)] of the resources of an index."""
+    r = []
+    for resource in index.io:
+        top = [c.name for c in resource[2:] if isinstance(c, IOStandard)]
+        for element in resource[2:]:
+            if isinstance(element, Pins):
+                pins, subsignal, standards = element.identifiers, None, top
+            elif isinstance(element, Subsignal):
+                pins = []
+                for c in element.constraints:
+                    if isinstance(c, Pins):
+                        pins = c.identifiers
+                sub       = [c.name for c in element.constraints if isinstance(c, IOStandard)]
+                subsignal = element.name
+                standards = sub or top
+            else:
+                continue
+            for identifier in pins:
+                try:
+                    pin = index.resolve(identifier)
+                except (KeyError, IndexError):
+                    pin = identifier
+                r.append((pin, (resource[0], resource[1], subsignal), (standards or [None])[0]))
+    return r
+
+def check_index(index, banks={}, base=None, show_alternatives=False, shared=[]):
+    """Check the pins of a PinIndex (only the ones of the indexes after base if not None).
+
+    shared: names of the resources sharing pins by design (see shared_resources).
+
+    Returns the pin conflicts [(pin, owners)] and bank conflicts [(bank, {vcco: owners})].
+    """
+    indexes = index.chain()
+    checked = indexes[indexes.index(base) + 1:] if base is not None else indexes
+    checked_owners = {owner for i in checked for owners in i.pins.values() for owner in owners}
+
+    # Pins claimed by several resources/subsignals.
+    conflicts = []
+    for pin, owners in sorted(index.conflicts().items()):
+        if pin in placeholder_pins:
+            continue
+        if not any(owner in checked_owners for owner in owners):
+            continue
+        if not show_alternatives and is_alternative(owners, shared):
+            continue
+        conflicts.append((pin, owners))
+
+    # Banks with different VCCOs.
+    bank_vccos = {}
+    for i in indexes:
+        for pin, owner, iostandard in _pin_standards(i):
+            vcco = get_vcco(iostandard)
+            if vcco is None or pin not in banks:
+                continue
+            bank_vccos.setdefault(banks[pin], {}).setdefault(vcco, []).append(owner)
+    bank_conflicts = []
+    for bank, vccos in sorted(bank_vccos.items()):
+        if len(vccos) > 1 and any(o in checked_owners for owners in vccos.values() for o in owners):
+            bank_conflicts.append((bank, vccos))
+    return conflicts, bank_conflicts
+
+class CheckResult:
+    def __init__(self, name, conflicts=[], bank_conflicts=[], banks_checked=False, error=None,
+        skipped=None):
+        self.name           = name
+        self.conflicts      = conflicts
+        self.bank_conflicts = bank_conflicts
+        self.banks_checked  = banks_checked
+        self.error          = error
+        self.skipped        = skipped
+
+    @property
+    def ok(self):
+        return self.error is None and not self.conflicts and not self.bank_conflicts
+
+class SkipCheck(Exception):
+    pass
+
+def _create_platform(platform, kwargs):
+    module = importlib.import_module(f"litex_boards.platforms.{platform}")
+    if not hasattr(module, "Platform"):
+        raise SkipCheck("no Platform.")
+    try:
+        return module.Platform(**kwargs)
+    except OSError as e:
+        # Platforms requiring their toolchain (ex: Efinix).
+        raise SkipCheck(str(e).splitlines()[0])
+
+def _banks(platform, packages_dir):
+    package = find_package(platform.device, packages_dir)
+    return (load_package(package), True) if package is not None else ({}, False)
+
+def check_platform(platform, kwargs={}, packages_dir=None, show_alternatives=False):
+    """Check the IOs of a platform (created with kwargs)."""
+    name = platform + "".join(f" {k}={v}" for k, v in kwargs.items())
+    try:
+        p = _create_platform(platform, kwargs)
+        banks, banks_checked = _banks(p, packages_dir)
+        conflicts, bank_conflicts = check_index(get_pin_index(p), banks,
+            show_alternatives = show_alternatives,
+            shared            = shared_resources.get(platform, []))
+        return CheckResult(name, conflicts, bank_conflicts, banks_checked)
+    except SkipCheck as e:
+        return CheckResult(name, skipped=str(e))
+    except Exception as e:
+        return CheckResult(name, error=f"{type(e).__name__}: {e}")
+
+# Constraints of the literal IO lists.
+constraints = {c.__name__: c for c in [Pins, Subsignal, IOStandard, Drive, Misc, Inverted]}
+
+def _literal_io(node, module, names):
+    """Return the value of a literal IO list node (raises ValueError when not literal).
+
+    Only literals, lists/tuples (and their concatenations), constraints (Pins(...), etc...), the
+    literal IO lists assigned in the target (names) and the IO lists of the platform modules
+    (ex: arty._sdcard_pmod_io) are accepted: nothing of the target is executed.
+    """
+    literal = lambda node: _literal_io(node, module, names)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [literal(e) for e in node.elts]
+        return values if isinstance(node, ast.List) else tuple(values)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
+        return literal(node.left) + literal(node.right)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in constraints:
+        return constraints[node.func.id](*[literal(a) for a in node.args],
+            **{k.arg: literal(k.value) for k in node.keywords})
+    if isinstance(node, ast.Name) and node.id in names:
+        return literal(names[node.id])
+    if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and
+        getattr(getattr(module, node.value.id, None), "__name__", "").startswith("litex_boards.platforms.")):
+        value = getattr(getattr(module, node.value.id), node.attr)
+        if isinstance(value, list):
+            return value
+    return ast.literal_eval(node)
+
+def get_extensions(target):
+    """Return the [(source, io)] of the extensions added by a target (platform.add_extension(...)).
+
+    The extensions are parsed as literal IO lists (see _literal_io), the other ones (ex: built by
+    code) are returned with a None io.
+    """
+    try:
+        module = importlib.import_module(f"litex_boards.targets.{target}")
+    except ImportError as e:
+        # Targets requiring cores that are not installed (ex: LiteHyperBus).
+        raise SkipCheck(f"{type(e).__name__}: {e}")
+    source = open(module.__file__).read()
+    tree   = ast.parse(source)
+    names  = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            names.setdefault(node.targets[0].id, node.value)
+    extensions = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Attribute) and
+            node.func.attr == "add_extension" and node.args):
+            expression = ast.get_source_segment(source, node.args[0])
+            try:
+                io = _literal_io(node.args[0], module, names)
+            except (ValueError, TypeError, RecursionError):
+                io = None
+            extensions.append((expression, io))
+    return extensions
+
+def check_target(target, platform, kwargs={}, packages_dir=None, show_alternatives=False):
+    """Check the extensions added by a target on its platform."""
+    results = []
+    try:
+        p     = _create_platform(platform, kwargs)
+        base  = get_pin_index(p)
+        banks, banks_checked = _banks(p, packages_dir)
+        for expression, io in get_extensions(target):
+            name = f"{target}: {expression}"
+            if io is None:
+                results.append(CheckResult(name, skipped="not a literal IO list."))
+                continue
+            conflicts, bank_conflicts = check_index(PinIndex(io, parent=base), banks,
+                base              = base,
+                show_alternatives = show_alternatives,
+                shared            = shared_resources.get(platform, []))
+            results.append(CheckResult(name, conflicts, bank_conflicts, banks_checked))
+    except SkipCheck as e:
+        results.append(CheckResult(target, skipped=str(e)))
+    except Exception as e:
+        results.append(CheckResult(target, error=f"{type(e).__name__}: {e}"))
+    return results
+
+def check(platforms=None, targets=False, packages_dir=None, show_alternatives=False, jobs=None):
+    """Check the platforms (all if None, with all their variants) and their targets' extensions.
+
+    Returns the CheckResults (platforms then targets' extensions).
+    """
+    registry = load_registry()
+    if platforms is None:
+        platforms = list(registry["platforms"].keys())
+    platform_jobs = []
+    for platform in platforms:
+        variants = registry["platforms"][platform]["variants"]
+        platform_jobs.append((platform, {}))
+        for param, values in variants.items():
+            platform_jobs += [(platform, {param: value}) for value in values]
+    target_jobs = []
+    if targets:
+        for target, info in registry["targets"].items():
+            if info["platforms"] and info["platforms"][0] in platforms:
+                target_jobs.append((target, info["platforms"][0]))
+
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        platform_futures = [executor.submit(check_platform, platform, kwargs, packages_dir,
+            show_alternatives) for platform, kwargs in platform_jobs]
+        target_futures   = [executor.submit(check_target, target, platform, {}, packages_dir,
+            show_alternatives) for target, platform in target_jobs]
+        # Variants with the same IOs report the same conflicts: only keep the first ones.
+        results = []
+        seen    = set()
+        for (platform, kwargs), future in zip(platform_jobs, platform_futures):
+            result = future.result()
+            key    = (platform, repr(result.conflicts), repr(result.bank_conflicts), result.error,
+                result.skipped)
+            if key not in seen:
+                seen.add(key)
+                results.append(result)
+        for future in target_futures:
+            results += future.result()
+    return results
+
+# Main ---------------------------------------------------------------------------------------------
+
+def _owner(owner):
+    name, number, subsignal = owner
+    return f"{name}:{number}" + (f".{subsignal}" if subsignal is not None else "")
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards pin conflicts/bank VCCO checker.")
+    parser.add_argument("platforms",  nargs="*",                    help="Platforms to check (default: all).")
+    parser.add_argument("--targets",  action="store_true",          help="Also check the extensions added by the targets.")
+    parser.add_argument("--packages", default=None,                 help="Directory of the package files (bank checks).")
+    parser.add_argument("--all",      action="store_true",          help="Also report the alternative resources (ex: spiflash/spiflash4x).")
+    parser.add_argument("--jobs",     default=None, type=int,       help="Number of processes (default: number of CPUs).")
+    parser.add_argument("--verbose",  action="store_true",          help="Also report the checks without conflicts/errors.")
+    args = parser.parse_args()
+
+    from litex_boards import resolve_short_name
+    platforms = None
+    if args.platforms:
+        platforms = []
+        for platform in args.platforms:
+            full_name = resolve_short_name("platforms", platform)
+            platforms.append(full_name.split(".")[-1] if full_name is not None else platform)
+
+    results = check(platforms, args.targets, args.packages, args.all, args.jobs)
+    for result in results:
+        if result.skipped is not None:
+            if args.verbose:
+                print(f"{result.name}: skipped ({result.skipped})")
+            continue
+        if result.ok:
+            if args.verbose:
+                banks = "" if result.banks_checked else " (banks not checked)"
+                print(f"{result.name}: OK{banks}")
+            continue
+        print(f"{result.name}:")
+        if result.error is not None:
+            print(f"    {result.error}")
+        for pin, owners in result.conflicts:
+            print(f"    pin {pin} used by " + ", ".join(_owner(o) for o in owners))
+        for bank, vccos in result.bank_conflicts:
+            vccos = [f"{vcco}V ({', '.join(_owner(o) for o in owners)})"
+                for vcco, owners in sorted(vccos.items())]
+            print(f"    bank {bank}: " + ", ".join(vccos))
+    nconflicts = sum(len(r.conflicts) + len(r.bank_conflicts) for r in results)
+    nerrors    = sum(r.error is not None for r in results)
+    nskipped   = sum(r.skipped is not None for r in results)
+    print(f"{len(results)} checks: {nconflicts} conflicts, {nerrors} errors, {nskipped} skipped.")
+    sys.exit(1 if (nconflicts or nerrors) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import importlib
+import functools
+
+from litex_boards.tools.registry import load_registry
+
+"""
+Farm loader: loads bitstreams on a farm of boards concurrently (one worker per cable).
+
+The programmers are the ones of the platforms (create_programmer(), with the OpenOCD configs of
+litex_boards/prog), only their commands are run concurrently with the cable of each board selected
+by its serial number (or USB location):
+
+- openocd        : adapter serial <serial> / adapter usb location <location>.
+- openFPGALoader : --ftdi-serial <serial> / --busdev-num <location>.
+- ecpdap         : --probe <serial> (probe as VID:PID:serial or index).
+
+Programmers running their tools directly (ex VivadoProgrammer) instead of through call() are not
+supported.
+
+Ex (with the bitstreams of build/<platform>/gateware):
+    ./farm_load.py --board digilent_arty,210319A1B2C3 --board digilent_arty,210319A1B2C4 \\
+                   --board lambdaconcept_ecpix5,usb:001:012 --board colorlight_i5,0d28:0204:0001
+    ./farm_load.py --farm farm.json # [{"target": "digilent_arty", "cable": "210319A1B2C3"}, ...]
+"""
+
+prog_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "prog")
+
+# Board --------------------------------------------------------------------------------------------
+
+class FarmBoard:
+    """Board of the farm: target (or platform), cable (serial or usb:<location>, None: default
+    cable), bitstream (default: build/<platform>/gateware/<platform><ext>) and Platform arguments."""
+    def __init__(self, target, cable=None, bitstream=None, **platform_kwargs):
+        self.target          = target
+        self.cable           = cable
+        self.bitstream       = bitstream
+        self.platform_kwargs = platform_kwargs
+
+    def __repr__(self):
+        return "{}@{}".format(self.target, self.cable if self.cable is not None else "default")
+
+class FarmResult:
+    def __init__(self, board, commands=None, duration=0.0, returncode=None, output=""):
+        self.board      = board
+        self.commands   = commands
+        self.duration   = duration
+        self.returncode = returncode
+        self.output     = output
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+@functools.lru_cache(maxsize=None)
+def _registry():
+    return load_registry()
+
+def get_platform(target, **kwargs):
+    """Return the Platform of a target (or platform) from the registry (the target is not imported)."""
+    registry = _registry()
+    if target in registry["targets"]:
+        platforms = registry["targets"][target]["platforms"]
+        if not platforms:
+            raise ValueError(f"Farm: no platform found for target {target}.")
+        target = platforms[0]
+    elif target not in registry["platforms"]:
+        raise ValueError(f"Farm: unknown target/platform {target}.")
+    module = importlib.import_module(f"litex_boards.platforms.{target}")
+    return module.Platform(**kwargs)
+
+# Commands -----------------------------------------------------------------------------------------
+
+def _select_cable(command, cable):
+    """Return the command with the cable selected."""
+    if cable is None:
+        return command
+    usb  = cable.startswith("usb:")
+    name = cable[4:] if usb else cable
+    tool = os.path.basename(command[0])
+    if tool == "openocd":
+        # Selected after the config (adapter driver) and before the script (init).
+        select = "adapter usb location {}" if usb else "adapter serial {}"
+        return command[:3] + ["-c", select.format(name)] + command[3:]
+    if tool == "openFPGALoader":
+        return command[:1] + (["--busdev-num", name] if usb else ["--ftdi-serial", name]) + command[1:]
+    if tool == "ecpdap":
+        if usb:
+            raise ValueError("Farm: ecpdap probes are selected by serial number (VID:PID:serial).")
+        return command[:2] + ["--probe", name] + command[2:]
+    raise ValueError(f"Farm: cable selection not supported with {tool}.")
+
+def _call_programmers():
+    """Return the LiteX programmers loading their bitstreams through call() (the only commands
+    recorded); the other ones (ex: VivadoProgrammer, DFUProg) run their tools directly."""
+    from litex.build.generic_programmer import GenericProgrammer
+    from litex.build.openocd import OpenOCD
+    from litex.build.openfpgaloader import OpenFPGALoader
+    from litex.build.altera.programmer import USBBlaster
+    from litex.build.gowin.programmer import GowinProgrammer
+    from litex.build.lattice.programmer import LatticeProgrammer, OpenOCDJTAGProgrammer
+    from litex.build.lattice.programmer import IceStormProgrammer, IceSugarProgrammer, IceBurnProgrammer
+    from litex.build.lattice.programmer import UJProg, EcpDapProgrammer, EcpprogProgrammer
+    from litex.build.xilinx.programmer import XC3SProg, FpgaProg, Adept
+    return GenericProgrammer, [OpenOCD, OpenFPGALoader, USBBlaster, GowinProgrammer,
+        LatticeProgrammer, OpenOCDJTAGProgrammer, IceStormProgrammer, IceSugarProgrammer,
+        IceBurnProgrammer, UJProg, EcpDapProgrammer, EcpprogProgrammer, XC3SProg, FpgaProg, Adept]
+
+def _uses_call(prog):
+    """Return whether the programmer loads bitstreams through GenericProgrammer.call: its
+    load_bitstream has to be the one of a known call() programmer (not overridden) and its call the
+    one of GenericProgrammer."""
+    generic, programmers = _call_programmers()
+    cls   = type(prog)
+    owner = next((c for c in cls.__mro__ if "load_bitstream" in vars(c)), None)
+    return owner in programmers and getattr(cls, "call", None) is generic.call
+
+def get_commands(board):
+    """Return the commands loading the bitstream on the board (from the platform's programmer)."""
+    platform  = get_platform(board.target, **board.platform_kwargs)
+    bitstream = board.bitstream
+    if bitstream is None:
+        bitstream = os.path.join("build", platform.name, "gateware", platform.name + platform.bitstream_ext)
+    if not os.path.exists(bitstream):
+        raise FileNotFoundError(f"Farm: bitstream {bitstream} not found for {board}.")
+    prog = platform.create_programmer()
+    # Use the OpenOCD configs of LiteX-Boards (instead of a download).
+    config = getattr(prog, "config", None)
+    if isinstance(config, str) and os.path.exists(os.path.join(prog_dir, config)):
+        prog.prog_local = prog_dir
+    # Record the commands of the programmer (run by the workers).
+    if not _uses_call(prog):
+        raise ValueError(f"Farm: {type(prog).__name__} of {board} not supported (not using call()).")
+    commands  = []
+    prog.call = lambda command, check=True: commands.append([str(c) for c in command])
+    prog.load_bitstream(bitstream)
+    if not commands:
+        raise ValueError(f"Farm: no command recorded from {type(prog).__name__} for {board}.")
+    return [_select_cable(command, board.cable) for command in commands]
+
+# Load ---------------------------------------------------------------------------------------------
+
+async def _run(board, commands, timeout):
+    result = FarmResult(board, commands)
+    start  = time.monotonic()
+    output = []
+    try:
+        for command in commands:
+            process = await asyncio.create_subprocess_exec(*command,
+                stdout = asyncio.subprocess.PIPE,
+                stderr = asyncio.subprocess.STDOUT)
+            try:
+                stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                output.append(f"Timeout after {timeout}s.")
+                result.returncode = -1
+                break
+            output.append(stdout.decode(errors="replace"))
+            result.returncode = process.returncode
+            if process.returncode != 0:
+                break
+    except OSError as e:
+        output.append(str(e))
+        result.returncode = -1
+    result.duration = time.monotonic() - start
+    result.output   = "".join(output)
+    return result
+
+async def load_farm(boards, timeout=None):
+    """Load the boards' bitstreams, concurrently between cables (sequentially on a cable).
+
+    Returns a FarmResult per board (in order) with its duration, return code and output.
+    """
+    # Commands (generated sequentially, programmers can write files: ex bit --> svf).
+    results  = [None]*len(boards)
+    commands = {}
+    for n, board in enumerate(boards):
+        try:
+            commands[n] = get_commands(board)
+        except (OSError, ValueError) as e:
+            results[n] = FarmResult(board, returncode=-1, output=str(e))
+
+    # One worker per cable.
+    cables = {}
+    for n in commands:
+        cables.setdefault(boards[n].cable, []).append(n)
+    async def worker(ns):
+        for n in ns:
+            results[n] = await _run(boards[n], commands[n], timeout)
+    await asyncio.gather(*[worker(ns) for ns in cables.values()])
+    return results
+
+def load(boards, timeout=None):
+    """Blocking version of load_farm."""
+    return asyncio.run(load_farm(boards, timeout))
+
+# Main ---------------------------------------------------------------------------------------------
+
+def _board(arg):
+    target, cable, bitstream = (arg.split(",") + [None, None])[:3]
+    return FarmBoard(target, cable or None, bitstream or None)
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards farm loader (concurrent bitstream loads).")
+    parser.add_argument("--board",   action="append", default=[],   help="Board as target[,cable[,bitstream]] (can be repeated).")
+    parser.add_argument("--farm",    default=None,                  help="Farm JSON file: list of {target, cable, bitstream, platform arguments}.")
+    parser.add_argument("--timeout", default=None, type=float,      help="Timeout of a board's load in seconds.")
+    parser.add_argument("--verbose", action="store_true",           help="Print the programmers' output.")
+    args = parser.parse_args()
+
+    boards = [_board(arg) for arg in args.board]
+    if args.farm is not None:
+        with open(args.farm) as f:
+            boards += [FarmBoard(**board) for board in json.load(f)]
+    if not boards:
+        parser.error("no board, use --board or --farm.")
+
+    start   = time.monotonic()
+    results = load(boards, args.timeout)
+    for result in results:
+        print("{:<40} {:>8.2f}s {}".format(repr(result.board), result.duration,
+            "OK" if result.ok else "FAILED ({})".format(result.returncode)))
+        if args.verbose or not result.ok:
+            for line in result.output.splitlines():
+                print("    " + line)
+    print("{}/{} boards loaded in {:.2f}s.".format(
+        sum(result.ok for result in results), len(results), time.monotonic() - start))
+    sys.exit(0 if all(result.ok for result in results) else 1)
+
+if __name__ == "__main__":
+    main()
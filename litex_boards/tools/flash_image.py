@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import hashlib
+import argparse
+
+"""
+SPI Flash image composer for the targets.
+
+Composes a single Flash image from a layout of regions (bitstream, BIOS, firmware, user data) at
+given offsets, so that a single programmer session writes everything. The image is built in one
+buffer (gaps filled with 0xff, the erased value of the Flash) and written in one go; regions are
+checked for overlaps and against the Flash size.
+
+Ex (in a target):
+    image = FlashImage(flash_size=16*MB)
+    image.add("bitstream", 0x00000000,        os.path.join(builder.gateware_dir, f"{soc.build_name}.bin"))
+    image.add("bios",      bios_flash_offset, os.path.join(builder.software_dir, "bios", "bios.bin"))
+    prog.flash(0, image.write(os.path.join(builder.output_dir, "image.bin")))
+
+Differential flashing: FlashImage.flash() can only erase/program the sectors that changed since the
+last image written to the board, recorded (per-sector SHA-256) in a FlashState:
+    image.flash(prog, os.path.join(builder.output_dir, "image.bin"),
+        state = FlashState(soc.build_name, board=board_id(prog)),
+        diff  = True)
+
+The record is kept per board, identified by the USB serial of its programming cable (board_id()).
+When the board can't be identified (unknown cable, several cables connected), the whole image is
+written. Flashing a board with another tool invalidates its record: flash it once without diff.
+
+Ex (standalone):
+    ./flash_image.py --flash-size=0x1000000 -o image.bin 0x0:top.bin 0x40000:bios.bin
+"""
+
+flash_state_dir_default = os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "flash")
+
+# Files --------------------------------------------------------------------------------------------
+
+def read_image_file(filename):
+    """Read a binary (.bin, etc...) or Efinix hex (.hex, one hex byte per line) file."""
+    if os.path.splitext(filename)[1] == ".hex":
+        with open(filename, "r") as f:
+            return bytes.fromhex("".join(line[:2] for line in f.read().split()))
+    with open(filename, "rb") as f:
+        return f.read()
+
+def write_image_file(filename, data):
+    """Write a binary or Efinix hex (.hex) file."""
+    if os.path.splitext(filename)[1] == ".hex":
+        with open(filename, "w") as f:
+            f.write("".join("{:02X}\n".format(b) for b in data))
+    else:
+        with open(filename, "wb") as f:
+            f.write(data)
+
+# Sectors ------------------------------------------------------------------------------------------
+
+def sector_hashes(data, sector_size):
+    """Return the SHA-256 of each sector of data."""
+    return [hashlib.sha256(data[i:i + sector_size]).hexdigest() for i in range(0, len(data), sector_size)]
+
+def changed_sectors(data, sector_size, hashes=None):
+    """Return the (offset, length) runs of sectors of data that differ from hashes (all if None)."""
+    runs = []
+    for n, h in enumerate(sector_hashes(data, sector_size)):
+        if hashes is not None and n < len(hashes) and hashes[n] == h:
+            continue
+        offset = n*sector_size
+        length = min(sector_size, len(data) - offset)
+        if len(runs) and sum(runs[-1]) == offset:
+            runs[-1] = (runs[-1][0], runs[-1][1] + length)
+        else:
+            runs.append((offset, length))
+    return runs
+
+# Board Identification -----------------------------------------------------------------------------
+
+# USB VID/PID of the programming cables of the programmers (FTDI, iCELink).
+programmer_usb_ids = {
+    "IceStormProgrammer" : [(0x0403, 0x6010), (0x0403, 0x6014)],
+    "IceSugarProgrammer" : [(0x1d50, 0x602b)],
+    "OpenFPGALoader"     : [(0x0403, 0x6010), (0x0403, 0x6011), (0x0403, 0x6014), (0x0403, 0x6015)],
+}
+
+def board_id(prog, sysfs_dir="/sys/bus/usb/devices"):
+    """Return an identifier (cable's USB VID:PID:serial) of the board programmed by prog.
+
+    None when the programmer's cable is unknown or when it is not the only one connected (the
+    programmer would then select one of them).
+    """
+    ids = programmer_usb_ids.get(type(prog).__name__, [])
+    def read(device, name):
+        try:
+            with open(os.path.join(sysfs_dir, device, name)) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    boards = []
+    if os.path.isdir(sysfs_dir):
+        for device in sorted(os.listdir(sysfs_dir)):
+            vid, pid = read(device, "idVendor"), read(device, "idProduct")
+            if vid is None or pid is None or (int(vid, 16), int(pid, 16)) not in ids:
+                continue
+            boards.append("{}:{}:{}".format(vid, pid, read(device, "serial")))
+    if len(boards) != 1 or boards[0].endswith(":None"):
+        return None
+    return boards[0]
+
+# Flash State --------------------------------------------------------------------------------------
+
+class FlashState:
+    """Record of the last image written to the Flash of a board (per-sector hashes).
+
+    Records are per target and board (None: unidentified board, nothing is recorded).
+    """
+    def __init__(self, name, board=None, state_dir=flash_state_dir_default):
+        self.board    = board
+        self.filename = None
+        if board is not None:
+            self.filename = os.path.join(state_dir, name, board.replace(":", "_") + ".json")
+
+    def load(self, sector_size):
+        """Return the recorded sector hashes (None if unknown or recorded with another sector size)."""
+        if self.filename is None:
+            return None
+        try:
+            with open(self.filename) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("sector_size", None) != sector_size:
+            return None
+        return state["hashes"]
+
+    def save(self, data, sector_size):
+        if self.filename is None:
+            return
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        with open(self.filename, "w") as f:
+            json.dump({
+                "size"        : len(data),
+                "sha256"      : hashlib.sha256(data).hexdigest(),
+                "sector_size" : sector_size,
+                "hashes"      : sector_hashes(data, sector_size),
+            }, f, indent=1)
+
+    def clear(self):
+        if self.filename is not None and os.path.exists(self.filename):
+            os.remove(self.filename)
+
+# Flash Image --------------------------------------------------------------------------------------
+
+class FlashImage:
+    def __init__(self, flash_size=None, fill=0xff):
+        self.flash_size = flash_size
+        self.fill       = fill
+        self.regions    = []
+
+    def add(self, name, offset, data, max_size=None):
+        """Add data (bytes or filename) at offset, optionally limited to max_size bytes."""
+        if isinstance(data, str):
+            data = read_image_file(data)
+        if max_size is not None and len(data) > max_size:
+            raise ValueError("Flash image: {} ({} bytes) larger than its region ({} bytes).".format(
+                name, len(data), max_size))
+        end = offset + len(data)
+        if self.flash_size is not None and end > self.flash_size:
+            raise ValueError("Flash image: {} (0x{:08x}-0x{:08x}) exceeds Flash size (0x{:08x}).".format(
+                name, offset, end, self.flash_size))
+        for _name, _offset, _data in self.regions:
+            if offset < _offset + len(_data) and _offset < end:
+                raise ValueError("Flash image: {} (0x{:08x}-0x{:08x}) overlaps {} (0x{:08x}-0x{:08x}).".format(
+                    name, offset, end, _name, _offset, _offset + len(_data)))
+        self.regions.append((name, offset, data))
+
+    @property
+    def size(self):
+        return max([offset + len(data) for _, offset, data in self.regions], default=0)
+
+    def get_image(self):
+        image = bytearray([self.fill])*self.size
+        for _, offset, data in self.regions:
+            image[offset:offset + len(data)] = data
+        return image
+
+    def write(self, filename):
+        """Write the image (binary or Efinix hex from the extension) and return its filename."""
+        write_image_file(filename, self.get_image())
+        return filename
+
+    def flash(self, prog, filename, sector_size=64*1024, state=None, diff=False):
+        """Write the image with prog.flash(offset, filename) and record it in state. filename is
+        (over)written with the image (and the runs, next to it): not one of the files added.
+
+        With diff, only the sectors that changed since the image recorded in state are written (one
+        prog.flash call per run of sectors). sector_size has to be the erase size of the programmer
+        (iceprog/icesprog erase 64KB blocks). Returns the written (offset, length) runs.
+        """
+        data   = self.get_image()
+        hashes = state.load(sector_size) if (state is not None and diff) else None
+        runs   = changed_sectors(data, sector_size, hashes)
+        write_image_file(filename, data)
+        if diff and state is not None and state.board is None:
+            print("Flash image: board not identified, writing the whole image.")
+        if hashes is not None:
+            print("Flash image: {} of {} sectors changed.".format(
+                sum((length + sector_size - 1)//sector_size for _, length in runs),
+                (len(data) + sector_size - 1)//sector_size))
+        # Invalidate record during programming (partially written image if interrupted).
+        if state is not None:
+            state.clear()
+        if runs == [(0, len(data))]:
+            prog.flash(0, filename)
+        else:
+            base, ext = os.path.splitext(filename)
+            for offset, length in runs:
+                run_filename = "{}_0x{:08x}{}".format(base, offset, ext)
+                write_image_file(run_filename, data[offset:offset + length])
+                prog.flash(offset, run_filename)
+        if state is not None:
+            state.save(data, sector_size)
+        return runs
+
+    def __str__(self):
+        r = []
+        for name, offset, data in sorted(self.regions, key=lambda region: region[1]):
+            r.append("0x{:08x}-0x{:08x}: {} ({} bytes)".format(offset, offset + len(data), name, len(data)))
+        return "\n".join(r)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards SPI Flash image composer.")
+    parser.add_argument("--flash-size", default=None,       help="Flash size (checked if set).")
+    parser.add_argument("-o", "--output", default="image.bin", help="Output image (.bin or .hex).")
+    parser.add_argument("regions", nargs="+",                help="Regions as offset:filename.")
+    args = parser.parse_args()
+
+    image = FlashImage(flash_size=None if args.flash_size is None else int(args.flash_size, 0))
+    for region in args.regions:
+        offset, filename = region.split(":", 1)
+        image.add(filename, int(offset, 0), filename)
+    image.write(args.output)
+    print(image)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import re
+import sys
+import argparse
+import subprocess
+
+"""
+Measure the startup cost of importing a board with python -X importtime.
+
+Ex:
+    ./import_bench.py                                      # from litex_boards.platforms import arty
+    ./import_bench.py --statement="from litex_boards.targets import arty"
+    ./import_bench.py --eager                              # Previous behaviour: import all boards.
+
+--eager imports all the vendor-prefixed platforms/targets before the statement, which is what
+importing litex_boards used to do, and gives the reference to compare against.
+"""
+
+# Eager import (previous behaviour) ----------------------------------------------------------------
+
+eager_statement = """
+import os, importlib, litex_boards
+for package in ["platforms", "targets"]:
+    for name in litex_boards.short_names[package].values():
+        try:
+            importlib.import_module(f"litex_boards.{package}.{name}")
+        except ModuleNotFoundError:
+            pass
+"""
+
+# Import Time --------------------------------------------------------------------------------------
+
+def import_time(statement, eager=False):
+    """Run statement in a fresh interpreter and return (total time in us, imported modules)."""
+    if eager:
+        statement = eager_statement + statement
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+        stdout = subprocess.PIPE,
+        stderr = subprocess.PIPE,
+        universal_newlines = True)
+    if r.returncode != 0:
+        raise RuntimeError(r.stderr.splitlines()[-1])
+    total   = 0
+    modules = []
+    for line in r.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if m is None:
+            continue
+        self_us, cumulative_us, indent, module = m.groups()
+        total += int(self_us)
+        modules.append(module)
+    return total, modules
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards import time benchmark.")
+    parser.add_argument("--statement", default="from litex_boards.platforms import arty",
+        help="Python statement to benchmark.")
+    parser.add_argument("--eager",   action="store_true", help="Import all boards first (previous behaviour).")
+    parser.add_argument("--repeat",  default=5, type=int, help="Number of runs (best one is reported).")
+    args = parser.parse_args()
+
+    runs = [import_time(args.statement, eager=args.eager) for _ in range(args.repeat)]
+    total, modules = min(runs, key=lambda r: r[0])
+    boards = [m for m in modules if m.startswith(("litex_boards.platforms.", "litex_boards.targets."))]
+    print(f"Statement       : {args.statement}{' (eager)' if args.eager else ''}")
+    print(f"Import time     : {total/1e3:.1f}ms (best of {args.repeat})")
+    print(f"Imported modules: {len(modules)}")
+    print(f"Imported boards : {len(boards)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import json
+import filecmp
+import shutil
+import tarfile
+import hashlib
+import argparse
+import tempfile
+import urllib.request
+
+"""
+Offline provisioning of the vendor IPs/third-party sources used by the targets.
+
+Artifacts (pre-generated XCIs, ValentyUSB, etc...) are resolved from a local content-addressed
+cache (blobs stored by SHA-256 and verified on use) instead of being downloaded/cloned in the
+current directory on each run. Targets only read from the cache (no subprocess); a missing artifact
+is fetched once (unless offline) and its SHA-256 is pinned in the cache index when not already
+pinned in the manifest below (and printed, to be pinned in the manifest).
+
+Vivado generates the IP outputs next to the XCIs: provision_ip() gives each build its own copy of
+an XCI, in the build's output directory.
+
+Offline build nodes are pre-seeded from a tarball exported on a connected machine:
+    ./provision.py --fetch                       # Fetch all artifacts in the cache.
+    ./provision.py --export seed.tar.gz          # Export cache.
+    ./provision.py --import seed.tar.gz          # Import cache (checksum-verified) on the build node.
+
+Environment:
+    LITEX_BOARDS_PROVISION_DIR : Cache directory (default: ~/.cache/litex_boards/provision).
+    LITEX_BOARDS_OFFLINE       : Never fetch, fail on missing artifacts.
+"""
+
+provision_dir_default = os.path.join(os.path.expanduser("~"), ".cache", "litex_boards", "provision")
+
+# Artifacts ----------------------------------------------------------------------------------------
+
+# kind "file": single file, kind "tarball": .tar.gz extracted (path of its top directory returned).
+# sha256: None to pin the artifact on first fetch/import.
+artifacts = {
+    "redpitaya_ps7_xci" : {
+        "kind"     : "file",
+        "url"      : "https://kmf2.trabucayre.com/redpitaya_ps7.txt",
+        "filename" : "redpitaya_ps7.xci",
+        "sha256"   : None,
+    },
+    "zybo_z7_ps7_xci" : {
+        "kind"     : "file",
+        "url"      : "https://github.com/litex-hub/litex-boards/files/4967144/zybo_z7_ps7.txt",
+        "filename" : "zybo_z7_ps7.xci",
+        "sha256"   : None,
+    },
+    "valentyusb" : {
+        "kind"     : "tarball",
+        "url"      : "https://github.com/litex-hub/valentyusb/archive/refs/heads/hw_cdc_eptri.tar.gz",
+        "sha256"   : None,
+    },
+}
+
+class ProvisionError(Exception): pass
+
+# Cache --------------------------------------------------------------------------------------------
+
+def _sha256(filename):
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class ProvisionCache:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.environ.get("LITEX_BOARDS_PROVISION_DIR", provision_dir_default)
+        os.makedirs(os.path.join(self.cache_dir, "blobs"), exist_ok=True)
+
+    def _blob(self, sha256):
+        return os.path.join(self.cache_dir, "blobs", sha256)
+
+    def _atomic_write_json(self, filename, data):
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp, filename)
+
+    # Index (name -> pinned SHA-256).
+    def index(self):
+        try:
+            with open(os.path.join(self.cache_dir, "index.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def pin(self, name, sha256):
+        index = self.index()
+        index[name] = sha256
+        self._atomic_write_json(os.path.join(self.cache_dir, "index.json"), index)
+
+    def expected_sha256(self, name):
+        return artifacts[name]["sha256"] or self.index().get(name, None)
+
+    # Blobs.
+    def add_blob(self, filename, sha256=None):
+        """Add filename to the cache (checked against sha256 if set) and return its SHA-256."""
+        h = _sha256(filename)
+        if sha256 is not None and h != sha256:
+            raise ProvisionError(f"{filename}: SHA-256 mismatch ({h}, expected {sha256}).")
+        if not os.path.exists(self._blob(h)):
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+            os.close(fd)
+            shutil.copyfile(filename, tmp)
+            os.replace(tmp, self._blob(h))
+        return h
+
+    def get_blob(self, sha256):
+        """Return the path of a blob, verifying its content."""
+        blob = self._blob(sha256)
+        if not os.path.exists(blob):
+            return None
+        if _sha256(blob) != sha256:
+            os.remove(blob)
+            raise ProvisionError(f"Corrupted blob {sha256} removed from the cache, fetch/import it again.")
+        return blob
+
+    # Fetch.
+    def fetch(self, name):
+        """Download artifact name in the cache and pin it."""
+        artifact = artifacts[name]
+        print(f"Provision: fetching {name} from {artifact['url']}...")
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f, urllib.request.urlopen(artifact["url"]) as r:
+                shutil.copyfileobj(r, f)
+            sha256 = self.add_blob(tmp, self.expected_sha256(name))
+        finally:
+            os.remove(tmp)
+        if artifact["sha256"] is None and self.index().get(name, None) is None:
+            print(f"Provision: pinned {name} to {sha256} (to pin in the manifest).")
+        self.pin(name, sha256)
+        return sha256
+
+    # Extract.
+    def _extract(self, name, blob, sha256):
+        src_dir = os.path.join(self.cache_dir, "src", sha256)
+        if not os.path.exists(src_dir):
+            os.makedirs(os.path.dirname(src_dir), exist_ok=True)
+            tmp = tempfile.mkdtemp(dir=os.path.dirname(src_dir))
+            with tarfile.open(blob) as tar:
+                for member in tar.getmembers():
+                    path = os.path.realpath(os.path.join(tmp, member.name))
+                    if not path.startswith(os.path.realpath(tmp) + os.sep) or member.issym() or member.islnk():
+                        raise ProvisionError(f"{name}: unsafe tarball member {member.name}.")
+                tar.extractall(tmp)
+            try:
+                os.rename(tmp, src_dir)
+            except OSError:
+                # Already extracted by a concurrent build.
+                shutil.rmtree(tmp, ignore_errors=True)
+        entries = os.listdir(src_dir)
+        return os.path.join(src_dir, entries[0]) if len(entries) == 1 else src_dir
+
+    def get(self, name, fetch=True):
+        sha256 = self.expected_sha256(name)
+        blob   = None if sha256 is None else self.get_blob(sha256)
+        if blob is None:
+            if not fetch or os.environ.get("LITEX_BOARDS_OFFLINE", None):
+                raise ProvisionError(f"{name} not in provision cache ({self.cache_dir}), fetch it "
+                    "(./provision.py --fetch) or import a seed tarball (./provision.py --import).")
+            sha256 = self.fetch(name)
+            blob   = self.get_blob(sha256)
+        if artifacts[name]["kind"] == "tarball":
+            return self._extract(name, blob, sha256)
+        return blob
+
+    # Seed tarball.
+    def export(self, filename):
+        index = self.index()
+        with tarfile.open(filename, "w:gz") as tar:
+            for name, sha256 in sorted(index.items()):
+                tar.add(self._blob(sha256), arcname=f"blobs/{sha256}")
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f, indent=1, sort_keys=True)
+            tar.add(tmp, arcname="index.json")
+            os.remove(tmp)
+
+    def import_(self, filename):
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp:
+            with tarfile.open(filename) as tar:
+                members = [m for m in tar.getmembers() if m.isfile() and
+                    (m.name == "index.json" or (m.name.startswith("blobs/") and "/" not in m.name[6:]))]
+                tar.extractall(tmp, members=members)
+            with open(os.path.join(tmp, "index.json")) as f:
+                index = json.load(f)
+            for name, sha256 in index.items():
+                expected = self.expected_sha256(name) if name in artifacts else None
+                if expected is not None and expected != sha256:
+                    raise ProvisionError(f"{name}: seed SHA-256 ({sha256}) differs from pinned one ({expected}).")
+                self.add_blob(os.path.join(tmp, "blobs", sha256), sha256)
+                self.pin(name, sha256)
+                print(f"Provision: imported {name} ({sha256}).")
+
+# Target API ---------------------------------------------------------------------------------------
+
+def provision(name, copy_dir=None):
+    """Return the path of artifact name from the provision cache.
+
+    Files are returned read-only from the cache; with copy_dir, a copy named after the artifact is
+    made in copy_dir/<sha256 prefix>/ (for tools writing next to their inputs, ex Vivado with XCIs).
+    """
+    if name not in artifacts:
+        raise ProvisionError(f"Unknown artifact {name}, available: {', '.join(artifacts.keys())}.")
+    path = ProvisionCache().get(name)
+    if copy_dir is None:
+        return path
+    sha256  = os.path.basename(path)
+    dst_dir = os.path.join(copy_dir, sha256[:16])
+    dst     = os.path.join(dst_dir, artifacts[name].get("filename", name))
+    if not os.path.exists(dst):
+        os.makedirs(dst_dir, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dst_dir)
+        os.close(fd)
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, dst)
+    return dst
+
+def provision_ip(soc, name):
+    """Return the path of artifact name (Vivado IP, ex: XCI) for soc, copied to the build.
+
+    Vivado generates the IP outputs next to the XCI: to avoid builds sharing (and racing on) them,
+    the XCI added to the platform (with platform.add_ip, ex: through Zynq7000.set_ps7_xci) is moved
+    to <output_dir>/ip/<name>/ when the Builder finalizes the SoC (the output directory is only
+    known then). The returned path is a staging copy, only used without Builder.
+    """
+    from migen import Module
+
+    staging = provision(name, copy_dir=os.path.join(ProvisionCache().cache_dir, "ip"))
+
+    class ProvisionedIP(Module):
+        def do_finalize(self):
+            platform = soc.platform
+            if getattr(platform, "output_dir", None) is None:
+                return
+            src = os.path.abspath(staging)
+            dst = os.path.abspath(os.path.join(platform.output_dir, "ip", name, os.path.basename(staging)))
+            if src not in platform.ips:
+                return
+            if not os.path.exists(dst) or not filecmp.cmp(src, dst, shallow=False):
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                shutil.copyfile(src, dst)
+            platform.ips[dst] = platform.ips.pop(src)
+
+    setattr(soc.submodules, f"provisioned_ip_{name}", ProvisionedIP())
+    return staging
+
+def provision_python_path(name):
+    """Add artifact name (Python sources) to the Python path."""
+    path = provision(name)
+    if path not in sys.path:
+        sys.path.append(path)
+    return path
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards offline provisioning cache.")
+    parser.add_argument("--cache-dir", default=None,     help="Cache directory.")
+    parser.add_argument("--fetch",     nargs="*",        help="Fetch artifacts (all if none specified).")
+    parser.add_argument("--export",    default=None,     help="Export cache to a seed tarball.")
+    parser.add_argument("--import",    default=None,     help="Import a seed tarball.", dest="import_")
+    parser.add_argument("--list",      action="store_true", help="List artifacts.")
+    args = parser.parse_args()
+
+    cache = ProvisionCache(args.cache_dir)
+    if args.import_ is not None:
+        cache.import_(args.import_)
+    if args.fetch is not None:
+        for name in (args.fetch or artifacts.keys()):
+            if cache.expected_sha256(name) is None or cache.get_blob(cache.expected_sha256(name)) is None:
+                cache.fetch(name)
+    if args.export is not None:
+        cache.export(args.export)
+    if args.list:
+        for name in artifacts.keys():
+            sha256 = cache.expected_sha256(name)
+            cached = sha256 is not None and os.path.exists(cache._blob(sha256))
+            print(f"{name:24s} {sha256 or '-':64s} {'cached' if cached else 'missing'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import ast
+import json
+import argparse
+
+from litex_boards import short_names
+
+"""
+Board registry: static index of the platforms/targets of LiteX-Boards.
+
+The registry is built by parsing the platforms/targets sources (no module is imported, so neither
+Migen nor the LiteX cores are required) and records for each platform: the FPGA device(s), default
+clock name/period, toolchain, variants, IOs/connectors names and for each target: its platform,
+options (including the ones added by the litex_boards.soc *_args helpers), SDRAM types and cores
+used.
+
+It is generated at install time (see setup.py) to litex_boards/registry.json and can also be
+generated/queried with:
+
+    ./registry.py --generate
+    ./registry.py --resource=pcie_x4 --memtype=DDR4             # Targets with PCIe x4 and DDR4.
+    ./registry.py --option=--with-sata --family=xilinx          # Xilinx targets with SATA.
+"""
+
+litex_boards_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+registry_file    = os.path.join(litex_boards_dir, "registry.json")
+
+# Helpers ------------------------------------------------------------------------------------------
+
+class _Unknown(Exception): pass
+
+def _eval(node, env):
+    """Evaluate the subset of Python expressions used in platform files (constants, arithmetic,
+    string formatting, dict lookups on variants)."""
+    if isinstance(node, (ast.Constant, ast.Str, ast.Num, ast.NameConstant)): # Python < 3.8.
+        return ast.literal_eval(node)
+    if isinstance(node, ast.Name) and node.id in env:
+        return env[node.id]
+    if isinstance(node, ast.BinOp):
+        l, r = _eval(node.left, env), _eval(node.right, env)
+        op = {ast.Add: lambda a, b: a + b, ast.Sub: lambda a, b: a - b,
+              ast.Mult: lambda a, b: a * b, ast.Div: lambda a, b: a / b}.get(type(node.op), None)
+        if op is not None:
+            return op(l, r)
+    if isinstance(node, ast.JoinedStr):
+        return "".join(str(_eval(v, env)) for v in node.values)
+    if isinstance(node, ast.FormattedValue) and node.format_spec is None:
+        return _eval(node.value, env)
+    if isinstance(node, ast.Dict):
+        return {_eval(k, env): _eval(v, env) for k, v in zip(node.keys, node.values)}
+    if (isinstance(node, ast.Call) and
+        isinstance(node.func, ast.Attribute) and
+        node.func.attr == "format" and not node.keywords):
+        return _eval(node.func.value, env).format(*[_eval(a, env) for a in node.args])
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_eval(node.operand, env)
+    if isinstance(node, ast.Subscript):
+        index = node.slice.value if isinstance(node.slice, ast.Index) else node.slice # Py < 3.9.
+        return _eval(node.value, env)[_eval(index, env)]
+    raise _Unknown
+
+def _try_eval(node, env={}):
+    try:
+        return _eval(node, env)
+    except (_Unknown, KeyError, TypeError):
+        return None
+
+def _resources(tree, prefix):
+    """Collect [name, number] of the IOs/connectors of the module-level lists named prefix*."""
+    resources = []
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.List):
+            if not any(isinstance(t, ast.Name) and t.id.startswith(prefix) for t in node.targets):
+                continue
+            for elt in node.value.elts:
+                if isinstance(elt, ast.Tuple) and isinstance(_try_eval(elt.elts[0]), str):
+                    entry = [_try_eval(elt.elts[0])]
+                    if len(elt.elts) > 1 and isinstance(_try_eval(elt.elts[1]), int):
+                        entry.append(_try_eval(elt.elts[1]))
+                    if entry not in resources:
+                        resources.append(entry)
+    return resources
+
+# Platforms ----------------------------------------------------------------------------------------
+
+def parse_platform(filename):
+    tree = ast.parse(open(filename).read(), filename)
+    info = {
+        "family"             : None,
+        "device"             : None,
+        "devices"            : {},
+        "variants"           : {},
+        "toolchain"          : None,
+        "default_clk_name"   : None,
+        "default_clk_period" : None,
+        "io"                 : _resources(tree, "_io"),
+        "connectors"         : [name for name, *_ in _resources(tree, "_connectors")],
+    }
+    # Module-level constants (ex: _device_map).
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            value = _try_eval(node.value)
+            if value is not None:
+                constants[node.targets[0].id] = value
+    for cls in tree.body:
+        if not (isinstance(cls, ast.ClassDef) and cls.name == "Platform"):
+            continue
+        for base in cls.bases:
+            if isinstance(base, ast.Name) and base.id.endswith("Platform"):
+                info["family"] = base.id[:-len("Platform")].lower()
+        for node in cls.body:
+            # Default Clk.
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+                if node.targets[0].id in ["default_clk_name", "default_clk_period"]:
+                    info[node.targets[0].id] = _try_eval(node.value)
+            # Device/Toolchain/Variants.
+            if isinstance(node, ast.FunctionDef) and node.name == "__init__":
+                args     = node.args.args[len(node.args.args) - len(node.args.defaults):]
+                defaults = {a.arg: _try_eval(d) for a, d in zip(args, node.args.defaults)}
+                info["toolchain"] = defaults.pop("toolchain", None)
+                # Variants: parameters used to select in a dict (ex: {"a7-35": ...}[variant]).
+                for sub in ast.walk(node):
+                    if isinstance(sub, ast.Subscript):
+                        index = sub.slice.value if isinstance(sub.slice, ast.Index) else sub.slice
+                        table = _try_eval(sub.value, constants)
+                        if not isinstance(table, dict):
+                            continue
+                        if isinstance(index, ast.Name) and index.id in defaults:
+                            info["variants"][index.id] = [k for k in table.keys() if k is not None]
+                # Device: first argument of XXXPlatform.__init__, evaluated for each variant.
+                def find_device(env):
+                    for stmt in node.body:
+                        for sub in ast.walk(stmt):
+                            if (isinstance(sub, ast.Call) and
+                                isinstance(sub.func, ast.Attribute) and
+                                sub.func.attr == "__init__" and len(sub.args) > 1):
+                                return _try_eval(sub.args[1], env)
+                        # Track simple local assignments (ex: device = {...}[variant]).
+                        if isinstance(stmt, ast.Assign) and isinstance(stmt.targets[0], ast.Name):
+                            value = _try_eval(stmt.value, env)
+                            if value is not None:
+                                env[stmt.targets[0].id] = value
+                    return None
+                info["device"] = find_device({**constants, **defaults})
+                for param, values in info["variants"].items():
+                    for value in values:
+                        env = {**constants, **defaults, param: value}
+                        info["devices"][value] = find_device(env)
+    return info
+
+# Targets ------------------------------------------------------------------------------------------
+
+# SDRAM type of the SDRAM PHYs not taking a memtype parameter.
+_sdram_phys = {
+    "GENSDRPHY"          : "SDR",
+    "HalfRateGENSDRPHY"  : "SDR",
+    "ECP5DDRPHY"         : "DDR3",
+    "lpddr4"             : "LPDDR4",
+    "S7LPDDR4PHY"        : "LPDDR4",
+    "K7LPDDR4PHY"        : "LPDDR4",
+    "V7LPDDR4PHY"        : "LPDDR4",
+    "A7LPDDR4PHY"        : "LPDDR4",
+}
+
+def _options(node):
+    """Return the options of an add_argument call node (or [])."""
+    options = []
+    if (isinstance(node, ast.Call) and
+        isinstance(node.func, ast.Attribute) and
+        node.func.attr == "add_argument"):
+        for arg in node.args:
+            arg = _try_eval(arg)
+            if isinstance(arg, str) and arg.startswith("--"):
+                options.append(arg)
+    return options
+
+def parse_soc_helpers(path=os.path.join(litex_boards_dir, "soc")):
+    """Collect the options added by the litex_boards.soc *_args(parser) helpers."""
+    helpers = {}
+    for f in sorted(os.listdir(path)):
+        if not f.endswith(".py"):
+            continue
+        filename = os.path.join(path, f)
+        tree     = ast.parse(open(filename).read(), filename)
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and node.name.endswith("_args"):
+                helpers[node.name] = [o for sub in ast.walk(node) for o in _options(sub)]
+    return helpers
+
+def parse_target(filename, helpers=None):
+    if helpers is None:
+        helpers = parse_soc_helpers()
+    tree = ast.parse(open(filename).read(), filename)
+    info = {
+        "platforms" : [],
+        "options"   : [],
+        "memtypes"  : [],
+        "cores"     : [],
+    }
+    def append(key, value):
+        if value not in info[key]:
+            info[key].append(value)
+    for node in ast.walk(tree):
+        # Platforms / Cores.
+        if isinstance(node, ast.ImportFrom) and node.module is not None:
+            package = node.module.split(".")[0]
+            if node.module == "litex_boards.platforms":
+                for alias in node.names:
+                    append("platforms", alias.name)
+            elif package.startswith("lite") and package not in ["litex", "litex_boards"]:
+                append("cores", package)
+            for alias in node.names:
+                if alias.name in _sdram_phys:
+                    append("memtypes", _sdram_phys[alias.name])
+        # Options (added directly or by the shared litex_boards.soc helpers, ex: pcie_args(parser)).
+        for option in _options(node):
+            append("options", option)
+        if (isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Name) and
+            node.func.id in helpers):
+            for option in helpers[node.func.id]:
+                append("options", option)
+        # SDRAM types.
+        if isinstance(node, ast.keyword) and node.arg == "memtype":
+            value = _try_eval(node.value)
+            if isinstance(value, str):
+                append("memtypes", value)
+        if isinstance(node, ast.Attribute) and node.attr in _sdram_phys:
+            append("memtypes", _sdram_phys[node.attr])
+    return info
+
+# Registry -----------------------------------------------------------------------------------------
+
+def _modules(package):
+    path = os.path.join(litex_boards_dir, package)
+    return sorted(f[:-3] for f in os.listdir(path) if f.endswith(".py") and f != "__init__.py")
+
+def build_registry():
+    registry = {"platforms": {}, "targets": {}}
+    for name in _modules("platforms"):
+        filename = os.path.join(litex_boards_dir, "platforms", name + ".py")
+        registry["platforms"][name] = parse_platform(filename)
+    helpers = parse_soc_helpers()
+    for name in _modules("targets"):
+        filename = os.path.join(litex_boards_dir, "targets", name + ".py")
+        info = parse_target(filename, helpers)
+        # Resolve short names (ex: arty -> digilent_arty).
+        info["platforms"] = [short_names["platforms"].get(p, p) for p in info["platforms"]]
+        registry["targets"][name] = info
+    return registry
+
+def generate_registry(filename=registry_file):
+    registry = build_registry()
+    with open(filename, "w") as f:
+        json.dump(registry, f, indent=1, sort_keys=True)
+    return registry
+
+def _is_stale(filename):
+    mtime = os.path.getmtime(filename)
+    for package in ["platforms", "targets", "soc"]:
+        path = os.path.join(litex_boards_dir, package)
+        if os.path.getmtime(path) > mtime:
+            return True
+        for name in _modules(package):
+            if os.path.getmtime(os.path.join(path, name + ".py")) > mtime:
+                return True
+    return False
+
+def load_registry(filename=registry_file):
+    """Load the registry, (re)building it in memory when missing or out of date."""
+    if os.path.exists(filename) and not _is_stale(filename):
+        with open(filename) as f:
+            return json.load(f)
+    return build_registry()
+
+# Queries ------------------------------------------------------------------------------------------
+
+def query(registry=None, resources=[], connectors=[], options=[], memtypes=[], cores=[],
+    family=None):
+    """Return the targets matching all the given constraints."""
+    if registry is None:
+        registry = load_registry()
+    matches = []
+    for name, target in registry["targets"].items():
+        platforms = [registry["platforms"][p] for p in target["platforms"]
+            if p in registry["platforms"]]
+        ios       = [io[0] for p in platforms for io in p["io"]]
+        conns     = [c for p in platforms for c in p["connectors"]]
+        families  = [p["family"] for p in platforms]
+        if not all(r in ios for r in resources):
+            continue
+        if not all(c in conns for c in connectors):
+            continue
+        if not all(o in target["options"] for o in options):
+            continue
+        if not all(m in target["memtypes"] for m in memtypes):
+            continue
+        if not all(c in target["cores"] for c in cores):
+            continue
+        if family is not None and family not in families:
+            continue
+        matches.append(name)
+    return matches
+
+# Run ----------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards registry.")
+    parser.add_argument("--generate",  action="store_true",  help="Generate registry file.")
+    parser.add_argument("--output",    default=registry_file, help="Registry file.")
+    parser.add_argument("--resource",  action="append", default=[], help="Required platform IO (ex: pcie_x4).")
+    parser.add_argument("--connector", action="append", default=[], help="Required platform connector (ex: pmoda).")
+    parser.add_argument("--option",    action="append", default=[], help="Required target option (ex: --with-sata).")
+    parser.add_argument("--memtype",   action="append", default=[], help="Required SDRAM type (ex: DDR4).")
+    parser.add_argument("--core",      action="append", default=[], help="Required core (ex: litepcie).")
+    parser.add_argument("--family",    default=None,                help="Required FPGA family (ex: xilinx).")
+    parser.add_argument("--dump",      default=None,                help="Dump registry entry of a platform/target.")
+    args = parser.parse_args()
+
+    if args.generate:
+        registry = generate_registry(args.output)
+        nplatforms = len(registry["platforms"])
+        ntargets   = len(registry["targets"])
+        print(f"{args.output}: {nplatforms} platforms, {ntargets} targets.")
+        return
+
+    registry = load_registry(args.output)
+    if args.dump is not None:
+        for package in ["platforms", "targets"]:
+            name = short_names[package].get(args.dump, args.dump)
+            if name in registry[package]:
+                print(json.dumps({package: registry[package][name]}, indent=1))
+        return
+
+    for name in query(registry,
+        resources  = args.resource,
+        connectors = args.connector,
+        options    = args.option,
+        memtypes   = args.memtype,
+        cores      = args.core,
+        family     = args.family):
+        print(name)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+import socket
+import struct
+import argparse
+
+"""
+Host client of the UDP Streamer (litex_boards.soc.ethernet.UDPMemoryStreamer).
+
+Dumps a region of the SoC's bus at link rate: a single request (address, length) is sent and the
+SoC streams the region back in packets prefixed with their address. Lost packets are requested
+again (UDP).
+
+Ex (target built with --with-etherbone --with-udp-streamer):
+    ./udp_dump.py --ip=192.168.1.50 --address=0x40000000 --length=0x100000 -o dump.bin
+"""
+
+# UDP Dump -----------------------------------------------------------------------------------------
+
+def _holes(length, received):
+    """Return the (offset, length) runs of [0, length] not covered by received (offset: length)."""
+    holes  = []
+    offset = 0
+    for start in sorted(received.keys()):
+        if start > offset:
+            holes.append((offset, start - offset))
+        offset = max(offset, start + received[start])
+    if offset < length:
+        holes.append((offset, length - offset))
+    return holes
+
+def udp_dump(ip, address, length, port=2000, timeout=0.5, retries=4, max_request=None):
+    """Read length bytes at address (both 32-bit aligned) from the SoC's bus through the UDP Streamer.
+
+    max_request limits the length of each request (default: whole region).
+    """
+    if (address % 4) or (length % 4):
+        raise ValueError("UDP dump: address/length must be 32-bit aligned.")
+    data     = bytearray(length)
+    received = {}
+    sock     = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.settimeout(timeout)
+    try:
+        for retry in range(retries + 1):
+            holes = _holes(length, received)
+            if not holes:
+                return bytes(data)
+            for offset, size in holes:
+                while size:
+                    n = size if max_request is None else min(size, max_request)
+                    # Request and wait for its data (requests are dropped by the SoC while streaming).
+                    sock.sendto(struct.pack(">II", address + offset, n), (ip, port))
+                    end = offset + n
+                    try:
+                        while True:
+                            packet, _ = sock.recvfrom(65536)
+                            packet_offset = struct.unpack(">I", packet[:4])[0] - address
+                            payload       = packet[4:]
+                            if packet_offset < 0 or packet_offset + len(payload) > length:
+                                continue
+                            data[packet_offset:packet_offset + len(payload)] = payload
+                            received[packet_offset] = len(payload)
+                            if packet_offset + len(payload) == end:
+                                break
+                    except socket.timeout:
+                        pass
+                    offset += n
+                    size   -= n
+    finally:
+        sock.close()
+    if _holes(length, received):
+        raise TimeoutError("UDP dump: no answer from {}:{} after {} retries.".format(ip, port, retries))
+    return bytes(data)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="LiteX-Boards UDP Streamer memory dump.")
+    parser.add_argument("--ip",      default="192.168.1.50",        help="SoC's IP address.")
+    parser.add_argument("--port",    default=2000, type=int,        help="UDP Streamer port.")
+    parser.add_argument("--address", required=True,                 help="Address (bytes).")
+    parser.add_argument("--length",  required=True,                 help="Length (bytes).")
+    parser.add_argument("-o", "--output", default=None,             help="Output file (default: hexdump).")
+    args = parser.parse_args()
+
+    data = udp_dump(args.ip, int(args.address, 0), int(args.length, 0), port=args.port)
+    if args.output is not None:
+        with open(args.output, "wb") as f:
+            f.write(data)
+    else:
+        address = int(args.address, 0)
+        for i in range(0, len(data), 16):
+            sys.stdout.write("0x{:08x}: {}\n".format(address + i, data[i:i + 16].hex(" ")))
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,29 @@
 #!/usr/bin/env python3
 
+import os
+
 from setuptools import setup
 from setuptools import find_packages
+from setuptools.command.build_py import build_py
+from setuptools.command.develop import develop
+
+# Board Registry -----------------------------------------------------------------------------------
+
+# Generate the board registry (see litex_boards/tools/registry.py) at install time.
+
+class BuildPyWithRegistry(build_py):
+    def run(self):
+        build_py.run(self)
+        if not self.dry_run:
+            from litex_boards.tools.registry import generate_registry
+            generate_registry(os.path.join(self.build_lib, "litex_boards", "registry.json"))
 
+class DevelopWithRegistry(develop):
+    def run(self):
+        develop.run(self)
+        if not self.dry_run:
+            from litex_boards.tools.registry import generate_registry
+            generate_registry()
 
 setup(
     name="litex-boards",
@@ -16,4 +37,8 @@ setup(
     python_requires="~=3.6",
     include_package_data=True,
     packages=find_packages(exclude=['test*']),
+    cmdclass={
+        "build_py" : BuildPyWithRegistry,
+        "develop"  : DevelopWithRegistry,
+    },
 )
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import subprocess
+import concurrent.futures
+
+"""
+Parallel platform/target generation runner.
+
+Each generation runs in its own Python process with its own working/output directory (so that
+generations don't delete/overwrite each other's files, including the files some targets create in
+the current directory) and the generations are spread over the cores of the machine. Wall time,
+peak RSS and status are collected for each generation.
+
+Ex:
+    python3 -m test.runner                          # All platforms/targets.
+    python3 -m test.runner --targets arty kcu105    # Some targets only.
+"""
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Jobs ---------------------------------------------------------------------------------------------
+
+class Job:
+    def __init__(self, name, args):
+        self.name    = name
+        self.args    = args
+        self.passed  = None
+        self.time    = None
+        self.maxrss  = None
+        self.log     = None
+
+def platform_job(name):
+    return Job(f"platform/{name}", [
+        "-m", "litex_boards.targets.simple", f"litex_boards.platforms.{name}",
+        "--no-compile-software",
+        "--no-compile-gateware",
+        "--uart-name=stub",
+    ])
+
+def target_job(name):
+    return Job(f"target/{name}", [
+        "-m", f"litex_boards.targets.{name}",
+        "--cpu-type=vexriscv",
+        "--cpu-variant=minimal",
+        "--no-compile-software",
+        "--no-compile-gateware",
+    ])
+
+# Run ----------------------------------------------------------------------------------------------
+
+def run_job(job, build_dir):
+    # Sandbox: dedicated working/output directory.
+    job_dir = os.path.join(build_dir, job.name.replace("/", "_"))
+    shutil.rmtree(job_dir, ignore_errors=True)
+    os.makedirs(job_dir)
+    job.log = os.path.join(job_dir, "run.log")
+
+    # Make litex_boards importable from the sandbox even when not installed.
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([repo_dir] + env.get("PYTHONPATH", "").split(os.pathsep))
+
+    start = time.time()
+    with open(job.log, "w") as log:
+        p = subprocess.Popen([sys.executable] + job.args + [f"--output-dir={job_dir}"],
+            cwd    = job_dir,
+            env    = env,
+            stdout = log,
+            stderr = subprocess.STDOUT)
+        # Use wait4 to get the resource usage of this process only.
+        _, status, rusage = os.wait4(p.pid, 0)
+        p.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    job.time   = time.time() - start
+    job.maxrss = rusage.ru_maxrss/1024 # ru_maxrss is in KiB on Linux.
+    job.passed = (p.returncode == 0)
+    return job
+
+def run_jobs(jobs, build_dir="build/test", workers=None):
+    """Run jobs in parallel (workers defaults to the number of CPUs) and return them."""
+    build_dir = os.path.abspath(build_dir)
+    # Generations are run in separate processes; threads are only used to wait on them.
+    workers   = workers or os.cpu_count()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda job: run_job(job, build_dir), jobs))
+
+def report(jobs, file=sys.stdout):
+    print(f"{'Name':48} {'Status':6} {'Time (s)':>9} {'RSS (MiB)':>10}", file=file)
+    print("-"*76, file=file)
+    for job in sorted(jobs, key=lambda job: job.name):
+        status = "PASS" if job.passed else "FAIL"
+        print(f"{job.name:48} {status:6} {job.time:9.1f} {job.maxrss:10.1f}", file=file)
+    print("-"*76, file=file)
+    failed = [job for job in jobs if not job.passed]
+    print(f"{len(jobs) - len(failed)}/{len(jobs)} passed, {len(failed)} failed.", file=file)
+    for job in failed:
+        print(f"{job.name}: see {job.log}", file=file)
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    from test.test_targets import collect_platforms, collect_targets
+    parser = argparse.ArgumentParser(description="Parallel platform/target generation runner.")
+    parser.add_argument("--platforms", nargs="*", default=None, help="Platforms to test (default: all).")
+    parser.add_argument("--targets",   nargs="*", default=None, help="Targets to test (default: all).")
+    parser.add_argument("--workers",   default=None, type=int,  help="Number of workers (default: CPUs).")
+    parser.add_argument("--build-dir", default="build/test",    help="Base build directory.")
+    args = parser.parse_args()
+
+    platforms = collect_platforms() if args.platforms is None else args.platforms
+    targets   = collect_targets()   if args.targets   is None else args.targets
+    jobs      = [platform_job(name) for name in platforms] + [target_job(name) for name in targets]
+    jobs      = run_jobs(jobs, build_dir=args.build_dir, workers=args.workers)
+    report(jobs)
+    sys.exit(0 if all(job.passed for job in jobs) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.soc.interconnect.axi import AXIInterface
+
+from litex_boards.soc.axi import AXIStripedDMAWriter, AXIStripedDMAReader
+
+class _Memory:
+    """AXI ports memory model (32-bit words at byte addresses, INCR bursts)."""
+    def __init__(self, ports):
+        self.ports  = ports
+        self.memory = {}
+        self.bursts = [] # (port, address) of the write bursts.
+
+    @passive
+    def write_generator(self, n):
+        port = self.ports[n]
+        yield port.aw.ready.eq(1)
+        yield port.w.ready.eq(1)
+        bursts    = []
+        beat      = 0
+        responses = 0
+        while True:
+            yield port.b.valid.eq(responses > 0)
+            responses = max(responses - 1, 0)
+            yield
+            if (yield port.aw.valid):
+                bursts.append((yield port.aw.addr))
+                self.bursts.append((n, bursts[-1]))
+            if (yield port.w.valid):
+                self.memory[bursts[0] + 4*beat] = (yield port.w.data)
+                beat += 1
+                if (yield port.w.last):
+                    bursts.pop(0)
+                    beat       = 0
+                    responses += 1
+
+    @passive
+    def read_generator(self, n):
+        port = self.ports[n]
+        yield port.ar.ready.eq(1)
+        while True:
+            yield
+            if (yield port.ar.valid):
+                address = (yield port.ar.addr)
+                length  = (yield port.ar.len) + 1
+                yield port.ar.ready.eq(0)
+                for beat in range(length):
+                    yield port.r.valid.eq(1)
+                    yield port.r.data.eq(self.memory.get(address + 4*beat, 0))
+                    yield port.r.last.eq(beat == length - 1)
+                    yield
+                    while not (yield port.r.ready):
+                        yield
+                yield port.r.valid.eq(0)
+                yield port.ar.ready.eq(1)
+
+class TestAXI(unittest.TestCase):
+    def dma_test(self, base, length, data=[]):
+        # 4 ports, 16-byte bursts, regions of 0x100 bytes from port 1.
+        ports  = [AXIInterface(data_width=32, address_width=16) for i in range(4)]
+        kwargs = dict(port_offset=1, burst_length=4, port_size=0x100)
+        dut    = Module()
+        dut.submodules.writer = writer = AXIStripedDMAWriter(ports, **kwargs)
+        dut.submodules.reader = reader = AXIStripedDMAReader(ports, **kwargs)
+        memory = _Memory(ports)
+        reads  = []
+        def generator():
+            # Write.
+            yield writer._base.storage.eq(base)
+            yield writer._length.storage.eq(length)
+            yield writer._enable.storage.eq(1)
+            n = 0
+            for i in range(256):
+                yield writer.sink.valid.eq(n < len(data))
+                yield writer.sink.data.eq(data[n] if n < len(data) else 0)
+                yield
+                if (yield writer.sink.valid) and (yield writer.sink.ready):
+                    n += 1
+            self.write_done  = (yield writer._done.status)
+            self.write_error = (yield writer._error.status)
+            # Read.
+            yield reader._base.storage.eq(base)
+            yield reader._length.storage.eq(length)
+            yield reader._enable.storage.eq(1)
+            yield reader.source.ready.eq(1)
+            for i in range(256):
+                yield
+                if (yield reader.source.valid):
+                    reads.append((yield reader.source.data))
+            self.read_done  = (yield reader._done.status)
+            self.read_error = (yield reader._error.status)
+        generators = [generator()]
+        for n in range(4):
+            generators += [memory.write_generator(n), memory.read_generator(n)]
+        run_simulation(dut, generators)
+        return memory, reads
+
+    def test_striping(self):
+        data = list(range(0x100, 0x100 + 6*4))
+        memory, reads = self.dma_test(base=0x20, length=0x60, data=data)
+        self.assertEqual((self.write_done, self.write_error), (1, 0))
+        self.assertEqual((self.read_done,  self.read_error),  (1, 0))
+        # Bursts 2-7 of the flat space: port n % 4, burst n // 4 of its region.
+        self.assertEqual(memory.bursts, [(n % 4, (1 + n % 4)*0x100 + (n//4)*16) for n in range(2, 8)])
+        for n in range(2, 8):
+            for beat in range(4):
+                address = (1 + n % 4)*0x100 + (n//4)*16 + 4*beat
+                self.assertEqual(memory.memory[address], data[4*(n - 2) + beat])
+        # Read back in order.
+        self.assertEqual(reads, data)
+
+    def test_bound(self):
+        # Buffer ending after the 4*0x100 bytes of the striped space: rejected.
+        memory, reads = self.dma_test(base=0x3e0, length=0x40, data=[0]*16)
+        self.assertEqual((self.write_done, self.write_error), (0, 1))
+        self.assertEqual((self.read_done,  self.read_error),  (0, 1))
+        self.assertEqual(memory.bursts, [])
+        self.assertEqual(reads, [])
@@ -0,0 +1,186 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import json
+import socket
+import struct
+import asyncio
+import tempfile
+import threading
+import unittest
+
+from litex.tools.remote.etherbone import EtherbonePacket, EtherboneRecord
+from litex.tools.remote.etherbone import EtherboneWrites, EtherboneIPC
+
+from litex_boards.tools.bridge import CSRMap, open_bridge, AsyncBridge
+
+_csr_csv = """\
+#--------------------------------------------------------------------------------
+# Auto-generated by LiteX
+#--------------------------------------------------------------------------------
+csr_base,ctrl,0x00000000,,
+csr_register,ctrl_scratch,0x00000004,1,rw
+csr_register,timer0_value,0x00000800,2,ro
+constant,config_csr_data_width,32,,
+memory_region,csr,0x80000000,0x10000,io
+"""
+
+class _Bus:
+    """SoC bus model (32-bit words) serving Etherbone records, counting the received packets."""
+    def __init__(self):
+        self.memory  = {}
+        self.packets = 0
+
+    def serve(self, packet_data, max_reads=255):
+        self.packets += 1
+        packet = EtherbonePacket(packet_data)
+        packet.decode()
+        record = packet.records.pop()
+        if record.writes is not None:
+            for i, data in enumerate(record.writes.get_datas()):
+                self.memory[record.writes.base_addr + 4*i] = data
+        if record.reads is not None:
+            assert len(record.reads.get_addrs()) <= max_reads
+            # Base return address (not decoded by EtherboneReads).
+            base_ret_addr = struct.unpack(">I", packet_data[12 + 4*(record.wcount + 1 if record.wcount else 0):][:4])[0]
+            response = EtherboneRecord()
+            response.writes = EtherboneWrites(base_addr=base_ret_addr,
+                datas=[self.memory.get(addr, 0) for addr in record.reads.get_addrs()])
+            response.wcount = len(response.writes)
+            packet = EtherbonePacket()
+            packet.records = [response]
+            packet.encode()
+            return packet.bytes
+        return None
+
+class _Server(threading.Thread, EtherboneIPC):
+    """litex_server model (Etherbone over TCP)."""
+    def __init__(self, bus):
+        threading.Thread.__init__(self, daemon=True)
+        self.bus    = bus
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.socket.listen(1)
+        self.port   = self.socket.getsockname()[1]
+
+    def run(self):
+        client, _ = self.socket.accept()
+        client.sendall(b"CommUART:127.0.0.1:1234")
+        while True:
+            packet = self.receive_packet(client)
+            if packet == 0:
+                break
+            response = self.bus.serve(packet)
+            if response is not None:
+                client.sendall(response)
+
+class _Etherbone(threading.Thread):
+    """LiteEth Etherbone model (UDP, buffer depth of 4)."""
+    def __init__(self, bus):
+        threading.Thread.__init__(self, daemon=True)
+        self.bus    = bus
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(("127.0.0.1", 0))
+        self.port   = self.socket.getsockname()[1]
+
+    def run(self):
+        while True:
+            packet, host = self.socket.recvfrom(8192)
+            response = self.bus.serve(packet, max_reads=4)
+            if response is not None:
+                self.socket.sendto(response, host)
+
+class TestBridge(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csr = os.path.join(self.tmp.name, "csr.csv")
+        with open(self.csr, "w") as f:
+            f.write(_csr_csv)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_csr_map(self):
+        with open(os.path.join(self.tmp.name, "csr.json"), "w") as f:
+            json.dump({
+                "csr_bases"     : {"ctrl": 0},
+                "csr_registers" : {
+                    "ctrl_scratch" : {"addr": 4,     "size": 1, "type": "rw"},
+                    "timer0_value" : {"addr": 0x800, "size": 2, "type": "ro"},
+                },
+                "constants"     : {"config_csr_data_width": 32},
+                "memories"      : {"csr": {"base": 0x80000000, "size": 0x10000, "type": "io"}},
+            }, f)
+        for csr_map in [CSRMap(self.csr), CSRMap(self.tmp.name)]:
+            self.assertEqual(csr_map.addresses("timer0_value"), [0x800, 0x804])
+            self.assertEqual(csr_map.decode("timer0_value", [0x1, 0x2]), 0x1_0000_0002)
+            self.assertEqual(csr_map.encode("timer0_value", 0x1_0000_0002), [0x1, 0x2])
+            self.assertEqual(csr_map.memories["csr"].base, 0x80000000)
+        with self.assertRaises(KeyError):
+            csr_map.register("unknown")
+
+    def test_tcp_batch(self):
+        bus    = _Bus()
+        server = _Server(bus)
+        server.start()
+        bridge = open_bridge(f"tcp://127.0.0.1:{server.port}", csr=self.csr)
+        bridge.write(0x100, list(range(300)))
+        self.assertEqual(bridge.read(0x100, 300), list(range(300)))
+        with bridge.batch() as batch:
+            batch.write_csr("ctrl_scratch", 0x12345678)
+            batch.write_csr("timer0_value", 0x1_0000_0002)
+            scratch = batch.read_csr("ctrl_scratch")
+            timer   = batch.read_csr("timer0_value")
+            batch.write_csr("ctrl_scratch", 0)
+        self.assertEqual((scratch.value, timer.value), (0x12345678, 0x1_0000_0002))
+        self.assertEqual(bridge.read_csr("ctrl_scratch"), 0)
+        # 300 words: 2 write + 2 read packets; batch: 2 write + 1 read + 1 write packets; 1 read packet.
+        self.assertEqual(bus.packets, 9)
+        bridge.close()
+
+    def test_udp_burst(self):
+        bus       = _Bus()
+        etherbone = _Etherbone(bus)
+        etherbone.start()
+        bridge = open_bridge(f"udp://127.0.0.1:{etherbone.port}", csr=self.csr, max_burst=4)
+        bus.memory.update({4*i: i for i in range(64)})
+        self.assertEqual(bridge.read_addrs([4*i for i in reversed(range(64))]), list(reversed(range(64))))
+        self.assertEqual(bus.packets, 16)
+        bridge.close()
+
+    def test_async(self):
+        bus    = _Bus()
+        server = _Server(bus)
+        server.start()
+        bus.memory.update({0x1000 + 4*i: i for i in range(100)})
+        abridge = AsyncBridge(open_bridge(f"tcp://127.0.0.1:{server.port}", csr=self.csr))
+        async def poll():
+            await abridge.write_csr("ctrl_scratch", 0x5a)
+            return await asyncio.gather(abridge.read_csr("ctrl_scratch"),
+                *[abridge.read(0x1000 + 4*i) for i in range(100)])
+        values = asyncio.run(poll())
+        self.assertEqual(values, [0x5a] + list(range(100)))
+        self.assertEqual(bus.packets, 2) # Coalesced reads.
+        abridge.close()
+
+    def test_pool(self):
+        bus    = _Bus()
+        server = _Server(bus)
+        server.start()
+        uri     = f"tcp://127.0.0.1:{server.port}"
+        bridge0 = open_bridge(uri)
+        bridge1 = open_bridge(uri, csr=self.csr)
+        self.assertIs(bridge0, bridge1)
+        self.assertIsNotNone(bridge0.csr_map)
+        # Other transport arguments: not shared.
+        with self.assertRaisesRegex(ValueError, "already open"):
+            open_bridge(uri, timeout=5)
+        bridge0.close()
+        bridge1.write_csr("ctrl_scratch", 1)
+        self.assertEqual(bridge1.read_csr("ctrl_scratch"), 1)
+        bridge1.close()
+        with self.assertRaises(OSError):
+            bridge1.read_csr("ctrl_scratch")
@@ -0,0 +1,75 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import types
+import argparse
+import tempfile
+import unittest
+
+from litex.soc.integration.builder import Builder
+
+from litex_boards.tools.build_cache import BuildCache, run_target
+
+# Target model: a Builder only generating gateware/top.v from --value.
+class _Builder:
+    def __init__(self, output_dir, value):
+        self.soc          = types.SimpleNamespace(platform=types.SimpleNamespace(name="test_platform"))
+        self.output_dir   = os.path.abspath(output_dir or os.path.join("build", "test_platform"))
+        self.gateware_dir = os.path.join(self.output_dir, "gateware")
+        self.value        = value
+
+def _main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--value",      default="0")
+    parser.add_argument("--output-dir", default=None)
+    parser.add_argument("--build",      action="store_true")
+    args = parser.parse_args()
+    Builder.build(_Builder(args.output_dir, args.value))
+
+class TestBuildCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp    = tempfile.TemporaryDirectory()
+        self.cwd    = os.getcwd()
+        self.builds = []
+        # Target module.
+        self.target = "litex_boards.targets._build_cache_test"
+        filename    = os.path.join(self.tmp.name, "target.py")
+        open(filename, "w").close()
+        sys.modules[self.target] = types.SimpleNamespace(__file__=filename, main=_main)
+        # Builder.build model.
+        def build(builder):
+            self.builds.append(builder.value)
+            os.makedirs(builder.gateware_dir, exist_ok=True)
+            with open(os.path.join(builder.gateware_dir, "top.v"), "w") as f:
+                f.write(builder.value)
+        self.build    = Builder.build
+        Builder.build = build
+
+    def tearDown(self):
+        Builder.build = self.build
+        sys.modules.pop(self.target)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def run_target(self, cwd, *args):
+        cwd = os.path.join(self.tmp.name, cwd)
+        os.makedirs(cwd, exist_ok=True)
+        os.chdir(cwd)
+        run_target("_build_cache_test", list(args), BuildCache(os.path.join(self.tmp.name, "cache")))
+        with open(os.path.join(cwd, "build", "test_platform", "gateware", "top.v")) as f:
+            return f.read()
+
+    def test_miss_hit_restore(self):
+        # Miss: built and stored.
+        self.assertEqual(self.run_target("a", "--value=1"), "1")
+        self.assertEqual(self.builds, ["1"])
+        # Hit from another directory: restored to its build/<platform>, not built.
+        self.assertEqual(self.run_target("b", "--value=1"), "1")
+        self.assertEqual(self.builds, ["1"])
+        # Other arguments: miss.
+        self.assertEqual(self.run_target("b", "--value=2"), "2")
+        self.assertEqual(self.builds, ["1", "2"])
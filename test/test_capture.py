@@ -0,0 +1,214 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import argparse
+import unittest
+from types import SimpleNamespace
+
+from migen import *
+
+from litex.soc.cores.code_tmds import TMDSEncoder, control_tokens
+
+from liteiclink.serdes.gth_ultrascale import GTHChannelPLL
+
+from litedram.common import LiteDRAMNativePort
+from litedram.modules import MT41J256M16
+
+from litex_boards.soc.pcie import pcie_args, pcie_argdict
+from litex_boards.soc.video import sdram_bandwidth
+from litex_boards.soc.capture import capture_params, TMDSDecoder, TMDSAligner
+from litex_boards.soc.capture import VideoPatternSource, VideoPixelPacker, VideoCaptureRing, HDMIRXGTHPHY
+from litex_boards.soc.capture import capture_args, capture_argdict
+
+_timings = ("8x4@test", {
+    "pix_clk"       : 1e6,
+    "h_active"      : 8,
+    "h_blanking"    : 4,
+    "h_sync_offset" : 1,
+    "h_sync_width"  : 1,
+    "v_active"      : 4,
+    "v_blanking"    : 4,
+    "v_sync_offset" : 1,
+    "v_sync_width"  : 1,
+})
+
+class _DRAM:
+    """Native port memory model (commands accepted immediately, reads returned in order)."""
+    def __init__(self, write_port, read_port):
+        self.write_port = write_port
+        self.read_port  = read_port
+        self.memory     = {}
+        self.writes     = []
+
+    @passive
+    def write_generator(self):
+        port = self.write_port
+        yield port.cmd.ready.eq(1)
+        yield port.wdata.ready.eq(1)
+        addresses = []
+        while True:
+            if (yield port.cmd.valid):
+                addresses.append((yield port.cmd.addr))
+            if (yield port.wdata.valid) and addresses:
+                address = addresses.pop(0)
+                self.memory[address] = (yield port.wdata.data)
+                self.writes.append(address)
+            yield
+
+    @passive
+    def read_generator(self):
+        port = self.read_port
+        yield port.cmd.ready.eq(1)
+        addresses = []
+        while True:
+            if (yield port.cmd.valid):
+                addresses.append((yield port.cmd.addr))
+            yield port.rdata.valid.eq(0)
+            if addresses:
+                yield port.rdata.valid.eq(1)
+                yield port.rdata.data.eq(self.memory.get(addresses.pop(0), 0))
+            yield
+
+class TestCapture(unittest.TestCase):
+    def test_capture_params(self):
+        half = sdram_bandwidth(200e6, MT41J256M16, "1:4", databits=32)
+        full = sdram_bandwidth(200e6, MT41J256M16, "1:4", databits=64)
+        # 4x 1080p60 (written + read): over the half-width DDR3 budget, in the full-width one.
+        with self.assertRaisesRegex(ValueError, "wider SDRAM"):
+            capture_params({}, ninputs=4, sdram_bandwidth=half)
+        params = capture_params({}, ninputs=4, sdram_bandwidth=full)
+        self.assertEqual(params["inputs"], [0, 1, 2, 3])
+        self.assertEqual(params["source"], "hdmi")
+        params = capture_params({"hdmi_capture_inputs": "0,2"}, ninputs=4, sdram_bandwidth=half)
+        self.assertEqual(params["inputs"], [0, 2])
+        with self.assertRaises(ValueError):
+            capture_params({"hdmi_capture_inputs": "4"}, ninputs=4)
+        # Board's default source.
+        self.assertEqual(capture_params({}, ninputs=4, source="pattern")["source"], "pattern")
+
+    def test_hdmi_rx_linerate(self):
+        pads = SimpleNamespace(**{"data{}_{}".format(n, p): Signal() for n in range(3) for p in "pn"})
+        # 1080p60: 1.485Gbps from the 148.5MHz refclk.
+        phy = HDMIRXGTHPHY(pads, Signal(), 148.5e6, 200e6, timings="1920x1080@60Hz")
+        plls = [m for name, m in phy._submodules if isinstance(m, GTHChannelPLL)]
+        self.assertEqual([pll.config["linerate"] for pll in plls], [1.485e9]*3)
+        # 640x480@60Hz (251.75Mbps): rejected.
+        with self.assertRaisesRegex(ValueError, "not supported by the GTH CPLL"):
+            HDMIRXGTHPHY(pads, Signal(), 148.5e6, 200e6, timings="640x480@60Hz")
+
+    def test_tmds(self):
+        # Characters: control periods with data in between.
+        chars = []
+        for line in range(8):
+            chars += [(0, line % 4, 0)]*16
+            chars += [(1, 0, (line*37 + i) & 0xff) for i in range(32)]
+
+        class DUT(Module):
+            def __init__(self):
+                self.submodules.encoder = TMDSEncoder()
+                self.submodules.aligner = TMDSAligner(nwords=2, period=64)
+                self.decoders = [TMDSDecoder() for i in range(2)]
+                self.submodules += self.decoders
+                for i, decoder in enumerate(self.decoders):
+                    self.comb += decoder.input.eq(self.aligner.output[10*i:10*(i+1)])
+        dut = DUT()
+
+        # Encode.
+        encoded = []
+        def encode_generator():
+            for de, c, d in chars + [(0, 0, 0)]*4:
+                yield dut.encoder.de.eq(de)
+                yield dut.encoder.c.eq(c)
+                yield dut.encoder.d.eq(d)
+                yield
+                encoded.append((yield dut.encoder.out))
+        run_simulation(dut.encoder, encode_generator())
+        encoded = encoded[4:] # Encoder latency.
+
+        # Bitstream (repeated, shifted by 3 bits) to 20-bit words, aligned and decoded.
+        bits = []
+        for char in encoded*8:
+            bits += [(char >> i) & 1 for i in range(10)]
+        bits  = bits[3:]
+        words = [sum(b << i for i, b in enumerate(bits[20*n:20*(n+1)]))
+            for n in range(len(bits)//20)]
+        decoded = []
+        def align_generator():
+            for word in words:
+                yield dut.aligner.input.eq(word)
+                yield
+                if (yield dut.aligner.aligned):
+                    for decoder in dut.decoders:
+                        decoded.append(((yield decoder.de), (yield decoder.c), (yield decoder.d)))
+        run_simulation(dut, align_generator())
+        self.assertTrue(len(decoded) > len(chars))
+        expected = [(de, 0 if de else c, d if de else 0) for de, c, d in chars]
+        decoded  = [(de, 0 if de else c, d if de else 0) for de, c, d in decoded]
+        # Decoded characters are the encoded ones (from a control period start).
+        start = decoded.index((0, 0, 0))
+        self.assertEqual(decoded[start:start + len(chars)], expected)
+
+    def test_capture_ring(self):
+        nframes    = 2
+        frame_size = 8*4*4
+        class DUT(Module):
+            def __init__(self):
+                self.write_port = LiteDRAMNativePort("write", address_width=16, data_width=64)
+                self.read_port  = LiteDRAMNativePort("read",  address_width=16, data_width=64)
+                self.submodules.pattern = VideoPatternSource(_timings, sys_clk_freq=2e6)
+                self.submodules.packer  = VideoPixelPacker(data_width=64)
+                self.submodules.ring    = VideoCaptureRing(self.write_port, self.read_port,
+                    base       = 0x100,
+                    frame_size = frame_size,
+                    nframes    = nframes)
+                self.comb += [
+                    self.pattern.source.connect(self.packer.sink),
+                    self.packer.source.connect(self.ring.sink),
+                ]
+        dut  = DUT()
+        dram = _DRAM(dut.write_port, dut.read_port)
+
+        reads = []
+        def generator():
+            yield dut.ring._enable.storage.eq(1)
+            for i in range(4000):
+                yield dut.ring.source.ready.eq(1)
+                if (yield dut.ring.source.valid):
+                    reads.append((yield dut.ring.source.data))
+                yield
+            self.writes    = (yield dut.ring._writes.status)
+            self.nreads    = (yield dut.ring._reads.status)
+            self.overflows = (yield dut.ring._overflows.status)
+        run_simulation(dut, [generator(), dram.write_generator(), dram.read_generator()])
+
+        words = frame_size//8
+        self.assertGreaterEqual(self.writes, 3)
+        self.assertEqual(self.overflows, 0)
+        # Frames written in the ring (base: 0x100 bytes, in 64-bit words).
+        self.assertEqual(dram.writes[:2*words], list(range(0x20, 0x20 + 2*words)))
+        self.assertEqual(dram.writes[2*words:3*words], list(range(0x20, 0x20 + words)))
+        # Frames read back: color bars (8 pixels/line, 1 per bar, rgb888 in 32-bit).
+        self.assertGreaterEqual(len(reads), 2*words)
+        pixels = []
+        for word in reads[:words]:
+            pixels += [word & 0xffffffff, word >> 32]
+        self.assertEqual(pixels[:8], [0xffffff, 0xffff00, 0x00ffff, 0x00ff00,
+                                      0xff00ff, 0xff0000, 0x0000ff, 0x000000])
+        self.assertEqual(pixels[8:16], pixels[:8])
+        self.assertEqual(reads[words:2*words], reads[:words])
+
+    def test_target(self):
+        from litex_boards.targets import decklink_quad_hdmi_recorder
+        # Default capture/PCIe arguments: pattern source, one DMA channel per input, 64-bit DDR3.
+        parser = argparse.ArgumentParser()
+        capture_args(parser)
+        pcie_args(parser)
+        args = parser.parse_args([])
+        soc  = decklink_quad_hdmi_recorder.BaseSoC(with_pcie=True, with_hdmi_capture=True,
+            cpu_type = None,
+            **capture_argdict(args),
+            **pcie_argdict(args))
+        self.assertEqual([hasattr(soc, f"pcie_dma{n}") for n in range(5)], [True]*4 + [False])
+        soc.finalize()
@@ -0,0 +1,124 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import sys
+import types
+import tempfile
+import unittest
+
+from litex.build.generic_platform import Pins, Subsignal, IOStandard
+
+from litex_boards.soc.pins import PinIndex
+from litex_boards.tools.check_pins import check_index, load_package, find_package, check
+from litex_boards.tools.check_pins import is_alternative, get_extensions
+
+# Target model: its extensions are parsed, not executed.
+_target = """
+_io = [("a", 0, Pins("A1"), IOStandard("LVCMOS33"))]
+_removed = os.remove("{filename}")
+platform.add_extension(_io)
+platform.add_extension(_io + [("b", 0, Subsignal("c", Pins("A2")))])
+platform.add_extension(make_io())
+"""
+
+_package = """\
+Device/Package xc7a35tcsg324 10/18/2026 00:00:00
+
+Pin      Pin Name                  Memory Byte Group  Bank  VCCAUX Group  Super Logic Region  I/O Type  No-Connect
+E3       IO_L12P_T1_MRCC_35        1                  35    NA            NA                  HR        NA
+R2       IO_L3P_T0_DQS_AD5P_35     0                  35    NA            NA                  HR        NA
+AA1      VCCO_35                   NA                 35    NA            NA                  NA        NA
+A1       GND                       NA                 NA    NA            NA                  NA        NA
+"""
+
+class TestCheckPins(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_check_index(self):
+        index = PinIndex([
+            ("a",          0, Pins("A1"), IOStandard("LVCMOS33")),
+            ("b",          0, Pins("A2"), IOStandard("LVCMOS18")),
+            ("c",          0, Subsignal("d", Pins("ext:0")), Subsignal("e", Pins("A3"))),
+            ("spiflash",   0, Pins("B1"), IOStandard("LVCMOS33")),
+            ("spiflash4x", 0, Pins("B1"), IOStandard("LVCMOS33")),
+        ], connectors=[("ext", "A1 A4")])
+        conflicts, bank_conflicts = check_index(index, banks={"A1": 14, "A2": 14, "B1": 14})
+        self.assertEqual(conflicts, [("A1", [("a", 0, None), ("c", 0, "d")])])
+        self.assertEqual(bank_conflicts, [(14, {
+            3.3: [("a", 0, None), ("spiflash", 0, None), ("spiflash4x", 0, None)],
+            1.8: [("b", 0, None)]})])
+        # Extension: only its own conflicts are reported.
+        extension = PinIndex([("f", 0, Pins("A3"))], parent=index)
+        conflicts, bank_conflicts = check_index(extension, base=index)
+        self.assertEqual(conflicts, [("A3", [("c", 0, "e"), ("f", 0, None)])])
+
+    def test_package(self):
+        filename = os.path.join(self.tmp.name, "xc7a35tcsg324pkg.txt")
+        with open(filename, "w") as f:
+            f.write(_package)
+        with open(os.path.join(self.tmp.name, "banks.csv"), "w") as f:
+            f.write("pin,bank\nE3,35\n")
+        self.assertEqual(load_package(filename), {"E3": 35, "R2": 35, "AA1": 35})
+        self.assertEqual(load_package(os.path.join(self.tmp.name, "banks.csv")), {"E3": 35})
+        self.assertEqual(find_package("xc7a35ticsg324-1L", self.tmp.name), filename)
+        self.assertIsNone(find_package("xc7a100tcsg324-1", self.tmp.name))
+
+    def test_check(self):
+        with open(os.path.join(self.tmp.name, "xc7a35tcsg324pkg.txt"), "w") as f:
+            f.write(_package)
+        results = check(["digilent_arty"], targets=True, packages_dir=self.tmp.name, jobs=2)
+        results = {result.name: result for result in results}
+        arty = results["digilent_arty"]
+        self.assertIsNone(arty.error)
+        self.assertTrue(arty.banks_checked)
+        # clk100 (E3, LVCMOS33) and ddram.a (R2, SSTL135) in the same bank of the test package.
+        self.assertEqual(arty.bank_conflicts,
+            [(35, {3.3: [("clk100", 0, None)], 1.35: [("ddram", 0, "a")]})])
+        self.assertFalse(results["digilent_arty variant=a7-100"].banks_checked)
+        self.assertIn("digilent_arty: arty.raw_pmod_io(\"pmoda\")", results)
+
+    def test_alternatives(self):
+        self.assertTrue(is_alternative([("spiflash", 0, "cs_n"), ("spiflash4x", 0, "cs_n")]))
+        self.assertTrue(is_alternative([("serial", 0, "tx"), ("usb_fifo", 0, "data")]))
+        self.assertTrue(is_alternative([("sfp", 0, "txp"), ("sfp_tx", 0, "p"), ("sfp2sata", 0, "tx_p")]))
+        self.assertTrue(is_alternative([("user_sma_clock", 0, None), ("user_sma_clock_p", 0, None)]))
+        self.assertFalse(is_alternative([("vga", 0, "r"), ("gpio_0", 0, None)]))
+        self.assertTrue(is_alternative([("vga", 0, "r"), ("gpio_0", 0, None)], shared=[{"vga", "gpio_0"}]))
+        self.assertFalse(is_alternative([("eth", 0, "mdc"), ("eth", 1, "mdc")]))
+
+    def test_skipped(self):
+        results = {r.name: r for r in check(["terasic_de1soc", "efinix_xyloni_dev_kit", "qmtech_daughterboard"])}
+        self.assertTrue(results["terasic_de1soc"].ok)
+        self.assertIsNone(results["efinix_xyloni_dev_kit"].error)
+        self.assertIn("Efinity", results["efinix_xyloni_dev_kit"].skipped)
+        self.assertEqual(results["qmtech_daughterboard"].skipped, "no Platform.")
+
+    def test_extensions(self):
+        canary   = os.path.join(self.tmp.name, "canary")
+        filename = os.path.join(self.tmp.name, "target.py")
+        open(canary, "w").close()
+        with open(filename, "w") as f:
+            f.write(_target.format(filename=canary))
+        sys.modules["litex_boards.targets._check_pins_test"] = types.SimpleNamespace(__file__=filename)
+        try:
+            extensions = get_extensions("_check_pins_test")
+        finally:
+            sys.modules.pop("litex_boards.targets._check_pins_test")
+        self.assertTrue(os.path.exists(canary))
+        self.assertEqual([expression for expression, io in extensions],
+            ["_io", "_io + [(\"b\", 0, Subsignal(\"c\", Pins(\"A2\")))]", "make_io()"])
+        self.assertEqual(extensions[0][1][0][2].identifiers, ["A1"])
+        self.assertEqual([resource[0] for resource in extensions[1][1]], ["a", "b"])
+        self.assertIsNone(extensions[2][1])
+
+    def test_placeholder_pins(self):
+        # Zynq PS7 resources ("-" pins) are not conflicting.
+        results = check(["digilent_zedboard"], packages_dir=self.tmp.name)
+        self.assertEqual([result.conflicts for result in results], [[]])
@@ -0,0 +1,95 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import stat
+import subprocess
+import time
+import tempfile
+import unittest
+from unittest import mock
+
+from litex.build.openocd import OpenOCD
+from litex.build.generic_programmer import GenericProgrammer
+from litex.build.lattice.programmer import IceStormProgrammer
+
+from litex_boards.tools.farm_load import FarmBoard, get_commands, load
+
+# Programmer model: logs its arguments and takes 0.5s (fails with a "fail" serial).
+_tool = """#!/bin/sh
+echo "$@" >> {log}
+sleep 0.5
+case "$*" in *fail*) exit 1;; esac
+"""
+
+class TestFarmLoad(unittest.TestCase):
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.log  = os.path.join(self.tmp.name, "log")
+        self.bit  = os.path.join(self.tmp.name, "top.bit")
+        self.path = os.environ["PATH"]
+        with open(self.bit, "wb") as f:
+            f.write(b"\x00")
+        for tool in ["openocd", "openFPGALoader"]:
+            filename = os.path.join(self.tmp.name, tool)
+            with open(filename, "w") as f:
+                f.write(_tool.format(log=self.log))
+            os.chmod(filename, os.stat(filename).st_mode | stat.S_IEXEC)
+        os.environ["PATH"] = self.tmp.name + os.pathsep + self.path
+
+    def tearDown(self):
+        os.environ["PATH"] = self.path
+        self.tmp.cleanup()
+
+    def test_commands(self):
+        openocd = get_commands(FarmBoard("digilent_arty", "210319A1B2C3", self.bit))
+        self.assertEqual(openocd[0][:5], ["openocd", "-f", openocd[0][2], "-c", "adapter serial 210319A1B2C3"])
+        self.assertTrue(os.path.exists(openocd[0][2])) # LiteX-Boards' OpenOCD config.
+        loader = get_commands(FarmBoard("lambdaconcept_ecpix5", "usb:001:012", self.bit))
+        self.assertEqual(loader[0][:3], ["openFPGALoader", "--busdev-num", "001:012"])
+
+    def test_unsupported(self):
+        # VivadoProgrammer runs Vivado itself (not through call()): rejected before loading.
+        with mock.patch("subprocess.Popen") as popen:
+            with self.assertRaisesRegex(ValueError, "VivadoProgrammer .* not supported"):
+                get_commands(FarmBoard("xilinx_alveo_u250", "serial0", self.bit))
+            popen.assert_not_called()
+        # Programmers overriding load_bitstream (even calling call()) or call: rejected.
+        class Programmer(GenericProgrammer):
+            def load_bitstream(self, bitstream_file):
+                self.call(["tool", bitstream_file])
+        class OpenOCDProgrammer(OpenOCD):
+            def call(self, command, check=True):
+                subprocess.call(command)
+        for programmer in [Programmer, OpenOCDProgrammer]:
+            platform = mock.Mock(create_programmer=lambda: programmer("cfg"))
+            with mock.patch("litex_boards.tools.farm_load.get_platform", return_value=platform):
+                with self.assertRaisesRegex(ValueError, "not supported"):
+                    get_commands(FarmBoard("digilent_arty", "serial0", self.bit))
+        # Subclass of a call() programmer: supported. No command recorded: error.
+        class IceStorm(IceStormProgrammer):
+            pass
+        platform = mock.Mock(create_programmer=IceStorm)
+        with mock.patch("litex_boards.tools.farm_load.get_platform", return_value=platform):
+            self.assertEqual(get_commands(FarmBoard("digilent_arty", None, self.bit)),
+                [["iceprog", "-S", self.bit]])
+            with mock.patch.object(IceStormProgrammer, "load_bitstream", lambda self, bitstream: None):
+                with self.assertRaisesRegex(ValueError, "no command recorded"):
+                    get_commands(FarmBoard("digilent_arty", None, self.bit))
+
+    def test_load(self):
+        boards = [FarmBoard("digilent_arty", f"serial{n}", self.bit) for n in range(4)]
+        boards.append(FarmBoard("digilent_arty", "serial0", self.bit))      # Same cable: sequential.
+        boards.append(FarmBoard("lambdaconcept_ecpix5", "fail", self.bit))  # Failing load.
+        boards.append(FarmBoard("digilent_arty", "serial5", "missing.bit")) # Missing bitstream.
+        start   = time.monotonic()
+        results = load(boards)
+        elapsed = time.monotonic() - start
+        self.assertEqual([r.ok for r in results], [True]*5 + [False]*2)
+        self.assertTrue(all(r.duration >= 0.5 for r in results[:6]))
+        with open(self.log) as f:
+            self.assertEqual(len(f.readlines()), 6)
+        # Concurrent between cables: ~2 loads (serial0 twice) instead of 6.
+        self.assertLess(elapsed, 2.0)
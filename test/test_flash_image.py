@@ -0,0 +1,109 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tempfile
+import unittest
+
+from litex_boards.tools.flash_image import FlashImage, FlashState, read_image_file, changed_sectors, sector_hashes
+from litex_boards.tools.flash_image import board_id
+
+class _Programmer:
+    def __init__(self):
+        self.writes = []
+
+    def flash(self, address, filename):
+        self.writes.append((address, read_image_file(filename)))
+
+class TestFlashImage(unittest.TestCase):
+    def test_image(self):
+        image = FlashImage(flash_size=0x100)
+        image.add("bitstream", 0x00, b"\x01\x02\x03", max_size=0x10)
+        image.add("bios",      0x10, b"\x04\x05")
+        self.assertEqual(image.size, 0x12)
+        self.assertEqual(image.get_image(), b"\x01\x02\x03" + b"\xff"*13 + b"\x04\x05")
+
+    def test_errors(self):
+        image = FlashImage(flash_size=0x100)
+        image.add("bitstream", 0x00, b"\x00"*0x20)
+        with self.assertRaises(ValueError):
+            image.add("bios", 0x10, b"\x00") # Overlap.
+        with self.assertRaises(ValueError):
+            image.add("bios", 0xff, b"\x00\x00") # Flash size.
+        with self.assertRaises(ValueError):
+            image.add("bios", 0x40, b"\x00\x00", max_size=1) # Region size.
+
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "top.hex"), "w") as f:
+                f.write("01\n02\n")
+            image = FlashImage()
+            image.add("bitstream", 0, os.path.join(d, "top.hex"))
+            image.add("bios",      4, b"\x03")
+            for ext in [".bin", ".hex"]:
+                filename = image.write(os.path.join(d, "image" + ext))
+                self.assertEqual(read_image_file(filename), b"\x01\x02\xff\xff\x03")
+
+    def test_changed_sectors(self):
+        old = b"\x00"*16
+        new = b"\x00"*4 + b"\x01"*8 + b"\x00"*4 + b"\x01"*4
+        self.assertEqual(changed_sectors(new, 4), [(0, 20)])
+        self.assertEqual(changed_sectors(new, 4, sector_hashes(old, 4)), [(4, 8), (16, 4)])
+        self.assertEqual(changed_sectors(old, 4, sector_hashes(old, 4)), [])
+
+    def test_flash_diff(self):
+        with tempfile.TemporaryDirectory() as d:
+            state = FlashState("target", board="0403:6010:serial0", state_dir=d)
+            prog  = _Programmer()
+            image = FlashImage()
+            image.add("bitstream", 0, b"\x00"*8)
+            image.add("bios",      8, b"\x01"*8)
+            # First flash: full image.
+            image.flash(prog, os.path.join(d, "image.bin"), sector_size=4, state=state, diff=True)
+            self.assertEqual(prog.writes, [(0, b"\x00"*8 + b"\x01"*8)])
+            # Second flash: only the changed sector.
+            prog  = _Programmer()
+            image = FlashImage()
+            image.add("bitstream", 0, b"\x00"*8)
+            image.add("bios",      8, b"\x01"*4 + b"\x02"*4)
+            image.flash(prog, os.path.join(d, "image.bin"), sector_size=4, state=state, diff=True)
+            self.assertEqual(prog.writes, [(12, b"\x02"*4)])
+            # Unchanged: nothing written.
+            prog = _Programmer()
+            image.flash(prog, os.path.join(d, "image.bin"), sector_size=4, state=state, diff=True)
+            self.assertEqual(prog.writes, [])
+
+    def test_flash_boards(self):
+        with tempfile.TemporaryDirectory() as d:
+            image = FlashImage()
+            image.add("bitstream", 0, b"\x00"*8)
+            def flash(board):
+                prog = _Programmer()
+                image.flash(prog, os.path.join(d, "image.bin"), sector_size=4, diff=True,
+                    state = FlashState("target", board=board, state_dir=d))
+                return prog.writes
+            self.assertEqual(flash("0403:6010:serial0"), [(0, b"\x00"*8)])
+            self.assertEqual(flash("0403:6010:serial0"), [])
+            # Another board: not recorded, whole image.
+            self.assertEqual(flash("0403:6010:serial1"), [(0, b"\x00"*8)])
+            # Unidentified board: always the whole image.
+            self.assertEqual(flash(None), [(0, b"\x00"*8)])
+            self.assertEqual(flash(None), [(0, b"\x00"*8)])
+
+    def test_board_id(self):
+        class IceStormProgrammer: pass
+        with tempfile.TemporaryDirectory() as d:
+            def add_device(name, vid, pid, serial):
+                os.makedirs(os.path.join(d, name))
+                for attr, value in [("idVendor", vid), ("idProduct", pid), ("serial", serial)]:
+                    with open(os.path.join(d, name, attr), "w") as f:
+                        f.write(value + "\n")
+            add_device("1-1", "1d6b", "0002", "hub")
+            self.assertEqual(board_id(IceStormProgrammer(), sysfs_dir=d), None)
+            add_device("1-2", "0403", "6010", "FT1234")
+            self.assertEqual(board_id(IceStormProgrammer(), sysfs_dir=d), "0403:6010:FT1234")
+            # Several cables: the programmer's selection is unknown.
+            add_device("1-3", "0403", "6010", "FT5678")
+            self.assertEqual(board_id(IceStormProgrammer(), sysfs_dir=d), None)
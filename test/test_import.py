@@ -0,0 +1,38 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import sys
+import unittest
+import subprocess
+
+class TestImport(unittest.TestCase):
+    def run_python(self, statement):
+        subprocess.check_call([sys.executable, "-c", statement])
+
+    # Importing litex_boards should not import any board.
+    def test_lazy_import(self):
+        self.run_python("""
+import sys
+import litex_boards
+import litex_boards.platforms
+import litex_boards.targets
+boards = [m for m in sys.modules if m.startswith(("litex_boards.platforms.", "litex_boards.targets."))]
+assert boards == [], boards
+""")
+
+    # Short and full names should resolve to the same module and only import the requested board.
+    def test_short_names(self):
+        self.run_python("""
+import sys
+from litex_boards.platforms import arty
+import litex_boards.platforms
+import litex_boards.platforms.digilent_arty
+assert arty is litex_boards.platforms.digilent_arty
+assert arty is litex_boards.platforms.arty
+assert arty is sys.modules["litex_boards.platforms.arty"]
+assert arty.__spec__.name == "litex_boards.platforms.digilent_arty", arty.__spec__
+boards = [m for m in sys.modules if m.startswith("litex_boards.platforms.")]
+assert sorted(boards) == ["litex_boards.platforms.arty", "litex_boards.platforms.digilent_arty"], boards
+""")
@@ -0,0 +1,51 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex.build.generic_platform import ConstraintError
+
+from litex_boards.platforms import digilent_arty, xilinx_kc705
+from litex_boards.soc.pins import get_pin_index, use_pin_index
+
+def _requests(platform):
+    platform.add_extension(digilent_arty.sdcard_pmod_io("pmodd"))
+    platform.add_connector(("ext", "pmoda:0 pmoda:1 G13"))
+    platform.add_extension([("ext_io", 0, digilent_arty.Pins("ext:0 ext:2"))])
+    platform.request("clk100")
+    platform.request_all("user_led")
+    platform.request("serial")
+    platform.request("sdcard")
+    platform.request("ext_io")
+    platform.request("ddram")
+    platform.request_remaining("user_sw")
+    platform.lookup_request("serial:tx")
+    constraints = platform.constraint_manager.get_sig_constraints()
+    return [(pins, repr(others), name) for sig, pins, others, name in constraints]
+
+class TestPins(unittest.TestCase):
+    def test_requests(self):
+        platform = use_pin_index(digilent_arty.Platform())
+        self.assertEqual(_requests(platform), _requests(digilent_arty.Platform()))
+        self.assertEqual(platform.lookup_request("serial").tx, platform.lookup_request("serial:tx"))
+        self.assertIsNone(platform.request("clk100", loose=True))
+        with self.assertRaises(ConstraintError):
+            platform.request("user_led", 0)
+        with self.assertRaises(ConstraintError):
+            platform.lookup_request("unknown")
+
+    def test_index(self):
+        index = get_pin_index(xilinx_kc705.Platform())
+        self.assertIs(index, get_pin_index(xilinx_kc705.Platform())) # Cached per platform class.
+        self.assertEqual(index.lookup("user_led", 0)[0][0], "user_led")
+        self.assertEqual(len(index.lookup("user_led")), 8)
+        self.assertEqual(index.resolve("LPC:LA00_CC_P"), index.connector("LPC")["LA00_CC_P"])
+        self.assertIn(("user_led", 0, None), index.pins[index.lookup("user_led", 0)[0][2].identifiers[0]])
+        # Extension on an already used pin.
+        platform = use_pin_index(digilent_arty.Platform())
+        platform.add_extension([("debug", 0, digilent_arty.Pins("pmoda:0"))])
+        platform.add_extension([("debug", 1, digilent_arty.Pins("G13"))])
+        conflicts = platform.constraint_manager.index.conflicts()
+        self.assertEqual(conflicts["G13"], [("debug", 0, None), ("debug", 1, None)])
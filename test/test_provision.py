@@ -0,0 +1,72 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import os
+import tarfile
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from migen import Module
+
+from litex_boards.tools.provision import ProvisionCache, ProvisionError, provision_ip
+
+class TestProvision(unittest.TestCase):
+    def test_seed(self):
+        with tempfile.TemporaryDirectory() as d:
+            # Seed a cache and export it.
+            with open(os.path.join(d, "ps7.xci"), "w") as f:
+                f.write("xci")
+            os.makedirs(os.path.join(d, "valentyusb-hw_cdc_eptri", "valentyusb"))
+            with tarfile.open(os.path.join(d, "valentyusb.tar.gz"), "w:gz") as tar:
+                tar.add(os.path.join(d, "valentyusb-hw_cdc_eptri"), arcname="valentyusb-hw_cdc_eptri")
+            cache = ProvisionCache(os.path.join(d, "cache0"))
+            cache.pin("zybo_z7_ps7_xci", cache.add_blob(os.path.join(d, "ps7.xci")))
+            cache.pin("valentyusb",      cache.add_blob(os.path.join(d, "valentyusb.tar.gz")))
+            cache.export(os.path.join(d, "seed.tar.gz"))
+
+            # Import it in an empty cache and use it offline.
+            cache = ProvisionCache(os.path.join(d, "cache1"))
+            cache.import_(os.path.join(d, "seed.tar.gz"))
+            with open(cache.get("zybo_z7_ps7_xci", fetch=False)) as f:
+                self.assertEqual(f.read(), "xci")
+            valentyusb = cache.get("valentyusb", fetch=False)
+            self.assertTrue(os.path.isdir(os.path.join(valentyusb, "valentyusb")))
+            with self.assertRaises(ProvisionError):
+                cache.get("redpitaya_ps7_xci", fetch=False)
+
+    def test_corrupted(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "ps7.xci"), "w") as f:
+                f.write("xci")
+            cache  = ProvisionCache(d)
+            sha256 = cache.add_blob(os.path.join(d, "ps7.xci"))
+            with self.assertRaises(ProvisionError):
+                cache.add_blob(os.path.join(d, "ps7.xci"), sha256="0"*64)
+            with open(os.path.join(d, "blobs", sha256), "w") as f:
+                f.write("corrupted")
+            with self.assertRaises(ProvisionError):
+                cache.get_blob(sha256)
+
+    def test_provision_ip(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "ps7.xci"), "w") as f:
+                f.write("xci")
+            cache = ProvisionCache(os.path.join(d, "cache"))
+            cache.pin("zybo_z7_ps7_xci", cache.add_blob(os.path.join(d, "ps7.xci")))
+            with mock.patch.dict(os.environ, {"LITEX_BOARDS_PROVISION_DIR": cache.cache_dir}):
+                # Each build gets its own copy of the XCI, in its output directory.
+                for build in ["build0", "build1"]:
+                    soc = Module()
+                    soc.platform = types.SimpleNamespace(ips={}, output_dir=os.path.join(d, build))
+                    xci = provision_ip(soc, "zybo_z7_ps7_xci")
+                    self.assertEqual(os.path.basename(xci), "zybo_z7_ps7.xci")
+                    soc.platform.ips[os.path.abspath(xci)] = False
+                    soc.finalize()
+                    dst = os.path.join(d, build, "ip", "zybo_z7_ps7_xci", "zybo_z7_ps7.xci")
+                    self.assertEqual(soc.platform.ips, {dst: False})
+                    with open(dst) as f:
+                        self.assertEqual(f.read(), "xci")
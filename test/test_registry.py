@@ -0,0 +1,45 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from litex_boards.tools.registry import build_registry, query
+
+class TestRegistry(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = build_registry()
+
+    def test_platform(self):
+        arty = self.registry["platforms"]["digilent_arty"]
+        self.assertEqual(arty["family"],             "xilinx")
+        self.assertEqual(arty["device"],             "xc7a35ticsg324-1L")
+        self.assertEqual(arty["devices"]["a7-100"],  "xc7a100tcsg324-1")
+        self.assertEqual(arty["toolchain"],          "vivado")
+        self.assertEqual(arty["default_clk_name"],   "clk100")
+        self.assertEqual(arty["default_clk_period"], 1e9/100e6)
+        self.assertIn(["ddram", 0], arty["io"])
+        self.assertIn("pmoda", arty["connectors"])
+
+    def test_target(self):
+        arty = self.registry["targets"]["digilent_arty"]
+        self.assertEqual(arty["platforms"], ["digilent_arty"])
+        self.assertIn("--with-ethernet", arty["options"])
+        self.assertIn("DDR3", arty["memtypes"])
+        self.assertIn("liteeth", arty["cores"])
+
+    def test_query(self):
+        targets = query(self.registry, resources=["pcie_x4"], memtypes=["DDR4"])
+        self.assertIn("xilinx_kcu105", targets)
+        self.assertNotIn("digilent_arty", targets)
+
+    def test_helper_options(self):
+        # Options added by the shared litex_boards.soc helpers (ex: pcie_args).
+        kcu105 = self.registry["targets"]["xilinx_kcu105"]
+        self.assertIn("--pcie-dmas", kcu105["options"])
+        self.assertIn("--sata-gen",  kcu105["options"])
+        targets = query(self.registry, options=["--pcie-dmas"])
+        self.assertIn("xilinx_kcu105", targets)
+        self.assertNotIn("digilent_arty", targets)
@@ -0,0 +1,161 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litesata.frontend.arbitration import LiteSATAUserPort
+
+from litex_boards.soc.sata import sata_params, sata_phy_gens, SATASectorStreamer
+
+class _Drive:
+    """LiteSATA user port model: dword n of sector s read as (s << 8 | n), fail_sector failing."""
+    def __init__(self, port, fail_sector=None):
+        self.port        = port
+        self.fail_sector = fail_sector
+        self.commands    = []
+        self.written     = {}
+
+    @passive
+    def generator(self):
+        port = self.port
+        while True:
+            yield port.sink.ready.eq(0)
+            yield port.source.valid.eq(0)
+            yield
+            if not (yield port.sink.valid):
+                continue
+            sector = (yield port.sink.sector)
+            count  = (yield port.sink.count)
+            write  = (yield port.sink.write)
+            failed = self.fail_sector is not None and (sector <= self.fail_sector < sector + count)
+            self.commands.append(("write" if write else "read", sector, count))
+            if write:
+                yield port.sink.ready.eq(1)
+                n = 0
+                while True:
+                    yield
+                    if (yield port.sink.valid):
+                        self.written[(sector << 8) | n] = (yield port.sink.data)
+                        n += 1
+                        if (yield port.sink.last):
+                            break
+                yield port.sink.ready.eq(0)
+            else:
+                yield port.sink.ready.eq(1)
+                yield
+                yield port.sink.ready.eq(0)
+                for s in range(sector, sector + count):
+                    for n in range(128):
+                        yield port.source.valid.eq(1)
+                        yield port.source.end.eq(0)
+                        yield port.source.data.eq((s << 8) | n)
+                        yield
+                        while not (yield port.source.ready):
+                            yield
+            # Response.
+            yield port.source.valid.eq(1)
+            yield port.source.end.eq(1)
+            yield port.source.failed.eq(failed)
+            yield
+            while not (yield port.source.ready):
+                yield
+            yield port.source.failed.eq(0)
+
+def _swap(v):
+    return int.from_bytes(v.to_bytes(4, "big"), "little")
+
+class TestSATA(unittest.TestCase):
+    def test_sata_params(self):
+        self.assertEqual(sata_phy_gens("xc7a200t-sbg484-1"), ["gen1", "gen2"])
+        self.assertEqual(sata_phy_gens("xcku040-ffva1156-2-e"), ["gen1", "gen2", "gen3"])
+        # Defaults: board's generation, one port over the CPU bus.
+        self.assertEqual(sata_params({}, "xc7k325t-ffg900-2", 125e6), {
+            "gen": "gen2", "data_width": 16, "ports": [0], "striping": False, "dma": None})
+        # Gen3: 32-bit PHY, requires 150MHz and a transceiver supporting it.
+        params = sata_params({"sata_gen": 3}, "xc7k325t-ffg900-2", 150e6)
+        self.assertEqual((params["gen"], params["data_width"]), ("gen3", 32))
+        with self.assertRaisesRegex(ValueError, "150.0MHz"):
+            sata_params({"sata_gen": 3}, "xc7k325t-ffg900-2", 125e6)
+        with self.assertRaisesRegex(ValueError, "not supported"):
+            sata_params({"sata_gen": 3}, "xc7a200t-sbg484-1", 150e6)
+        # Several ports: sector streamers (to the SDRAM by default).
+        params = sata_params({"sata_ports": 2, "sata_striping": True}, "xcku040-ffva1156-2-e",
+            125e6, ports=2)
+        self.assertEqual((params["ports"], params["striping"], params["dma"]),
+            ([0, 1], True, "sdram"))
+        with self.assertRaises(ValueError):
+            sata_params({"sata_ports": 3}, "xcku040-ffva1156-2-e", 125e6, ports=2)
+        with self.assertRaises(ValueError):
+            sata_params({"sata_striping": True}, "xcku040-ffva1156-2-e", 125e6, ports=2)
+        # Striping: power of 2 number of ports (ex: the 3 ports of the Acorn with PCIe).
+        with self.assertRaisesRegex(ValueError, "power of 2"):
+            sata_params({"sata_ports": 3, "sata_striping": True}, "xc7a200t-fbg484-2", 125e6, ports=3)
+        params = sata_params({"sata_ports": 3}, "xc7a200t-fbg484-2", 125e6, ports=3)
+        self.assertEqual((params["ports"], params["striping"]), ([0, 1, 2], False))
+
+    def streamer_test(self, write, sector, count, fail_sector=None, junk=0):
+        port  = LiteSATAUserPort(32)
+        dut   = SATASectorStreamer(port, chunk=2)
+        drive = _Drive(port, fail_sector)
+        data  = []
+        def generator():
+            # Data before start (drained).
+            for i in range(junk):
+                yield dut.sink.valid.eq(1)
+                yield dut.sink.data.eq(0xdeadbeef)
+                yield
+            yield dut.sink.valid.eq(0)
+            for i in range(8):
+                yield
+            yield dut._sector.storage.eq(sector)
+            yield dut._count.storage.eq(count)
+            yield dut._write.storage.eq(write)
+            yield dut._start.re.eq(1)
+            yield
+            yield dut._start.re.eq(0)
+            yield
+            n = 0
+            while not (yield dut._done.status):
+                # Stream.
+                yield dut.source.ready.eq(1)
+                yield dut.sink.valid.eq(n < count*128)
+                yield dut.sink.data.eq(_swap(0x5a000000 | n))
+                yield
+                if (yield dut.source.valid):
+                    data.append((yield dut.source.data))
+                if (yield dut.sink.valid) and (yield dut.sink.ready):
+                    n += 1
+            self.error = (yield dut._error.status)
+        run_simulation(dut, [generator(), drive.generator()])
+        return drive, data
+
+    def test_streamer_read(self):
+        drive, data = self.streamer_test(write=0, sector=0x10, count=5)
+        # Split in commands of 2 sectors.
+        self.assertEqual(drive.commands, [("read", 0x10, 2), ("read", 0x12, 2), ("read", 0x14, 1)])
+        self.assertEqual(self.error, 0)
+        # Sectors in order, in memory byte order.
+        self.assertEqual(data, [_swap((s << 8) | n) for s in range(0x10, 0x15) for n in range(128)])
+
+    def test_streamer_write(self):
+        drive, data = self.streamer_test(write=1, sector=0x20, count=3)
+        self.assertEqual(drive.commands, [("write", 0x20, 2), ("write", 0x22, 1)])
+        self.assertEqual(self.error, 0)
+        self.assertEqual(len(drive.written), 3*128)
+        self.assertEqual(drive.written[(0x20 << 8) | 0],   0x5a000000)
+        self.assertEqual(drive.written[(0x22 << 8) | 127], 0x5a000000 | (2*128 + 127))
+
+    def test_streamer_drain(self):
+        drive, data = self.streamer_test(write=1, sector=0x30, count=1, junk=16)
+        self.assertEqual(drive.written[(0x30 << 8) | 0],   0x5a000000)
+        self.assertEqual(drive.written[(0x30 << 8) | 127], 0x5a000000 | 127)
+
+    def test_streamer_error(self):
+        drive, data = self.streamer_test(write=0, sector=0, count=6, fail_sector=3)
+        # Transfer stopped on the failing command.
+        self.assertEqual(drive.commands, [("read", 0, 2), ("read", 2, 2)])
+        self.assertEqual(self.error, 1)
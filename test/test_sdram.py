@@ -0,0 +1,77 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import unittest
+
+from migen import *
+
+from litex.build.generic_platform import Pins
+from litex.build.sim import SimPlatform
+from litex.soc.interconnect import wishbone
+from litex.soc.integration.soc_core import SoCMini
+
+from litedram.modules import MT48LC16M16
+from litedram.phy.model import SDRAMPHYModel, get_sdram_phy_settings
+
+from litex_boards.platforms import xilinx_alveo_u250
+from litex_boards.soc.sdram import WishboneInterleaver, sdram_channels_check, add_sdram_channels
+
+class TestSDRAM(unittest.TestCase):
+    def test_channels_check(self):
+        platform = xilinx_alveo_u250.Platform()
+        sdram_channels_check(platform, [0, 1, 2, 4])
+        # Fourth channel of the U250 numbered 4 in the platform.
+        with self.assertRaisesRegex(ValueError, r"channel\(s\) 3 not available, available: 0, 1, 2, 4"):
+            sdram_channels_check(platform, [0, 1, 2, 3])
+        with self.assertRaisesRegex(ValueError, "more than once"):
+            sdram_channels_check(platform, [0, 0])
+
+    def test_interleaver(self):
+        # 4 slaves of 256 bytes, 16-byte blocks, main_ram at 0x1000.
+        class DUT(Module):
+            def __init__(self):
+                self.master = wishbone.Interface()
+                self.srams  = [wishbone.SRAM(256) for i in range(4)]
+                self.submodules += self.srams
+                self.submodules.interleaver = WishboneInterleaver(self.master,
+                    [sram.bus for sram in self.srams],
+                    base_address = 0x1000,
+                    granularity  = 16)
+        dut   = DUT()
+        reads = []
+        self.words = []
+        def generator():
+            for n in range(64):
+                yield from dut.master.write(0x1000//4 + n, n)
+            for n in range(64):
+                reads.append((yield from dut.master.read(0x1000//4 + n)))
+            # Block b (4 words) in slave b % 4, at block b // 4.
+            for sram in dut.srams:
+                words = []
+                for i in range(16):
+                    words.append((yield sram.mem[i]))
+                self.words.append(words)
+        run_simulation(dut, generator())
+        self.assertEqual(reads, list(range(64)))
+        for s, words in enumerate(self.words):
+            self.assertEqual(words, [4*(4*(i//4) + s) + i % 4 for i in range(16)])
+
+    def test_add_sdram_channels(self):
+        platform = SimPlatform("sim", [("sys_clk", 0, Pins(1)), ("sys_rst", 0, Pins(1))])
+        soc      = SoCMini(platform, clk_freq=100e6)
+        module   = MT48LC16M16(100e6, "1:1")
+        settings = get_sdram_phy_settings(memtype=module.memtype, data_width=32, clk_freq=100e6)
+        phys     = [SDRAMPHYModel(module, settings) for i in range(2)]
+        crossbars = add_sdram_channels(soc, phys, module,
+            origin  = 0x40000000,
+            size    = 0x10000000,
+            mapping = "interleaved")
+        # One controller/crossbar per channel, main_ram: a 64MB window on each channel.
+        self.assertEqual(crossbars, [soc.sdram.crossbar, soc.sdram1.crossbar])
+        self.assertEqual(soc.bus.regions["main_ram"].size, 2*0x04000000)
+        with self.assertRaisesRegex(ValueError, "power of 2"):
+            add_sdram_channels(SoCMini(platform, clk_freq=100e6),
+                [SDRAMPHYModel(module, settings) for i in range(3)], module, origin=0x40000000,
+                mapping = "interleaved")
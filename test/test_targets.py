@@ -5,13 +5,11 @@
 # This file is Copyright (c) 2019 Tim 'mithro' Ansell <me@mith.ro>
 # SPDX-License-Identifier: BSD-2-Clause
 
-import subprocess
 import unittest
-import os
 
-from migen import *
+from litex_boards.tools.registry import load_registry
 
-from litex.soc.integration.builder import *
+from test import runner
 
 class TestTargets(unittest.TestCase):
     excluded_platforms = [
@@ -39,45 +37,25 @@ class TestTargets(unittest.TestCase):
 
     # Build simple design for all platforms.
     def test_platforms(self):
-        # Collect platforms.
-        platforms = []
-        for file in os.listdir("./litex_boards/platforms/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_platforms:
-                    platforms.append(file)
-
-        # Test platforms with simple design.
-        for name in platforms:
-            with self.subTest(platform=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.simple litex_boards.platforms.{} \
-    --no-compile-software   \
-    --no-compile-gateware   \
-    --uart-name="stub"      \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+        self.check_jobs([runner.platform_job(name) for name in collect_platforms()])
 
     # Build default configuration for all targets.
     def test_targets(self):
-        # Collect targets.
-        targets = []
-        for file in os.listdir("./litex_boards/targets/"):
-            if file.endswith(".py"):
-                file = file.replace(".py", "")
-                if file not in ["__init__"] + self.excluded_targets:
-                    targets.append(file)
-
-        # Test targets.
-        for name in targets:
-            with self.subTest(target=name):
-                os.system("rm -rf build")
-                cmd = """\
-python3 -m litex_boards.targets.{} \
-    --cpu-type=vexriscv     \
-    --cpu-variant=minimal   \
-    --no-compile-software   \
-    --no-compile-gateware   \
-""".format(name)
-                subprocess.check_call(cmd, shell=True)
+        self.check_jobs([runner.target_job(name) for name in collect_targets()])
+
+    # Run jobs in parallel (each in its own build directory) and check them.
+    def check_jobs(self, jobs):
+        jobs = runner.run_jobs(jobs)
+        runner.report(jobs)
+        for job in jobs:
+            with self.subTest(job=job.name):
+                self.assertTrue(job.passed, f"{job.name} failed, see {job.log}")
+
+# Collect platforms/targets from the board registry.
+def collect_platforms():
+    registry = load_registry()
+    return [name for name in registry["platforms"] if name not in TestTargets.excluded_platforms]
+
+def collect_targets():
+    registry = load_registry()
+    return [name for name in registry["targets"] if name not in TestTargets.excluded_targets]
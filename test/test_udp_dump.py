@@ -0,0 +1,49 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import socket
+import struct
+import threading
+import unittest
+
+from litex_boards.tools.udp_dump import udp_dump
+
+class _Streamer(threading.Thread):
+    """UDP Streamer model (packets of 16 bytes), dropping the packets in drop once."""
+    def __init__(self, memory, drop=[]):
+        threading.Thread.__init__(self, daemon=True)
+        self.memory = memory
+        self.drop   = list(drop)
+        self.sock   = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port   = self.sock.getsockname()[1]
+
+    def run(self):
+        while True:
+            request, host = self.sock.recvfrom(64)
+            address, length = struct.unpack(">II", request)
+            for offset in range(address, address + length, 16):
+                if offset in self.drop:
+                    self.drop.remove(offset)
+                    continue
+                data = self.memory[offset:min(offset + 16, address + length)]
+                self.sock.sendto(struct.pack(">I", offset) + data, host)
+
+class TestUDPDump(unittest.TestCase):
+    def test_dump(self):
+        memory   = bytes(range(256))
+        streamer = _Streamer(memory)
+        streamer.start()
+        self.assertEqual(udp_dump("127.0.0.1", 0x20, 0x80, port=streamer.port), memory[0x20:0xa0])
+
+    def test_lost_packets(self):
+        memory   = bytes(range(256))
+        streamer = _Streamer(memory, drop=[0x10, 0x40])
+        streamer.start()
+        self.assertEqual(udp_dump("127.0.0.1", 0x00, 0x100, port=streamer.port, timeout=0.1), memory)
+
+    def test_unaligned(self):
+        with self.assertRaises(ValueError):
+            udp_dump("127.0.0.1", 0x01, 0x10)
@@ -0,0 +1,52 @@
+#
+# This file is part of LiteX-Boards.
+#
+# SPDX-License-Identifier: BSD-2-Clause
+
+import argparse
+import unittest
+
+from litedram.modules import MT41K256M16, IS42S16160
+
+from litex_boards.soc.video import video_args, video_argdict, video_params, sdram_bandwidth
+
+class TestVideo(unittest.TestCase):
+    def test_sdram_bandwidth(self):
+        self.assertEqual(sdram_bandwidth(50e6,  IS42S16160,  "1:1", databits=16), 100e6)
+        self.assertEqual(sdram_bandwidth(100e6, MT41K256M16, "1:4", databits=16), 1600e6)
+
+    def test_args(self):
+        parser = argparse.ArgumentParser()
+        video_args(parser)
+        self.assertEqual(video_argdict(parser.parse_args([])), {})
+        args = parser.parse_args(["--video-timings=1280x720@60Hz", "--video-format=rgb565"])
+        self.assertEqual(video_argdict(args), {
+            "video_timings" : "1280x720@60Hz",
+            "video_format"  : "rgb565"})
+
+    def test_video_params(self):
+        bandwidth = sdram_bandwidth(50e6, IS42S16160, "1:1", databits=16)
+        def params(**kwargs):
+            return video_params(kwargs, timings="640x480@75Hz", pix_clk=25e6,
+                sdram_bandwidth=bandwidth)
+        # Board's defaults.
+        self.assertEqual(params(), {"timings": "640x480@75Hz", "format": "rgb888", "pix_clk": 25e6})
+        # Over the budget: rejected, with rgb565 suggested when it fits.
+        with self.assertRaisesRegex(ValueError, "fits in rgb565"):
+            params(video_timings="800x600@60Hz")
+        self.assertEqual(params(video_timings="800x600@60Hz", video_format="rgb565"),
+            {"timings": "800x600@60Hz", "format": "rgb565", "pix_clk": 40e6})
+        # Downscaled to the largest timings fitting in the budget (logged).
+        with self.assertLogs("Video", "WARNING") as logs:
+            self.assertEqual(params(video_timings="1280x720@60Hz", video_downscale=True)["timings"],
+                "640x480@75Hz")
+        self.assertIn("640x480@75Hz", logs.output[0])
+        self.assertEqual(params(video_timings="1280x720@60Hz", video_downscale=True,
+            video_format="rgb565")["timings"], "800x600@75Hz")
+        with self.assertRaisesRegex(ValueError, "no smaller timings"):
+            params(video_timings="1280x720@60Hz", video_downscale=True, video_bandwidth_share=0.1)
+        with self.assertRaises(ValueError):
+            params(video_timings="1280x720@61Hz")
+        # Without framebuffer, no budget.
+        self.assertEqual(video_params({"video_timings": "1920x1080@60Hz"}, timings="640x480@75Hz",
+            sdram_bandwidth=bandwidth, framebuffer=False)["pix_clk"], 148.5e6)